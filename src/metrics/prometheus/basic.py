@@ -104,6 +104,88 @@ PERFORMANCE_REQUESTS_DURATION = Histogram(
     buckets=requests_buckets,
 )
 
+PERFORMANCE_EPOCHS_BATCH_DURATION = Histogram(
+    'performance_epochs_batch_duration',
+    'Duration of a single epochs batch fetch attempt from Performance Collector API',
+    ['status'],
+    namespace=PROMETHEUS_PREFIX,
+    buckets=requests_buckets,
+)
+
+PERFORMANCE_EPOCHS_BATCH_SIZE = Gauge(
+    'performance_epochs_batch_size',
+    'Number of epochs requested in the last batch from Performance Collector API',
+    namespace=PROMETHEUS_PREFIX,
+)
+
+HTTP_COALESCED_REQUESTS = Counter(
+    'http_coalesced_requests',
+    'Total count of GET requests served by an identical request already in flight',
+    ['provider', 'endpoint'],
+    namespace=PROMETHEUS_PREFIX,
+)
+
+EL_CALL_CACHE_REQUESTS = Counter(
+    'el_call_cache_requests',
+    'Total count of contract call cache lookups',
+    ['result'],  # "hit" or "miss"
+    namespace=PROMETHEUS_PREFIX,
+)
+
+EL_CALL_CACHE_SIZE = Gauge(
+    'el_call_cache_size_bytes',
+    'Size of the contract call cache',
+    namespace=PROMETHEUS_PREFIX,
+)
+
+DEPOSIT_SIGNATURE_CACHE_REQUESTS = Counter(
+    'deposit_signature_cache_requests',
+    'Total count of deposit signature verification cache lookups',
+    ['result'],  # "hit" or "miss"
+    namespace=PROMETHEUS_PREFIX,
+)
+
+IPFS_CACHE_REQUESTS = Counter(
+    'ipfs_cache_requests',
+    'Total count of IPFS content cache lookups',
+    ['result'],  # "hit", "miss" or "corrupted"
+    namespace=PROMETHEUS_PREFIX,
+)
+
+KEYS_API_STORE_REQUESTS = Counter(
+    'keys_api_store_requests',
+    'Total count of module versions looked up in the local keys store',
+    ['result'],  # "hit" or "miss"
+    namespace=PROMETHEUS_PREFIX,
+)
+
+IPFS_CACHE_SIZE = Gauge(
+    'ipfs_cache_size_bytes',
+    'Size of the IPFS content cache',
+    namespace=PROMETHEUS_PREFIX,
+)
+
+IPFS_PROVIDER_LATENCY = Gauge(
+    'ipfs_provider_latency_seconds',
+    'Exponentially weighted moving average of IPFS provider fetch latency',
+    ['provider'],
+    namespace=PROMETHEUS_PREFIX,
+)
+
+IPFS_PROVIDER_ERROR_RATE = Gauge(
+    'ipfs_provider_error_rate',
+    'Exponentially weighted moving average of IPFS provider fetch error rate',
+    ['provider'],
+    namespace=PROMETHEUS_PREFIX,
+)
+
+IPFS_UPLOADS = Counter(
+    'ipfs_uploads',
+    'Total count of uploads to IPFS providers',
+    ['provider', 'result'],  # result is "success" or "failure"
+    namespace=PROMETHEUS_PREFIX,
+)
+
 KEYS_API_REQUESTS_DURATION = Histogram(
     'keys_api_requests_duration',
     'Duration of requests to Keys API',
@@ -5,6 +5,7 @@ from itertools import batched, groupby
 from src.modules.common.types import ZERO_HASH
 from src.modules.oracles.accounting.third_phase.types import ExtraData, ExtraDataLengths, FormatList, ItemType
 from src.types import NodeOperatorGlobalIndex
+from src.utils.bytes_writer import BytesWriter
 from src.web3py.types import Web3
 
 
@@ -107,23 +108,33 @@ class ExtraDataService:
         result = []
 
         for payload_batch in batched(all_payloads, max_items_count_per_tx, strict=False):
-            tx_body = b''
+            writer = BytesWriter(sum(cls.get_item_length(payload) for _, payload in payload_batch))
             for item_type, payload in payload_batch:
-                tx_body += index.to_bytes(ExtraDataLengths.ITEM_INDEX)
-                tx_body += item_type.value.to_bytes(ExtraDataLengths.ITEM_TYPE)
-                tx_body += payload.module_id.to_bytes(ExtraDataLengths.MODULE_ID)
-                tx_body += len(payload.node_operator_ids).to_bytes(ExtraDataLengths.NODE_OPS_COUNT)
-                tx_body += b''.join(
-                    no_id.to_bytes(ExtraDataLengths.NODE_OPERATOR_ID) for no_id in payload.node_operator_ids
-                )
-                tx_body += b''.join(count.to_bytes(ExtraDataLengths.NODE_OPERATOR_VALUE) for count in payload.value)
+                writer.write_uint(index, ExtraDataLengths.ITEM_INDEX)
+                writer.write_uint(item_type.value, ExtraDataLengths.ITEM_TYPE)
+                writer.write_uint(payload.module_id, ExtraDataLengths.MODULE_ID)
+                writer.write_uint(len(payload.node_operator_ids), ExtraDataLengths.NODE_OPS_COUNT)
+                writer.write_uints(payload.node_operator_ids, ExtraDataLengths.NODE_OPERATOR_ID)
+                writer.write_uints(payload.value, ExtraDataLengths.NODE_OPERATOR_VALUE)
 
                 index += 1
 
-            result.append(tx_body)
+            result.append(writer.to_bytes())
 
         return index, result
 
+    @staticmethod
+    def get_item_length(payload: ItemPayload) -> int:
+        """Size of the encoded item with the given payload in bytes."""
+        return (
+            ExtraDataLengths.ITEM_INDEX
+            + ExtraDataLengths.ITEM_TYPE
+            + ExtraDataLengths.MODULE_ID
+            + ExtraDataLengths.NODE_OPS_COUNT
+            + len(payload.node_operator_ids) * ExtraDataLengths.NODE_OPERATOR_ID
+            + len(payload.value) * ExtraDataLengths.NODE_OPERATOR_VALUE
+        )
+
     @staticmethod
     def add_hashes_to_transactions(txs_data: list[bytes]) -> tuple[bytes, list[bytes]]:
         """
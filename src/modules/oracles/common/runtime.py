@@ -1,4 +1,5 @@
 from collections.abc import Iterator
+from pathlib import Path
 from typing import Any, TypeVar, cast
 
 from packaging.version import Version
@@ -8,8 +9,10 @@ from src import constants, variables
 from src.metrics.logging import logging
 from src.metrics.prometheus.basic import init_basic_metrics
 from src.modules.oracles.common.oracle_module import OracleModule
-from src.providers.ipfs import Filebase, IPFSProvider, Kubo, LidoIPFS, Pinata
+from src.providers.ipfs import Filebase, IPFSCache, IPFSProvider, Kubo, LidoIPFS, Pinata
+from src.providers.keys.store import KeysStore
 from src.utils.exception import IncompatibleException
+from src.web3py.call_cache import ContractCallCache
 from src.web3py.contract_tweak import tweak_w3_contracts
 from src.web3py.extensions import (
     IPFS,
@@ -43,8 +46,12 @@ def _build_web3_base[W3: Web3Base](web3_cls: type[W3], module_name: str) -> W3:
         )
     )
 
+    call_cache = None
+    if variables.EL_CALL_CACHE_PATH:
+        call_cache = ContractCallCache(Path(variables.EL_CALL_CACHE_PATH), variables.EL_CALL_CACHE_MAX_SIZE_MB * 2**20)
+
     logger.info({'msg': 'Modify web3 with custom contract function call.'})
-    tweak_w3_contracts(web3)
+    tweak_w3_contracts(web3, call_cache)
 
     logger.info({'msg': 'Initialize DataBus telemetry module.'})
     telemetry_data_bus = TelemetryDataBus(
@@ -59,6 +66,8 @@ def _build_web3_base[W3: Web3Base](web3_cls: type[W3], module_name: str) -> W3:
 
     logger.info({'msg': 'Initialize keys api client.'})
     kac = KeysAPIClientModule(variables.KEYS_API_URI, web3)
+    if variables.KEYS_API_STORE_PATH:
+        kac.keys_store = KeysStore(Path(variables.KEYS_API_STORE_PATH))
 
     logger.info({'msg': 'Check configured providers.'})
     if Version(kac.get_status().app_version) < constants.ALLOWED_KAPI_VERSION:
@@ -85,7 +94,7 @@ def _build_web3_base[W3: Web3Base](web3_cls: type[W3], module_name: str) -> W3:
 def build_oracle_web3(module_name: str) -> Web3:
     web3 = _build_web3_base(Web3, module_name)
 
-    ipfs = IPFS(web3, ipfs_providers(), retries=variables.HTTP_REQUEST_RETRY_COUNT_IPFS)
+    ipfs = ipfs_module(web3)
 
     modules: dict[str, Any] = {
         'lido_contracts': LidoContracts,
@@ -108,7 +117,7 @@ def build_staking_module_web3(module_name: str) -> Web3StakingModule:
         raise ValueError("PERFORMANCE_COLLECTOR_URI is required")
 
     performance = PerformanceClientModule(variables.PERFORMANCE_COLLECTOR_URI)
-    ipfs = IPFS(web3, ipfs_providers(), retries=variables.HTTP_REQUEST_RETRY_COUNT_IPFS)
+    ipfs = ipfs_module(web3)
 
     logger.info({'msg': 'Initialize DataBus telemetry module.'})
 
@@ -156,6 +165,24 @@ def check_providers_chain_ids(web3: Web3Base, cc: ConsensusClientModule, kac: Ke
     )
 
 
+def ipfs_module(web3: Web3Base) -> IPFS:
+    return IPFS(
+        web3,
+        ipfs_providers(),
+        retries=variables.HTTP_REQUEST_RETRY_COUNT_IPFS,
+        cache=ipfs_cache(),
+        hedged=variables.IPFS_HEDGED_FETCH,
+        hedge_delay=variables.IPFS_HEDGE_DELAY_SECONDS,
+        early_quorum=variables.IPFS_PUBLISH_EARLY_QUORUM,
+    )
+
+
+def ipfs_cache() -> IPFSCache | None:
+    if not variables.IPFS_CACHE_PATH:
+        return None
+    return IPFSCache(Path(variables.IPFS_CACHE_PATH), variables.IPFS_CACHE_MAX_SIZE_MB * 2**20)
+
+
 def ipfs_providers() -> Iterator[IPFSProvider]:
     """
     Create IPFS providers in PRIORITY order.
@@ -1,6 +1,7 @@
 from eth_typing import HexStr
 
 from src.types import ValidatorIndex
+from src.utils.bytes_writer import BytesWriter
 from src.utils.types import hex_str_to_bytes
 from src.web3py.extensions.lido_validators import LidoValidator, NodeOperatorGlobalIndex
 
@@ -14,6 +15,10 @@ VALIDATOR_INDEX_LENGTH = 8
 KEY_INDEX_LENGTH = 8
 VALIDATOR_PUB_KEY_LENGTH = 48
 
+RECORD_LENGTH = (
+    MODULE_ID_LENGTH + NODE_OPERATOR_ID_LENGTH + VALIDATOR_INDEX_LENGTH + KEY_INDEX_LENGTH + VALIDATOR_PUB_KEY_LENGTH
+)
+
 
 def encode_data(validators_to_eject: list[tuple[NodeOperatorGlobalIndex, LidoValidator]]):
     """
@@ -26,22 +31,22 @@ def encode_data(validators_to_eject: list[tuple[NodeOperatorGlobalIndex, LidoVal
     """
     validators = sort_validators_to_eject(validators_to_eject)
 
-    result = b''
+    writer = BytesWriter(len(validators) * RECORD_LENGTH)
 
     for (module_id, op_id), validator in validators:
-        result += module_id.to_bytes(MODULE_ID_LENGTH)
-        result += op_id.to_bytes(NODE_OPERATOR_ID_LENGTH)
-        result += validator.index.to_bytes(VALIDATOR_INDEX_LENGTH)
-        result += validator.lido_id.index.to_bytes(KEY_INDEX_LENGTH)
+        writer.write_uint(module_id, MODULE_ID_LENGTH)
+        writer.write_uint(op_id, NODE_OPERATOR_ID_LENGTH)
+        writer.write_uint(validator.index, VALIDATOR_INDEX_LENGTH)
+        writer.write_uint(validator.lido_id.index, KEY_INDEX_LENGTH)
 
         pubkey_bytes = hex_str_to_bytes(HexStr(validator.validator.pubkey))
 
         if len(pubkey_bytes) != VALIDATOR_PUB_KEY_LENGTH:
             raise ValueError(f'Unexpected size of validator pub key. Pub key size: {len(validator.validator.pubkey)}')
 
-        result += pubkey_bytes
+        writer.write_bytes(pubkey_bytes)
 
-    return result, DATA_FORMAT_LIST_WITH_KEY_INDEX
+    return writer.to_bytes(), DATA_FORMAT_LIST_WITH_KEY_INDEX
 
 
 def sort_validators_to_eject(
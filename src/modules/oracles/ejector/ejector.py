@@ -1,5 +1,6 @@
 import dataclasses
 import logging
+from bisect import bisect_right
 from typing import cast
 
 from web3.exceptions import ContractCustomError
@@ -39,8 +40,8 @@ from src.utils.validator_balance import (
 from src.utils.validator_state import (
     compute_activation_exit_epoch,
     get_activation_exit_churn_limit,
+    has_execution_withdrawal_credential,
     is_active_validator,
-    is_fully_withdrawable_validator,
 )
 from src.web3py.extensions.lido_validators import LidoValidator
 from src.web3py.types import Web3
@@ -227,20 +228,7 @@ class Ejector(OracleModule[Web3]):
         rewards_speed_per_epoch = self.prediction_service.get_rewards_per_epoch(blockstamp, chain_config)
         logger.info({'msg': 'Calculate average rewards speed per epoch.', 'value': rewards_speed_per_epoch})
 
-        validators_going_to_exit = self.validators_state_service.get_recently_requested_but_not_exiting_validators(
-            chain_config,
-            blockstamp,
-        )
-
-        going_to_withdraw_balance_gwei = Gwei(
-            sum(
-                map(
-                    get_predictable_inbound_balance,
-                    validators_going_to_exit,
-                ),
-                Gwei(0),
-            )
-        )
+        going_to_withdraw_balance_gwei = self._get_going_to_withdraw_balance(blockstamp)
 
         withdrawal_epoch = self._get_predicted_withdrawable_epoch(
             going_to_withdraw_balance_gwei + to_exit_gwei,
@@ -269,21 +257,63 @@ class Ejector(OracleModule[Web3]):
         )
 
     @lru_cache(maxsize=1)
+    def _get_going_to_withdraw_balance(self, blockstamp: ReferenceBlockStamp) -> Gwei:
+        validators_going_to_exit = self.validators_state_service.get_recently_requested_but_not_exiting_validators(
+            self.get_chain_config(blockstamp),
+            blockstamp,
+        )
+
+        return Gwei(
+            sum(
+                map(
+                    get_predictable_inbound_balance,
+                    validators_going_to_exit,
+                ),
+                Gwei(0),
+            )
+        )
+
     def _get_withdrawable_lido_validators_balance(self, on_epoch: EpochNumber, blockstamp: BlockStamp) -> Wei:
+        sweep_balance, withdrawable_epochs, cumulative_full_balance = self._get_withdrawable_balance_schedule(
+            blockstamp
+        )
+        fully_withdrawable_count = bisect_right(withdrawable_epochs, on_epoch)
+        return gwei_to_wei(Gwei(sweep_balance + cumulative_full_balance[fully_withdrawable_count]))
+
+    @lru_cache(maxsize=1)
+    def _get_withdrawable_balance_schedule(self, blockstamp: BlockStamp) -> tuple[Gwei, list[EpochNumber], list[Gwei]]:
+        """
+        Every Lido validator brings its sweep until it becomes fully withdrawable and its whole balance after.
+
+        Returns the sweep of all Lido validators, withdrawable epochs of the validators that will become fully
+        withdrawable in ascending order, and the cumulative balance on top of the sweep they bring by each epoch,
+        so the withdrawable balance on any epoch is found by a binary search.
+        """
         lido_validators = self.w3.lido_validators.get_active_lido_validators(blockstamp=blockstamp)
 
-        result = Gwei(0)
+        sweep_balance = Gwei(0)
+        full_withdrawals: list[tuple[EpochNumber, Gwei]] = []
 
         for v in lido_validators:
             if v.consolidating_as_source:
                 continue
 
-            if is_fully_withdrawable_validator(v.validator, v.balance, on_epoch):
-                result += get_predictable_full_inbound_balance(v)
-            else:
-                result += get_predictable_inbound_sweep(v)
+            sweep = get_predictable_inbound_sweep(v)
+            sweep_balance += sweep
+
+            # Same conditions as in `is_fully_withdrawable_validator` except the withdrawable epoch
+            if has_execution_withdrawal_credential(v.validator) and v.balance > Gwei(0):
+                full_withdrawals.append(
+                    (v.validator.withdrawable_epoch, get_predictable_full_inbound_balance(v) - sweep)
+                )
+
+        full_withdrawals.sort(key=lambda withdrawal: withdrawal[0])
+
+        cumulative_full_balance = [Gwei(0)]
+        for _, balance in full_withdrawals:
+            cumulative_full_balance.append(Gwei(cumulative_full_balance[-1] + balance))
 
-        return gwei_to_wei(result)
+        return sweep_balance, [epoch for epoch, _ in full_withdrawals], cumulative_full_balance
 
     @lru_cache(maxsize=1)
     def _get_total_el_balance(self, blockstamp: BlockStamp) -> Wei:
@@ -339,6 +369,7 @@ class Ejector(OracleModule[Web3]):
         return get_sweep_delay_in_epochs(state, chain_config)
 
     # https://github.com/ethereum/consensus-specs/blob/dev/specs/phase0/beacon-chain.md#get_total_active_balance
+    @lru_cache(maxsize=1)
     def _get_total_active_balance(self, blockstamp: ReferenceBlockStamp) -> Gwei:
         active_validators = self._get_active_validators(blockstamp)
         return max(
@@ -353,6 +384,19 @@ class Ejector(OracleModule[Web3]):
         """
         Calculates the amount of ETH locked for depositing for a given epoches_number.
         """
+        reserve_per_frame = self._get_deposit_reserve_per_frame(blockstamp)
+        ao_frame_size = self._get_accounting_frame_size(blockstamp)
+
+        # `get_withdrawals_reserve` already reflects the reserve locked for the current accounting
+        # frame at `blockstamp`. Only additional fully covered accounting frames within
+        # `epoches_number` must be added here, so floor-division is intentional. Using ceil
+        # would over-count by adding a reserve for a partial / already-accounted frame.
+        ao_frames = epoches_number // ao_frame_size
+
+        return Wei(ao_frames * reserve_per_frame)
+
+    @lru_cache(maxsize=1)
+    def _get_deposit_reserve_per_frame(self, blockstamp: ReferenceBlockStamp) -> Wei:
         deposit_per_frame = self.w3.lido_contracts.lido.get_deposits_reserve_target(blockstamp.block_hash)
         max_wr_wei = self.w3.lido_contracts.withdrawal_queue_nft.max_steth_withdrawal_amount(blockstamp.block_hash)
 
@@ -360,8 +404,10 @@ class Ejector(OracleModule[Web3]):
         # the buffer after WRs are fulfilled — so it cannot be redirected to deposits unless
         # the first WR in line exceeds the available buffer. In that worst case, at most `max_wr_wei` per
         # frame can flow into the buffer for deposits instead of fulfilling withdrawals
-        reserve_per_frame = min(deposit_per_frame, max_wr_wei)
+        return Wei(min(deposit_per_frame, max_wr_wei))
 
+    @lru_cache(maxsize=1)
+    def _get_accounting_frame_size(self, blockstamp: ReferenceBlockStamp) -> int:
         consensus_contract = cast(
             HashConsensusContract,
             self.w3.eth.contract(
@@ -371,11 +417,4 @@ class Ejector(OracleModule[Web3]):
             ),
         )
 
-        ao_frame_size = consensus_contract.get_frame_config(blockstamp.block_hash).epochs_per_frame
-        # `get_withdrawals_reserve` already reflects the reserve locked for the current accounting
-        # frame at `blockstamp`. Only additional fully covered accounting frames within
-        # `epoches_number` must be added here, so floor-division is intentional. Using ceil
-        # would over-count by adding a reserve for a partial / already-accounted frame.
-        ao_frames = epoches_number // ao_frame_size
-
-        return Wei(ao_frames * reserve_per_frame)
+        return consensus_contract.get_frame_config(blockstamp.block_hash).epochs_per_frame
@@ -1,30 +1,60 @@
 import math
-from collections import defaultdict
 from dataclasses import dataclass
+from typing import Self
 
 from src.constants import (
+    COMPOUNDING_WITHDRAWAL_PREFIX,
+    ETH1_ADDRESS_WITHDRAWAL_PREFIX,
     FAR_FUTURE_EPOCH,
+    MAX_EFFECTIVE_BALANCE_ELECTRA,
     MAX_PENDING_PARTIALS_PER_WITHDRAWALS_SWEEP,
     MAX_WITHDRAWALS_PER_PAYLOAD,
     MIN_ACTIVATION_BALANCE,
 )
 from src.modules.common.types import ChainConfig
 from src.providers.consensus.types import BeaconStateView
-from src.types import Gwei
-from src.utils.validator_state import (
-    get_max_effective_balance,
-    is_fully_withdrawable_validator,
-    is_partially_withdrawable_validator,
-)
+from src.types import EpochNumber, Gwei
 from src.utils.web3converter import epoch_from_slot
 
 
+# Max effective balance by withdrawal credentials prefix. Validators with other prefixes are never swept
+# https://github.com/ethereum/consensus-specs/blob/dev/specs/electra/beacon-chain.md#new-get_max_effective_balance
+EXECUTION_WITHDRAWAL_PREFIX_MAX_EFFECTIVE_BALANCE = {
+    ETH1_ADDRESS_WITHDRAWAL_PREFIX: MIN_ACTIVATION_BALANCE,
+    COMPOUNDING_WITHDRAWAL_PREFIX: MAX_EFFECTIVE_BALANCE_ELECTRA,
+}
+
+
 @dataclass
 class Withdrawal:
     validator_index: int
     amount: int
 
 
+@dataclass
+class SweepColumns:
+    """
+    Validators fields the withdrawals sweep depends on, one list per field with an item per validator index.
+    `max_effective_balance` is None for validators without an execution withdrawal credential.
+    """
+
+    max_effective_balance: list[Gwei | None]
+    effective_balance: list[Gwei]
+    withdrawable_epoch: list[EpochNumber]
+    balance: list[Gwei]
+
+    @classmethod
+    def from_state(cls, state: BeaconStateView) -> Self:
+        validators = state.validators
+        max_effective_balances = EXECUTION_WITHDRAWAL_PREFIX_MAX_EFFECTIVE_BALANCE
+        return cls(
+            max_effective_balance=[max_effective_balances.get(v.withdrawal_credentials[:4]) for v in validators],
+            effective_balance=[v.effective_balance for v in validators],
+            withdrawable_epoch=[v.withdrawable_epoch for v in validators],
+            balance=list(state.balances),
+        )
+
+
 def get_sweep_delay_in_epochs(state: BeaconStateView, spec: ChainConfig) -> int:
     """
     This method predicts the average withdrawal delay in epochs.
@@ -57,10 +87,11 @@ def predict_withdrawals_number_in_sweep_cycle(state: BeaconStateView, slots_per_
     This makes such an event extremely unlikely. More details can be found in the research: https://hackmd.io/@lido/HyrhJeLOJe.
     """
     pending_partial_withdrawals = get_pending_partial_withdrawals(state)
-    validators_withdrawals = get_validators_withdrawals(state, pending_partial_withdrawals, slots_per_epoch)
+    validators_withdrawals_number = get_validators_withdrawals_number(
+        state, pending_partial_withdrawals, slots_per_epoch
+    )
 
     pending_partial_withdrawals_number = len(pending_partial_withdrawals)
-    validators_withdrawals_number = len(validators_withdrawals)
 
     # Each payload can have no more than MAX_PENDING_PARTIALS_PER_WITHDRAWALS_SWEEP
     # pending partials out of MAX_WITHDRAWALS_PER_PAYLOAD
@@ -137,25 +168,49 @@ def get_validators_withdrawals(
     https://github.com/ethereum/consensus-specs/blob/dev/specs/electra/beacon-chain.md#modified-get_expected_withdrawals
     """
     epoch = epoch_from_slot(state.slot, slots_per_epoch)
-    withdrawals = []
-    partially_withdrawn_map: dict[int, int] = defaultdict(int)
+    amounts = get_validators_withdrawal_amounts(SweepColumns.from_state(state), partial_withdrawals, epoch)
 
-    for withdrawal in partial_withdrawals:
-        partially_withdrawn_map[withdrawal.validator_index] += withdrawal.amount
+    return [
+        Withdrawal(validator_index=validator_index, amount=amount)
+        for validator_index, amount in enumerate(amounts)
+        if amount
+    ]
 
-    for validator_index, validator in enumerate(state.indexed_validators):
-        partially_withdrawn_balance = Gwei(partially_withdrawn_map.get(validator_index, 0))
-        balance = Gwei(state.balances[validator_index] - partially_withdrawn_balance)
 
-        if is_fully_withdrawable_validator(validator.validator, balance, epoch):
-            withdrawals.append(Withdrawal(validator_index=validator_index, amount=balance))
-        elif is_partially_withdrawable_validator(validator.validator, balance):
-            max_effective_balance = get_max_effective_balance(validator.validator)
-            withdrawals.append(
-                Withdrawal(
-                    validator_index=validator_index,
-                    amount=balance - max_effective_balance,
-                )
-            )
+def get_validators_withdrawals_number(
+    state: BeaconStateView, partial_withdrawals: list[Withdrawal], slots_per_epoch: int
+) -> int:
+    """
+    Returns the number of withdrawals `get_validators_withdrawals` returns without building them.
+    """
+    epoch = epoch_from_slot(state.slot, slots_per_epoch)
+    amounts = get_validators_withdrawal_amounts(SweepColumns.from_state(state), partial_withdrawals, epoch)
 
-    return withdrawals
+    return len(amounts) - amounts.count(0)
+
+
+def get_validators_withdrawal_amounts(
+    columns: SweepColumns, partial_withdrawals: list[Withdrawal], epoch: EpochNumber
+) -> list[int]:
+    """
+    Returns the amount withdrawn by the sweep from every validator, 0 for validators that are not withdrawable.
+
+    Same checks as `is_fully_withdrawable_validator` and `is_partially_withdrawable_validator` applied to all
+    validators in a single pass over the columns, after the partial withdrawals are deducted from the balances.
+    """
+    balances = columns.balance.copy()
+    for withdrawal in partial_withdrawals:
+        balances[withdrawal.validator_index] -= withdrawal.amount
+
+    amounts = [0] * len(balances)
+    for validator_index, (max_effective_balance, effective_balance, withdrawable_epoch, balance) in enumerate(
+        zip(columns.max_effective_balance, columns.effective_balance, columns.withdrawable_epoch, balances, strict=True)
+    ):
+        if max_effective_balance is None:
+            continue
+        if withdrawable_epoch <= epoch and balance > 0:
+            amounts[validator_index] = balance
+        elif effective_balance == max_effective_balance and balance > max_effective_balance:
+            amounts[validator_index] = balance - max_effective_balance
+
+    return amounts
@@ -2,9 +2,10 @@ import logging
 import sys
 import time
 from collections import defaultdict
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from contextlib import suppress
 from dataclasses import dataclass
+from pathlib import Path
 
 from eth_typing import HexAddress
 from hexbytes import HexBytes
@@ -24,10 +25,10 @@ from src.modules.oracles.common.oracle_module import OracleModule
 from src.modules.oracles.staking_modules.common.distribution import Distribution, DistributionResult
 from src.modules.oracles.staking_modules.common.helpers.last_report import LastReport
 from src.modules.oracles.staking_modules.common.log import Logs
-from src.modules.oracles.staking_modules.common.state import NetworkDuties, State
+from src.modules.oracles.staking_modules.common.state import NetworkDuties, PartialState, State
 from src.modules.oracles.staking_modules.common.tree import RewardsTree, StrikesTree, Tree
 from src.modules.oracles.staking_modules.common.types import ReportData, RewardsShares, StrikesList, StrikesValidator
-from src.modules.sidecars.performance.common.db import Duty
+from src.modules.sidecars.performance.common.db import Duty, FilteredDuty
 from src.providers.consensus.types import Validator
 from src.providers.execution.contracts.cs_fee_oracle import CSFeeOracleContract
 from src.providers.execution.exceptions import InconsistentData
@@ -38,9 +39,12 @@ from src.types import (
     NodeOperatorId,
     ReferenceBlockStamp,
     SlotNumber,
+    StakingModuleAddress,
     ValidatorIndex,
 )
 from src.utils.cache import global_lru_cache as lru_cache
+from src.utils.car import CARConverter, CARFile
+from src.utils.pubkey_index import get_pubkey_index
 from src.utils.validator_state import is_active_validator
 from src.web3py.extensions.telemetry_data_bus import TelemetryEventId
 from src.web3py.types import Web3StakingModule
@@ -91,6 +95,9 @@ class SMPerformanceOracle(OracleModule[Web3StakingModule]):
         3. Calculate the share of each node operator excluding underperforming validators.
     """
 
+    # Min number of new epochs to advance the partial state by during idle cycles (1 day).
+    ACCUMULATION_MIN_EPOCHS = 225
+
     report_contract: CSFeeOracleContract
     consumer: HexAddress
     collector_telemetry: ThrottledTelemetry
@@ -124,10 +131,12 @@ class SMPerformanceOracle(OracleModule[Web3StakingModule]):
 
         report_blockstamp = self.get_blockstamp_for_report(last_finalized_blockstamp)
         if not report_blockstamp:
+            self.try_accumulate_duties(last_finalized_blockstamp)
             return ModuleExecuteDelay.NEXT_FINALIZED_EPOCH
 
         is_range_available = self.check_report_range_availability(report_blockstamp)
         if not is_range_available:
+            self.try_accumulate_duties(last_finalized_blockstamp)
             return ModuleExecuteDelay.NEXT_FINALIZED_EPOCH
 
         self.process_report(report_blockstamp)
@@ -267,34 +276,204 @@ class SMPerformanceOracle(OracleModule[Web3StakingModule]):
         CONTRACT_ON_PAUSE.labels(self.consumer).set(on_pause)
         return not on_pause
 
+    @duration_meter()
+    def try_accumulate_duties(self, blockstamp: BlockStamp) -> None:
+        """Accumulation is an optimisation only, the frame is processed from scratch at the report time if it fails"""
+        try:
+            self.accumulate_duties(blockstamp)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logger.exception({"msg": "Failed to accumulate duties in advance", "error": str(error)})
+
+    def accumulate_duties(self, blockstamp: BlockStamp) -> None:
+        """
+        Folds the epochs of the predicted report range that are already available in the performance sidecar into
+        the persisted partial state, so only the tail epochs are left to process at the report time.
+        """
+        state_path = self._get_partial_state_path()
+        if state_path is None:
+            return
+
+        l_epoch, r_epoch = self._get_predicted_range(blockstamp)
+        epochs_per_frame = self._get_web3_converter(blockstamp).frame_config.epochs_per_frame
+        filtered = variables.PERFORMANCE_ORACLE_FILTER_MODULE_VALIDATORS
+        partial = self._load_partial_state(state_path, l_epoch, r_epoch, epochs_per_frame)
+        if partial is None:
+            partial = PartialState.empty(l_epoch, r_epoch, epochs_per_frame, filtered)
+
+        to_epoch = self._find_last_available_epoch(EpochNumber(partial.processed_epoch + 1), r_epoch)
+        if to_epoch is None:
+            return
+        # Every step fetches the whole validators registry, so the state is advanced by chunks of epochs.
+        if to_epoch - partial.processed_epoch < self.ACCUMULATION_MIN_EPOCHS and to_epoch != r_epoch:
+            return
+
+        validators_by_index = self.w3.cc.get_validators_by_indexes(blockstamp)
+        tracked_indexes = None
+        if filtered:
+            tracked_indexes = self._get_module_validator_indexes(blockstamp, validators_by_index)
+
+        logger.info(
+            {
+                "msg": "Accumulating duties in advance",
+                "from_epoch": partial.processed_epoch + 1,
+                "to_epoch": to_epoch,
+                "report_range": (l_epoch, r_epoch),
+            }
+        )
+        self._fold_duties(partial.state, partial.processed_epoch, to_epoch, validators_by_index, tracked_indexes)
+        partial.processed_epoch = to_epoch
+        partial.save(state_path)
+
+    def _find_last_available_epoch(self, from_epoch: EpochNumber, to_epoch: EpochNumber) -> EpochNumber | None:
+        """Returns the last epoch of the longest available range starting at `from_epoch`"""
+        if from_epoch > to_epoch:
+            return None
+        if self.w3.performance.is_range_available(from_epoch, to_epoch):
+            return to_epoch
+
+        # Binary search over the range end: `available` is always available, `unavailable` is never.
+        available, unavailable = from_epoch - 1, to_epoch
+        while unavailable - available > 1:
+            middle = (available + unavailable) // 2
+            if self.w3.performance.is_range_available(from_epoch, EpochNumber(middle)):
+                available = middle
+            else:
+                unavailable = middle
+        return EpochNumber(available) if available >= from_epoch else None
+
+    def _get_partial_state_path(self) -> Path | None:
+        if not variables.PERFORMANCE_ORACLE_STATE_DIR:
+            return None
+        state_dir = Path(variables.PERFORMANCE_ORACLE_STATE_DIR)
+        state_dir.mkdir(parents=True, exist_ok=True)
+        return state_dir / f"{self.consumer}.duties"
+
+    @staticmethod
+    def _load_partial_state(
+        path: Path, l_epoch: EpochNumber, r_epoch: EpochNumber, epochs_per_frame: int
+    ) -> PartialState | None:
+        partial = PartialState.load(path)
+        if partial is None:
+            return None
+        if not partial.matches(
+            l_epoch, r_epoch, epochs_per_frame, variables.PERFORMANCE_ORACLE_FILTER_MODULE_VALIDATORS
+        ):
+            logger.info({"msg": "Partial state is built for another range, skipping it", "path": str(path)})
+            return None
+        return partial
+
+    def _fold_duties(
+        self,
+        state: State,
+        processed_epoch: EpochNumber,
+        to_epoch: EpochNumber,
+        validators_by_index: dict[ValidatorIndex, Validator],
+        tracked_indexes: set[ValidatorIndex] | None,
+    ) -> None:
+        """
+        Adds the duties of epochs (`processed_epoch`, `to_epoch`] to the state. Frame duties are additive over
+        consecutive epochs ranges, so the frames may be filled by parts.
+        """
+        for l_epoch, r_epoch in state.frames:
+            from_epoch = EpochNumber(max(l_epoch, processed_epoch + 1))
+            till_epoch = EpochNumber(min(r_epoch, to_epoch))
+            if from_epoch > till_epoch:
+                continue
+            state.save_duties(
+                (l_epoch, r_epoch),
+                self._get_frame_duties(from_epoch, till_epoch, validators_by_index, tracked_indexes),
+            )
+
     @lru_cache(maxsize=1)
     @duration_meter()
     def _get_duties_state(
         self, report_l_epoch: EpochNumber, report_r_epoch: EpochNumber, epochs_per_frame: int
     ) -> State:
+        state_path = self._get_partial_state_path()
+        partial = None
+        if state_path is not None:
+            partial = self._load_partial_state(state_path, report_l_epoch, report_r_epoch, epochs_per_frame)
+        if partial is None:
+            partial = PartialState.empty(
+                report_l_epoch,
+                report_r_epoch,
+                epochs_per_frame,
+                variables.PERFORMANCE_ORACLE_FILTER_MODULE_VALIDATORS,
+            )
+        state = partial.state
+
+        if partial.processed_epoch >= report_r_epoch:
+            logger.info({"msg": "All the duties are aggregated in advance", "total_frames": len(state.frames)})
+            return state
+
         finalized_blockstamp = self._receive_last_finalized_slot()
         validators_by_index = self.w3.cc.get_validators_by_indexes(finalized_blockstamp)
 
-        state = State(report_l_epoch, report_r_epoch, epochs_per_frame)
+        tracked_indexes = None
+        if variables.PERFORMANCE_ORACLE_FILTER_MODULE_VALIDATORS:
+            tracked_indexes = self._get_module_validator_indexes(finalized_blockstamp, validators_by_index)
+
         logger.info(
             {
                 "msg": "Starting state fulfillment",
                 "total_frames": len(state.frames),
                 "total_epochs": report_r_epoch - report_l_epoch + 1,
+                "processed_in_advance_epochs": partial.processed_epoch - report_l_epoch + 1,
                 "total_validators": len(validators_by_index),
+                "tracked_validators": len(validators_by_index) if tracked_indexes is None else len(tracked_indexes),
             }
         )
 
-        for l_epoch, r_epoch in state.frames:
-            state.save_duties((l_epoch, r_epoch), self._get_frame_duties(l_epoch, r_epoch, validators_by_index))
+        self._fold_duties(state, partial.processed_epoch, report_r_epoch, validators_by_index, tracked_indexes)
+
+        if state_path is not None:
+            # Keep the complete state to not process the frame again if the report is retried.
+            partial.processed_epoch = report_r_epoch
+            partial.save(state_path)
 
         return state
 
+    def _get_module_validator_indexes(
+        self, blockstamp: BlockStamp, validators_by_index: dict[int, Validator]
+    ) -> set[ValidatorIndex]:
+        """
+        Indexes of the staking module validators known at the given blockstamp. Used keys are never removed from the
+        module, so the set covers the validators of all the frames ending before the blockstamp.
+        """
+        module_address = StakingModuleAddress(self.w3.staking_module.module.address)
+        kapi = self.w3.kac.get_used_module_operators_keys(module_address, blockstamp)
+        pubkey_index = get_pubkey_index()
+        if pubkey_index is None:
+            module_pubkeys = {key.key for key in kapi['keys']}
+            return {
+                validator.index
+                for validator in validators_by_index.values()
+                if validator.validator.pubkey in module_pubkeys
+            }
+
+        pubkey_index.update(validators_by_index)
+        return {
+            index
+            for index in pubkey_index.get_many(key.key for key in kapi['keys'])
+            if index is not None and index in validators_by_index
+        }
+
     def _get_frame_duties(  # noqa: C901
-        self, l_epoch: EpochNumber, r_epoch: EpochNumber, validators_by_index: dict[int, Validator]
+        self,
+        l_epoch: EpochNumber,
+        r_epoch: EpochNumber,
+        validators_by_index: dict[int, Validator],
+        tracked_indexes: set[ValidatorIndex] | None = None,
     ) -> NetworkDuties:
+        """
+        Aggregates duties of the validators for the frame.
+
+        If `tracked_indexes` is given, only these validators get their own accumulators. Duties of the rest of the
+        network are summed up into the `untracked_*` accumulators using the epoch summaries from the sidecar.
+        """
         duties_to_save = NetworkDuties()
         missed_atts: defaultdict[ValidatorIndex, int] = defaultdict(int)
+        untracked_missed_atts = 0
         processed_epochs: set[EpochNumber] = set()
 
         total_epochs = r_epoch - l_epoch + 1
@@ -303,7 +482,12 @@ class SMPerformanceOracle(OracleModule[Web3StakingModule]):
             {"msg": "Processing frame", "start_epoch": l_epoch, "end_epoch": r_epoch, "total_epochs": total_epochs}
         )
 
-        raw_duties = self.w3.performance.get_epochs_data(l_epoch, r_epoch)
+        raw_duties: Iterable[Duty | FilteredDuty]
+        if tracked_indexes is None:
+            raw_duties = self.w3.performance.get_epochs_data(l_epoch, r_epoch)
+        else:
+            raw_duties = self.w3.performance.get_epochs_data(l_epoch, r_epoch, validator_indexes=tracked_indexes)
+
         for duties in raw_duties:
             self._validate_epoch_data(duties)
 
@@ -317,11 +501,27 @@ class SMPerformanceOracle(OracleModule[Web3StakingModule]):
                 if vid not in validators_by_index:
                     raise ValueError(f"Validator {vid} is missing in validators list")
                 proposed = duties.proposals_flags[i]
-                v_prop = duties_to_save.proposals[vid]
-                v_prop.assigned += 1
-                v_prop.included += int(proposed)
+                duties_to_save.proposals.add(vid, assigned=1, included=int(proposed))
                 blocks_in_epoch += int(proposed)
 
+            if isinstance(duties, FilteredDuty):
+                summary = duties.summary
+                duties_to_save.untracked_proposals.assigned += summary.proposals_assigned - len(duties.proposals_vids)
+                duties_to_save.untracked_proposals.included += summary.proposals_included - blocks_in_epoch
+                # Sync committee duties depend on all the blocks proposed in the epoch.
+                blocks_in_epoch = summary.proposals_included
+                if blocks_in_epoch:
+                    untracked_syncs = summary.syncs_assigned - len(duties.syncs_vids)
+                    untracked_sync_misses = summary.syncs_missed - sum(duties.syncs_misses)
+                    if untracked_sync_misses > untracked_syncs * blocks_in_epoch:
+                        raise ValueError(
+                            f"Inconsistent sync committee duties summary in epoch {epoch}: "
+                            f"{untracked_sync_misses=} > {untracked_syncs=} * {blocks_in_epoch=}"
+                        )
+                    duties_to_save.untracked_syncs.assigned += untracked_syncs * blocks_in_epoch
+                    duties_to_save.untracked_syncs.included += untracked_syncs * blocks_in_epoch - untracked_sync_misses
+                untracked_missed_atts += summary.missed_attestations - len(duties.missed_attestation_vids)
+
             if blocks_in_epoch:
                 for i, vid in enumerate(ValidatorIndex(vid) for vid in duties.syncs_vids):
                     if vid not in validators_by_index:
@@ -332,9 +532,7 @@ class SMPerformanceOracle(OracleModule[Web3StakingModule]):
                             f"Inconsistent sync committee duties data: index={i}, {vid=}, "
                             f"{s_misses=} > {blocks_in_epoch=}"
                         )
-                    v_sync = duties_to_save.syncs[vid]
-                    v_sync.assigned += blocks_in_epoch
-                    v_sync.included += blocks_in_epoch - s_misses
+                    duties_to_save.syncs.add(vid, assigned=blocks_in_epoch, included=blocks_in_epoch - s_misses)
 
             for vid in (ValidatorIndex(vid) for vid in duties.missed_attestation_vids):
                 validator = validators_by_index.get(vid)
@@ -356,19 +554,29 @@ class SMPerformanceOracle(OracleModule[Web3StakingModule]):
             if not assigned:
                 continue
 
+            if tracked_indexes is not None and validator.index not in tracked_indexes:
+                duties_to_save.untracked_attestations.assigned += assigned
+                duties_to_save.untracked_attestations.included += assigned
+                continue
+
             misses = missed_atts[validator.index]
             if misses > assigned:
                 raise ValueError(
                     f"Invalid attestation duties data: validator={validator.index}, {misses=} > {assigned=}"
                 )
-            v_atts = duties_to_save.attestations[validator.index]
-            v_atts.assigned += assigned
-            v_atts.included += assigned - misses
+            duties_to_save.attestations.add(validator.index, assigned=assigned, included=assigned - misses)
+
+        if untracked_missed_atts > duties_to_save.untracked_attestations.included:
+            raise ValueError(
+                f"Invalid attestation duties summary: {untracked_missed_atts=} > "
+                f"{duties_to_save.untracked_attestations.assigned=}"
+            )
+        duties_to_save.untracked_attestations.included -= untracked_missed_atts
 
         return duties_to_save
 
     @staticmethod
-    def _validate_epoch_data(duty: Duty):
+    def _validate_epoch_data(duty: Duty | FilteredDuty):
         if len(duty.missed_attestation_vids) != len(set(duty.missed_attestation_vids)):
             raise ValueError(f"Duplicate validator indices in missed attestation vids for epoch {duty.epoch}")
 
@@ -382,6 +590,18 @@ class SMPerformanceOracle(OracleModule[Web3StakingModule]):
         if syncs_vids_len != syncs_misses_len:
             raise ValueError(f"Epoch {duty.epoch} data is corrupted: {syncs_vids_len=} != {syncs_misses_len=}")
 
+        if isinstance(duty, FilteredDuty):
+            summary = duty.summary
+            if (
+                summary.missed_attestations < len(duty.missed_attestation_vids)
+                or summary.proposals_assigned < proposals_vids_len
+                or summary.proposals_included < sum(duty.proposals_flags)
+                or summary.proposals_included > summary.proposals_assigned
+                or summary.syncs_assigned < syncs_vids_len
+                or summary.syncs_missed < sum(duty.syncs_misses)
+            ):
+                raise ValueError(f"Epoch {duty.epoch} summary is inconsistent with the filtered duties: {summary=}")
+
     @staticmethod
     def _count_active_epochs(validator: Validator, l_epoch: EpochNumber, r_epoch: EpochNumber) -> int:
         first_active_epoch = max(l_epoch, validator.validator.activation_epoch)
@@ -423,13 +643,20 @@ class SMPerformanceOracle(OracleModule[Web3StakingModule]):
         logger.info({"msg": "New strikes tree built for the report", "root": repr(tree.root)})
         return tree
 
+    @staticmethod
+    def _encode_to_car(obj: Tree | Logs) -> CARFile:
+        # The JSON is hashed and spooled to disk while being encoded, so the dump is never held in memory at once
+        with CARConverter().open_car() as writer:
+            obj.encode_to(writer)
+            return writer.finish()
+
     def _publish_tree(self, tree: Tree) -> CID:
-        tree_cid = self.w3.ipfs.publish(tree.encode())
+        tree_cid = self.w3.ipfs.publish(self._encode_to_car(tree))
         logger.info({"msg": "Tree dump uploaded to IPFS", "cid": repr(tree_cid)})
         return tree_cid
 
     def _publish_log(self, logs: Logs) -> CID:
-        log_cid = self.w3.ipfs.publish(logs.encode())
+        log_cid = self.w3.ipfs.publish(self._encode_to_car(logs))
         logger.info({"msg": "Frame(s) log uploaded to IPFS", "cid": repr(log_cid)})
         return log_cid
 
@@ -1,11 +1,13 @@
 import logging
 import math
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from dataclasses import asdict, dataclass, field
 
 from eth_typing import HexStr
 
+from src import variables
 from src.constants import EFFECTIVE_BALANCE_INCREMENT, MAX_EFFECTIVE_BALANCE_ELECTRA, MIN_ACTIVATION_BALANCE
 from src.modules.oracles.staking_modules.common.helpers.last_report import LastReport
 from src.modules.oracles.staking_modules.common.log import FramePerfLog, Logs, OperatorFrameSummary
@@ -44,6 +46,15 @@ class ValidatorDutiesOutcome:
     strikes: int
 
 
+@dataclass
+class FrameOutcomes:
+    """Outcomes of the module validators duties in a frame. They don't depend on the other frames"""
+
+    participation_shares: dict[NodeOperatorId, dict[ValidatorIndex, ParticipationShares]] = field(default_factory=dict)
+    rebate_share: ParticipationShares = 0
+    strikes: dict[StrikesValidator, int] = field(default_factory=dict)
+
+
 @dataclass
 class DistributionResult:
     total_rewards: RewardsShares = 0
@@ -68,28 +79,35 @@ class Distribution:
         result = DistributionResult()
         result.strikes.update(last_report.strikes.items())
 
+        frames = self.state.frames
+        frame_blockstamps = [self._get_frame_blockstamp(blockstamp, to_epoch) for _, to_epoch in frames]
+        frame_logs = [
+            FramePerfLog(frame_blockstamp, frame)
+            for frame, frame_blockstamp in zip(frames, frame_blockstamps, strict=True)
+        ]
+        frames_outcomes = self._calculate_frames_outcomes(frames, frame_blockstamps, frame_logs)
+
+        # Rewards to distribute in a frame depend on the rewards distributed in the previous ones, as well as
+        # strikes, so the outcomes are folded frame by frame.
         distributed_so_far = 0
-        for frame in self.state.frames:
+        for frame, frame_blockstamp, frame_log, outcomes in zip(
+            frames, frame_blockstamps, frame_logs, frames_outcomes, strict=True
+        ):
             from_epoch, to_epoch = frame
             logger.info({"msg": f"Calculating distribution for frame [{from_epoch};{to_epoch}]"})
 
-            frame_blockstamp = self._get_frame_blockstamp(blockstamp, to_epoch)
-            frame_module_validators = self._get_module_validators(frame_blockstamp)
-
             total_rewards_to_distribute = self.w3.staking_module.fee_distributor.shares_to_distribute(
                 frame_blockstamp.block_hash
             )
             rewards_to_distribute_in_frame = total_rewards_to_distribute - distributed_so_far
 
-            frame_log = FramePerfLog(frame_blockstamp, frame)
-            (rewards_map_in_frame, distributed_rewards_in_frame, rebate_to_protocol_in_frame, strikes_in_frame) = (
-                self._calculate_distribution_in_frame(
-                    frame, frame_blockstamp, rewards_to_distribute_in_frame, frame_module_validators, frame_log
-                )
+            rewards_map_in_frame, distributed_rewards_in_frame, rebate_to_protocol_in_frame = (
+                self._distribute_rewards_in_frame(outcomes, rewards_to_distribute_in_frame, frame_log)
             )
             if not distributed_rewards_in_frame:
                 logger.info({"msg": f"No rewards distributed in frame [{from_epoch};{to_epoch}]"})
 
+            strikes_in_frame = outcomes.strikes
             result.strikes = self._process_strikes(result.strikes, strikes_in_frame, frame_blockstamp)
             if not strikes_in_frame:
                 logger.info({"msg": f"No strikes in frame [{from_epoch};{to_epoch}]"})
@@ -115,6 +133,26 @@ class Distribution:
 
         return result
 
+    def _calculate_frames_outcomes(
+        self,
+        frames: list[Frame],
+        frame_blockstamps: list[ReferenceBlockStamp],
+        frame_logs: list[FramePerfLog],
+    ) -> list[FrameOutcomes]:
+        """Calculates the outcomes of the frames concurrently, the result is in the order of the frames"""
+
+        def calculate_frame(frame: Frame, frame_blockstamp: ReferenceBlockStamp, log: FramePerfLog) -> FrameOutcomes:
+            logger.info({"msg": f"Calculating outcomes for frame [{frame[0]};{frame[1]}]"})
+            frame_module_validators = self._get_module_validators(frame_blockstamp)
+            return self._calculate_frame_outcomes(frame, frame_blockstamp, frame_module_validators, log)
+
+        max_workers = min(len(frames), variables.PERFORMANCE_ORACLE_MAX_FRAMES_CONCURRENCY)
+        if max_workers <= 1:
+            return list(map(calculate_frame, frames, frame_blockstamps, frame_logs))
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='distribution') as executor:
+            return list(executor.map(calculate_frame, frames, frame_blockstamps, frame_logs))
+
     def _get_frame_blockstamp(self, blockstamp: ReferenceBlockStamp, to_epoch: EpochNumber) -> ReferenceBlockStamp:
         if to_epoch != blockstamp.ref_epoch:
             return self._get_ref_blockstamp_for_frame(blockstamp, to_epoch)
@@ -161,24 +199,27 @@ class Distribution:
 
         return no_validators
 
-    def _calculate_distribution_in_frame(
+    def _calculate_frame_outcomes(
         self,
         frame: Frame,
         blockstamp: ReferenceBlockStamp,
-        rewards_to_distribute: RewardsShares,
         operators_to_validators: dict[NodeOperatorId, list[LidoValidator]],
         log: FramePerfLog,
-    ) -> tuple[dict[NodeOperatorId, RewardsShares], RewardsShares, RewardsShares, dict[StrikesValidator, int]]:
-        total_rebate_share = 0
-        participation_shares: dict[NodeOperatorId, dict[ValidatorIndex, ParticipationShares]] = {}
-        frame_strikes: dict[StrikesValidator, int] = {}
+    ) -> FrameOutcomes:
+        outcomes = FrameOutcomes()
 
         network_perf = self._get_network_performance(frame)
 
         logger.info({"msg": f"Network performance in {frame=}: {network_perf=}"})
 
+        # Curve params of all the operators are read at once, so `get_curve_params` below makes no requests.
+        self.w3.staking_module.get_curve_params_many(operators_to_validators, blockstamp)
+
+        attestations = self.state.data[frame].attestations
         for no_id, validators in operators_to_validators.items():
-            active_validators = [v for v in validators if self.state.data[frame].attestations[v.index].assigned > 0]
+            active_validators = [
+                v for v in validators if v.index in attestations and attestations[v.index].assigned > 0
+            ]
             if not active_validators:
                 logger.info({"msg": f"No active validators for {no_id=} in the frame. Skipping"})
                 continue
@@ -209,16 +250,24 @@ class Distribution:
                     log_operator,
                 )
                 if validator_duties_outcome.strikes:
-                    frame_strikes[(no_id, validator.pubkey)] = validator_duties_outcome.strikes
+                    outcomes.strikes[(no_id, validator.pubkey)] = validator_duties_outcome.strikes
                     log_operator.validators[validator.index].strikes = validator_duties_outcome.strikes
-                if not participation_shares.get(no_id):
-                    participation_shares[no_id] = {}
-                participation_shares[no_id][validator.index] = validator_duties_outcome.participation_share
+                if not outcomes.participation_shares.get(no_id):
+                    outcomes.participation_shares[no_id] = {}
+                outcomes.participation_shares[no_id][validator.index] = validator_duties_outcome.participation_share
 
-                total_rebate_share += validator_duties_outcome.rebate_share
+                outcomes.rebate_share += validator_duties_outcome.rebate_share
 
+        return outcomes
+
+    def _distribute_rewards_in_frame(
+        self,
+        outcomes: FrameOutcomes,
+        rewards_to_distribute: RewardsShares,
+        log: FramePerfLog,
+    ) -> tuple[dict[NodeOperatorId, RewardsShares], RewardsShares, RewardsShares]:
         rewards_distribution_map = self.calc_rewards_distribution_in_frame(
-            participation_shares, total_rebate_share, rewards_to_distribute, log
+            outcomes.participation_shares, outcomes.rebate_share, rewards_to_distribute, log
         )
         distributed_rewards = sum(rewards_distribution_map.values())
         # Rebate all rewards if there are no active validators or validators are below the threshold in frame.
@@ -230,7 +279,7 @@ class Distribution:
         log.distributed_rewards = distributed_rewards
         log.rebate_to_protocol = rebate_to_protocol
 
-        return rewards_distribution_map, distributed_rewards, rebate_to_protocol, frame_strikes
+        return rewards_distribution_map, distributed_rewards, rebate_to_protocol
 
     def _get_network_performance(self, frame: Frame) -> float:
         att_aggr = self.state.get_att_network_aggr(frame)
@@ -374,6 +423,8 @@ class Distribution:
                 merged[key] = StrikesList()
             merged[key].push(strikes_in_frame[key])
 
+        self.w3.staking_module.get_curve_params_many((no_id for no_id, _ in merged), frame_blockstamp)
+
         for key in list(merged.keys()):
             no_id, _ = key
             if key not in strikes_in_frame:
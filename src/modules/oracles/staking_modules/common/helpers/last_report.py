@@ -60,14 +60,14 @@ class LastReport:
             return []
 
         logger.info({"msg": "Fetching rewards tree by CID from IPFS", "cid": repr(self.rewards_tree_cid)})
-        tree = RewardsTree.decode(self.w3.ipfs.fetch(self.rewards_tree_cid, self.current_frame))
+        root, values = RewardsTree.decode_values(self.w3.ipfs.fetch(self.rewards_tree_cid, self.current_frame))
 
-        logger.info({"msg": "Restored rewards tree from IPFS dump", "root": repr(tree.root)})
+        logger.info({"msg": "Restored rewards tree from IPFS dump", "root": repr(root)})
 
-        if tree.root != self.rewards_tree_root:
+        if root != self.rewards_tree_root:
             raise ValueError("Unexpected rewards tree root got from IPFS dump")
 
-        return tree.values
+        return values
 
     @cached_property
     def strikes(self) -> dict[StrikesValidator, StrikesList]:
@@ -76,11 +76,11 @@ class LastReport:
             return {}
 
         logger.info({"msg": "Fetching strikes tree by CID from IPFS", "cid": repr(self.strikes_tree_cid)})
-        tree = StrikesTree.decode(self.w3.ipfs.fetch(self.strikes_tree_cid, self.current_frame))
+        root, values = StrikesTree.decode_values(self.w3.ipfs.fetch(self.strikes_tree_cid, self.current_frame))
 
-        logger.info({"msg": "Restored strikes tree from IPFS dump", "root": repr(tree.root)})
+        logger.info({"msg": "Restored strikes tree from IPFS dump", "root": repr(root)})
 
-        if tree.root != self.strikes_tree_root:
+        if root != self.strikes_tree_root:
             raise ValueError("Unexpected strikes tree root got from IPFS dump")
 
-        return {(no_id, pubkey): strikes for no_id, pubkey, strikes in tree.values}
+        return {(no_id, pubkey): strikes for no_id, pubkey, strikes in values}
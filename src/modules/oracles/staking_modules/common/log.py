@@ -1,15 +1,22 @@
+import io
 import json
 from collections import defaultdict
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field, is_dataclass
+from typing import ClassVar
 
 from src.constants import STAKING_MODULE_LOGS_VERSION
 from src.modules.oracles.staking_modules.common.state import DutyAccumulator
 from src.modules.oracles.staking_modules.common.types import RewardsShares
 from src.providers.execution.contracts.cs_parameters_registry import PerformanceCoefficients
 from src.types import EpochNumber, NodeOperatorId, ReferenceBlockStamp, ValidatorIndex
+from src.utils import json_writer
 
 
-class LogJSONEncoder(json.JSONEncoder): ...
+class LogJSONEncoder(json.JSONEncoder):
+    def default(self, o):
+        if is_dataclass(o) and not isinstance(o, type):
+            return json_writer.shallow_asdict(o)
+        return super().default(o)
 
 
 @dataclass
@@ -62,13 +69,19 @@ class Logs:
     frames: list[FramePerfLog] = field(default_factory=list)
     _ver: int = STAKING_MODULE_LOGS_VERSION
 
+    # Logs -> frames -> frame -> operators -> operator -> validators, every validator summary is encoded at once
+    STREAM_DEPTH: ClassVar[int] = 6
+
     def encode(self) -> bytes:
-        return (
-            LogJSONEncoder(
-                indent=None,
-                separators=(',', ':'),
-                sort_keys=True,
-            )
-            .encode(asdict(self))
-            .encode()
+        buffer = io.BytesIO()
+        self.encode_to(buffer)
+        return buffer.getvalue()
+
+    def encode_to(self, fp: json_writer.BinaryWriter) -> None:
+        """Writes the JSON representation of the logs to the file-like object without building it in memory"""
+        encoder = LogJSONEncoder(
+            indent=None,
+            separators=(',', ':'),
+            sort_keys=True,
         )
+        json_writer.dump(self, fp, encoder, self.STREAM_DEPTH)
@@ -1,8 +1,17 @@
+import base64
+import hashlib
+import json
 import logging
-from collections import defaultdict
+import os
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterator, Mapping, MutableMapping
+from compression import zstd
 from dataclasses import dataclass, field
-from itertools import batched
-from typing import Self
+from itertools import batched, compress
+from pathlib import Path
+from typing import Any, ClassVar, Self
 
 from src.types import EpochNumber, ValidatorIndex
 from src.utils.range import sequence
@@ -38,26 +47,160 @@ class ValidatorDuties:
     sync: DutyAccumulator | None
 
 
+class DutyCounters(MutableMapping[ValidatorIndex, DutyAccumulator]):
+    """
+    Duty accumulators of validators kept in dense uint32 arrays indexed by validator index.
+
+    A million of validators takes a few megabytes instead of a million of objects. Items are returned as
+    `DutyAccumulator` snapshots, so counters are changed via `add` or item assignment only.
+    """
+
+    # 'I' is at least 32 bits wide. Counters are bound by the number of slots in a frame, so it's enough.
+    TYPECODE = 'I'
+
+    def __init__(self, accumulators: Mapping[ValidatorIndex, DutyAccumulator] | None = None):
+        self._assigned = array(self.TYPECODE)
+        self._included = array(self.TYPECODE)
+        self._present = bytearray()
+        self._len = 0
+        # Validators with more included duties than assigned ones, see `first_invalid`.
+        self._invalid: set[ValidatorIndex] = set()
+        if accumulators:
+            self.update(accumulators)
+
+    def __getitem__(self, validator_index: ValidatorIndex) -> DutyAccumulator:
+        if validator_index not in self:
+            raise KeyError(validator_index)
+        return DutyAccumulator(assigned=self._assigned[validator_index], included=self._included[validator_index])
+
+    def __setitem__(self, validator_index: ValidatorIndex, acc: DutyAccumulator) -> None:
+        self._reserve(validator_index)
+        self._assigned[validator_index] = acc.assigned
+        self._included[validator_index] = acc.included
+        self._mark_present(validator_index)
+
+    def __delitem__(self, validator_index: ValidatorIndex) -> None:
+        if validator_index not in self:
+            raise KeyError(validator_index)
+        self._assigned[validator_index] = 0
+        self._included[validator_index] = 0
+        self._present[validator_index] = 0
+        self._len -= 1
+        self._invalid.discard(validator_index)
+
+    def __contains__(self, validator_index: object) -> bool:
+        return (
+            isinstance(validator_index, int)
+            and 0 <= validator_index < len(self._present)
+            and bool(self._present[validator_index])
+        )
+
+    def __iter__(self) -> Iterator[ValidatorIndex]:
+        return compress(range(len(self._present)), self._present)  # type: ignore[return-value]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
+
+    def add(self, validator_index: ValidatorIndex, assigned: int, included: int) -> None:
+        self._reserve(validator_index)
+        self._assigned[validator_index] += assigned
+        self._included[validator_index] += included
+        self._mark_present(validator_index)
+
+    def merge(self, other: Self) -> None:
+        if not self._len:
+            # Saving a frame into an empty state is the common case, so copy the arrays as a whole.
+            self._assigned = array(self.TYPECODE, other._assigned)
+            self._included = array(self.TYPECODE, other._included)
+            self._present = bytearray(other._present)
+            self._len = other._len
+            self._invalid = set(other._invalid)
+            return
+        for validator_index in other:
+            self.add(validator_index, other._assigned[validator_index], other._included[validator_index])
+
+    def to_bytes(self) -> tuple[bytes, bytes, bytes]:
+        """Returns little-endian assigned and included counters and the presence flags"""
+        assigned, included = array(self.TYPECODE, self._assigned), array(self.TYPECODE, self._included)
+        if sys.byteorder != 'little':
+            assigned.byteswap()
+            included.byteswap()
+        return assigned.tobytes(), included.tobytes(), bytes(self._present)
+
+    @classmethod
+    def from_bytes(cls, assigned: bytes, included: bytes, present: bytes) -> Self:
+        """Inverse of `to_bytes`"""
+        counters = cls()
+        counters._assigned.frombytes(assigned)
+        counters._included.frombytes(included)
+        if sys.byteorder != 'little':
+            counters._assigned.byteswap()
+            counters._included.byteswap()
+        counters._present = bytearray(present)
+        if not len(counters._assigned) == len(counters._included) == len(counters._present):
+            raise ValueError("Counters arrays have different lengths")
+        if counters._present.translate(None, b'\x00\x01'):
+            raise ValueError("Invalid presence flags")
+        counters._len = counters._present.count(1)
+        counters._invalid = {vid for vid in counters if counters._included[vid] > counters._assigned[vid]}
+        return counters
+
+    def totals(self) -> DutyAccumulator:
+        return DutyAccumulator(assigned=sum(self._assigned), included=sum(self._included))
+
+    def first_invalid(self) -> ValidatorIndex | None:
+        return min(self._invalid) if self._invalid else None
+
+    def _reserve(self, validator_index: ValidatorIndex) -> None:
+        size = len(self._present)
+        if validator_index < size:
+            if validator_index < 0:
+                raise IndexError(f"Invalid validator index: {validator_index}")
+            return
+        # Grow geometrically, validators are usually added in the order of indexes.
+        missing = max(validator_index + 1, size + size // 2) - size
+        self._assigned.frombytes(bytes(missing * self._assigned.itemsize))
+        self._included.frombytes(bytes(missing * self._included.itemsize))
+        self._present.extend(bytes(missing))
+
+    def _mark_present(self, validator_index: ValidatorIndex) -> None:
+        if not self._present[validator_index]:
+            self._present[validator_index] = 1
+            self._len += 1
+        if self._included[validator_index] > self._assigned[validator_index]:
+            self._invalid.add(validator_index)
+        else:
+            self._invalid.discard(validator_index)
+
+
 @dataclass
 class NetworkDuties:
-    # fmt: off
-    attestations: defaultdict[ValidatorIndex, DutyAccumulator] = field(
-        default_factory=lambda: defaultdict(DutyAccumulator)
-    )
-    proposals: defaultdict[ValidatorIndex, DutyAccumulator] = field(
-        default_factory=lambda: defaultdict(DutyAccumulator)
-    )
-    syncs: defaultdict[ValidatorIndex, DutyAccumulator] = field(
-        default_factory=lambda: defaultdict(DutyAccumulator)
-    )
+    attestations: DutyCounters = field(default_factory=DutyCounters)
+    proposals: DutyCounters = field(default_factory=DutyCounters)
+    syncs: DutyCounters = field(default_factory=DutyCounters)
+    # Duties of validators that are not tracked one by one (e.g. the performance data was filtered down to the
+    # staking module validators). They are accounted in the network aggregates only.
+    untracked_attestations: DutyAccumulator = field(default_factory=DutyAccumulator)
+    untracked_proposals: DutyAccumulator = field(default_factory=DutyAccumulator)
+    untracked_syncs: DutyAccumulator = field(default_factory=DutyAccumulator)
+
+    def __post_init__(self) -> None:
+        # Plain mappings of accumulators are accepted as well.
+        for name in ('attestations', 'proposals', 'syncs'):
+            counters = getattr(self, name)
+            if not isinstance(counters, DutyCounters):
+                setattr(self, name, DutyCounters(counters))
 
     def merge(self, other: Self) -> None:
-        for val, duty in other.attestations.items():
-            self.attestations[val].merge(duty)
-        for val, duty in other.proposals.items():
-            self.proposals[val].merge(duty)
-        for val, duty in other.syncs.items():
-            self.syncs[val].merge(duty)
+        self.attestations.merge(other.attestations)
+        self.proposals.merge(other.proposals)
+        self.syncs.merge(other.syncs)
+        self.untracked_attestations.merge(other.untracked_attestations)
+        self.untracked_proposals.merge(other.untracked_proposals)
+        self.untracked_syncs.merge(other.untracked_syncs)
 
 
 type Frame = tuple[EpochNumber, EpochNumber]
@@ -107,7 +250,7 @@ class State:
         frame_data = self.data.get(frame)
         if frame_data is None:
             raise InvalidState(f"No data for frame: {frame=}")
-        aggr = self._get_duty_network_aggr(frame_data.attestations)
+        aggr = self._get_duty_network_aggr(frame_data.attestations, frame_data.untracked_attestations)
         logger.info({"msg": "Network attestations aggregate computed", "value": repr(aggr), "avg_perf": aggr.perf})
         return aggr
 
@@ -115,7 +258,7 @@ class State:
         frame_data = self.data.get(frame)
         if frame_data is None:
             raise InvalidState(f"No data for frame: {frame=}")
-        aggr = self._get_duty_network_aggr(frame_data.proposals)
+        aggr = self._get_duty_network_aggr(frame_data.proposals, frame_data.untracked_proposals)
         logger.info({"msg": "Network proposal aggregate computed", "value": repr(aggr), "avg_perf": aggr.perf})
         return aggr
 
@@ -123,20 +266,137 @@ class State:
         frame_data = self.data.get(frame)
         if frame_data is None:
             raise InvalidState(f"No data for frame: {frame=}")
-        aggr = self._get_duty_network_aggr(frame_data.syncs)
+        aggr = self._get_duty_network_aggr(frame_data.syncs, frame_data.untracked_syncs)
         logger.info({"msg": "Network syncs aggregate computed", "value": repr(aggr), "avg_perf": aggr.perf})
         return aggr
 
     @staticmethod
-    def _get_duty_network_aggr(duty_frame_data: defaultdict[ValidatorIndex, DutyAccumulator]) -> DutyAccumulator:
-        included = assigned = 0
-        for validator, acc in duty_frame_data.items():
-            if acc.included > acc.assigned:
-                raise InvalidState(f"Invalid accumulator: {validator=}, {acc=}")
-            included += acc.included
-            assigned += acc.assigned
+    def _get_duty_network_aggr(duty_frame_data: DutyCounters, untracked: DutyAccumulator) -> DutyAccumulator:
+        if not 0 <= untracked.included <= untracked.assigned:
+            raise InvalidState(f"Invalid accumulator of untracked validators: {untracked=}")
+        validator = duty_frame_data.first_invalid()
+        if validator is not None:
+            acc = duty_frame_data[validator]
+            raise InvalidState(f"Invalid accumulator: {validator=}, {acc=}")
+        totals = duty_frame_data.totals()
         aggr = DutyAccumulator(
-            included=included,
-            assigned=assigned,
+            included=totals.included + untracked.included,
+            assigned=totals.assigned + untracked.assigned,
         )
         return aggr
+
+
+@dataclass
+class PartialState:
+    """
+    Report state with the duties of epochs up to `processed_epoch` inclusive aggregated in advance.
+
+    Persisted with a checksum to survive restarts of the oracle.
+    """
+
+    l_epoch: EpochNumber
+    r_epoch: EpochNumber
+    epochs_per_frame: int
+    # Whether the duties are filtered down to the staking module validators.
+    filtered: bool
+    processed_epoch: EpochNumber
+    state: State
+
+    VERSION: ClassVar[int] = 1
+    CHECKSUM_SIZE: ClassVar[int] = 32
+
+    @classmethod
+    def empty(cls, l_epoch: EpochNumber, r_epoch: EpochNumber, epochs_per_frame: int, filtered: bool) -> Self:
+        state = State(l_epoch, r_epoch, epochs_per_frame)
+        return cls(l_epoch, r_epoch, epochs_per_frame, filtered, EpochNumber(l_epoch - 1), state)
+
+    def matches(self, l_epoch: EpochNumber, r_epoch: EpochNumber, epochs_per_frame: int, filtered: bool) -> bool:
+        return (self.l_epoch, self.r_epoch, self.epochs_per_frame, self.filtered) == (
+            l_epoch,
+            r_epoch,
+            epochs_per_frame,
+            filtered,
+        )
+
+    def save(self, path: Path) -> None:
+        payload = zstd.compress(json.dumps(self._to_dict(), separators=(',', ':')).encode())
+        checksum = hashlib.blake2b(payload, digest_size=self.CHECKSUM_SIZE).digest()
+        # Replace the file atomically to never leave a partially written state behind.
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(checksum + payload)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> Self | None:
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        checksum, payload = data[: cls.CHECKSUM_SIZE], data[cls.CHECKSUM_SIZE :]
+        if hashlib.blake2b(payload, digest_size=cls.CHECKSUM_SIZE).digest() != checksum:
+            logger.warning({"msg": "Partial state checksum mismatch, discarding it", "path": str(path)})
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            return cls._from_dict(json.loads(zstd.decompress(payload)))
+        except (zstd.ZstdError, ValueError, KeyError, TypeError) as error:
+            logger.warning(
+                {"msg": "Failed to load partial state, discarding it", "path": str(path), "error": str(error)}
+            )
+            path.unlink(missing_ok=True)
+            return None
+
+    def _to_dict(self) -> dict[str, Any]:
+        return {
+            "version": self.VERSION,
+            "l_epoch": self.l_epoch,
+            "r_epoch": self.r_epoch,
+            "epochs_per_frame": self.epochs_per_frame,
+            "filtered": self.filtered,
+            "processed_epoch": self.processed_epoch,
+            "frames": [
+                {"frame": list(frame), **_network_duties_to_dict(duties)} for frame, duties in self.state.data.items()
+            ],
+        }
+
+    @classmethod
+    def _from_dict(cls, data: dict[str, Any]) -> Self:
+        if data["version"] != cls.VERSION:
+            raise ValueError(f"Unsupported partial state version: {data['version']}")
+        partial = cls.empty(
+            EpochNumber(data["l_epoch"]), EpochNumber(data["r_epoch"]), data["epochs_per_frame"], data["filtered"]
+        )
+        partial.processed_epoch = EpochNumber(data["processed_epoch"])
+        frames = {(EpochNumber(item["frame"][0]), EpochNumber(item["frame"][1])): item for item in data["frames"]}
+        if set(frames) != set(partial.state.data):
+            raise ValueError("Partial state frames do not match the epochs range")
+        for frame, item in frames.items():
+            partial.state.data[frame] = _network_duties_from_dict(item)
+        return partial
+
+
+def _network_duties_to_dict(duties: NetworkDuties) -> dict[str, Any]:
+    data: dict[str, Any] = {}
+    for name in ('attestations', 'proposals', 'syncs'):
+        counters: DutyCounters = getattr(duties, name)
+        data[name] = [base64.b64encode(column).decode() for column in counters.to_bytes()]
+        untracked: DutyAccumulator = getattr(duties, f"untracked_{name}")
+        data[f"untracked_{name}"] = [untracked.assigned, untracked.included]
+    return data
+
+
+def _network_duties_from_dict(data: dict[str, Any]) -> NetworkDuties:
+    duties = NetworkDuties()
+    for name in ('attestations', 'proposals', 'syncs'):
+        assigned, included, present = (base64.b64decode(column, validate=True) for column in data[name])
+        setattr(duties, name, DutyCounters.from_bytes(assigned, included, present))
+        untracked_assigned, untracked_included = data[f"untracked_{name}"]
+        setattr(duties, f"untracked_{name}", DutyAccumulator(untracked_assigned, untracked_included))
+    return duties
@@ -1,13 +1,17 @@
+import io
 import json
 from abc import ABC, abstractmethod
 from collections.abc import Iterable, Sequence
 from json import JSONDecodeError, JSONDecoder, JSONEncoder
 from typing import Any, ClassVar, Self
 
+import json_stream  # type: ignore
 from hexbytes import HexBytes
 from oz_merkle_tree import Dump, StandardMerkleTree
 
 from src.modules.oracles.staking_modules.common.types import RewardsTreeLeaf, StrikesList, StrikesTreeLeaf
+from src.utils import json_writer
+from src.utils.merkle import STANDARD_TREE_FORMAT, build_standard_tree_dump
 from src.utils.types import hex_str_to_bytes
 
 
@@ -18,14 +22,21 @@ class TreeJSONEncoder(JSONEncoder):
         return super().default(o)
 
 
-class TreeJSONDecoder(JSONDecoder): ...
+class TreeJSONDecoder(JSONDecoder):
+    @staticmethod
+    def decode_value(obj: Any) -> Any:
+        """Converts a leaf value of the tree dump to the leaf type"""
+        return obj
 
 
 class Tree[LeafType: Iterable](ABC):
     """A wrapper around StandardMerkleTree to cover use cases of the staking module oracle"""
 
     encoder: ClassVar[type[JSONEncoder]] = TreeJSONEncoder
-    decoder: ClassVar[type[JSONDecoder]] = TreeJSONDecoder
+    decoder: ClassVar[type[TreeJSONDecoder]] = TreeJSONDecoder
+
+    # Dump -> values -> value, every value is encoded at once
+    STREAM_DEPTH: ClassVar[int] = 2
 
     tree: StandardMerkleTree[LeafType]
 
@@ -51,18 +62,56 @@ class Tree[LeafType: Iterable](ABC):
         except Exception as e:
             raise ValueError("Unable to load tree") from e
 
+    @classmethod
+    def decode_values(cls, content: bytes) -> tuple[HexBytes, list[LeafType]]:
+        """
+        Read the root and the values of a tree dump incrementally, without restoring the whole tree in memory.
+        The root is checked against the values by rebuilding the tree.
+        """
+
+        dump_format, leaf_encoding, root = None, None, None
+        values: list[LeafType] = []
+        try:
+            for key, item in json_stream.load(io.BytesIO(content)).items():
+                match key:
+                    case "format":
+                        dump_format = item
+                    case "leafEncoding":
+                        leaf_encoding = list(item)
+                    case "tree":
+                        # Only the root is required, the rest of the nodes are skipped
+                        root = HexBytes(next(iter(item)))
+                    case "values":
+                        for entry in item:
+                            value = json_stream.to_standard_types(entry)["value"]
+                            values.append(cls.decoder.decode_value(value))
+        except Exception as e:
+            raise ValueError("Unable to load tree") from e
+
+        if dump_format != STANDARD_TREE_FORMAT or leaf_encoding is None or root is None or not values:
+            raise ValueError("Unable to load tree")
+
+        if HexBytes(build_standard_tree_dump(values, leaf_encoding)["tree"][0]) != root:
+            raise ValueError("Tree root doesn't match the tree values")
+
+        return root, values
+
     def encode(self) -> bytes:
         """Convert the underlying StandardMerkleTree to a binary representation"""
 
-        return (
-            self.encoder(
-                indent=None,
-                separators=(',', ':'),
-                sort_keys=True,
-            )
-            .encode(self.dump())
-            .encode()
+        buffer = io.BytesIO()
+        self.encode_to(buffer)
+        return buffer.getvalue()
+
+    def encode_to(self, fp: json_writer.BinaryWriter) -> None:
+        """Write the binary representation of the tree to the file-like object without building it in memory"""
+
+        encoder = self.encoder(
+            indent=None,
+            separators=(',', ':'),
+            sort_keys=True,
         )
+        json_writer.dump(self.dump(), fp, encoder, self.STREAM_DEPTH)
 
     def dump(self) -> Dump[LeafType]:
         return self.tree.dump()
@@ -79,21 +128,20 @@ class RewardsTreeJSONDecoder(TreeJSONDecoder):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs, object_pairs_hook=self.__object_pairs_hook)
 
+    @classmethod
+    def __object_pairs_hook(cls, items: list[tuple[str, Any]]):
+        return {k: cls.decode_value(v) if k == "value" else v for k, v in items}
+
     @staticmethod
-    def __object_pairs_hook(items: list[tuple[str, Any]]):
-        def try_decode_value(key: str, obj: Any):
-            if key != "value":
-                return obj
-            if not isinstance(obj, list) or not len(obj) == 2:
-                raise ValueError(f"Unexpected RewardsTreeLeaf value given {obj=}")
-            no_id, shares = obj
-            if not isinstance(no_id, int):
-                raise ValueError(f"Unexpected RewardsTreeLeaf value given {obj=}")
-            if not isinstance(shares, int):
-                raise ValueError(f"Unexpected RewardsTreeLeaf value given {obj=}")
-            return no_id, shares
-
-        return {k: try_decode_value(k, v) for k, v in items}
+    def decode_value(obj: Any) -> RewardsTreeLeaf:
+        if not isinstance(obj, list) or not len(obj) == 2:
+            raise ValueError(f"Unexpected RewardsTreeLeaf value given {obj=}")
+        no_id, shares = obj
+        if not isinstance(no_id, int):
+            raise ValueError(f"Unexpected RewardsTreeLeaf value given {obj=}")
+        if not isinstance(shares, int):
+            raise ValueError(f"Unexpected RewardsTreeLeaf value given {obj=}")
+        return no_id, shares
 
 
 class RewardsTree(Tree[RewardsTreeLeaf]):
@@ -120,23 +168,22 @@ class StrikesTreeJSONDecoder(TreeJSONDecoder):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs, object_pairs_hook=self.__object_pairs_hook)
 
+    @classmethod
+    def __object_pairs_hook(cls, items: list[tuple[str, Any]]):
+        return {k: cls.decode_value(v) if k == "value" else v for k, v in items}
+
     @staticmethod
-    def __object_pairs_hook(items: list[tuple[str, Any]]):
-        def try_decode_value(key: str, obj: Any):
-            if key != "value":
-                return obj
-            if not isinstance(obj, list) or not len(obj) == 3:
-                raise ValueError(f"Unexpected StrikesTreeLeaf value given {obj=}")
-            no_id, pubkey, strikes = obj
-            if not isinstance(no_id, int):
-                raise ValueError(f"Unexpected StrikesTreeLeaf value given {obj=}")
-            if not isinstance(pubkey, str) or not pubkey.startswith("0x"):
-                raise ValueError(f"Unexpected StrikesTreeLeaf value given {obj=}")
-            if not isinstance(strikes, list):
-                raise ValueError(f"Unexpected StrikesTreeLeaf value given {obj=}")
-            return no_id, HexBytes(hex_str_to_bytes(pubkey)), StrikesList(strikes)
-
-        return {k: try_decode_value(k, v) for k, v in items}
+    def decode_value(obj: Any) -> StrikesTreeLeaf:
+        if not isinstance(obj, list) or not len(obj) == 3:
+            raise ValueError(f"Unexpected StrikesTreeLeaf value given {obj=}")
+        no_id, pubkey, strikes = obj
+        if not isinstance(no_id, int):
+            raise ValueError(f"Unexpected StrikesTreeLeaf value given {obj=}")
+        if not isinstance(pubkey, str) or not pubkey.startswith("0x"):
+            raise ValueError(f"Unexpected StrikesTreeLeaf value given {obj=}")
+        if not isinstance(strikes, list):
+            raise ValueError(f"Unexpected StrikesTreeLeaf value given {obj=}")
+        return no_id, HexBytes(hex_str_to_bytes(pubkey)), StrikesList(strikes)
 
 
 class StrikesTree(Tree[StrikesTreeLeaf]):
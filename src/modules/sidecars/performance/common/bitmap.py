@@ -0,0 +1,50 @@
+import base64
+import binascii
+from collections.abc import Iterable
+from compression import zstd
+
+
+# 2^27 validator indexes are far beyond any realistic registry size.
+MAX_BITMAP_BYTES = 2**24
+
+
+def encode_indexes_bitmap(indexes: Iterable[int]) -> str:
+    """
+    Packs validator indexes into a bitmap (bit `i % 8` of byte `i // 8` is set for index `i`),
+    compresses it with zstd and encodes it as base64.
+    """
+    bitmap = bytearray()
+    for index in indexes:
+        if index < 0:
+            raise ValueError(f"Negative validator index: {index}")
+        byte_index = index >> 3
+        if byte_index >= len(bitmap):
+            bitmap.extend(bytes(byte_index - len(bitmap) + 1))
+        bitmap[byte_index] |= 1 << (index & 7)
+    return base64.b64encode(zstd.compress(bytes(bitmap))).decode()
+
+
+def decode_indexes_bitmap(data: str) -> frozenset[int]:
+    """Inverse of `encode_indexes_bitmap`"""
+    try:
+        compressed = base64.b64decode(data, validate=True)
+    except binascii.Error as e:
+        raise ValueError("Validator indexes bitmap is not a valid base64 string") from e
+
+    decompressor = zstd.ZstdDecompressor()
+    try:
+        bitmap = decompressor.decompress(compressed, max_length=MAX_BITMAP_BYTES + 1)
+    except zstd.ZstdError as e:
+        raise ValueError("Validator indexes bitmap is not a valid zstd frame") from e
+    if len(bitmap) > MAX_BITMAP_BYTES:
+        raise ValueError(f"Validator indexes bitmap exceeds {MAX_BITMAP_BYTES} bytes")
+    if not decompressor.eof:
+        raise ValueError("Validator indexes bitmap is truncated")
+
+    return frozenset(
+        (byte_index << 3) | bit
+        for byte_index, byte in enumerate(bitmap)
+        if byte
+        for bit in range(8)
+        if byte & (1 << bit)
+    )
@@ -1,7 +1,10 @@
+import hashlib
+import json
+from collections.abc import Set
 from datetime import UTC, datetime
-from typing import Any, ClassVar
+from typing import Any, ClassVar, Self
 
-from pydantic import PostgresDsn
+from pydantic import PostgresDsn, computed_field
 from sqlalchemy import ARRAY, Boolean, Column, DateTime, Integer, SmallInteger, asc, delete, desc, exists
 from sqlalchemy.engine import Engine
 from sqlalchemy.sql import func
@@ -53,6 +56,72 @@ class Duty(SQLModel, table=True):
         sa_column=Column(ARRAY(SmallInteger()), nullable=False),
     )
 
+    @computed_field(description="Hash of the epoch duties. Lets clients verify their local copies of the epoch.")
+    @property
+    def content_hash(self) -> str:
+        content = json.dumps(
+            [
+                self.epoch,
+                self.missed_attestation_vids,
+                self.proposals_vids,
+                self.proposals_flags,
+                self.syncs_vids,
+                self.syncs_misses,
+            ],
+            separators=(',', ':'),
+        )
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+class DutiesSummary(SQLModel):
+    """Network-wide duty counters for a single epoch, regardless of any validator filter."""
+
+    missed_attestations: int = Field(description="Number of validators that missed attestation duties.")
+    proposals_assigned: int = Field(description="Number of proposer duties.")
+    proposals_included: int = Field(description="Number of proposed blocks.")
+    syncs_assigned: int = Field(description="Number of sync committee duties.")
+    syncs_missed: int = Field(description="Sum of sync committee miss counters.")
+
+
+class FilteredDuty(SQLModel):
+    """Epoch duties restricted to a subset of validators, with network-wide counters kept in `summary`."""
+
+    epoch: int
+    missed_attestation_vids: list[int] = Field(default_factory=list)
+    proposals_vids: list[int] = Field(default_factory=list)
+    proposals_flags: list[bool] = Field(default_factory=list)
+    syncs_vids: list[int] = Field(default_factory=list)
+    syncs_misses: list[int] = Field(default_factory=list)
+    summary: DutiesSummary
+
+    @classmethod
+    def from_duty(cls, duty: Duty, validator_indexes: Set[int]) -> Self:
+        proposals = [
+            (vid, flag)
+            for vid, flag in zip(duty.proposals_vids, duty.proposals_flags, strict=True)
+            if vid in validator_indexes
+        ]
+        syncs = [
+            (vid, misses)
+            for vid, misses in zip(duty.syncs_vids, duty.syncs_misses, strict=True)
+            if vid in validator_indexes
+        ]
+        return cls(
+            epoch=duty.epoch,
+            missed_attestation_vids=[vid for vid in duty.missed_attestation_vids if vid in validator_indexes],
+            proposals_vids=[vid for vid, _ in proposals],
+            proposals_flags=[flag for _, flag in proposals],
+            syncs_vids=[vid for vid, _ in syncs],
+            syncs_misses=[misses for _, misses in syncs],
+            summary=DutiesSummary(
+                missed_attestations=len(duty.missed_attestation_vids),
+                proposals_assigned=len(duty.proposals_vids),
+                proposals_included=sum(duty.proposals_flags),
+                syncs_assigned=len(duty.syncs_vids),
+                syncs_missed=sum(duty.syncs_misses),
+            ),
+        )
+
 
 class EpochsDemand(SQLModel, table=True):
     """Requested epoch range that a consumer expects from the performance collector."""
@@ -8,15 +8,16 @@ from fastapi.params import Body
 from pydantic import BaseModel
 from sqlmodel import select
 
-from src.modules.sidecars.performance.common.db import DutiesDB, Duty, IncompleteEpochRangeError
+from src.modules.sidecars.performance.common.db import DutiesDB, Duty, FilteredDuty, IncompleteEpochRangeError
 from src.modules.sidecars.performance.web.metrics import attach_metrics
-from src.modules.sidecars.performance.web.middleware import RequestTimeoutMiddleware
+from src.modules.sidecars.performance.web.middleware import CompressionMiddleware, RequestTimeoutMiddleware
 from src.modules.sidecars.performance.web.validation import (
     ConsumerParam,
     EpochParam,
     EpochRangeParam,
     EpochsDemandParam,
     EpochsDemandResponse,
+    FilteredEpochRangeParam,
     LimitedEpochRangeParam,
     RetentionEpochsParam,
     RetentionEpochsResponse,
@@ -25,6 +26,7 @@ from src.types import EpochNumber
 from src.variables import (
     PERFORMANCE_WEB_SERVER_API_HOST,
     PERFORMANCE_WEB_SERVER_API_PORT,
+    PERFORMANCE_WEB_SERVER_COMPRESSION_MIN_SIZE,
     PERFORMANCE_WEB_SERVER_DB_CONNECTION_TIMEOUT,
     PERFORMANCE_WEB_SERVER_DB_STATEMENT_TIMEOUT_MS,
     PERFORMANCE_WEB_SERVER_LIMIT_CONCURRENCY,
@@ -54,6 +56,7 @@ async def lifespan(app: FastAPI):
 app = FastAPI(title="Performance Collector API", lifespan=lifespan)
 attach_metrics(app)
 app.add_middleware(RequestTimeoutMiddleware, timeout=PERFORMANCE_WEB_SERVER_REQUEST_TIMEOUT)
+app.add_middleware(CompressionMiddleware, minimum_size=PERFORMANCE_WEB_SERVER_COMPRESSION_MIN_SIZE)
 
 api_v1 = APIRouter(prefix="/v1")
 
@@ -98,10 +101,9 @@ def epochs_missing(epoch_range: Annotated[LimitedEpochRangeParam, Query()], db:
     return db.missing_epochs_in(epoch_range.from_epoch, epoch_range.to_epoch)
 
 
-@api_v1.get("/epochs", response_model=list[Duty])
-def epochs_data(epoch_range: Annotated[LimitedEpochRangeParam, Query()], db: DBDep):
+def get_complete_epochs_data(db: DutiesDB, from_epoch: EpochNumber, to_epoch: EpochNumber) -> list[Duty]:
     try:
-        return db.get_complete_epochs_data(epoch_range.from_epoch, epoch_range.to_epoch)
+        return db.get_complete_epochs_data(from_epoch, to_epoch)
     except IncompleteEpochRangeError as error:
         raise HTTPException(
             status_code=409,
@@ -114,6 +116,17 @@ def epochs_data(epoch_range: Annotated[LimitedEpochRangeParam, Query()], db: DBD
         ) from error
 
 
+@api_v1.get("/epochs", response_model=list[Duty])
+def epochs_data(epoch_range: Annotated[LimitedEpochRangeParam, Query()], db: DBDep):
+    return get_complete_epochs_data(db, epoch_range.from_epoch, epoch_range.to_epoch)
+
+
+@api_v1.post("/epochs", response_model=list[FilteredDuty])
+def filtered_epochs_data(epoch_range: Annotated[FilteredEpochRangeParam, Body()], db: DBDep):
+    duties = get_complete_epochs_data(db, epoch_range.from_epoch, epoch_range.to_epoch)
+    return [FilteredDuty.from_duty(duty, epoch_range.validator_indexes) for duty in duties]
+
+
 @api_v1.get("/epochs/stored-count", response_model=int)
 def stored_epochs_count(epoch_range: Annotated[EpochRangeParam, Query()], db: DBDep):
     return db.count_stored_epochs_in_range(epoch_range.from_epoch, epoch_range.to_epoch)
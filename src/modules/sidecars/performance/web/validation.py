@@ -2,6 +2,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
+from src.modules.sidecars.performance.common.bitmap import decode_indexes_bitmap
 from src.types import EpochNumber
 from src.variables import PERFORMANCE_WEB_SERVER_MAX_EPOCH_RANGE
 
@@ -59,6 +60,18 @@ class LimitedEpochRangeParam(EpochRangeParam):
         return self
 
 
+class FilteredEpochRangeParam(LimitedEpochRangeParam):
+    # zstd-compressed, base64-encoded bitmap, see `encode_indexes_bitmap`.
+    validator_indexes: frozenset[int]
+
+    @field_validator("validator_indexes", mode="before")
+    @classmethod
+    def decode_validator_indexes(cls, value: object) -> frozenset[int]:
+        if not isinstance(value, str):
+            raise ValueError("validator_indexes must be a base64-encoded bitmap")
+        return decode_indexes_bitmap(value)
+
+
 class EpochParam(BaseModel):
     epoch: EpochNumber
 
@@ -237,10 +237,14 @@ class ConsensusClient(HTTPProvider):
             path_params=(state_id,),
             stream=True,
             validate_response=data_is_transient_dict,
-            stream_consumer=lambda d: list(d["block_roots"]),
+            stream_consumer=self._consume_block_roots,
         )
         return data
 
+    @staticmethod
+    def _consume_block_roots(state: Any) -> list[BlockRoot]:
+        return list(state["block_roots"])
+
     def get_validators(self, blockstamp: BlockStamp) -> list[Validator]:
         return self.get_state_view(blockstamp).indexed_validators
 
@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Sequence
 
 from eth_typing import ChecksumAddress
 from web3 import Web3
@@ -6,6 +7,7 @@ from web3.types import BlockIdentifier
 
 from src.types import NodeOperatorId
 from src.utils.cache import global_lru_cache as lru_cache
+from src.web3py.contract_tweak import BatchReads
 
 from ..base_interface import ContractInterface
 
@@ -42,3 +44,27 @@ class CSAccountingContract(ContractInterface):
             }
         )
         return resp
+
+    def get_bond_curve_ids(
+        self,
+        node_operator_ids: Sequence[NodeOperatorId],
+        block_identifier: BlockIdentifier = "latest",
+    ) -> dict[NodeOperatorId, int]:
+        """
+        Returns the curve IDs of the given node operators.
+        Reads are aggregated via Multicall3, falls back to individual calls if Multicall3 is not available.
+        """
+
+        with BatchReads(self.w3, block_identifier) as reads:
+            for node_operator_id in node_operator_ids:
+                reads.add(self.functions.getBondCurveId(node_operator_id))
+            result = dict(zip(node_operator_ids, reads.execute(), strict=True))
+
+        logger.info(
+            {
+                "msg": f"Call `getBondCurveId` for {len(node_operator_ids)} node operators.",
+                "value": sorted(set(result.values())),
+                "block_identifier": repr(block_identifier),
+            }
+        )
+        return result
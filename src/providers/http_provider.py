@@ -1,18 +1,25 @@
 import logging
+import threading
 from abc import ABC
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Hashable, Sequence
+from concurrent.futures import Future
+from functools import partial
 from http import HTTPStatus
 from typing import Any, NoReturn, Protocol
 from urllib.parse import urljoin, urlparse
 
 # NOTE: Missing library stubs or py.typed marker. That's why we use `type: ignore`
-from json_stream import requests as json_stream_requests  # type: ignore
-from json_stream.base import TransientStreamingJSONObject  # type: ignore
+from json_stream import (
+    requests as json_stream_requests,  # type: ignore
+    to_standard_types,  # type: ignore
+)
+from json_stream.base import TransientStreamingJSONList, TransientStreamingJSONObject  # type: ignore
 from prometheus_client import Histogram
 from requests import JSONDecodeError, Response, Session
 from requests.adapters import HTTPAdapter
 from urllib3 import Retry
 
+from src.metrics.prometheus.basic import HTTP_COALESCED_REQUESTS
 from src.providers.consistency import ProviderConsistencyModule
 
 
@@ -66,6 +73,11 @@ def data_is_transient_dict(data: Any, meta: dict, *, endpoint: str):
         raise ValueError(f"Expected mapping response from {endpoint}")
 
 
+def data_is_transient_list(data: Any, meta: dict, *, endpoint: str):
+    if not isinstance(data, TransientStreamingJSONList):
+        raise ValueError(f"Expected list response from {endpoint}")
+
+
 class HTTPProvider(ProviderConsistencyModule, ABC):
     """
     Base HTTP Provider with metrics and retry strategy integrated inside.
@@ -76,6 +88,13 @@ class HTTPProvider(ProviderConsistencyModule, ABC):
 
     PROVIDER_EXCEPTION = NotOkResponse
 
+    # Content codings advertised via Accept-Encoding. urllib3 decodes gzip and zstd bodies
+    # chunk by chunk, so both plain and streamed responses are decompressed on the fly.
+    ACCEPT_ENCODING: str | None = None
+
+    # Methods retried by the adapter on the listed statuses and read errors
+    RETRY_ALLOWED_METHODS: frozenset[str] = Retry.DEFAULT_ALLOWED_METHODS
+
     def __init__(
         self,
         hosts: list[str],
@@ -95,12 +114,19 @@ class HTTPProvider(ProviderConsistencyModule, ABC):
             total=self.retry_count,
             status_forcelist=[418, 429, 500, 502, 503, 504],
             backoff_factor=self.backoff_factor,
+            allowed_methods=self.RETRY_ALLOWED_METHODS,
         )
 
         adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session = Session()
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
+        if self.ACCEPT_ENCODING:
+            self.session.headers["Accept-Encoding"] = self.ACCEPT_ENCODING
+
+        # GET requests being sent, see `_get`
+        self._in_flight: dict[Hashable, Future] = {}
+        self._in_flight_lock = threading.Lock()
 
     @staticmethod
     def _urljoin(host, url):
@@ -117,6 +143,7 @@ class HTTPProvider(ProviderConsistencyModule, ABC):
         validate_response: ReturnValueValidator = data_is_any,
         stream: bool = False,
         stream_consumer: Callable[[Any], Any] | None = None,
+        stream_meta: bool = False,
     ) -> tuple[Any, dict]:
         """
         Plain or streamed GET request with fallbacks
@@ -128,7 +155,76 @@ class HTTPProvider(ProviderConsistencyModule, ABC):
         stream_consumer - when stream=True, a callable that consumes the stream data and
         returns the final result. Must be provided for streamed requests so that mid-stream
         failures are caught inside the fallback loop and trigger retry with the next host.
+
+        stream_meta - when stream=True, read the whole response and return the top-level fields
+        besides `data` as meta. Otherwise the response is read only as far as the consumer needs.
+
+        Identical requests sent concurrently from several threads are coalesced: the first one is sent and the rest
+        wait for it and get the same result or exception. Requests are identical if all the arguments are equal, so
+        callables created on every call (e.g. lambdas) disable coalescing. Results are shared, do not mutate them.
         """
+        request = partial(
+            self._get_with_fallbacks,
+            endpoint,
+            path_params,
+            query_params,
+            force_raise,
+            validate_response,
+            stream,
+            stream_consumer,
+            stream_meta,
+        )
+        try:
+            key: Hashable | None = (
+                endpoint,
+                tuple(path_params or ()),
+                frozenset((query_params or {}).items()),
+                force_raise,
+                validate_response,
+                stream,
+                stream_consumer,
+                stream_meta,
+            )
+            hash(key)
+        except TypeError:
+            key = None
+
+        if key is None:
+            return request()
+
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if future is None:
+                future = self._in_flight[key] = Future()
+
+        if not is_leader:
+            HTTP_COALESCED_REQUESTS.labels(provider=self.__class__.__name__, endpoint=endpoint).inc()
+            return future.result()
+
+        try:
+            result = request()
+        except BaseException as error:
+            self._pop_in_flight(key).set_exception(error)
+            raise
+        self._pop_in_flight(key).set_result(result)
+        return result
+
+    def _pop_in_flight(self, key: Hashable) -> Future:
+        with self._in_flight_lock:
+            return self._in_flight.pop(key)
+
+    def _get_with_fallbacks(
+        self,
+        endpoint: str,
+        path_params: Sequence[str | int] | None,
+        query_params: dict | None,
+        force_raise: Callable[..., Exception | None],
+        validate_response: ReturnValueValidator,
+        stream: bool,
+        stream_consumer: Callable[[Any], Any] | None,
+        stream_meta: bool,
+    ) -> tuple[Any, dict]:
         errors: list[Exception] = []
 
         for host in self.hosts:
@@ -141,6 +237,7 @@ class HTTPProvider(ProviderConsistencyModule, ABC):
                     stream=stream,
                     validate_response=validate_response,
                     stream_consumer=stream_consumer,
+                    stream_meta=stream_meta,
                 )
             except Exception as e:  # pylint: disable=W0703
                 errors.append(e)
@@ -169,6 +266,7 @@ class HTTPProvider(ProviderConsistencyModule, ABC):
         stream: bool = False,
         validate_response: ReturnValueValidator = data_is_any,
         stream_consumer: Callable[[Any], Any] | None = None,
+        stream_meta: bool = False,
     ) -> tuple[Any, dict]:
         """
         Simple GET request without fallbacks
@@ -218,6 +316,9 @@ class HTTPProvider(ProviderConsistencyModule, ABC):
                 logger.debug({'msg': response_fail_msg})
                 raise self.PROVIDER_EXCEPTION(status=0, text='JSON decode error.') from error
 
+        if stream and stream_meta:
+            return self._consume_stream_with_meta(json_response, endpoint, validate_response, stream_consumer)
+
         meta: dict[str, Any] = {}
         try:
             data = json_response["data"]  # type: ignore[index]
@@ -234,6 +335,36 @@ class HTTPProvider(ProviderConsistencyModule, ABC):
             data = stream_consumer(data)
         return data, meta
 
+    @staticmethod
+    def _consume_stream_with_meta(
+        json_response: Any,
+        endpoint: str,
+        validate_response: ReturnValueValidator,
+        stream_consumer: Callable[[Any], Any] | None,
+    ) -> tuple[Any, dict]:
+        """
+        Reads the streamed response in the order of fields: `data` goes to the stream consumer and the rest of the
+        top-level fields are collected as meta, so meta may follow `data` in the response.
+        Validator gets only the meta fields preceding `data`.
+        """
+        if not isinstance(json_response, TransientStreamingJSONObject):
+            raise ValueError(f"Expected mapping response from {endpoint}")
+
+        data: Any = None
+        has_data = False
+        meta: dict[str, Any] = {}
+        for key, value in json_response.items():
+            if key != "data":
+                meta[key] = to_standard_types(value)
+                continue
+            validate_response(value, meta, endpoint=endpoint)
+            data = stream_consumer(value) if stream_consumer is not None else to_standard_types(value)
+            has_data = True
+
+        if not has_data:
+            raise ValueError(f"Expected data in response from {endpoint}")
+        return data, meta
+
     def _post(
         self,
         endpoint: str,
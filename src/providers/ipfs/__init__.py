@@ -1,3 +1,4 @@
+from .cache import IPFSCache
 from .cid import CID, CIDv0, CIDv1, is_cid_v0
 from .filebase import Filebase
 from .kubo import Kubo
@@ -20,4 +21,5 @@ __all__ = [
     "UploadError",
     "PinError",
     "IPFSProvider",
+    "IPFSCache",
 ]
@@ -0,0 +1,137 @@
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from src.metrics.prometheus.basic import IPFS_CACHE_REQUESTS, IPFS_CACHE_SIZE
+from src.utils.car import CARConverter, CARFile
+
+from .cid import CID, normalize_cid
+
+
+logger = logging.getLogger(__name__)
+
+
+class IPFSCache:
+    """
+    Disk cache of IPFS content keyed by CID.
+
+    Content behind a CID never changes, so an entry never expires. Every entry is verified against its CID when
+    stored and when read, so a corrupted file is dropped and fetched again instead of being served. Entries are
+    evicted least recently used first when the total size of the cache exceeds `max_size` bytes.
+    """
+
+    # Fraction of `max_size` to keep after eviction, so eviction does not run on every insert
+    EVICTION_TARGET = 0.9
+
+    def __init__(self, path: Path, max_size: int):
+        self.path = path
+        self.max_size = max_size
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.car_converter = CARConverter()
+        self._lock = threading.Lock()
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+        IPFS_CACHE_SIZE.set(self._size)
+
+    def _entries(self) -> list[Path]:
+        return [entry for entry in self.path.iterdir() if entry.is_file() and not entry.name.startswith(".")]
+
+    def _entry_path(self, cid: CID) -> Path | None:
+        try:
+            return self.path / str(normalize_cid(str(cid)))
+        except Exception:  # pylint: disable=broad-exception-caught
+            # Content addressed by a CID not representable as CIDv0 can't be verified by the CAR converter
+            return None
+
+    def _is_valid(self, entry: Path, content: bytes) -> bool:
+        return self.car_converter.create_unixfs_based_cid(content) == entry.name
+
+    def get(self, cid: CID) -> bytes | None:
+        entry = self._entry_path(cid)
+        if entry is None:
+            return None
+
+        try:
+            content = entry.read_bytes()
+        except FileNotFoundError:
+            IPFS_CACHE_REQUESTS.labels(result="miss").inc()
+            return None
+
+        if not self._is_valid(entry, content):
+            logger.warning({"msg": "Dropped corrupted IPFS cache entry.", "cid": str(cid)})
+            IPFS_CACHE_REQUESTS.labels(result="corrupted").inc()
+            self._remove(entry)
+            return None
+
+        IPFS_CACHE_REQUESTS.labels(result="hit").inc()
+        # Keep the access time in the modification time to evict the least recently used entries first
+        entry.touch()
+        return content
+
+    def put(self, cid: CID, content: bytes) -> None:
+        entry = self._entry_path(cid)
+        if entry is None or len(content) > self.max_size or entry.exists():
+            return
+
+        if not self._is_valid(entry, content):
+            logger.warning({"msg": "Content doesn't match the CID, not cached.", "cid": str(cid)})
+            return
+
+        # Write to a temporary file first, so a crash never leaves a partially written entry
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix=".")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        self._commit(tmp, entry, len(content))
+
+    def put_car(self, car: CARFile) -> None:
+        """
+        Stores the content of the CAR under its root CID. The root is built of the content itself, so the content is
+        streamed to the entry without being hashed again.
+        """
+        entry = self._entry_path(CID(car.root.encode()))
+        if entry is None or entry.exists():
+            return
+
+        size = 0
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix=".")
+        with os.fdopen(fd, "wb") as f:
+            for chunk in car.iter_content():
+                size += len(chunk)
+                if size > self.max_size:
+                    break
+                f.write(chunk)
+        if size > self.max_size:
+            os.unlink(tmp)
+            return
+        self._commit(tmp, entry, size)
+
+    def _commit(self, tmp: str, entry: Path, size: int) -> None:
+        os.replace(tmp, entry)
+
+        with self._lock:
+            self._size += size
+            if self._size > self.max_size:
+                self._evict()
+            IPFS_CACHE_SIZE.set(self._size)
+
+    def _remove(self, entry: Path) -> None:
+        with self._lock:
+            try:
+                size = entry.stat().st_size
+                entry.unlink()
+            except FileNotFoundError:
+                return
+            self._size -= size
+            IPFS_CACHE_SIZE.set(self._size)
+
+    def _evict(self) -> None:
+        target = self.max_size * self.EVICTION_TARGET
+        evicted = 0
+        for entry in sorted(self._entries(), key=lambda e: e.stat().st_mtime_ns):
+            if self._size <= target:
+                break
+            self._size -= entry.stat().st_size
+            entry.unlink(missing_ok=True)
+            evicted += 1
+        logger.info({"msg": "Evicted IPFS content from the cache.", "evicted": evicted, "size": self._size})
@@ -1,5 +1,7 @@
 from collections import UserString
 
+import multiformats
+
 
 class CID(UserString):
     def __repr__(self):
@@ -15,3 +17,11 @@ class CIDv1(CID): ...
 # @see https://github.com/multiformats/cid/blob/master/README.md#decoding-algorithm
 def is_cid_v0(cid: str) -> bool:
     return cid.startswith("Qm") and len(cid) == 46
+
+
+def normalize_cid(cid: str) -> CID:
+    """Converts CIDv1 to CIDv0, which is the form produced by `CARConverter`"""
+    parsed_cid = multiformats.CID.decode(cid)
+    if parsed_cid.version == 1:
+        parsed_cid = parsed_cid.set(version=0, base='base58btc')
+    return CID(str(parsed_cid))
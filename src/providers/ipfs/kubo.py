@@ -1,10 +1,15 @@
 # pylint: disable=duplicate-code
 
+import json
 import logging
+import secrets
+from collections.abc import Iterable, Iterator
 from json import JSONDecodeError
 
 import requests
 
+from src.utils.car import CARFile
+
 from .cid import CID
 from .types import FetchError, IPFSProvider, PinError, UploadError
 
@@ -71,6 +76,46 @@ class Kubo(IPFSProvider):
         except KeyError as ex:
             raise UploadError from ex
 
+    def _upload_car(self, car: CARFile, name: str | None = None) -> str:
+        # @see https://docs.ipfs.tech/reference/kubo/rpc/#api-v0-dag-import
+        url = f"{self.endpoint}/api/v0/dag/import"
+        boundary = secrets.token_hex(16)
+
+        try:
+            resp = requests.post(
+                url,
+                data=self._multipart_stream(boundary, name or "file", car.iter_bytes()),
+                params={"pin-roots": "true"},
+                headers={**self._headers(), "Content-Type": f"multipart/form-data; boundary={boundary}"},
+                timeout=self.timeout,
+            )
+            resp.raise_for_status()
+        except requests.RequestException as ex:
+            logger.error({"msg": "Request has been failed", "error": str(ex)})
+            raise UploadError from ex
+
+        # The response is a stream of JSON messages, the imported root is reported as {"Root": {"Cid": {"/": ...}}}
+        try:
+            for line in resp.text.splitlines():
+                message = json.loads(line)
+                if "Root" in message:
+                    return message["Root"]["Cid"]["/"]
+        except JSONDecodeError as ex:
+            raise UploadError from ex
+        except (KeyError, TypeError) as ex:
+            raise UploadError from ex
+        raise UploadError("No root in the response of the CAR import")
+
+    @staticmethod
+    def _multipart_stream(boundary: str, name: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Streams a multipart/form-data body of a single file, `files=` of requests would load it in memory"""
+        yield (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{name}"\r\n'
+            "Content-Type: application/vnd.ipld.car\r\n\r\n"
+        ).encode()
+        yield from chunks
+        yield f"\r\n--{boundary}--\r\n".encode()
+
     def pin(self, cid: CID) -> None:
         # @see https://docs.ipfs.tech/reference/kubo/rpc/#api-v0-pin-add
         url = f"{self.endpoint}/api/v0/pin/add"
@@ -1,11 +1,9 @@
 from abc import ABC, abstractmethod
 
-import multiformats
-
 from src import variables
-from src.utils.car import CARConverter
+from src.utils.car import CARConverter, CARFile
 
-from .cid import CID, CIDv0
+from .cid import CID, CIDv0, normalize_cid
 
 
 class IPFSError(Exception):
@@ -62,10 +60,7 @@ class IPFSProvider(ABC):
         self.car_converter = CARConverter()
 
     def _normalize_cid(self, cid: str) -> CID:
-        parsed_cid = multiformats.CID.decode(cid)
-        if parsed_cid.version == 1:
-            parsed_cid = parsed_cid.set(version=0, base='base58btc')
-        return CID(str(parsed_cid))
+        return normalize_cid(cid)
 
     def fetch(self, cid: CID) -> bytes:
         content = self._fetch(cid)
@@ -79,10 +74,18 @@ class IPFSProvider(ABC):
         pass
 
     def publish(self, content: bytes, name: str | None = None) -> CID:
-        cid = self.upload(content, name)
+        car = self.car_converter.create_car([content])
+        try:
+            return self.publish_car(car, name)
+        finally:
+            car.close()
 
-        if variables.IPFS_VALIDATE_CID:
-            self._validate_cid(cid, content)
+    def publish_car(self, car: CARFile, name: str | None = None) -> CID:
+        """Uploads and pins the content of the CAR, the uploaded CID is validated against the root of the CAR"""
+        cid = self.upload_car(car, name)
+
+        if variables.IPFS_VALIDATE_CID and str(cid) != car.root.encode():
+            raise CIDValidationError(car.root.encode(), str(cid))
 
         self.pin(cid)
         return cid
@@ -91,9 +94,18 @@ class IPFSProvider(ABC):
     def _upload(self, content: bytes, name: str | None = None) -> str:
         pass
 
+    def _upload_car(self, car: CARFile, name: str | None = None) -> str:
+        """Uploads the content of the CAR, providers able to import CAR files upload the CAR itself"""
+        return self._upload(car.read_content(), name)
+
     def upload(self, content: bytes, name: str | None = None) -> CIDv0:
-        cid_str = self._upload(content, name)
-        normalized_cid = self._normalize_cid(cid_str)
+        return self._to_cidv0(self._upload(content, name))
+
+    def upload_car(self, car: CARFile, name: str | None = None) -> CIDv0:
+        return self._to_cidv0(self._upload_car(car, name))
+
+    def _to_cidv0(self, cid: str) -> CIDv0:
+        normalized_cid = self._normalize_cid(cid)
         return CIDv0(str(normalized_cid))
 
     @abstractmethod
@@ -1,13 +1,30 @@
+import logging
+from collections.abc import Callable, Iterable
 from time import sleep
-from typing import TypedDict, cast
+from typing import Any, TypedDict, cast
+
+from json_stream import to_standard_types  # type: ignore
 
 from src.metrics.prometheus.basic import KEYS_API_LATEST_BLOCKNUMBER, KEYS_API_REQUESTS_DURATION
-from src.providers.http_provider import HTTPProvider, NotOkResponse, data_is_dict
+from src.providers.http_provider import (
+    HTTPProvider,
+    NotOkResponse,
+    ReturnValueValidator,
+    data_is_any,
+    data_is_dict,
+    data_is_list,
+    data_is_transient_dict,
+    data_is_transient_list,
+)
+from src.providers.keys.store import KeysStore, ModuleVersion
 from src.providers.keys.types import KeysApiStatus, LidoKey
 from src.types import BlockStamp, StakingModuleAddress
 from src.utils.cache import global_lru_cache as lru_cache
 
 
+logger = logging.getLogger(__name__)
+
+
 class KeysOutdatedException(Exception):
     pass
 
@@ -46,16 +63,40 @@ class KeysAPIClient(HTTPProvider):
     PROVIDER_EXCEPTION = KAPIClientError
 
     USED_MODULE_OPERATORS_KEYS = 'v1/modules/{}/operators/keys?used=true'
+    USED_MODULE_KEYS = 'v1/modules/{}/keys?used=true'
     USED_KEYS = 'v1/keys?used=true'
+    MODULES = 'v1/modules'
     STATUS = 'v1/status'
 
-    def _get_with_blockstamp(self, url: str, blockstamp: BlockStamp, params: dict | None = None) -> dict | list:
+    # Used keys are synced incrementally by modules if set, see `_sync_used_keys`
+    keys_store: KeysStore | None = None
+
+    def _get_with_blockstamp(
+        self,
+        url: str,
+        blockstamp: BlockStamp,
+        params: dict | None = None,
+        validate_response: ReturnValueValidator = data_is_any,
+        stream_consumer: Callable[[Any], Any] | None = None,
+    ) -> Any:
         """
-        Returns response if blockstamp < blockNumber from response
+        Returns response if blockstamp < blockNumber from response.
+        If `stream_consumer` is given, response data is streamed into it.
         """
         for i in range(self.retry_count):
-            data, meta = self._get(url, query_params=params)
-            blocknumber_meta = meta['meta']['elBlockSnapshot']['blockNumber']
+            if stream_consumer is None:
+                data, meta = self._get(url, query_params=params, validate_response=validate_response)
+            else:
+                data, meta = self._get(
+                    url,
+                    query_params=params,
+                    stream=True,
+                    validate_response=validate_response,
+                    stream_consumer=stream_consumer,
+                    stream_meta=True,
+                )
+            # Modules list has the block snapshot at the top level, the rest of endpoints have it in meta
+            blocknumber_meta = meta.get('meta', meta)['elBlockSnapshot']['blockNumber']
             KEYS_API_LATEST_BLOCKNUMBER.set(blocknumber_meta)
             if blocknumber_meta >= blockstamp.block_number:
                 return data
@@ -70,10 +111,82 @@ class KeysAPIClient(HTTPProvider):
     @lru_cache(maxsize=1)
     def get_used_lido_keys(self, blockstamp: BlockStamp) -> list[LidoKey]:
         """Docs: https://keys-api.lido.fi/api/static/index.html#/keys/KeysController_get"""
-        data = [LidoKey.from_response(**x) for x in self._get_with_blockstamp(self.USED_KEYS, blockstamp)]
+        if self.keys_store is None:
+            data = self._get_all_used_keys(blockstamp)
+        else:
+            data = self._sync_used_keys(self.keys_store, blockstamp)
         self._check_used_keys(data)
         return data
 
+    def _get_all_used_keys(self, blockstamp: BlockStamp) -> list[LidoKey]:
+        return self._get_with_blockstamp(
+            self.USED_KEYS,
+            blockstamp,
+            validate_response=data_is_transient_list,
+            stream_consumer=self._parse_keys,
+        )
+
+    def _sync_used_keys(self, store: KeysStore, blockstamp: BlockStamp) -> list[LidoKey]:
+        """
+        Fetches the keys of the modules changed since the previous sync, the rest of the keys are taken from the store.
+
+        Falls back to fetching all the keys at once if a module has changed between the requests, since the keys of
+        other modules may be outdated by then.
+        """
+        modules = self._get_with_blockstamp(self.MODULES, blockstamp, validate_response=data_is_list)
+
+        keys: list[LidoKey] = []
+        for module in modules:
+            address = module['stakingModuleAddress']
+            version = (module['nonce'], module['lastChangedBlockHash'])
+            if store.get_version(address) == version:
+                keys.extend(store.get_keys(address))
+                continue
+
+            module_keys, fetched_version = self._get_used_module_keys(address, blockstamp)
+            if fetched_version != version:
+                logger.warning(
+                    {
+                        'msg': 'Module has changed during keys sync. Fetching all keys.',
+                        'module': address,
+                        'expected_version': version,
+                        'fetched_version': fetched_version,
+                    }
+                )
+                store.clear()
+                return self._get_all_used_keys(blockstamp)
+
+            store.put_module(address, version, module_keys)
+            keys.extend(module_keys)
+
+        store.retain_modules(module['stakingModuleAddress'] for module in modules)
+        return keys
+
+    def _get_used_module_keys(self, module_address: str, blockstamp: BlockStamp) -> tuple[list[LidoKey], ModuleVersion]:
+        """Docs: https://keys-api.lido.fi/api/static/index.html#/sr-module-keys/SRModulesKeysController_getModuleKeys"""
+        return self._get_with_blockstamp(
+            self.USED_MODULE_KEYS.format(module_address),
+            blockstamp,
+            validate_response=data_is_transient_dict,
+            stream_consumer=self._parse_module_keys,
+        )
+
+    @classmethod
+    def _parse_module_keys(cls, data: Any) -> tuple[list[LidoKey], ModuleVersion]:
+        keys: list[LidoKey] = []
+        module: dict = {}
+        for field, value in data.items():
+            if field == 'keys':
+                keys = cls._parse_keys(value)
+            elif field == 'module':
+                module = to_standard_types(value)
+        return keys, (module['nonce'], module['lastChangedBlockHash'])
+
+    @staticmethod
+    def _parse_keys(keys: Iterable) -> list[LidoKey]:
+        """Converts keys one by one as they are read, so the whole response is never kept in memory"""
+        return [LidoKey.from_response(**dict(key.items())) for key in keys]
+
     @lru_cache(maxsize=1)
     def get_used_module_operators_keys(
         self, module_address: StakingModuleAddress, blockstamp: BlockStamp
@@ -85,10 +198,11 @@ class KeysAPIClient(HTTPProvider):
         if (kapi_module_address := data['module']['stakingModuleAddress']) != module_address:
             raise KAPIInconsistentData(f"Module address mismatch: {kapi_module_address=} != {module_address=}")
 
-        data['keys'] = [LidoKey.from_response(**k) for k in data['keys']]
-        self._check_used_keys(data['keys'])
+        # Response data may be shared with concurrent callers, so it is not modified
+        keys = [LidoKey.from_response(**k) for k in data['keys']]
+        self._check_used_keys(keys)
 
-        return cast(ModuleOperatorsKeys, data)
+        return cast(ModuleOperatorsKeys, {**data, 'keys': keys})
 
     def get_status(self) -> KeysApiStatus:
         """Docs: https://keys-api.lido.fi/api/static/index.html#/status/StatusController_get"""
@@ -0,0 +1,121 @@
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import cast
+
+from eth_typing import ChecksumAddress, HexStr
+
+from src.metrics.prometheus.basic import KEYS_API_STORE_REQUESTS
+from src.providers.keys.types import LidoKey
+from src.types import NodeOperatorId
+
+
+# Module nonce and last changed block hash. KAPI changes both whenever the set of module keys changes.
+ModuleVersion = tuple[int, str]
+
+
+class KeysStore:
+    """
+    Local copy of the used keys of the staking modules, stored in SQLite at `path` or in memory if `path` is None.
+
+    Keys are stored by module along with the module version they were fetched at, so only the modules with another
+    version in KAPI have to be fetched again. Keys of a module are replaced as a whole, so removed keys are dropped
+    too. Keys of every module are also kept in memory once stored or loaded from the database.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self._lock = threading.Lock()
+        if path is None:
+            self._db = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS modules "
+            "(address TEXT PRIMARY KEY, nonce INTEGER NOT NULL, last_changed_block_hash TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS keys ("
+            "module_address TEXT NOT NULL, operator_index INTEGER NOT NULL, key_index INTEGER NOT NULL, "
+            "key TEXT NOT NULL, deposit_signature TEXT NOT NULL, "
+            "PRIMARY KEY (module_address, operator_index, key_index))"
+        )
+        self._keys: dict[str, list[LidoKey]] = {}
+
+    def get_version(self, module_address: str) -> ModuleVersion | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT nonce, last_changed_block_hash FROM modules WHERE address = ?", (module_address,)
+            ).fetchone()
+        KEYS_API_STORE_REQUESTS.labels(result="miss" if row is None else "hit").inc()
+        return None if row is None else (row[0], row[1])
+
+    def get_keys(self, module_address: str) -> list[LidoKey]:
+        """Returns the keys of the module ordered by operator and key index"""
+        with self._lock:
+            if module_address not in self._keys:
+                rows = self._db.execute(
+                    "SELECT operator_index, key_index, key, deposit_signature FROM keys "
+                    "WHERE module_address = ? ORDER BY operator_index, key_index",
+                    (module_address,),
+                )
+                address = cast(ChecksumAddress, module_address)
+                self._keys[module_address] = [
+                    LidoKey(
+                        index=key_index,
+                        key=HexStr(key),
+                        deposit_signature=HexStr(deposit_signature),
+                        operator_index=NodeOperatorId(operator_index),
+                        used=True,
+                        module_address=address,
+                    )
+                    for operator_index, key_index, key, deposit_signature in rows
+                ]
+            return list(self._keys[module_address])
+
+    def put_module(self, module_address: str, version: ModuleVersion, keys: list[LidoKey]) -> None:
+        """Replaces all the keys of the module"""
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.execute("DELETE FROM keys WHERE module_address = ?", (module_address,))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO keys (module_address, operator_index, key_index, key, deposit_signature) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ((module_address, k.operator_index, k.index, k.key, k.deposit_signature) for k in keys),
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO modules (address, nonce, last_changed_block_hash) VALUES (?, ?, ?)",
+                (module_address, *version),
+            )
+            self._db.execute("COMMIT")
+            self._keys[module_address] = list(keys)
+
+    def retain_modules(self, module_addresses: Iterable[str]) -> None:
+        """Removes the modules missing in `module_addresses` with their keys"""
+        module_addresses = set(module_addresses)
+        with self._lock:
+            stored = [row[0] for row in self._db.execute("SELECT address FROM modules")]
+            removed = [(address,) for address in stored if address not in module_addresses]
+            if not removed:
+                return
+            self._db.execute("BEGIN")
+            self._db.executemany("DELETE FROM keys WHERE module_address = ?", removed)
+            self._db.executemany("DELETE FROM modules WHERE address = ?", removed)
+            self._db.execute("COMMIT")
+            for (address,) in removed:
+                self._keys.pop(address, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.execute("DELETE FROM keys")
+            self._db.execute("DELETE FROM modules")
+            self._db.execute("COMMIT")
+            self._keys.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, fields
+from functools import cache
 from typing import Self, cast
 
 from eth_typing import ChecksumAddress, HexStr
@@ -19,12 +21,20 @@ class LidoKey(FromResponse):
 
     @classmethod
     def from_response(cls, **kwargs) -> Self:
-        response_lido_key = super().from_response(**{camel_to_snake(key): value for key, value in kwargs.items()})
-        lido_key: Self = cast(Self, response_lido_key)
-        lido_key.key = HexStr(lido_key.key.lower())  # pylint: disable=no-member
+        """Called for every key of the registry, so response field names are converted once per name"""
+        lido_key = cls(**{field: value for name, value in kwargs.items() if (field := _lido_key_field(name))})
+        lido_key.key = HexStr(lido_key.key.lower())
+        # Keys of the same module share the address string
+        lido_key.module_address = cast(ChecksumAddress, sys.intern(lido_key.module_address))
         return lido_key
 
 
+@cache
+def _lido_key_field(name: str) -> str | None:
+    field = camel_to_snake(name)
+    return field if field in {f.name for f in fields(LidoKey)} else None
+
+
 @dataclass
 class KeysApiStatus(FromResponse):
     app_version: str
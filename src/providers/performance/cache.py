@@ -0,0 +1,66 @@
+import json
+import logging
+import os
+import tempfile
+from compression import zstd
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+
+from src.modules.sidecars.performance.common.db import Duty
+from src.types import EpochNumber
+
+
+logger = logging.getLogger(__name__)
+
+
+class EpochsDutiesCache:
+    """
+    Disk cache of the epochs duties received from the performance API.
+
+    The API serves finalized epochs only, so a cached epoch never expires. Every epoch is kept in a separate
+    zstd-compressed file as it was received, including the content hash computed by the server. The hash is checked
+    on every read, and a broken entry is dropped to be fetched again.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def has(self, epoch: EpochNumber) -> bool:
+        return self._epoch_file(epoch).is_file()
+
+    def get(self, epoch: EpochNumber) -> Duty | None:
+        epoch_file = self._epoch_file(epoch)
+        try:
+            item = json.loads(zstd.decompress(epoch_file.read_bytes()))
+            duty = Duty.model_validate(item)
+        except FileNotFoundError:
+            return None
+        except (OSError, zstd.ZstdError, ValueError, ValidationError) as error:
+            logger.warning({"msg": "Broken epoch duties in the cache", "epoch": epoch, "error": str(error)})
+            epoch_file.unlink(missing_ok=True)
+            return None
+
+        if duty.epoch != epoch or duty.content_hash != item.get("content_hash"):
+            logger.warning({"msg": "Epoch duties in the cache do not match the content hash", "epoch": epoch})
+            epoch_file.unlink(missing_ok=True)
+            return None
+
+        return duty
+
+    def put(self, epoch: EpochNumber, item: dict[str, Any]) -> None:
+        """Stores the epoch item as received from the API. The caller is responsible for the content hash check."""
+        # Write to a temporary file first to never leave a partially written entry under the epoch name.
+        fd, tmp_name = tempfile.mkstemp(dir=self.path, prefix=f".{epoch}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(zstd.compress(json.dumps(item, separators=(',', ':')).encode()))
+            os.replace(tmp_name, self._epoch_file(epoch))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _epoch_file(self, epoch: EpochNumber) -> Path:
+        return self.path / f"{epoch}.json.zst"
@@ -1,9 +1,25 @@
-from collections.abc import Iterator
-from itertools import batched
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import groupby
+from typing import overload
+
+from requests import JSONDecodeError
+from requests.exceptions import ChunkedEncodingError, ContentDecodingError
+from urllib3 import Retry
 
 from src import variables
-from src.metrics.prometheus.basic import PERFORMANCE_REQUESTS_DURATION
-from src.modules.sidecars.performance.common.db import Duty, EpochsDemand
+from src.metrics.prometheus.basic import (
+    PERFORMANCE_EPOCHS_BATCH_DURATION,
+    PERFORMANCE_EPOCHS_BATCH_SIZE,
+    PERFORMANCE_REQUESTS_DURATION,
+    Status,
+)
+from src.modules.sidecars.performance.common.bitmap import encode_indexes_bitmap
+from src.modules.sidecars.performance.common.db import Duty, EpochsDemand, FilteredDuty
 from src.providers.http_provider import (
     HTTPProvider,
     NotOkResponse,
@@ -11,17 +27,53 @@ from src.providers.http_provider import (
     data_is_int,
     data_is_list,
 )
+from src.providers.performance.cache import EpochsDutiesCache
 from src.types import EpochNumber
 from src.utils.range import sequence
 
 
+logger = logging.getLogger(__name__)
+
+
 class PerformanceClientError(NotOkResponse):
     pass
 
 
+def _is_broken_body(error: NotOkResponse) -> bool:
+    """Body of a successful response was cut off, couldn't be decoded or didn't match its content hash"""
+    return error.status == 0 and (
+        error.__cause__ is None
+        or isinstance(error.__cause__, (ChunkedEncodingError, ContentDecodingError, JSONDecodeError))
+    )
+
+
+@dataclass
+class EpochsBatchSizer:
+    """
+    Picks the number of epochs for the next batch request so that a single request takes about `target_seconds`.
+    The response time grows with the payload size, so the latency covers both the server load and the data volume.
+    """
+
+    size: int
+    max_size: int
+    target_seconds: float
+
+    def observe(self, epochs: int, duration: float) -> None:
+        if duration <= 0:
+            return
+        optimal = epochs * self.target_seconds / duration
+        # Move halfway to the optimal size to smooth out latency spikes. It shrinks the batch at most twice at once,
+        # growth is capped the same way.
+        smoothed = (self.size + optimal) / 2
+        self.size = max(1, min(int(smoothed), self.size * 2, self.max_size))
+
+
 class PerformanceClient(HTTPProvider):
     PROVIDER_EXCEPTION = PerformanceClientError
     PROMETHEUS_HISTOGRAM = PERFORMANCE_REQUESTS_DURATION
+    ACCEPT_ENCODING = 'zstd, gzip'
+    # Filtered epochs data is queried with POST, it doesn't change anything on the server
+    RETRY_ALLOWED_METHODS = Retry.DEFAULT_ALLOWED_METHODS | {'POST'}
 
     API_PREFIX = 'v1'
     API_EPOCHS_CHECK = f'{API_PREFIX}/check-epochs'
@@ -29,6 +81,8 @@ class PerformanceClient(HTTPProvider):
     API_EPOCHS_STORED_COUNT = f'{API_EPOCHS_DATA}/stored-count'
     API_EPOCHS_DEMAND = f'{API_PREFIX}/demands'
 
+    epochs_cache: EpochsDutiesCache | None = None
+
     def is_range_available(self, from_epoch: EpochNumber, to_epoch: EpochNumber) -> bool:
         data, _ = self._get(
             self.API_EPOCHS_CHECK,
@@ -41,16 +95,176 @@ class PerformanceClient(HTTPProvider):
         data, _ = self._get(self.API_EPOCHS_DATA + f"/{epoch}")
         return Duty.model_validate(data) if data else None
 
-    def get_epochs_data(self, from_epoch: EpochNumber, to_epoch: EpochNumber) -> Iterator[Duty]:
-        batch_size = variables.PERFORMANCE_COLLECTOR_EPOCHS_BATCH_SIZE
-        for epochs_batch in batched(sequence(from_epoch, to_epoch), batch_size, strict=False):
-            data, _ = self._get(
+    @overload
+    def get_epochs_data(self, from_epoch: EpochNumber, to_epoch: EpochNumber) -> Iterator[Duty]: ...
+
+    @overload
+    def get_epochs_data(
+        self, from_epoch: EpochNumber, to_epoch: EpochNumber, validator_indexes: Iterable[int]
+    ) -> Iterator[FilteredDuty]: ...
+
+    def get_epochs_data(
+        self, from_epoch: EpochNumber, to_epoch: EpochNumber, validator_indexes: Iterable[int] | None = None
+    ) -> Iterator[Duty] | Iterator[FilteredDuty]:
+        """
+        Yields duties for the given epochs range.
+
+        If `validator_indexes` is given, the server keeps only the duties of these validators and reports
+        network-wide counters in `FilteredDuty.summary`.
+        """
+        if validator_indexes is None:
+            return self._get_all_epochs_data(from_epoch, to_epoch)
+        return self._get_filtered_epochs_data(from_epoch, to_epoch, encode_indexes_bitmap(validator_indexes))
+
+    def _get_all_epochs_data(self, from_epoch: EpochNumber, to_epoch: EpochNumber) -> Iterator[Duty]:
+        if self.epochs_cache is None:
+            return self._iter_epochs_batches(from_epoch, to_epoch, self._fetch_epochs_data)
+        return self._get_cached_epochs_data(self.epochs_cache, from_epoch, to_epoch)
+
+    def _get_cached_epochs_data(
+        self, cache: EpochsDutiesCache, from_epoch: EpochNumber, to_epoch: EpochNumber
+    ) -> Iterator[Duty]:
+        """Yields cached epochs from the disk and fetches the missing ranges only"""
+
+        def fetch_and_cache_batch(batch_from: EpochNumber, batch_to: EpochNumber) -> list[Duty]:
+            return self._fetch_epochs_data(batch_from, batch_to, cache)
+
+        for cached, epochs_group in groupby(sequence(from_epoch, to_epoch), key=cache.has):
+            epochs = list(epochs_group)
+            if not cached:
+                yield from self._iter_epochs_batches(epochs[0], epochs[-1], fetch_and_cache_batch)
+                continue
+            for epoch in epochs:
+                duty = cache.get(epoch)
+                if duty is None:
+                    yield from self._iter_epochs_batches(epoch, epoch, fetch_and_cache_batch)
+                else:
+                    yield duty
+
+    def _fetch_epochs_data(
+        self, from_epoch: EpochNumber, to_epoch: EpochNumber, cache: EpochsDutiesCache | None = None
+    ) -> list[Duty]:
+        data, _ = self._get(
+            self.API_EPOCHS_DATA,
+            query_params={'from': from_epoch, 'to': to_epoch},
+            validate_response=data_is_list,
+        )
+        duties = []
+        for item in data:
+            duty = Duty.model_validate(item)
+            content_hash = item.get('content_hash')
+            if content_hash is not None and content_hash != duty.content_hash:
+                # Raised as a transport error to refetch the batch.
+                raise self.PROVIDER_EXCEPTION(
+                    f'Content hash mismatch for epoch {duty.epoch}', status=0, text='Content hash mismatch.'
+                )
+            # Performance API versions without content hashes are not cached, there is nothing to verify against.
+            if cache is not None and content_hash is not None:
+                cache.put(EpochNumber(duty.epoch), item)
+            duties.append(duty)
+        return duties
+
+    def _get_filtered_epochs_data(
+        self, from_epoch: EpochNumber, to_epoch: EpochNumber, validator_indexes_bitmap: str
+    ) -> Iterator[FilteredDuty]:
+        def fetch_batch(batch_from: EpochNumber, batch_to: EpochNumber) -> list[FilteredDuty]:
+            data, _ = self._post(
                 self.API_EPOCHS_DATA,
-                query_params={'from': epochs_batch[0], 'to': epochs_batch[-1]},
+                body_data={
+                    'from': batch_from,
+                    'to': batch_to,
+                    'validator_indexes': validator_indexes_bitmap,
+                },
                 validate_response=data_is_list,
             )
-            for item in data:
-                yield Duty.model_validate(item)
+            return [FilteredDuty.model_validate(item) for item in data]
+
+        return self._iter_epochs_batches(from_epoch, to_epoch, fetch_batch)
+
+    def _iter_epochs_batches[T](
+        self,
+        from_epoch: EpochNumber,
+        to_epoch: EpochNumber,
+        fetch_batch: Callable[[EpochNumber, EpochNumber], list[T]],
+    ) -> Iterator[T]:
+        """
+        Fetches the epochs range in batches with up to `PERFORMANCE_CLIENT_MAX_CONCURRENCY` requests in flight
+        and yields items in the order of epochs. The size of every next batch is adjusted to the observed latency.
+        """
+        max_concurrency = variables.PERFORMANCE_CLIENT_MAX_CONCURRENCY
+        sizer = EpochsBatchSizer(
+            size=variables.PERFORMANCE_COLLECTOR_EPOCHS_BATCH_SIZE,
+            max_size=variables.PERFORMANCE_CLIENT_MAX_EPOCHS_BATCH_SIZE,
+            target_seconds=variables.PERFORMANCE_CLIENT_TARGET_BATCH_SECONDS,
+        )
+        pending: deque[tuple[int, Future[tuple[list[T], float]]]] = deque()
+        next_epoch = from_epoch
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='performance-client')
+        try:
+            while pending or next_epoch <= to_epoch:
+                while next_epoch <= to_epoch and len(pending) < max_concurrency:
+                    batch_to = EpochNumber(min(next_epoch + sizer.size - 1, to_epoch))
+                    PERFORMANCE_EPOCHS_BATCH_SIZE.set(batch_to - next_epoch + 1)
+                    future = executor.submit(self._fetch_epochs_batch, fetch_batch, next_epoch, batch_to)
+                    pending.append((batch_to - next_epoch + 1, future))
+                    next_epoch = EpochNumber(batch_to + 1)
+
+                epochs, future = pending.popleft()
+                items, duration = future.result()
+                sizer.observe(epochs, duration)
+                yield from items
+        finally:
+            # Cancel prefetched batches nobody is going to consume and wait for the running ones,
+            # so no request outlives the iterator.
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _fetch_epochs_batch[T](
+        self,
+        fetch_batch: Callable[[EpochNumber, EpochNumber], list[T]],
+        from_epoch: EpochNumber,
+        to_epoch: EpochNumber,
+    ) -> tuple[list[T], float]:
+        """
+        Fetches a single batch retrying the responses broken in the middle of the body, which the HTTP adapter can't
+        retry: the adapter retries connection errors and server error statuses before the body is read, so these are
+        not retried here once again. Returns the items and the duration of the last attempt.
+        """
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                items = fetch_batch(from_epoch, to_epoch)
+            except self.PROVIDER_EXCEPTION as error:
+                PERFORMANCE_EPOCHS_BATCH_DURATION.labels(status=Status.FAILURE.value).observe(
+                    time.perf_counter() - started
+                )
+                if not _is_broken_body(error) or attempt >= self.retry_count:
+                    raise
+                attempt += 1
+                logger.warning(
+                    {
+                        'msg': 'Failed to fetch epochs batch, retrying',
+                        'from_epoch': from_epoch,
+                        'to_epoch': to_epoch,
+                        'attempt': attempt,
+                        'error': str(error),
+                    }
+                )
+                time.sleep(self.backoff_factor * 2 ** (attempt - 1))
+                continue
+
+            duration = time.perf_counter() - started
+            PERFORMANCE_EPOCHS_BATCH_DURATION.labels(status=Status.SUCCESS.value).observe(duration)
+            logger.debug(
+                {
+                    'msg': 'Epochs batch fetched',
+                    'from_epoch': from_epoch,
+                    'to_epoch': to_epoch,
+                    'duration': duration,
+                }
+            )
+            return items, duration
 
     def get_epochs_demand(self, consumer: str) -> EpochsDemand | None:
         data, _ = self._get(self.API_EPOCHS_DEMAND + f"/{consumer}")
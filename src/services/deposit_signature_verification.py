@@ -1,10 +1,60 @@
 # pyright: reportPrivateImportUsage=false
+import hashlib
+import math
+import sqlite3
+import threading
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import cache
+from pathlib import Path
+
 import ssz
 from eth_typing import Hash32
-from py_ecc.bls import G2ProofOfPossession as BLSVerifier
+from py_ecc.bls import G2ProofOfPossession
 from py_ecc.bls.g2_primitives import BLSPubkey, BLSSignature
 
+from src import variables
 from src.constants import DOMAIN_DEPOSIT_TYPE, GENESIS_FORK_VERSION
+from src.metrics.prometheus.basic import DEPOSIT_SIGNATURE_CACHE_REQUESTS
+from src.providers.consensus.types import PendingDeposit
+from src.utils.types import hex_str_to_bytes
+
+
+# Prefer the arkworks bindings if installed, they verify a signature over 100 times faster than the pure-Python py_ecc
+try:
+    from py_arkworks_bls12381 import GT, G1Point, G2Point
+except ImportError:
+    GT, G1Point, G2Point = None, None, None
+
+
+class ArkworksBLSVerifier:
+    """
+    `G2ProofOfPossession.Verify` on top of the arkworks BLS12-381 bindings.
+    The points are decompressed with the subgroup checks, and the pubkey must not be the point at infinity.
+    """
+
+    DST = G2ProofOfPossession.DST
+
+    @classmethod
+    def Verify(cls, PK: BLSPubkey, message: bytes, signature: BLSSignature) -> bool:
+        try:
+            pubkey_point = G1Point.from_compressed_bytes(PK)
+            signature_point = G2Point.from_compressed_bytes(signature)
+        except Exception:  # pylint: disable=broad-exception-caught
+            return False
+
+        if pubkey_point == G1Point.identity():
+            return False
+
+        # e(pubkey, H(message)) == e(G1, signature)
+        return GT.pairing_check(
+            [pubkey_point, -G1Point()],
+            [G2Point.hash_to_curve(message, cls.DST), signature_point],
+        )
+
+
+BLSVerifier = G2ProofOfPossession if G1Point is None else ArkworksBLSVerifier
 
 
 class DepositMessage(ssz.Serializable):
@@ -95,11 +145,147 @@ def is_valid_deposit_signature(
     Source:
     https://github.com/ethereum/consensus-specs/blob/139ff2875783ccba26c34aa15acebbcfba5f6eae/specs/electra/beacon-chain.md#new-is_valid_deposit_signature
     """
+    signing_root = compute_deposit_signing_root(
+        pubkey, withdrawal_credentials, amount, genesis_fork_version, genesis_validators_root
+    )
+    return BLSVerifier.Verify(BLSPubkey(pubkey), signing_root, BLSSignature(signature))
+
+
+def compute_deposit_signing_root(
+    pubkey: bytes,
+    withdrawal_credentials: bytes,
+    amount: int,
+    genesis_fork_version: bytes | None = None,
+    genesis_validators_root: bytes | None = None,
+) -> Hash32:
     deposit_message = DepositMessage(
         pubkey=pubkey,
         withdrawal_credentials=withdrawal_credentials,
         amount=amount,
     )
     domain = compute_domain(DOMAIN_DEPOSIT_TYPE, genesis_fork_version, genesis_validators_root)
-    signing_root = compute_signing_root(deposit_message, domain)
-    return BLSVerifier.Verify(BLSPubkey(pubkey), signing_root, BLSSignature(signature))
+    return compute_signing_root(deposit_message, domain)
+
+
+class DepositSignatureCache:
+    """
+    Cache of deposit signature verification results, stored in SQLite at `path` or in memory if `path` is None.
+
+    An entry is keyed by the signing root, which commits to the withdrawal credentials, the amount and the fork, and
+    by the pubkey and the signature. The result of the verification never changes for the same key, so an entry
+    never expires. Entries are tiny and their number is bounded by the number of deposits ever made, so the cache is
+    never evicted either.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self._lock = threading.Lock()
+        if path is None:
+            self._db = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS signatures (key BLOB PRIMARY KEY, valid INTEGER NOT NULL)")
+
+    @staticmethod
+    def key(pubkey: bytes, signing_root: bytes, signature: bytes) -> bytes:
+        return hashlib.blake2b(signing_root + pubkey + signature, digest_size=32).digest()
+
+    def get_many(self, keys: Sequence[bytes]) -> dict[bytes, bool]:
+        results: dict[bytes, bool] = {}
+        with self._lock:
+            # Stay within the default SQLite limit of variables in a statement
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                placeholders = ",".join("?" * len(batch))
+                query = f"SELECT key, valid FROM signatures WHERE key IN ({placeholders})"
+                results.update((key, bool(valid)) for key, valid in self._db.execute(query, batch))
+
+        DEPOSIT_SIGNATURE_CACHE_REQUESTS.labels(result="hit").inc(len(results))
+        DEPOSIT_SIGNATURE_CACHE_REQUESTS.labels(result="miss").inc(len(set(keys)) - len(results))
+        return results
+
+    def put_many(self, results: dict[bytes, bool]) -> None:
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR IGNORE INTO signatures (key, valid) VALUES (?, ?)",
+                ((key, int(valid)) for key, valid in results.items()),
+            )
+            self._db.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+@cache
+def get_deposit_signature_cache() -> DepositSignatureCache:
+    path = variables.DEPOSIT_SIGNATURE_CACHE_PATH
+    return DepositSignatureCache(Path(path) if path else None)
+
+
+@contextmanager
+def signature_verification_pool(signatures_count: int) -> Iterator[Executor | None]:
+    """
+    Pool of processes to verify up to `signatures_count` signatures at a time, to be reused by all the
+    `verify_deposit_signatures` calls of a batch. None if a single process is enough.
+    """
+    workers = min(variables.DEPOSIT_SIGNATURE_VERIFICATION_WORKERS, signatures_count)
+    if workers <= 1:
+        yield None
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield executor
+
+
+def verify_deposit_signatures(
+    deposits: Sequence[PendingDeposit],
+    genesis_fork_version: bytes,
+    executor: Executor | None = None,
+) -> list[bool]:
+    """
+    Returns whether the signature of every deposit is valid, as `is_valid_deposit_signature` does.
+
+    Results are taken from the cache first. The remaining signatures are verified in the `executor`, if given, since
+    the verification is CPU bound, and stored in the cache.
+    """
+    signatures = []
+    for deposit in deposits:
+        pubkey = hex_str_to_bytes(deposit.pubkey)
+        signing_root = compute_deposit_signing_root(
+            pubkey,
+            hex_str_to_bytes(deposit.withdrawal_credentials),
+            deposit.amount,
+            genesis_fork_version,
+            # Fork-agnostic domain since deposits are valid across forks
+        )
+        signatures.append((pubkey, signing_root, hex_str_to_bytes(deposit.signature)))
+
+    signature_cache = get_deposit_signature_cache()
+    keys = [DepositSignatureCache.key(*signature) for signature in signatures]
+    results = signature_cache.get_many(keys)
+
+    missed = {key: signature for key, signature in zip(keys, signatures, strict=True) if key not in results}
+    if missed:
+        verified = dict(zip(missed, _verify_signatures(list(missed.values()), executor), strict=True))
+        signature_cache.put_many(verified)
+        results.update(verified)
+
+    return [results[key] for key in keys]
+
+
+def _verify_signatures(signatures: list[tuple[bytes, bytes, bytes]], executor: Executor | None) -> list[bool]:
+    workers = min(variables.DEPOSIT_SIGNATURE_VERIFICATION_WORKERS, len(signatures))
+    if executor is None or workers <= 1:
+        return [_verify_signature(signature) for signature in signatures]
+
+    chunksize = math.ceil(len(signatures) / (workers * 4))
+    return list(executor.map(_verify_signature, signatures, chunksize=chunksize))
+
+
+def _verify_signature(signature: tuple[bytes, bytes, bytes]) -> bool:
+    pubkey, signing_root, signature_bytes = signature
+    return BLSVerifier.Verify(BLSPubkey(pubkey), signing_root, BLSSignature(signature_bytes))
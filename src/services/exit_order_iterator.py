@@ -1,4 +1,5 @@
 import logging
+from collections import defaultdict
 from dataclasses import dataclass
 from typing import cast
 
@@ -18,6 +19,7 @@ from src.providers.execution.contracts.curated_staking_module import CuratedStak
 from src.providers.execution.contracts.meta_registry import MetaRegistryContract, OperatorGroup
 from src.services.validator_state import LidoValidatorStateService
 from src.types import Gwei, NodeOperatorGlobalIndex, ReferenceBlockStamp, StakingModuleId
+from src.utils.priority_queue import IndexedPriorityQueue
 from src.utils.validator_balance import get_predictable_inbound_balance
 from src.utils.validator_state import get_max_effective_balance, is_on_exit
 from src.web3py.extensions.lido_validators import (
@@ -107,6 +109,14 @@ class ValidatorExitIterator:
     | V       | Highest deviation from the exit share limit or the biggest by balance |                                                       |                        |
     | V       |                                                                       | Highest deviation from the target stake               |                        |
     | V       |                                                                       |                                                       | Lowest validator index |
+
+    The order is kept incrementally instead of sorting all node operators for every validator:
+    * NOs above the boosted or smooth exit target always go first and are compared by the full predicate.
+    * In a module where all NOs have the same weight and no meta-registry group, the target stake deviation
+      orders NOs the same way as their total stake does, whatever the module total is. Such NOs are kept
+      in a priority queue by the total stake and the lowest validator index, and only the ejected NO is re-keyed.
+    * NOs of the other modules (CMv1 and CMv2 with groups or weights) are compared by the full predicate.
+    The best candidate of each module is compared with the full predicate, so the order is the same as with sorting.
     """  # noqa: E501
 
     max_current_exit_balance: Gwei
@@ -115,6 +125,8 @@ class ValidatorExitIterator:
     module_stats: dict[StakingModuleId, StakingModuleStats]
     node_operators_stats: dict[NodeOperatorGlobalIndex, NodeOperatorStats]
     exitable_validators: dict[NodeOperatorGlobalIndex, list[LidoValidator]]
+    # Number of validators already ejected from the head of each exitable validators list
+    ejected_count: dict[NodeOperatorGlobalIndex, int]
 
     cm_v2_id: StakingModuleId
 
@@ -147,6 +159,13 @@ class ValidatorExitIterator:
         self.module_stats: dict[StakingModuleId, StakingModuleStats] = {}
         self.node_operators_stats: dict[NodeOperatorGlobalIndex, NodeOperatorStats] = {}
         self.exitable_validators: dict[NodeOperatorGlobalIndex, list[LidoValidator]] = {}
+        self.ejected_count: dict[NodeOperatorGlobalIndex, int] = {}
+
+        # Exit order structures, built on the first iteration and updated on every ejection
+        self._targeted_operators: dict[NodeOperatorGlobalIndex, NodeOperatorStats] | None = None
+        self._module_queues: dict[StakingModuleId, IndexedPriorityQueue[NodeOperatorGlobalIndex]] = {}
+        self._scanned_operators: dict[StakingModuleId, list[tuple[NodeOperatorGlobalIndex, NodeOperatorStats]]] = {}
+        self._forced_queue: IndexedPriorityQueue[NodeOperatorGlobalIndex] | None = None
 
     def _prepare_data_structure(self):
         self._prepare_module_stats()
@@ -391,25 +410,91 @@ class ValidatorExitIterator:
     # --- Iterator ---
     @duration_meter()
     def __next__(self) -> tuple[NodeOperatorGlobalIndex, LidoValidator]:
-        for node_operator in sorted(self.node_operators_stats.values(), key=self._no_predicate):
-            gid = (
-                node_operator.module_stats.staking_module.id,
-                node_operator.node_operator.id,
-            )
-            # Check if there are exitable validators
-            # get the next node operator if yes
-            if not self.exitable_validators[gid]:
-                continue
+        if self._targeted_operators is None:
+            self._build_exit_queues()
 
-            v: LidoValidator = self._eject_validator(gid)
-            self.max_current_exit_balance += get_max_effective_balance(v.validator)
+        gid = self._get_next_node_operator()
+        if gid is None:
+            raise StopIteration
 
-            if self.max_current_exit_balance > self.exit_limit_in_gwei:
-                raise StopIteration
+        v: LidoValidator = self._eject_validator(gid)
+        self.max_current_exit_balance += get_max_effective_balance(v.validator)
+
+        if self.max_current_exit_balance > self.exit_limit_in_gwei:
+            raise StopIteration
 
-            return gid, v
+        return gid, v
 
-        raise StopIteration
+    def _build_exit_queues(self) -> None:
+        self._targeted_operators = {}
+        self._module_queues = {}
+        self._scanned_operators = {}
+
+        operators_by_module: dict[StakingModuleId, list[tuple[NodeOperatorGlobalIndex, NodeOperatorStats]]] = (
+            defaultdict(list)
+        )
+        for gid, no_stats in self.node_operators_stats.items():
+            operators_by_module[gid[0]].append((gid, no_stats))
+
+        for sm_id, operators in operators_by_module.items():
+            if self._is_ordered_by_total_stake([no_stats for _, no_stats in operators]):
+                self._module_queues[sm_id] = IndexedPriorityQueue()
+            else:
+                self._scanned_operators[sm_id] = operators
+
+        for gid in self.node_operators_stats:
+            self._update_exit_queues(gid)
+
+    @staticmethod
+    def _is_ordered_by_total_stake(operators: list[NodeOperatorStats]) -> bool:
+        """
+        With the same weight the target stake is the same for all NOs of the module, so the deviation from it is
+        monotonic in the NO total stake. Stakes are whole gwei far below 2**53, so the float deviation keeps ties
+        and strict order of the stakes.
+        """
+        return (
+            len({no_stats.weight for no_stats in operators}) == 1
+            and all(isinstance(no_stats.total_stake, int) for no_stats in operators)
+            and not any(no_stats.internal_operator_group or no_stats.external_operator_group for no_stats in operators)
+        )
+
+    def _get_next_node_operator(self) -> NodeOperatorGlobalIndex | None:
+        targeted_operators = cast(dict[NodeOperatorGlobalIndex, NodeOperatorStats], self._targeted_operators)
+        # NOs above the exit targets have non-zero leading predicates, so they go before all the others
+        if targeted_operators:
+            return min(targeted_operators, key=lambda gid: self._no_predicate(targeted_operators[gid]))
+
+        candidates = [queue.peek()[0] for queue in self._module_queues.values() if queue]
+        for operators in self._scanned_operators.values():
+            exitable = [gid for gid, _ in operators if self._has_exitable_validators(gid)]
+            if exitable:
+                candidates.append(min(exitable, key=lambda gid: self._no_predicate(self.node_operators_stats[gid])))
+
+        if not candidates:
+            return None
+
+        return min(candidates, key=lambda gid: self._no_predicate(self.node_operators_stats[gid]))
+
+    def _update_exit_queues(self, gid: NodeOperatorGlobalIndex) -> None:
+        no_stats = self.node_operators_stats[gid]
+        has_validators = self._has_exitable_validators(gid)
+
+        if self._targeted_operators is not None:
+            queue = self._module_queues.get(gid[0])
+            if has_validators and (self._no_force_predicate(no_stats) or self._no_soft_predicate(no_stats)):
+                self._targeted_operators[gid] = no_stats
+            else:
+                self._targeted_operators.pop(gid, None)
+                if queue is not None and has_validators:
+                    queue.push(gid, (-no_stats.total_stake, self._lowest_validator_index_predicate(no_stats)))
+                elif queue is not None and gid in queue:
+                    queue.remove(gid)
+
+        if self._forced_queue is not None:
+            if has_validators and self._no_force_predicate(no_stats):
+                self._forced_queue.push(gid, self.no_remaining_forced_predicate(no_stats))
+            elif gid in self._forced_queue:
+                self._forced_queue.remove(gid)
 
     @staticmethod
     def _make_exit_predicate(gid: NodeOperatorGlobalIndex, indexes: dict):
@@ -423,8 +508,13 @@ class ValidatorExitIterator:
 
         return is_validator_exitable
 
+    def _has_exitable_validators(self, gid: NodeOperatorGlobalIndex) -> bool:
+        return self.ejected_count.get(gid, 0) < len(self.exitable_validators[gid])
+
     def _eject_validator(self, gid: NodeOperatorGlobalIndex) -> LidoValidator:
-        lido_validator = self.exitable_validators[gid].pop(0)
+        ejected = self.ejected_count.get(gid, 0)
+        lido_validator = self.exitable_validators[gid][ejected]
+        self.ejected_count[gid] = ejected + 1
 
         exit_balance = get_predictable_inbound_balance(lido_validator)
 
@@ -437,6 +527,7 @@ class ValidatorExitIterator:
         self.node_operators_stats[gid].predictable_balance -= exit_balance
 
         self._decrease_affected_stake(gid, exit_balance)
+        self._update_exit_queues(gid)
 
         logger.debug(
             {
@@ -545,10 +636,11 @@ class ValidatorExitIterator:
         ---------- val 100 ------ val 200 ----- val 340 ----->
         """
         gid = (node_operator.module_stats.staking_module.id, node_operator.node_operator.id)
-        validators = self.exitable_validators[gid]
         # all validators in exitable_validators are sorted
         # If NO doesn't have exitable validators - sorting by validator index doesn't matter
-        return validators[0].index if validators else 0
+        if not self._has_exitable_validators(gid):
+            return 0
+        return self.exitable_validators[gid][self.ejected_count.get(gid, 0)].index
 
     def get_remaining_forced_validators(self) -> list[tuple[NodeOperatorGlobalIndex, LidoValidator]]:
         """
@@ -558,28 +650,22 @@ class ValidatorExitIterator:
         """
         result: list[tuple[NodeOperatorGlobalIndex, LidoValidator]] = []
 
-        while True:
-            for no_stats in sorted(self.node_operators_stats.values(), key=self.no_remaining_forced_predicate):
-                if self._no_force_predicate(no_stats) == 0:
-                    # The current and all further NOs in the list have no forced validators to exit. Cycle done
-                    return result
+        if self._forced_queue is None:
+            self._forced_queue = IndexedPriorityQueue()
+            for gid in self.node_operators_stats:
+                self._update_exit_queues(gid)
 
-                gid = (
-                    no_stats.node_operator.staking_module.id,
-                    no_stats.node_operator.id,
-                )
+        # The queue keeps only NOs with forced validators to exit, so the cycle is done once it's empty
+        while self._forced_queue:
+            gid, _ = self._forced_queue.peek()
 
-                if self.exitable_validators[gid]:
-                    v = self._eject_validator(gid)
-                    self.max_current_exit_balance += get_max_effective_balance(v.validator)
+            v = self._eject_validator(gid)
+            self.max_current_exit_balance += get_max_effective_balance(v.validator)
 
-                    if self.max_current_exit_balance > self.exit_limit_in_gwei:
-                        return result
+            if self.max_current_exit_balance > self.exit_limit_in_gwei:
+                return result
 
-                    result.append((gid, v))
-                    break
-            else:
-                break
+            result.append((gid, v))
 
         return result
 
@@ -0,0 +1,38 @@
+from collections.abc import Iterable
+
+
+class BytesWriter:
+    """
+    Writes fixed-width fields one after another into a buffer preallocated for the whole payload.
+
+    Encoding n items with `bytes +=` copies everything written so far on every item, which is quadratic in the
+    payload size. Here every field is copied exactly once. The payload size must be known upfront, and `to_bytes`
+    checks that it was filled completely.
+    """
+
+    def __init__(self, size: int):
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._offset = 0
+
+    def write_uint(self, value: int, length: int) -> None:
+        """Writes big-endian unsigned integer. Raises OverflowError if the value doesn't fit into `length` bytes."""
+        self.write_bytes(value.to_bytes(length))
+
+    def write_uints(self, values: Iterable[int], length: int) -> None:
+        """Writes big-endian unsigned integers of the same width one after another."""
+        self.write_bytes(b''.join(value.to_bytes(length) for value in values))
+
+    def write_bytes(self, value: bytes) -> None:
+        end = self._offset + len(value)
+        if end > len(self._buffer):
+            raise ValueError(f'Write of {len(value)} bytes at offset {self._offset} exceeds size {len(self._buffer)}.')
+
+        self._view[self._offset : end] = value
+        self._offset = end
+
+    def to_bytes(self) -> bytes:
+        if self._offset != len(self._buffer):
+            raise ValueError(f'Only {self._offset} of {len(self._buffer)} bytes are written.')
+
+        return bytes(self._buffer)
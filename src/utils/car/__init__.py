@@ -1,6 +1,8 @@
-from .converter import CARConverter
+from .converter import CARConverter, CARFile, CARWriter
 
 
 __all__ = [
     "CARConverter",
+    "CARFile",
+    "CARWriter",
 ]
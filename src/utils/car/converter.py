@@ -1,14 +1,202 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import IO, Self
+
 from ipld_dag_pb import PBLink, PBNode, encode as dag_pb_encode
-from multiformats import CID, multihash
+from multiformats import CID, multihash, varint
 
 from .schemes import unixfs_pb2
 
 
 DEFAULT_CHUNK_SIZE = 262144  # Default chunk size for IPFS UnixFS (256KB)
+# Size of the CAR blocks kept in memory before spilling to disk
+CAR_SPOOL_MAX_SIZE = 64 * 2**20
 
 Block = tuple[CID, bytes]
 
 
+def _car_header(root: CID) -> bytes:
+    """
+    Encodes the CARv1 header, a DAG-CBOR map `{"roots": [root], "version": 1}` prefixed by its length.
+
+    The map is small and fixed, so it's encoded by hand: CBOR map of 2 items with the keys in DAG-CBOR order, the root
+    is a CID tag (42) over bytes with the 0x00 multibase prefix.
+    """
+    cid_bytes = b"\x00" + bytes(root)
+    header = (
+        b"\xa2"  # map(2)
+        + b"\x65roots"  # text(5)
+        + b"\x81"  # array(1)
+        + b"\xd8\x2a"  # tag(42)
+        + b"\x58"  # bytes, 1-byte length
+        + bytes([len(cid_bytes)])
+        + cid_bytes
+        + b"\x67version"  # text(7)
+        + b"\x01"  # unsigned(1)
+    )
+    return varint.encode(len(header)) + header
+
+
+def encode_car_block(cid: CID, data: bytes) -> bytes:
+    """Encodes a CARv1 section: the length of the CID and the data followed by both"""
+    cid_bytes = bytes(cid)
+    return varint.encode(len(cid_bytes) + len(data)) + cid_bytes + data
+
+
+@dataclass
+class CARFile:
+    """
+    CAR of UnixFS content with the blocks and the content itself written to spooled temporary files.
+
+    The files are read with an own offset by every reader, so the CAR can be uploaded by several threads at once.
+    """
+
+    root: CID
+    blocks: IO[bytes]
+    content: IO[bytes]
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def header(self) -> bytes:
+        return _car_header(self.root)
+
+    def _iter_file(self, file: IO[bytes], chunk_size: int) -> Iterator[bytes]:
+        offset = 0
+        while True:
+            with self._lock:
+                file.seek(offset)
+                chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            offset += len(chunk)
+            yield chunk
+
+    def iter_bytes(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yields the CAR content without loading the blocks in memory at once"""
+        yield self.header()
+        yield from self._iter_file(self.blocks, chunk_size)
+
+    def read(self) -> bytes:
+        return b"".join(self.iter_bytes())
+
+    def iter_content(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yields the content the CAR is built of"""
+        yield from self._iter_file(self.content, chunk_size)
+
+    def read_content(self) -> bytes:
+        return b"".join(self.iter_content())
+
+    def close(self) -> None:
+        self.blocks.close()
+        self.content.close()
+
+
+class CARWriter:
+    """
+    Write-only file-like object building the UnixFS DAG of the content written to it, e.g. by `json_writer.dump`.
+
+    Leaf nodes are built and hashed by a pool of `workers` threads while the content is being written, the number of
+    chunks in flight is bounded, so memory doesn't depend on the size of the content. Unless `spool_max_size` is None,
+    the content and the CAR sections of all the blocks are written to spooled temporary files, the blocks in the same
+    order as `CARConverter._build_unixfs_blocks_and_root` returns them.
+    """
+
+    def __init__(
+        self,
+        converter: CARConverter,
+        *,
+        workers: int | None = None,
+        spool_max_size: int | None = CAR_SPOOL_MAX_SIZE,
+    ) -> None:
+        self._converter = converter
+        self._workers = workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="car-hash")
+        self._in_flight: deque[Future[tuple[CID, bytes, int]]] = deque()
+        self._buffer = bytearray()
+        self._leaves: list[tuple[CID, int, int]] = []
+        self._blocks: IO[bytes] | None = None
+        self._content: IO[bytes] | None = None
+        if spool_max_size is not None:
+            # The files are owned by the CARFile returned by `finish`
+            self._blocks = tempfile.SpooledTemporaryFile(max_size=spool_max_size)  # noqa: SIM115
+            self._content = tempfile.SpooledTemporaryFile(max_size=spool_max_size)  # noqa: SIM115
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, data: bytes) -> int:
+        if self._content is not None:
+            self._content.write(data)
+        if not self._buffer and len(data) == DEFAULT_CHUNK_SIZE:
+            self._submit(data)
+            return len(data)
+        self._buffer += data
+        while len(self._buffer) >= DEFAULT_CHUNK_SIZE:
+            self._submit(bytes(self._buffer[:DEFAULT_CHUNK_SIZE]))
+            del self._buffer[:DEFAULT_CHUNK_SIZE]
+        return len(data)
+
+    def _submit(self, chunk: bytes) -> None:
+        self._in_flight.append(self._executor.submit(self._converter._build_leaf, chunk))
+        if len(self._in_flight) >= 2 * self._workers:
+            self._collect(self._in_flight.popleft().result())
+
+    def _collect(self, leaf: tuple[CID, bytes, int]) -> None:
+        cid, node, size = leaf
+        self._leaves.append((cid, len(node), size))
+        if self._blocks is not None:
+            self._blocks.write(encode_car_block(cid, node))
+
+    def build_root(self) -> CID:
+        """Builds the rest of the DAG and returns its root CID, nothing can be written after that"""
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._in_flight:
+            self._collect(self._in_flight.popleft().result())
+        self._executor.shutdown()
+
+        if not self._leaves:
+            # Empty content is a single empty leaf
+            self._collect(self._converter._build_leaf(b""))
+
+        if len(self._leaves) == 1:
+            return self._leaves[0][0]
+
+        root_node = self._converter._serialize_unixfs_parent_node(self._leaves)
+        root_cid = self._converter._create_cid_from_pb_node(root_node)
+        if self._blocks is not None:
+            self._blocks.write(encode_car_block(root_cid, root_node))
+        return root_cid
+
+    def finish(self) -> CARFile:
+        """Builds the rest of the DAG and returns the CAR, the spooled files are owned by the CAR from now on"""
+        if self._blocks is None or self._content is None:
+            raise ValueError("CAR blocks aren't spooled")
+        root = self.build_root()
+        car = CARFile(root, self._blocks, self._content)
+        self._blocks = self._content = None
+        return car
+
+    def close(self) -> None:
+        """Releases the workers and the spooled files unless they are owned by the returned CAR"""
+        for future in self._in_flight:
+            future.cancel()
+        self._executor.shutdown()
+        for file in (self._blocks, self._content):
+            if file is not None:
+                file.close()
+        self._blocks = self._content = None
+
+
 class CARConverter:
     """CAR (Content Addressable aRchive) format converter.
 
@@ -33,8 +221,9 @@ class CARConverter:
         unixfs.filesize = len(data_bytes)
         unixfs_serialized = unixfs.SerializeToString()
 
-        pb_node = PBNode(data=unixfs_serialized, links=[])
-        return dag_pb_encode(pb_node)
+        # A DAG-PB node without links has the only field, Data (1, length-delimited), so it's encoded directly:
+        # `dag_pb_encode` copies the data byte by byte, which dominates the hashing time of large content.
+        return b"\x0a" + varint.encode(len(unixfs_serialized)) + unixfs_serialized
 
     def _serialize_unixfs_parent_node(self, leafs_info: list[tuple[CID, int, int]]) -> bytes:
         """Serialize UnixFS parent node that links to child chunks.
@@ -97,5 +286,42 @@ class CARConverter:
         return root_cid, blocks
 
     def create_unixfs_based_cid(self, data_bytes: bytes) -> str:
-        root_cid, _ = self._build_unixfs_blocks_and_root(data_bytes)
-        return root_cid.encode()
+        return self.build_unixfs_root(self._iter_chunks(memoryview(data_bytes))).encode()
+
+    @staticmethod
+    def _iter_chunks(data: memoryview, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+        for i in range(0, len(data), chunk_size):
+            yield data[i : i + chunk_size]
+
+    def _build_leaf(self, chunk: bytes) -> tuple[CID, bytes, int]:
+        node = self._serialize_unixfs_leaf_node(bytes(chunk))
+        # hashlib releases the GIL on large inputs, so leaves are hashed in parallel by the worker threads
+        digest = multihash.wrap(hashlib.sha256(node).digest(), "sha2-256")
+        return CID("base58btc", 0, "dag-pb", digest), node, len(chunk)
+
+    def build_unixfs_root(self, stream: Iterable[bytes], *, workers: int | None = None) -> CID:
+        """
+        Builds the UnixFS DAG of the streamed content and returns its root CID, same as `_build_unixfs_blocks_and_root`
+        does for the whole content at once.
+        """
+        with CARWriter(self, workers=workers, spool_max_size=None) as writer:
+            for piece in stream:
+                writer.write(piece)
+            return writer.build_root()
+
+    def open_car(self, *, workers: int | None = None, spool_max_size: int = CAR_SPOOL_MAX_SIZE) -> CARWriter:
+        """Returns a writer building the CAR of the content written to it in a single pass"""
+        return CARWriter(self, workers=workers, spool_max_size=spool_max_size)
+
+    def create_car(
+        self,
+        stream: Iterable[bytes],
+        *,
+        workers: int | None = None,
+        spool_max_size: int = CAR_SPOOL_MAX_SIZE,
+    ) -> CARFile:
+        """Builds a CAR of the streamed content in a single pass, the blocks are spilled to disk when large"""
+        with self.open_car(workers=workers, spool_max_size=spool_max_size) as writer:
+            for piece in stream:
+                writer.write(piece)
+            return writer.finish()
@@ -0,0 +1,84 @@
+from collections.abc import Iterator, Mapping
+from dataclasses import fields, is_dataclass
+from json import JSONEncoder
+from typing import Any, Protocol
+
+
+# Number of chunks joined before a single write to the output
+WRITE_BATCH_SIZE = 4096
+
+
+class BinaryWriter(Protocol):
+    """Binary file-like object open for writing, e.g. a file or `CARWriter`"""
+
+    def write(self, data: bytes, /) -> int: ...
+
+
+def shallow_asdict(obj: Any) -> dict[str, Any]:
+    """Same as `dataclasses.asdict`, but doesn't copy nested values"""
+    return {f.name: getattr(obj, f.name) for f in fields(obj)}
+
+
+def _key_to_str(key: Any) -> str:
+    # Follows the conversion of dict keys made by the json module
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, float):
+        return float.__repr__(key)
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+
+
+def iterencode(obj: Any, encoder: JSONEncoder, depth: int) -> Iterator[str]:
+    """
+    Yields the JSON representation of the object in chunks, without building the whole string in memory.
+
+    Mappings, lists, tuples and dataclasses are unrolled up to `depth` levels, deeper values are encoded by the given
+    encoder at once. The joined output is identical to `encoder.encode(obj)` for encoders without indentation if
+    dataclasses are converted to dicts as with `dataclasses.asdict`.
+    """
+    if is_dataclass(obj) and not isinstance(obj, type):
+        obj = shallow_asdict(obj)
+
+    if depth <= 0 or not isinstance(obj, Mapping | list | tuple) or not obj:
+        yield encoder.encode(obj)
+        return
+
+    item_separator, key_separator = encoder.item_separator, encoder.key_separator
+
+    if isinstance(obj, Mapping):
+        items = sorted(obj.items()) if encoder.sort_keys else obj.items()
+        yield "{"
+        for i, (key, value) in enumerate(items):
+            if i:
+                yield item_separator
+            yield encoder.encode(_key_to_str(key))
+            yield key_separator
+            yield from iterencode(value, encoder, depth - 1)
+        yield "}"
+        return
+
+    yield "["
+    for i, value in enumerate(obj):
+        if i:
+            yield item_separator
+        yield from iterencode(value, encoder, depth - 1)
+    yield "]"
+
+
+def dump(obj: Any, fp: BinaryWriter, encoder: JSONEncoder, depth: int) -> None:
+    """Writes the JSON representation of the object to the binary file-like object incrementally"""
+    batch: list[str] = []
+    for chunk in iterencode(obj, encoder, depth):
+        batch.append(chunk)
+        if len(batch) >= WRITE_BATCH_SIZE:
+            fp.write("".join(batch).encode())
+            batch.clear()
+    fp.write("".join(batch).encode())
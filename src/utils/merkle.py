@@ -0,0 +1,130 @@
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from eth_abi import encode as abi_encode
+from hexbytes import HexBytes
+from oz_merkle_tree import Dump
+
+
+# Call the hashing backend directly to skip the per-call dispatch of `eth_hash.auto`, preferring the faster pysha3
+try:
+    from eth_hash.backends.pysha3 import keccak256 as keccak
+except ImportError:
+    from eth_hash.backends.pycryptodome import keccak256 as keccak
+
+
+HASH_SIZE = 32
+STANDARD_TREE_FORMAT = "standard-v1"
+
+type LeafEncoder = Callable[[Sequence[Any]], bytes]
+
+
+def _encode_uint256(value: int) -> bytes:
+    # NOTE: to_bytes raises OverflowError on negative and too big values as the ABI encoder does.
+    return int(value).to_bytes(HASH_SIZE)
+
+
+def _encode_address(value: str | bytes) -> bytes:
+    address = HexBytes(value)
+    if len(address) != 20:
+        raise ValueError(f"Invalid address {value!r}")
+    return address.rjust(HASH_SIZE, b"\0")
+
+
+def _encode_bytes(value: bytes) -> bytes:
+    padding = -len(value) % HASH_SIZE
+    return len(value).to_bytes(HASH_SIZE) + bytes(value) + bytes(padding)
+
+
+def _encode_uint256_array(value: Sequence[int]) -> bytes:
+    return len(value).to_bytes(HASH_SIZE) + b"".join(_encode_uint256(item) for item in value)
+
+
+_STATIC_ENCODERS: dict[str, Callable[[Any], bytes]] = {
+    "uint256": _encode_uint256,
+    "address": _encode_address,
+}
+
+_DYNAMIC_ENCODERS: dict[str, Callable[[Any], bytes]] = {
+    "bytes": _encode_bytes,
+    "uint256[]": _encode_uint256_array,
+}
+
+
+def make_leaf_encoder(leaf_encoding: Sequence[str]) -> LeafEncoder:
+    """
+    Returns a function to ABI-encode a leaf value as `abi.encode(...)` does.
+
+    Types used by the oracle trees are encoded directly, avoiding type resolution of the generic encoder for every
+    leaf. Any other type falls back to `eth_abi.encode`.
+    """
+    leaf_encoding = tuple(leaf_encoding)
+    if not all(t in _STATIC_ENCODERS or t in _DYNAMIC_ENCODERS for t in leaf_encoding):
+        return lambda value: abi_encode(leaf_encoding, value)
+
+    if all(t in _STATIC_ENCODERS for t in leaf_encoding):
+        static_encoders = tuple(_STATIC_ENCODERS[t] for t in leaf_encoding)
+
+        def encode_static(value: Sequence[Any]) -> bytes:
+            return b"".join(enc(item) for enc, item in zip(static_encoders, value, strict=True))
+
+        return encode_static
+
+    encoders = tuple((_DYNAMIC_ENCODERS.get(t), _STATIC_ENCODERS.get(t)) for t in leaf_encoding)
+    head_size = HASH_SIZE * len(leaf_encoding)
+
+    def encode(value: Sequence[Any]) -> bytes:
+        head: list[bytes] = []
+        tail: list[bytes] = []
+        offset = head_size
+        for (dynamic_encoder, static_encoder), item in zip(encoders, value, strict=True):
+            if dynamic_encoder is None:
+                head.append(static_encoder(item))  # type: ignore[misc]
+                continue
+            data = dynamic_encoder(item)
+            head.append(offset.to_bytes(HASH_SIZE))
+            tail.append(data)
+            offset += len(data)
+        return b"".join(head) + b"".join(tail)
+
+    return encode
+
+
+def build_standard_tree_dump[T: Sequence[Any]](values: Sequence[T], leaf_encoding: Sequence[str]) -> Dump[T]:
+    """
+    Builds a dump of the OpenZeppelin `StandardMerkleTree` of the given values.
+
+    The result is identical to `StandardMerkleTree(values, leaf_encoding).dump()`: leaves are double keccak hashes of
+    the ABI-encoded values sorted by hash, the tree is stored as a flat array with the root at index 0 and children of
+    node `i` at `2i + 1` and `2i + 2`, and inner nodes are hashes of sorted pairs. All the nodes are kept in a single
+    preallocated buffer and every layer is built by one pass over it.
+    """
+    if not values:
+        raise ValueError("Expected non-zero number of leaves")
+
+    encode = make_leaf_encoder(leaf_encoding)
+    leaves = [keccak(keccak(encode(value))) for value in values]
+    order = sorted(range(len(leaves)), key=leaves.__getitem__)
+
+    nodes_count = 2 * len(leaves) - 1
+    tree = bytearray(nodes_count * HASH_SIZE)
+    tree_indexes = [0] * len(values)
+    for leaf_position, value_index in enumerate(order):
+        tree_index = nodes_count - 1 - leaf_position
+        tree[tree_index * HASH_SIZE : (tree_index + 1) * HASH_SIZE] = leaves[value_index]
+        tree_indexes[value_index] = tree_index
+
+    view = memoryview(tree)
+    for i in range(nodes_count - len(leaves) - 1, -1, -1):
+        left = bytes(view[(2 * i + 1) * HASH_SIZE : (2 * i + 2) * HASH_SIZE])
+        right = bytes(view[(2 * i + 2) * HASH_SIZE : (2 * i + 3) * HASH_SIZE])
+        view[i * HASH_SIZE : (i + 1) * HASH_SIZE] = keccak(left + right if left <= right else right + left)
+
+    return {
+        "format": STANDARD_TREE_FORMAT,
+        "leafEncoding": list(leaf_encoding),
+        "tree": ["0x" + tree[i : i + HASH_SIZE].hex() for i in range(0, len(tree), HASH_SIZE)],
+        "values": [
+            {"value": value, "treeIndex": tree_index} for value, tree_index in zip(values, tree_indexes, strict=True)
+        ],
+    }  # type: ignore[return-value]
@@ -0,0 +1,85 @@
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+
+class IndexedPriorityQueue[T: Hashable]:
+    """
+    Binary min-heap of unique items with a position index, so the key of any item can be increased, decreased or
+    removed in O(log n) instead of rebuilding the heap. Keys are compared only with each other, items never are.
+    """
+
+    def __init__(self, items: Iterable[tuple[T, Any]] = ()):
+        self._heap: list[tuple[Any, T]] = [(key, item) for item, key in items]
+        self._heap.sort(key=lambda entry: entry[0])
+        self._positions: dict[T, int] = {item: i for i, (_, item) in enumerate(self._heap)}
+        if len(self._positions) != len(self._heap):
+            raise ValueError('Items in the priority queue must be unique.')
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._positions
+
+    def peek(self) -> tuple[T, Any]:
+        """Returns the item with the lowest key and the key. Raises IndexError if the queue is empty."""
+        key, item = self._heap[0]
+        return item, key
+
+    def pop(self) -> tuple[T, Any]:
+        item, key = self.peek()
+        self.remove(item)
+        return item, key
+
+    def push(self, item: T, key: Any) -> None:
+        """Adds the item to the queue or changes the key of the item already in the queue."""
+        position = self._positions.get(item)
+        if position is None:
+            self._heap.append((key, item))
+            self._positions[item] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return
+
+        previous_key = self._heap[position][0]
+        self._heap[position] = (key, item)
+        if key < previous_key:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def remove(self, item: T) -> None:
+        """Removes the item from the queue. Raises KeyError if the item is not in the queue."""
+        position = self._positions.pop(item)
+        last = self._heap.pop()
+        if position == len(self._heap):
+            return
+
+        self._heap[position] = last
+        self._positions[last[1]] = position
+        self._sift_up(position)
+        self._sift_down(self._positions[last[1]])
+
+    def _swap(self, i: int, j: int) -> None:
+        self._heap[i], self._heap[j] = self._heap[j], self._heap[i]
+        self._positions[self._heap[i][1]] = i
+        self._positions[self._heap[j][1]] = j
+
+    def _sift_up(self, position: int) -> None:
+        while position > 0:
+            parent = (position - 1) // 2
+            if not self._heap[position][0] < self._heap[parent][0]:
+                return
+            self._swap(position, parent)
+            position = parent
+
+    def _sift_down(self, position: int) -> None:
+        size = len(self._heap)
+        while True:
+            smallest = position
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < size and self._heap[child][0] < self._heap[smallest][0]:
+                    smallest = child
+            if smallest == position:
+                return
+            self._swap(position, smallest)
+            position = smallest
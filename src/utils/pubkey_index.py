@@ -0,0 +1,153 @@
+import logging
+import threading
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from functools import cache
+from pathlib import Path
+
+from src import variables
+from src.providers.consensus.types import Validator
+from src.types import ValidatorIndex
+
+
+logger = logging.getLogger(__name__)
+
+PUBKEY_LENGTH = 48
+# Number of slots in the hash table of an empty index, must be a power of 2
+MIN_SLOTS = 1024
+
+
+class PubkeyIndex:
+    """
+    Map of validator pubkeys to validator indexes.
+
+    Validators are never removed from the registry and their indexes never change, so the map is append-only and
+    `update` adds only the validators appended to the registry since the previous update. The map is valid for any
+    state of the same chain: an index is valid for a state if it is below the number of validators in the state.
+
+    Pubkeys are stored raw in a single buffer ordered by validator index, with an open addressing hash table of
+    indexes over the buffer. It takes ~56 bytes per validator, a quarter of a dict owning hex string keys.
+    If `path` is given, pubkeys are appended to the file as well, so a restart doesn't need the whole registry to be
+    indexed again.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pubkeys = bytearray()
+        self._slots = array('I', bytes(4 * MIN_SLOTS))
+
+        if path is not None and path.exists():
+            data = path.read_bytes()
+            # Drop the tail of an interrupted write
+            self._pubkeys = bytearray(data[: len(data) - len(data) % PUBKEY_LENGTH])
+            self._rebuild_slots()
+
+    def __len__(self) -> int:
+        return len(self._pubkeys) // PUBKEY_LENGTH
+
+    def get(self, pubkey: str) -> ValidatorIndex | None:
+        """Returns the index of the validator with the given hex pubkey, or None if there is no such validator."""
+        return self.get_many([pubkey])[0]
+
+    def get_many(self, pubkeys: Iterable[str]) -> list[ValidatorIndex | None]:
+        slots, mask, buffer = self._slots, len(self._slots) - 1, self._pubkeys
+        indexes: list[ValidatorIndex | None] = []
+
+        for pubkey in pubkeys:
+            key = _to_bytes(pubkey)
+            index = None
+            if key is not None:
+                slot = hash(key) & mask
+                while value := slots[slot]:
+                    start = (value - 1) * PUBKEY_LENGTH
+                    if buffer[start : start + PUBKEY_LENGTH] == key:
+                        index = ValidatorIndex(value - 1)
+                        break
+                    slot = (slot + 1) & mask
+            indexes.append(index)
+
+        return indexes
+
+    def update(self, validators: Sequence[Validator] | Mapping[int, Validator]) -> None:
+        """
+        Indexes the validators appended to the registry since the previous update.
+        `validators` is the whole registry of a state, ordered by validator index.
+        """
+        with self._lock:
+            if not self._is_consistent_with(validators):
+                logger.warning({"msg": "Pubkey index doesn't match the validators registry, rebuilding it."})
+                self._pubkeys = bytearray()
+                self._rebuild_slots()
+                if self.path is not None:
+                    self.path.unlink(missing_ok=True)
+
+            known = len(self)
+            if known >= len(validators):
+                return
+
+            appended = b''.join(_to_raw_pubkey(validators[index]) for index in range(known, len(validators)))
+            self._pubkeys += appended
+            if 2 * len(self) > len(self._slots):
+                self._rebuild_slots()
+            else:
+                self._insert_slots(known)
+
+            if self.path is not None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open('ab') as f:
+                    f.write(appended)
+
+        logger.info({"msg": "Pubkey index updated.", "appended": len(self) - known, "total": len(self)})
+
+    def _is_consistent_with(self, validators: Sequence[Validator] | Mapping[int, Validator]) -> bool:
+        """Checks the first and the last validators known both to the index and the registry"""
+        common = min(len(self), len(validators))
+        if not common:
+            return True
+        return all(
+            self._pubkeys[index * PUBKEY_LENGTH : (index + 1) * PUBKEY_LENGTH] == _to_raw_pubkey(validators[index])
+            for index in {0, common - 1}
+        )
+
+    def _insert_slots(self, start: int) -> None:
+        """Adds the pubkeys from `start` index to the end of the buffer to the hash table"""
+        slots, mask = self._slots, len(self._slots) - 1
+        with memoryview(self._pubkeys) as buffer:
+            for offset in range(start * PUBKEY_LENGTH, len(buffer), PUBKEY_LENGTH):
+                slot = hash(buffer[offset : offset + PUBKEY_LENGTH].tobytes()) & mask
+                while slots[slot]:
+                    slot = (slot + 1) & mask
+                slots[slot] = offset // PUBKEY_LENGTH + 1
+
+    def _rebuild_slots(self) -> None:
+        size = MIN_SLOTS
+        while size < 2 * len(self):
+            size *= 2
+        self._slots = array('I', bytes(4 * size))
+        self._insert_slots(0)
+
+
+def _to_bytes(pubkey: str) -> bytes | None:
+    try:
+        key = bytes.fromhex(pubkey.removeprefix('0x'))
+    except ValueError:
+        return None
+    return key if len(key) == PUBKEY_LENGTH else None
+
+
+def _to_raw_pubkey(validator: Validator) -> bytes:
+    key = _to_bytes(validator.validator.pubkey)
+    if key is None:
+        raise ValueError(f'Unexpected validator pubkey {validator.validator.pubkey}.')
+    return key
+
+
+@cache
+def get_pubkey_index() -> PubkeyIndex | None:
+    """
+    Pubkey index shared by all modules of the process. None if `PUBKEY_INDEX_PATH` is not set: the index stays in
+    memory for the whole process lifetime, so it pays off only if it saves indexing the registry again on restart.
+    """
+    path = variables.PUBKEY_INDEX_PATH
+    return PubkeyIndex(Path(path)) if path else None
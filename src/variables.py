@@ -38,6 +38,22 @@ DELEGATION_CONTRACT_ADDRESS: Final = os.getenv('DELEGATION_CONTRACT_ADDRESS', ''
 STAKING_MODULE_ADDRESS: Final = os.getenv('STAKING_MODULE_ADDRESS')
 FINALIZATION_BATCH_MAX_REQUEST_COUNT: Final = int(os.getenv('FINALIZATION_BATCH_MAX_REQUEST_COUNT', 1000))
 EL_REQUESTS_BATCH_SIZE: Final = int(os.getenv('EL_REQUESTS_BATCH_SIZE', 500))
+# SQLite file to cache results of contract calls pinned to a block hash. Disabled if empty
+EL_CALL_CACHE_PATH: Final = os.getenv('EL_CALL_CACHE_PATH', '')
+EL_CALL_CACHE_MAX_SIZE_MB: Final = int(os.getenv('EL_CALL_CACHE_MAX_SIZE_MB', 256))
+# SQLite file to cache results of deposit signature verification. Results are kept in memory only if empty
+DEPOSIT_SIGNATURE_CACHE_PATH: Final = os.getenv('DEPOSIT_SIGNATURE_CACHE_PATH', '')
+# Number of processes verifying deposit signatures missed in the cache. Up to 4 CPUs available to the process by default
+DEPOSIT_SIGNATURE_VERIFICATION_WORKERS: Final = int(
+    os.getenv('DEPOSIT_SIGNATURE_VERIFICATION_WORKERS', min(os.process_cpu_count() or 1, 4))
+)
+# File to keep validator pubkeys between restarts, so the pubkey index is built from the whole registry only once.
+# Disabled if empty: pubkeys are matched with a dict built per call
+PUBKEY_INDEX_PATH: Final = os.getenv('PUBKEY_INDEX_PATH', '')
+# SQLite file to keep used keys between cycles, so only the changed modules are fetched from KAPI. Disabled if empty
+KEYS_API_STORE_PATH: Final = os.getenv('KEYS_API_STORE_PATH', '')
+# Multicall3 is deployed at the same address on all supported chains
+MULTICALL3_ADDRESS: Final = os.getenv('MULTICALL3_ADDRESS', '0xcA11bde05977b3631167028862bE2a173976CA11')
 
 # We add some gas to the transaction to be sure that we have enough gas to execute corner cases
 # eg when we tried to submit a few reports in a single block
@@ -81,6 +97,20 @@ HTTP_REQUEST_RETRY_COUNT_PERFORMANCE: Final = int(os.getenv('HTTP_REQUEST_RETRY_
 HTTP_REQUEST_SLEEP_BEFORE_RETRY_IN_SECONDS_PERFORMANCE: Final = int(
     os.getenv('HTTP_REQUEST_SLEEP_BEFORE_RETRY_IN_SECONDS_PERFORMANCE', 2)
 )
+# Request performance data of the staking module validators only. Requires a performance API with `POST /v1/epochs`
+PERFORMANCE_ORACLE_FILTER_MODULE_VALIDATORS: Final = (
+    os.getenv('PERFORMANCE_ORACLE_FILTER_MODULE_VALIDATORS', 'False').lower() == 'true'
+)
+# Directory to persist the frame duties aggregated in advance during idle cycles. Disabled if empty
+PERFORMANCE_ORACLE_STATE_DIR: Final = os.getenv('PERFORMANCE_ORACLE_STATE_DIR', '')
+PERFORMANCE_ORACLE_MAX_FRAMES_CONCURRENCY: Final = max(
+    1, int(os.getenv('PERFORMANCE_ORACLE_MAX_FRAMES_CONCURRENCY', 2))
+)
+PERFORMANCE_CLIENT_MAX_CONCURRENCY: Final = max(1, min(32, int(os.getenv('PERFORMANCE_CLIENT_MAX_CONCURRENCY', 4))))
+PERFORMANCE_CLIENT_MAX_EPOCHS_BATCH_SIZE: Final = int(os.getenv('PERFORMANCE_CLIENT_MAX_EPOCHS_BATCH_SIZE', 1000))
+PERFORMANCE_CLIENT_TARGET_BATCH_SECONDS: Final = float(os.getenv('PERFORMANCE_CLIENT_TARGET_BATCH_SECONDS', 5))
+# Directory to cache finalized epochs duties received from the performance API. Disabled if empty
+PERFORMANCE_CLIENT_CACHE_DIR: Final = os.getenv('PERFORMANCE_CLIENT_CACHE_DIR', '')
 
 HTTP_REQUEST_TIMEOUT_KEYS_API: Final = int(os.getenv('HTTP_REQUEST_TIMEOUT_KEYS_API', 120))
 HTTP_REQUEST_RETRY_COUNT_KEYS_API: Final = int(os.getenv('HTTP_REQUEST_RETRY_COUNT_KEYS_API', 5))
@@ -91,6 +121,14 @@ HTTP_REQUEST_SLEEP_BEFORE_RETRY_IN_SECONDS_KEYS_API: Final = int(
 HTTP_REQUEST_TIMEOUT_IPFS: Final = int(os.getenv('HTTP_REQUEST_TIMEOUT_IPFS', 15))
 HTTP_REQUEST_RETRY_COUNT_IPFS: Final = int(os.getenv('HTTP_REQUEST_RETRY_COUNT_IPFS', 3))
 IPFS_VALIDATE_CID: Final[bool] = os.getenv('IPFS_VALIDATE_CID', 'True').lower() == 'true'
+# Fetch from the next IPFS provider if the current one is slower than usual, instead of waiting for its timeout
+IPFS_HEDGED_FETCH: Final[bool] = os.getenv('IPFS_HEDGED_FETCH', 'False').lower() == 'true'
+IPFS_HEDGE_DELAY_SECONDS: Final = float(os.getenv('IPFS_HEDGE_DELAY_SECONDS', 2))
+# Return from IPFS publishing once the majority of providers agree on the CID, the rest of uploads finish in background
+IPFS_PUBLISH_EARLY_QUORUM: Final[bool] = os.getenv('IPFS_PUBLISH_EARLY_QUORUM', 'True').lower() == 'true'
+# Directory to cache content fetched from IPFS by CID. Disabled if empty
+IPFS_CACHE_PATH: Final = os.getenv('IPFS_CACHE_PATH', '')
+IPFS_CACHE_MAX_SIZE_MB: Final = int(os.getenv('IPFS_CACHE_MAX_SIZE_MB', 512))
 
 # - Metrics -
 PROMETHEUS_PORT: Final = int(os.getenv('PROMETHEUS_PORT', 9000))
@@ -119,6 +157,8 @@ PERFORMANCE_WEB_SERVER_LIMIT_MAX_REQUESTS: Final = (
     int(os.getenv('PERFORMANCE_WEB_SERVER_LIMIT_MAX_REQUESTS', 0)) or None
 )
 PERFORMANCE_WEB_SERVER_LIMIT_CONCURRENCY: Final = int(os.getenv('PERFORMANCE_WEB_SERVER_LIMIT_CONCURRENCY', 0)) or None
+# Responses smaller than this are sent uncompressed even if the client accepts zstd or gzip.
+PERFORMANCE_WEB_SERVER_COMPRESSION_MIN_SIZE: Final = int(os.getenv('PERFORMANCE_WEB_SERVER_COMPRESSION_MIN_SIZE', 1024))
 
 PERFORMANCE_COLLECTOR_MAX_CONCURRENCY: Final = min(32, int(os.getenv('PERFORMANCE_COLLECTOR_MAX_CONCURRENCY', 2)))
 PERFORMANCE_COLLECTOR_DB_CONNECTION_TIMEOUT: Final = int(os.getenv('PERFORMANCE_COLLECTOR_DB_CONNECTION_TIMEOUT', 30))
@@ -218,6 +258,13 @@ PUBLIC_ENV_VARS = {
         'STAKING_MODULE_ADDRESS': STAKING_MODULE_ADDRESS,
         'FINALIZATION_BATCH_MAX_REQUEST_COUNT': FINALIZATION_BATCH_MAX_REQUEST_COUNT,
         'EL_REQUESTS_BATCH_SIZE': EL_REQUESTS_BATCH_SIZE,
+        'EL_CALL_CACHE_PATH': EL_CALL_CACHE_PATH or 'Disabled',
+        'EL_CALL_CACHE_MAX_SIZE_MB': EL_CALL_CACHE_MAX_SIZE_MB,
+        'DEPOSIT_SIGNATURE_CACHE_PATH': DEPOSIT_SIGNATURE_CACHE_PATH or 'In memory',
+        'DEPOSIT_SIGNATURE_VERIFICATION_WORKERS': DEPOSIT_SIGNATURE_VERIFICATION_WORKERS,
+        'PUBKEY_INDEX_PATH': PUBKEY_INDEX_PATH or 'Disabled',
+        'KEYS_API_STORE_PATH': KEYS_API_STORE_PATH or 'Disabled',
+        'MULTICALL3_ADDRESS': MULTICALL3_ADDRESS,
         'TX_GAS_ADDITION': TX_GAS_ADDITION,
         'EVENTS_SEARCH_STEP': EVENTS_SEARCH_STEP,
         'MIN_PRIORITY_FEE': MIN_PRIORITY_FEE,
@@ -237,6 +284,11 @@ PUBLIC_ENV_VARS = {
         'HTTP_REQUEST_TIMEOUT_IPFS': HTTP_REQUEST_TIMEOUT_IPFS,
         'HTTP_REQUEST_RETRY_COUNT_IPFS': HTTP_REQUEST_RETRY_COUNT_IPFS,
         'IPFS_VALIDATE_CID': IPFS_VALIDATE_CID,
+        'IPFS_HEDGED_FETCH': IPFS_HEDGED_FETCH,
+        'IPFS_HEDGE_DELAY_SECONDS': IPFS_HEDGE_DELAY_SECONDS,
+        'IPFS_PUBLISH_EARLY_QUORUM': IPFS_PUBLISH_EARLY_QUORUM,
+        'IPFS_CACHE_PATH': IPFS_CACHE_PATH or 'Disabled',
+        'IPFS_CACHE_MAX_SIZE_MB': IPFS_CACHE_MAX_SIZE_MB,
         'PROMETHEUS_PORT': PROMETHEUS_PORT,
         'PROMETHEUS_PREFIX': PROMETHEUS_PREFIX,
         'HEALTHCHECK_SERVER_PORT': HEALTHCHECK_SERVER_PORT,
@@ -250,6 +302,7 @@ PUBLIC_ENV_VARS = {
         'PERFORMANCE_WEB_SERVER_WORKERS': PERFORMANCE_WEB_SERVER_WORKERS,
         'PERFORMANCE_WEB_SERVER_LIMIT_MAX_REQUESTS': PERFORMANCE_WEB_SERVER_LIMIT_MAX_REQUESTS,
         'PERFORMANCE_WEB_SERVER_LIMIT_CONCURRENCY': PERFORMANCE_WEB_SERVER_LIMIT_CONCURRENCY,
+        'PERFORMANCE_WEB_SERVER_COMPRESSION_MIN_SIZE': PERFORMANCE_WEB_SERVER_COMPRESSION_MIN_SIZE,
         'PERFORMANCE_COLLECTOR_MAX_CONCURRENCY': PERFORMANCE_COLLECTOR_MAX_CONCURRENCY,
         'PERFORMANCE_COLLECTOR_DB_CONNECTION_TIMEOUT': PERFORMANCE_COLLECTOR_DB_CONNECTION_TIMEOUT,
         'PERFORMANCE_COLLECTOR_EPOCHS_BATCH_SIZE': PERFORMANCE_COLLECTOR_EPOCHS_BATCH_SIZE,
@@ -265,6 +318,13 @@ PUBLIC_ENV_VARS = {
         'HTTP_REQUEST_SLEEP_BEFORE_RETRY_IN_SECONDS_PERFORMANCE': (
             HTTP_REQUEST_SLEEP_BEFORE_RETRY_IN_SECONDS_PERFORMANCE
         ),
+        'PERFORMANCE_ORACLE_FILTER_MODULE_VALIDATORS': PERFORMANCE_ORACLE_FILTER_MODULE_VALIDATORS,
+        'PERFORMANCE_ORACLE_STATE_DIR': PERFORMANCE_ORACLE_STATE_DIR or 'Disabled',
+        'PERFORMANCE_ORACLE_MAX_FRAMES_CONCURRENCY': PERFORMANCE_ORACLE_MAX_FRAMES_CONCURRENCY,
+        'PERFORMANCE_CLIENT_MAX_CONCURRENCY': PERFORMANCE_CLIENT_MAX_CONCURRENCY,
+        'PERFORMANCE_CLIENT_MAX_EPOCHS_BATCH_SIZE': PERFORMANCE_CLIENT_MAX_EPOCHS_BATCH_SIZE,
+        'PERFORMANCE_CLIENT_TARGET_BATCH_SECONDS': PERFORMANCE_CLIENT_TARGET_BATCH_SECONDS,
+        'PERFORMANCE_CLIENT_CACHE_DIR': PERFORMANCE_CLIENT_CACHE_DIR,
         'MAX_CYCLE_LIFETIME_IN_SECONDS': MAX_CYCLE_LIFETIME_IN_SECONDS,
         'VAULT_PAGINATION_LIMIT': VAULT_PAGINATION_LIMIT,
         'VAULT_VALIDATOR_STATUSES_BATCH_SIZE': VAULT_VALIDATOR_STATUSES_BATCH_SIZE,
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+from hexbytes import HexBytes
+from web3.types import BlockIdentifier, TxParams
+
+from src.metrics.prometheus.basic import EL_CALL_CACHE_REQUESTS, EL_CALL_CACHE_SIZE
+
+
+logger = logging.getLogger(__name__)
+
+
+class ContractCallCache:
+    """
+    Disk cache of `eth_call` return data for calls pinned to a block hash.
+
+    The state at a given block hash never changes, so an entry never expires and is only evicted, oldest first,
+    when the total size of the stored return data exceeds `max_size` bytes. Calls with a block number or a relative
+    tag such as `latest` are never cached, since the block behind them may change with a reorg or a new head.
+    """
+
+    # Fraction of `max_size` to keep after eviction, so eviction does not run on every insert
+    EVICTION_TARGET = 0.9
+
+    def __init__(self, path: Path, max_size: int):
+        self.path = path
+        self.max_size = max_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS calls (key BLOB PRIMARY KEY, result BLOB NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM calls").fetchone()[0]
+        EL_CALL_CACHE_SIZE.set(self._size)
+
+    @staticmethod
+    def key(transaction: TxParams, block_identifier: BlockIdentifier | None) -> bytes | None:
+        """Returns the cache key of the call, or None if the call is not pinned to a block hash"""
+        is_hex_str = isinstance(block_identifier, str) and block_identifier.startswith("0x")
+        if not (is_hex_str or isinstance(block_identifier, bytes)):
+            return None
+        block_hash = HexBytes(block_identifier)  # type: ignore[arg-type]
+        if len(block_hash) != 32:
+            return None
+
+        payload = json.dumps(dict(transaction), sort_keys=True, default=str)
+        return hashlib.blake2b(block_hash + payload.encode(), digest_size=32).digest()
+
+    def get(self, key: bytes) -> bytes | None:
+        with self._lock:
+            row = self._db.execute("SELECT result FROM calls WHERE key = ?", (key,)).fetchone()
+        EL_CALL_CACHE_REQUESTS.labels(result="hit" if row else "miss").inc()
+        return row[0] if row else None
+
+    def put(self, key: bytes, result: bytes) -> None:
+        size = len(key) + len(result)
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO calls (key, result, size) VALUES (?, ?, ?)", (key, bytes(result), size)
+            )
+            self._size += size * cursor.rowcount
+            if self._size > self.max_size:
+                self._evict()
+            EL_CALL_CACHE_SIZE.set(self._size)
+
+    def _evict(self) -> None:
+        target = self.max_size * self.EVICTION_TARGET
+        evicted, last_rowid = 0, 0
+        for rowid, size in self._db.execute("SELECT rowid, size FROM calls ORDER BY rowid"):
+            if self._size <= target:
+                break
+            self._size -= size
+            evicted, last_rowid = evicted + 1, rowid
+        self._db.execute("DELETE FROM calls WHERE rowid <= ?", (last_rowid,))
+        logger.info({"msg": "Evicted contract calls from the cache.", "evicted": evicted, "size": self._size})
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
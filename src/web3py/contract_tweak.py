@@ -1,6 +1,7 @@
 import itertools
-from collections.abc import Callable
-from typing import Any
+import logging
+from collections.abc import Callable, Iterator
+from typing import Any, Self
 
 from eth_abi.exceptions import DecodingError
 from eth_typing import (
@@ -11,6 +12,7 @@ from eth_typing import (
 from eth_utils.abi import (
     get_abi_output_types,
 )
+from hexbytes import HexBytes
 from web3 import Web3
 from web3._utils.abi import (
     map_abi_data,
@@ -31,6 +33,12 @@ from web3.types import (
 )
 from web3.utils import get_abi_element
 
+from src.variables import EL_REQUESTS_BATCH_SIZE, MULTICALL3_ADDRESS
+from src.web3py.call_cache import ContractCallCache
+
+
+logger = logging.getLogger(__name__)
+
 
 def call_contract_function(  # pylint: disable=keyword-arg-before-vararg,too-many-positional-arguments
     w3: Web3,
@@ -62,12 +70,21 @@ def call_contract_function(  # pylint: disable=keyword-arg-before-vararg,too-man
         fn_kwargs=kwargs,
     )
 
-    return_data = w3.eth.call(
-        call_transaction,
-        block_identifier=block_id,
-        state_override=state_override,
-        ccip_read_enabled=ccip_read_enabled,
-    )
+    call_cache: ContractCallCache | None = getattr(w3, "contract_call_cache", None)
+    cache_key = None
+    if call_cache and not (state_override or ccip_read_enabled):
+        cache_key = call_cache.key(call_transaction, block_id)
+
+    return_data = call_cache.get(cache_key) if call_cache and cache_key else None
+    if return_data is None:
+        return_data = w3.eth.call(
+            call_transaction,
+            block_identifier=block_id,
+            state_override=state_override,
+            ccip_read_enabled=ccip_read_enabled,
+        )
+        if call_cache and cache_key and return_data:
+            call_cache.put(cache_key, return_data)
 
     if fn_abi is None:
         fn_abi = get_abi_element(
@@ -78,6 +95,21 @@ def call_contract_function(  # pylint: disable=keyword-arg-before-vararg,too-man
             **kwargs,
         )
 
+    return decode_contract_call_return_data(
+        w3, address, normalizers, function_identifier, fn_abi, decode_tuples, return_data
+    )
+
+
+def decode_contract_call_return_data(  # pylint: disable=too-many-positional-arguments
+    w3: Web3,
+    address: ChecksumAddress,
+    normalizers: tuple[Callable[..., Any], ...],
+    function_identifier: ABIElementIdentifier,
+    fn_abi: ABIFunction,
+    decode_tuples: bool | None,
+    return_data: bytes,
+) -> Any:
+    """Decodes and normalizes the raw `eth_call` return data of the contract function"""
     output_types = get_abi_output_types(fn_abi)
 
     try:
@@ -160,7 +192,134 @@ class Contract(_Contract):
         self.functions = ContractFunctions(self.abi, self.w3, self.address, decode_tuples=self.decode_tuples)
 
 
-def tweak_w3_contracts(w3: Web3):
+MULTICALL3_ABI: ABI = [
+    {
+        "type": "function",
+        "name": "aggregate3",
+        "stateMutability": "payable",
+        "inputs": [
+            {
+                "name": "calls",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+            }
+        ],
+        "outputs": [
+            {
+                "name": "returnData",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+            }
+        ],
+    }
+]
+
+# Keeps a single aggregate3 request well below the default eth_call gas cap and the request body limits of EL nodes
+MULTICALL_MAX_CALLDATA_SIZE = 128 * 1024
+
+
+class BatchReads:
+    """
+    Collects view calls and executes them via Multicall3 `aggregate3` at the same block.
+
+    with BatchReads(w3, block_hash) as reads:
+        for no_id in node_operator_ids:
+            reads.add(contract.functions.getBondCurveId(no_id))
+        curve_ids = reads.execute()
+
+    Calls are packed into chunks of at most `max_calls` calls and `MULTICALL_MAX_CALLDATA_SIZE` bytes of calldata.
+    Reverted calls are repeated individually so the caller gets the same error as without batching.
+    If Multicall3 is not available, the whole chunk falls back to individual calls.
+    """
+
+    def __init__(
+        self,
+        w3: Web3,
+        block_identifier: BlockIdentifier,
+        max_calls: int = EL_REQUESTS_BATCH_SIZE,
+        multicall_address: str = MULTICALL3_ADDRESS,
+    ) -> None:
+        self.w3 = w3
+        self.block_identifier = block_identifier
+        self.max_calls = max_calls
+        self.multicall = w3.eth.contract(address=Web3.to_checksum_address(multicall_address), abi=MULTICALL3_ABI)
+        self._calls: list[tuple[_ContractFunction, bytes]] = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._calls.clear()
+
+    def add(self, function: _ContractFunction) -> None:
+        self._calls.append((function, HexBytes(function._encode_transaction_data())))  # pylint: disable=protected-access
+
+    def execute(self) -> list[Any]:
+        """Returns decoded results in the order the calls were added"""
+        results: list[Any] = []
+        for chunk in self._chunks():
+            results.extend(self._aggregate(chunk))
+        self._calls.clear()
+        return results
+
+    def _chunks(self) -> Iterator[list[tuple[_ContractFunction, bytes]]]:
+        chunk: list[tuple[_ContractFunction, bytes]] = []
+        chunk_size = 0
+        for call in self._calls:
+            if chunk and (len(chunk) >= self.max_calls or chunk_size + len(call[1]) > MULTICALL_MAX_CALLDATA_SIZE):
+                yield chunk
+                chunk, chunk_size = [], 0
+            chunk.append(call)
+            chunk_size += len(call[1])
+        if chunk:
+            yield chunk
+
+    def _aggregate(self, chunk: list[tuple[_ContractFunction, bytes]]) -> list[Any]:
+        try:
+            response = self.multicall.functions.aggregate3(
+                [(function.address, True, calldata) for function, calldata in chunk]
+            ).call(block_identifier=self.block_identifier)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning(
+                {
+                    "msg": "Multicall3 request failed, falling back to individual calls.",
+                    "calls": len(chunk),
+                    "error": str(e),
+                }
+            )
+            return [function.call(block_identifier=self.block_identifier) for function, _ in chunk]
+
+        results = []
+        for (function, _), (success, return_data) in zip(chunk, response, strict=True):
+            if success:
+                try:
+                    results.append(
+                        decode_contract_call_return_data(
+                            self.w3,
+                            function.address,
+                            function._return_data_normalizers or (),  # pylint: disable=protected-access
+                            function.abi_element_identifier,
+                            function.abi,
+                            function.decode_tuples,
+                            return_data,
+                        )
+                    )
+                    continue
+                except BadFunctionCallOutput:
+                    pass
+            # Repeat the call individually to raise the original error
+            results.append(function.call(block_identifier=self.block_identifier))
+        return results
+
+
+def tweak_w3_contracts(w3: Web3, call_cache: ContractCallCache | None = None):
     """
     Normal call to contract's method with blockhash would parse blockhash into block_number.
     Remove parse_block_identifier(self.w3, block_identifier) from ContractFunction and setup new ContractFactory
@@ -169,5 +328,8 @@ def tweak_w3_contracts(w3: Web3):
     Here are two tweaks:
     1. https://github.com/ethereum/web3.py/issues/2816
     2. https://github.com/ethereum/web3.py/issues/2865
+
+    If `call_cache` is provided, results of the calls pinned to a block hash are served from it.
     """
     w3.eth._default_contract_factory = Contract  # pylint: disable=protected-access
+    w3.contract_call_cache = call_cache  # type: ignore[attr-defined]
@@ -1,17 +1,23 @@
 import logging
 import random
-from collections import Counter
-from collections.abc import Iterable
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import asdict, dataclass
-from functools import wraps
+import statistics
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Collection, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import asdict, dataclass, field
+from functools import partial, wraps
 
 from web3 import Web3
 from web3.module import Module
 
+from src.metrics.prometheus.basic import IPFS_PROVIDER_ERROR_RATE, IPFS_PROVIDER_LATENCY, IPFS_UPLOADS
+from src.providers.ipfs.cache import IPFSCache
 from src.providers.ipfs.cid import CID
 from src.providers.ipfs.types import IPFSError, IPFSProvider
 from src.types import FrameNumber
+from src.utils.car import CARConverter, CARFile
 
 
 logger = logging.getLogger(__name__)
@@ -23,10 +29,48 @@ class SuccessfulUpload:
     cid: str
 
 
+@dataclass
+class ProviderStats:
+    """Fetch latency and error rate of an IPFS provider"""
+
+    # Weight of the latest observation in the moving averages
+    ALPHA = 0.3
+    # Number of the latest latencies to compute the hedge delay from
+    WINDOW = 50
+
+    latency: float | None = None
+    error_rate: float = 0.0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=ProviderStats.WINDOW))
+
+    def observe(self, latency: float | None) -> None:
+        """Records a fetch, `latency` is None for a failed one"""
+        self.error_rate += self.ALPHA * ((latency is None) - self.error_rate)
+        if latency is None:
+            return
+        self.latencies.append(latency)
+        self.latency = latency if self.latency is None else self.latency + self.ALPHA * (latency - self.latency)
+
+    @property
+    def expected_latency(self) -> float:
+        """Latency adjusted by the chance of a failure, infinite for a provider never succeeded"""
+        if self.latency is None:
+            return float("inf")
+        return self.latency / max(1 - self.error_rate, 0.1)
+
+    def latency_percentile(self, percentile: int) -> float | None:
+        if len(self.latencies) < 2:
+            return self.latency
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[percentile - 1]
+
+
 class MaxRetryError(IPFSError):
     pass
 
 
+class FetchAbandonedError(IPFSError):
+    pass
+
+
 class NoMoreProvidersError(IPFSError):
     pass
 
@@ -40,9 +84,26 @@ class IPFS(Module):
 
     w3: Web3
 
-    def __init__(self, w3: Web3, providers: Iterable[IPFSProvider], *, retries: int = 3) -> None:
+    # Percentile of the provider latency to wait for before fetching from the next provider
+    HEDGE_PERCENTILE = 95
+
+    def __init__(
+        self,
+        w3: Web3,
+        providers: Iterable[IPFSProvider],
+        *,
+        retries: int = 3,
+        cache: IPFSCache | None = None,
+        hedged: bool = False,
+        hedge_delay: float = 2.0,
+        early_quorum: bool = False,
+    ) -> None:
         super().__init__(w3)
         self.retries = retries
+        self.cache = cache
+        self.hedged = hedged
+        self.hedge_delay = hedge_delay
+        self.early_quorum = early_quorum
 
         self.current_provider_index: int = 0
         self.last_working_provider_index: int = 0
@@ -60,6 +121,13 @@ class IPFS(Module):
         for p in self.providers:
             assert isinstance(p, IPFSProvider)
 
+        self.car_converter = CARConverter()
+        self.stats = {id(p): ProviderStats() for p in self.providers}
+        self._stats_lock = threading.Lock()
+
+        # Uploads left to finish in background after the early quorum
+        self.background_uploads: set[Future[CID]] = set()
+
     @staticmethod
     def with_fallback(fn):
         @wraps(fn)
@@ -108,9 +176,25 @@ class IPFS(Module):
             self.current_provider_index = provider_rotation_frame % len(self.providers)
             self.last_working_provider_index = self.current_provider_index
 
+    def fetch(self, cid: CID, provider_rotation_frame: FrameNumber) -> bytes:
+        if self.cache is not None:
+            content = self.cache.get(cid)
+            if content is not None:
+                logger.info({"msg": "Fetched content from the IPFS cache", "cid": str(cid)})
+                return content
+
+        if self.hedged:
+            content = self._hedged_fetch(cid, provider_rotation_frame)
+        else:
+            content = self._fetch_from_provider(cid, provider_rotation_frame)
+
+        if self.cache is not None:
+            self.cache.put(cid, content)
+        return content
+
     @with_fallback
     @retry
-    def fetch(self, cid: CID, provider_rotation_frame: FrameNumber) -> bytes:
+    def _fetch_from_provider(self, cid: CID, provider_rotation_frame: FrameNumber) -> bytes:
         self._set_provider_for_frame(provider_rotation_frame)
         logger.info(
             {
@@ -123,9 +207,114 @@ class IPFS(Module):
         )
         return self.provider.fetch(cid)
 
+    def _hedged_order(self, provider_rotation_frame: FrameNumber) -> list[IPFSProvider]:
+        # Providers without history keep the rotation order of the frame to spread the load among oracles
+        offset = provider_rotation_frame % len(self.providers)
+        rotated = self.providers[offset:] + self.providers[:offset]
+        with self._stats_lock:
+            return sorted(rotated, key=lambda p: self.stats[id(p)].expected_latency)
+
+    def _hedge_delay(self, provider: IPFSProvider) -> float:
+        with self._stats_lock:
+            delay = self.stats[id(provider)].latency_percentile(self.HEDGE_PERCENTILE)
+        return self.hedge_delay if delay is None else delay
+
+    def _observe(self, provider: IPFSProvider, latency: float | None) -> None:
+        with self._stats_lock:
+            stats = self.stats[id(provider)]
+            stats.observe(latency)
+        provider_class = provider.__class__.__name__
+        IPFS_PROVIDER_ERROR_RATE.labels(provider=provider_class).set(stats.error_rate)
+        if stats.latency is not None:
+            IPFS_PROVIDER_LATENCY.labels(provider=provider_class).set(stats.latency)
+
+    def _fetch_with_retry(self, provider: IPFSProvider, cid: CID, abandoned: threading.Event) -> bytes:
+        """Same as `retry`, but a fetch abandoned by `_hedged_fetch` gives up after the attempt in flight"""
+        retries_left = self.retries
+        while True:
+            try:
+                return provider.fetch(cid)
+            except IPFSError as ex:
+                retries_left -= 1
+                if not retries_left:
+                    raise MaxRetryError from ex
+                if abandoned.is_set():
+                    raise FetchAbandonedError from ex
+                logger.warning({"msg": f"Retrying a failed fetch, {retries_left=}", "error": str(ex)})
+
+    def _timed_fetch(self, provider: IPFSProvider, cid: CID, abandoned: threading.Event) -> bytes:
+        started = time.perf_counter()
+        try:
+            content = self._fetch_with_retry(provider, cid, abandoned)
+        except Exception:
+            self._observe(provider, None)
+            raise
+        self._observe(provider, time.perf_counter() - started)
+        return content
+
+    def _hedged_fetch(self, cid: CID, provider_rotation_frame: FrameNumber) -> bytes:
+        """
+        Fetches from the historically fastest provider first and, if it hasn't responded within its usual latency
+        (or failed), from the next one as well, returning the first response. Providers validate the content against
+        the CID, so an invalid response counts as a failure.
+
+        Requests still in flight are abandoned rather than interrupted: they aren't retried anymore, and their results
+        are only used to update the provider statistics.
+        """
+        providers = self._hedged_order(provider_rotation_frame)
+        logger.info(
+            {
+                "msg": "Called: w3.ipfs.fetch(...)",
+                "provider_rotation_frame": provider_rotation_frame,
+                "providers_order": [p.__class__.__name__ for p in providers],
+                "cid": str(cid),
+            }
+        )
+
+        executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="ipfs-fetch")
+        abandoned = threading.Event()
+        pending: dict[Future[bytes], IPFSProvider] = {}
+        last_error: Exception | None = None
+        try:
+            for i, provider in enumerate(providers):
+                pending[executor.submit(self._timed_fetch, provider, cid, abandoned)] = provider
+                is_last = i == len(providers) - 1
+                while pending:
+                    done, _ = wait(
+                        pending, timeout=None if is_last else self._hedge_delay(provider), return_when=FIRST_COMPLETED
+                    )
+                    if not done:
+                        logger.info({"msg": "IPFS provider is slow, hedging", "provider": provider.__class__.__name__})
+                        break
+                    for future in done:
+                        done_provider = pending.pop(future)
+                        try:
+                            content = future.result()
+                        except Exception as ex:  # pylint: disable=broad-exception-caught
+                            logger.warning(
+                                {
+                                    "msg": "IPFS provider failed",
+                                    "provider": done_provider.__class__.__name__,
+                                    "error": str(ex),
+                                }
+                            )
+                            last_error = ex
+                            continue
+                        logger.info({"msg": "Fetched content from IPFS", "provider": done_provider.__class__.__name__})
+                        return content
+                    if not is_last:
+                        # Go on with the next provider right away if the current one has failed
+                        break
+        finally:
+            abandoned.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        logger.error({"msg": "No more IPFS providers left to call"})
+        raise NoMoreProvidersError from last_error
+
     @retry
-    def _upload_to_provider(self, provider: IPFSProvider, content: bytes, name: str | None = None) -> CID:
-        return provider.publish(content, name)
+    def _upload_to_provider(self, provider: IPFSProvider, car: CARFile, name: str | None = None) -> CID:
+        return provider.publish_car(car, name)
 
     def _select_cid_with_quorum(self, successful_uploads: list[SuccessfulUpload]) -> CID:
         cid_counts = Counter(upload.cid for upload in successful_uploads)
@@ -175,27 +364,101 @@ class IPFS(Module):
             f"Successful uploads: {[upload.provider_class for upload in successful_uploads]}"
         )
 
-    def publish(self, content: bytes, name: str | None = None) -> CID:
+    def _has_early_quorum(self, successful_uploads: list[SuccessfulUpload]) -> bool:
+        # A CID agreed by the majority of all the providers is the majority of the successful uploads whatever the
+        # rest of the uploads end up with, so `_select_cid_with_quorum` would select it after all the uploads as well
+        if not self.early_quorum or not successful_uploads:
+            return False
+        required_quorum = len(self.providers) // 2 + 1
+        return Counter(upload.cid for upload in successful_uploads).most_common(1)[0][1] >= required_quorum
+
+    @staticmethod
+    def _report_upload(provider: IPFSProvider, future: Future[CID]) -> None:
+        result = "failure" if future.cancelled() or future.exception() else "success"
+        IPFS_UPLOADS.labels(provider=provider.__class__.__name__, result=result).inc()
+
+    @staticmethod
+    def _report_background_upload(provider: IPFSProvider, selected_cid: CID, future: Future[CID]) -> None:
+        provider_class = provider.__class__.__name__
+        if future.cancelled() or future.exception():
+            logger.warning(
+                {"msg": "Background upload failed", "provider_class": provider_class, "error": str(future.exception())}
+            )
+            return
+        cid = str(future.result())
+        if cid != str(selected_cid):
+            logger.warning(
+                {
+                    "msg": "Background upload returned a CID different from the selected one",
+                    "provider_class": provider_class,
+                    "cid": cid,
+                    "selected_cid": str(selected_cid),
+                }
+            )
+            return
+        logger.info({"msg": "Background upload completed", "provider_class": provider_class, "cid": cid})
+
+    @staticmethod
+    def _close_after_uploads(car: CARFile, futures: Collection[Future[CID]]) -> Callable[[], None]:
+        """
+        Closes the CAR once all the uploads are done and the returned function is called, since the uploads left in
+        background read the CAR after `publish` returns
+        """
+        publishing = object()
+        holders: set[object] = {*futures, publishing}
+        lock = threading.Lock()
+
+        def release(holder: object) -> None:
+            with lock:
+                holders.discard(holder)
+                if holders:
+                    return
+            car.close()
+
+        for future in futures:
+            future.add_done_callback(release)
+        return partial(release, publishing)
+
+    def publish(self, content: bytes | CARFile, name: str | None = None) -> CID:
+        """
+        Uploads the content to all the providers and selects the CID by quorum. The CAR of the content is built once
+        for all the providers, a given CAR is owned by the call and closed once all the uploads are done.
+        """
         logger.info({"msg": "Started: w3.ipfs.publish(...)", "total_providers": len(self.providers)})
 
-        successful_uploads = []
+        car = content if isinstance(content, CARFile) else self.car_converter.create_car([content])
+
+        # Uploads outlive `publish` with the early quorum, so every call has its own pool: the uploads left by the
+        # previous call mustn't hold up the next one
+        uploads_pool = ThreadPoolExecutor(max_workers=len(self.providers), thread_name_prefix="ipfs-publish")
+        future_to_provider = {
+            uploads_pool.submit(self._upload_to_provider, provider, car, name): provider for provider in self.providers
+        }
+        uploads_pool.shutdown(wait=False)
+        release_car = self._close_after_uploads(car, future_to_provider)
+        try:
+            return self._select_published_cid(car, future_to_provider)
+        finally:
+            release_car()
+
+    def _select_published_cid(self, car: CARFile, future_to_provider: dict[Future[CID], IPFSProvider]) -> CID:
+        successful_uploads: list[SuccessfulUpload] = []
         failed_uploads = []
 
-        with ThreadPoolExecutor(max_workers=len(self.providers)) as executor:
-            future_to_provider = {
-                executor.submit(self._upload_to_provider, provider, content, name): provider
-                for provider in self.providers
-            }
+        for future, provider in future_to_provider.items():
+            future.add_done_callback(partial(self._report_upload, provider))
 
-            for future in as_completed(future_to_provider):
-                provider = future_to_provider[future]
-                try:
-                    cid = future.result()
-                    successful_uploads.append(
-                        SuccessfulUpload(provider_class=provider.__class__.__name__, cid=str(cid))
-                    )
-                except Exception as ex:  # pylint: disable=broad-exception-caught
-                    failed_uploads.append({"provider_class": provider.__class__.__name__, "error": str(ex)})
+        pending = set(future_to_provider)
+        for future in as_completed(future_to_provider):
+            pending.discard(future)
+            provider = future_to_provider[future]
+            try:
+                cid = future.result()
+                successful_uploads.append(SuccessfulUpload(provider_class=provider.__class__.__name__, cid=str(cid)))
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                failed_uploads.append({"provider_class": provider.__class__.__name__, "error": str(ex)})
+            if self._has_early_quorum(successful_uploads):
+                break
 
         if not successful_uploads:
             logger.error({"msg": "Failed to upload to all providers", "failed_uploads": failed_uploads})
@@ -206,6 +469,24 @@ class IPFS(Module):
 
         selected_cid = self._select_cid_with_quorum(successful_uploads)
 
+        if pending:
+            logger.info(
+                {
+                    "msg": "Quorum reached, the rest of the uploads continue in background",
+                    "pending_providers": [future_to_provider[future].__class__.__name__ for future in pending],
+                }
+            )
+            for future in pending:
+                self.background_uploads.add(future)
+                future.add_done_callback(
+                    partial(self._report_background_upload, future_to_provider[future], selected_cid)
+                )
+                future.add_done_callback(self.background_uploads.discard)
+
+        if self.cache is not None and str(selected_cid) == car.root.encode():
+            # Pre-warm the cache, the published content is fetched back by the next report
+            self.cache.put_car(car)
+
         logger.info(
             {
                 "msg": "Completed: w3.ipfs.publish(...)",
@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Iterable
 from dataclasses import asdict, dataclass
 from enum import Enum
 from itertools import chain
@@ -10,10 +11,11 @@ from web3.module import Module
 from src.constants import COMPOUNDING_WITHDRAWAL_PREFIX, ETH1_ADDRESS_WITHDRAWAL_PREFIX
 from src.providers.consensus.types import PendingConsolidation, PendingDeposit, Validator
 from src.providers.keys.types import LidoKey
-from src.services.deposit_signature_verification import is_valid_deposit_signature
+from src.services.deposit_signature_verification import signature_verification_pool, verify_deposit_signatures
 from src.types import BlockStamp, Gwei, NodeOperatorGlobalIndex, NodeOperatorId, StakingModuleId
 from src.utils.cache import global_lru_cache as lru_cache
 from src.utils.dataclass import FromResponse, Nested
+from src.utils.pubkey_index import get_pubkey_index
 from src.utils.types import hex_str_to_bytes
 from src.utils.validator_state import get_max_effective_balance
 
@@ -268,35 +270,26 @@ class LidoValidatorsProvider(Module):
         A key whose first valid-signature deposit uses non-Lido WC is treated as a
         frontrun and excluded entirely along with any subsequent deposits for that key.
         """
+        deposits_by_pubkey: dict[str, list[PendingDeposit]] = {}
+        for d in pending_deposits:
+            if d.pubkey in filter_pubkeys:
+                deposits_by_pubkey.setdefault(d.pubkey, []).append(d)
+
+        first_valid = LidoValidatorsProvider._get_first_valid_deposits(deposits_by_pubkey, genesis_fork_version)
+
         result: dict[str, list[PendingDeposit]] = {}
-        invalid_keys: set[str] = set()
 
         for d in pending_deposits:
-            if d.pubkey not in filter_pubkeys:
-                continue
-
             if d.pubkey in result:
                 result[d.pubkey].append(d)
                 continue
 
-            if d.pubkey in invalid_keys:
-                continue
-
-            if not is_valid_deposit_signature(
-                pubkey=hex_str_to_bytes(d.pubkey),
-                withdrawal_credentials=hex_str_to_bytes(d.withdrawal_credentials),
-                amount=d.amount,
-                signature=hex_str_to_bytes(d.signature),
-                genesis_fork_version=genesis_fork_version,
-                # Fork-agnostic domain since deposits are valid across forks
-                # genesis_validators_root=hex_str_to_bytes(genesis_config.genesis_validators_root),
-            ):
+            if first_valid.get(d.pubkey) is not d:
                 continue
 
             if d.withdrawal_credentials in lido_wc_list:
                 result[d.pubkey] = [d]
             else:
-                invalid_keys.add(d.pubkey)
                 logger.warning(
                     {
                         'msg': 'Ignoring key. Possible front run attack',
@@ -306,6 +299,36 @@ class LidoValidatorsProvider(Module):
 
         return result
 
+    @staticmethod
+    def _get_first_valid_deposits(
+        deposits_by_pubkey: dict[str, list[PendingDeposit]],
+        genesis_fork_version: bytes,
+    ) -> dict[str, PendingDeposit]:
+        """
+        Returns the first deposit with a valid signature of every key that has one.
+
+        Deposits of every key are checked in order until the first valid one. Signatures are verified in rounds,
+        one deposit of every key per round, so usually all keys are verified in a single batch. The first round is the
+        largest one, so a single pool of processes sized for it serves all the rounds.
+        """
+        first_valid: dict[str, PendingDeposit] = {}
+        next_to_verify = dict.fromkeys(deposits_by_pubkey, 0)
+
+        with signature_verification_pool(len(next_to_verify)) as executor:
+            while next_to_verify:
+                batch = [deposits_by_pubkey[pubkey][i] for pubkey, i in next_to_verify.items()]
+                verified = verify_deposit_signatures(batch, genesis_fork_version, executor)
+
+                not_verified = {}
+                for (pubkey, i), deposit, is_valid in zip(next_to_verify.items(), batch, verified, strict=True):
+                    if is_valid:
+                        first_valid[pubkey] = deposit
+                    elif i + 1 < len(deposits_by_pubkey[pubkey]):
+                        not_verified[pubkey] = i + 1
+                next_to_verify = not_verified
+
+        return first_valid
+
     @lru_cache(maxsize=1)
     def _get_lido_validators_with_keys(self, blockstamp: BlockStamp) -> tuple[list[LidoValidator], list[LidoKey]]:
         lido_keys = self.w3.kac.get_used_lido_keys(blockstamp)
@@ -330,18 +353,32 @@ class LidoValidatorsProvider(Module):
         keys: list[LidoKey],
         validators: list[Validator],
     ) -> tuple[list[LidoValidator], list[LidoKey]]:
-        """Merging and filter non-lido validators."""
-        validators_keys_dict = {validator.validator.pubkey: validator for validator in validators}
+        """
+        Merging and filter non-lido validators.
+        `validators` is the whole registry of a state, so keys are matched with the shared pubkey index if it is
+        enabled.
+        """
+        pubkey_index = get_pubkey_index()
+        key_validators: Iterable[Validator | None]
+        if pubkey_index is None:
+            validators_keys_dict = {validator.validator.pubkey: validator for validator in validators}
+            key_validators = (validators_keys_dict.get(key.key) for key in keys)
+        else:
+            pubkey_index.update(validators)
+            key_validators = (
+                validators[index] if index is not None and index < len(validators) else None
+                for index in pubkey_index.get_many(key.key for key in keys)
+            )
 
         lido_validators = []
         pending_lido_keys = []
 
-        for key in keys:
-            if key.key in validators_keys_dict:
+        for key, validator in zip(keys, key_validators, strict=True):
+            if validator is not None:
                 lido_validators.append(
                     LidoValidator(
                         lido_id=key,
-                        **asdict(validators_keys_dict[key.key]),
+                        **asdict(validator),
                     )
                 )
             else:
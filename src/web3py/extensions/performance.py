@@ -1,10 +1,14 @@
+from pathlib import Path
+
 from web3.module import Module
 
+from src.providers.performance.cache import EpochsDutiesCache
 from src.providers.performance.client import PerformanceClient
 from src.variables import (
     HTTP_REQUEST_RETRY_COUNT_PERFORMANCE,
     HTTP_REQUEST_SLEEP_BEFORE_RETRY_IN_SECONDS_PERFORMANCE,
     HTTP_REQUEST_TIMEOUT_PERFORMANCE,
+    PERFORMANCE_CLIENT_CACHE_DIR,
 )
 
 
@@ -17,3 +21,5 @@ class PerformanceClientModule(PerformanceClient, Module):
             HTTP_REQUEST_SLEEP_BEFORE_RETRY_IN_SECONDS_PERFORMANCE,
         )
         super(Module, self).__init__()
+        if PERFORMANCE_CLIENT_CACHE_DIR:
+            self.epochs_cache = EpochsDutiesCache(Path(PERFORMANCE_CLIENT_CACHE_DIR))
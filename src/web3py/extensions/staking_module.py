@@ -1,4 +1,6 @@
 import logging
+from collections.abc import Iterable
+from threading import Lock
 from time import sleep
 from typing import cast
 
@@ -16,7 +18,7 @@ from src.providers.execution.contracts.cs_module import CSModuleContract
 from src.providers.execution.contracts.cs_parameters_registry import CSParametersRegistryContract, CurveParams
 from src.providers.execution.contracts.cs_strikes import CSStrikesContract
 from src.providers.ipfs import CID, CIDv0, CIDv1, is_cid_v0
-from src.types import BlockStamp, NodeOperatorId, SlotNumber
+from src.types import BlockHash, BlockStamp, NodeOperatorId, SlotNumber
 
 
 logger = logging.getLogger(__name__)
@@ -41,6 +43,8 @@ class StakingModuleContracts(Module):
 
     CONTRACT_LOAD_MAX_RETRIES: int = 100
     CONTRACT_LOAD_RETRY_DELAY: int = 60
+    # Curve params of node operators are memoised for a few latest blocks only.
+    CURVE_PARAMS_CACHE_BLOCKS: int = 8
 
     def __init__(self, w3: Web3) -> None:
         super().__init__(w3)
@@ -50,6 +54,8 @@ class StakingModuleContracts(Module):
         self._module_address = variables.STAKING_MODULE_ADDRESS
 
         self._contract_addresses: tuple[str, ...] | None = None
+        self._curve_params: dict[BlockHash, dict[NodeOperatorId, CurveParams]] = {}
+        self._curve_params_lock = Lock()
         self._load_contracts()
 
     def get_last_processing_ref_slot(self, blockstamp: BlockStamp) -> SlotNumber:
@@ -76,7 +82,40 @@ class StakingModuleContracts(Module):
         return CIDv0(result) if is_cid_v0(result) else CIDv1(result)
 
     def get_curve_params(self, no_id: NodeOperatorId, blockstamp: BlockStamp) -> CurveParams:
+        with self._curve_params_lock:
+            curve_params = self._curve_params.get(blockstamp.block_hash, {}).get(no_id)
+        if curve_params is not None:
+            return curve_params
+
         curve_id = self.accounting.get_bond_curve_id(no_id, blockstamp.block_hash)
+        return self._get_curve_params_by_id(curve_id, blockstamp)
+
+    def get_curve_params_many(
+        self, no_ids: Iterable[NodeOperatorId], blockstamp: BlockStamp
+    ) -> dict[NodeOperatorId, CurveParams]:
+        """
+        Returns curve params of the node operators. Curve IDs are requested in batches and params of every distinct
+        curve are read once. The result is memoised per block, so `get_curve_params` makes no requests afterward.
+        """
+        no_ids = list(dict.fromkeys(no_ids))
+        with self._curve_params_lock:
+            cached = self._curve_params.get(blockstamp.block_hash, {})
+            missing = [no_id for no_id in no_ids if no_id not in cached]
+
+        if missing:
+            curve_ids = self.accounting.get_bond_curve_ids(missing, blockstamp.block_hash)
+            params_by_curve = {
+                curve_id: self._get_curve_params_by_id(curve_id, blockstamp) for curve_id in set(curve_ids.values())
+            }
+            with self._curve_params_lock:
+                cached = self._curve_params.setdefault(blockstamp.block_hash, {})
+                cached.update((no_id, params_by_curve[curve_id]) for no_id, curve_id in curve_ids.items())
+                while len(self._curve_params) > self.CURVE_PARAMS_CACHE_BLOCKS:
+                    del self._curve_params[next(iter(self._curve_params))]
+
+        return {no_id: cached[no_id] for no_id in no_ids}
+
+    def _get_curve_params_by_id(self, curve_id: int, blockstamp: BlockStamp) -> CurveParams:
         perf_coeffs = self.params.get_performance_coefficients(curve_id, blockstamp.block_hash)
         perf_leeway_data = self.params.get_performance_leeway_data(curve_id, blockstamp.block_hash)
         reward_share_data = self.params.get_reward_share_data(curve_id, blockstamp.block_hash)
@@ -142,6 +181,8 @@ class StakingModuleContracts(Module):
                     ),
                 )
                 self._contract_addresses = self._get_contract_addresses()
+                with self._curve_params_lock:
+                    self._curve_params.clear()
                 return
             except Web3Exception as e:
                 last_error = e
@@ -12,6 +12,7 @@ from web3 import EthereumTesterProvider
 from src import variables
 from src.modules.oracles.common.runtime import ipfs_providers
 from src.providers.execution.base_interface import ContractInterface
+from src.utils.pubkey_index import get_pubkey_index
 from src.web3py.contract_tweak import tweak_w3_contracts
 from src.web3py.extensions import (
     IPFS,
@@ -86,6 +87,14 @@ def configure_unit_tests(request):
         yield
 
 
+@pytest.fixture(autouse=True)
+def fresh_pubkey_index():
+    # The index is a process-wide singleton, so tests must not see the registries of each other
+    get_pubkey_index.cache_clear()
+    yield
+    get_pubkey_index.cache_clear()
+
+
 @pytest.fixture(autouse=True)
 def configure_mainnet_tests(request, monkeypatch):
     if request.node.get_closest_marker(MAINNET_MARKER):
@@ -1500,6 +1500,21 @@ class TestCSAccountingContract:
         result = CSAccountingContract.get_bond_curve_id(contract, NodeOperatorId(1), block_identifier="latest")
         assert result == 5
 
+    def test_get_bond_curve_ids__batched(self):
+        contract = _mock_contract()
+        ids = [NodeOperatorId(1), NodeOperatorId(2), NodeOperatorId(3)]
+
+        with patch("src.providers.execution.contracts.cs_accounting.BatchReads") as batch_reads:
+            reads = batch_reads.return_value.__enter__.return_value
+            reads.execute.return_value = [1, 2, 1]
+            result = CSAccountingContract.get_bond_curve_ids(contract, ids, block_identifier="0xabc")
+
+        assert result == {NodeOperatorId(1): 1, NodeOperatorId(2): 2, NodeOperatorId(3): 1}
+        batch_reads.assert_called_once_with(contract.w3, "0xabc")
+        assert reads.add.call_count == 3
+        contract.functions.getBondCurveId.assert_has_calls([call(1), call(2), call(3)], any_order=True)
+        contract.get_bond_curve_id.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # CSFeeOracleContract
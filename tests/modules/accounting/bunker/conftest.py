@@ -20,9 +20,14 @@ def simple_blockstamp(block_number: int) -> BlockStamp:
     return BlockStamp(f"0x{block_number}", block_number, '', block_number, 0)
 
 
+def simple_pubkey(pubkey: str) -> str:
+    """Pads a short hex pubkey to the 48 bytes of a real one"""
+    return '0x' + pubkey.removeprefix('0x').rjust(96, '0')
+
+
 def simple_key(pubkey: str) -> LidoKey:
     key = object.__new__(LidoKey)
-    key.key = pubkey
+    key.key = simple_pubkey(pubkey)
     return key
 
 
@@ -40,7 +45,7 @@ def simple_validator(
         index=ValidatorIndex(index),
         balance=Gwei(balance),
         validator=ValidatorState(
-            pubkey=pubkey,
+            pubkey=simple_pubkey(pubkey),
             withdrawal_credentials='',
             effective_balance=Gwei(effective_balance),
             slashed=slashed,
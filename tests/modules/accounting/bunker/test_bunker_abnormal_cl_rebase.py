@@ -13,7 +13,12 @@ from src.web3py.types import Web3
 from tests.factory.blockstamp import ReferenceBlockStampFactory
 from tests.factory.configs import BunkerConfigFactory, ChainConfigFactory, FrameConfigFactory
 from tests.factory.no_registry import LidoValidatorFactory
-from tests.modules.accounting.bunker.conftest import simple_blockstamp, simple_key, simple_ref_blockstamp
+from tests.modules.accounting.bunker.conftest import (
+    simple_blockstamp,
+    simple_key,
+    simple_pubkey,
+    simple_ref_blockstamp,
+)
 
 
 DEFAULT_BALANCE = Gwei(32 * 10**9)
@@ -31,7 +36,7 @@ def simple_validators(
             index=ValidatorIndex(index),
             balance=balance,
             validator=ValidatorState(
-                pubkey=f"0x{index}",
+                pubkey=simple_pubkey(f"0x{index}"),
                 withdrawal_credentials='',
                 effective_balance=effective_balance,
                 slashed=False,
@@ -547,7 +552,7 @@ def test_calculate_injected_capital__v4__correct_wei_to_gwei_conversion(
         web3, ChainConfigFactory.build(), BunkerConfigFactory.build(), FrameConfigFactory.build()
     )
 
-    lido_pubkey = '0xabc'
+    lido_pubkey = simple_pubkey('0xabc')
     lido_wc = '0x010000000000000000000000aabbccddaabbccddaabbccddaabbccddaabbccdd'
     abnormal_case.lido_keys = [simple_key(lido_pubkey)]
     abnormal_case.lido_validators = []
@@ -561,8 +566,8 @@ def test_calculate_injected_capital__v4__correct_wei_to_gwei_conversion(
     abnormal_case.w3.cc.get_genesis = Mock(return_value=genesis_mock)
 
     monkeypatch.setattr(
-        'src.web3py.extensions.lido_validators.is_valid_deposit_signature',
-        Mock(return_value=True),
+        'src.web3py.extensions.lido_validators.verify_deposit_signatures',
+        lambda deposits, genesis_fork_version, executor=None: [True] * len(deposits),
     )
     monkeypatch.setattr(
         'src.web3py.extensions.lido_validators.hex_str_to_bytes',
@@ -620,7 +625,7 @@ def test_calculate_injected_capital__v4__invalid_signature_deposit_excluded(web3
         web3, ChainConfigFactory.build(), BunkerConfigFactory.build(), FrameConfigFactory.build()
     )
 
-    lido_pubkey = '0xabc'
+    lido_pubkey = simple_pubkey('0xabc')
     lido_wc = '0x010000000000000000000000aabbccddaabbccddaabbccddaabbccddaabbccdd'
     abnormal_case.lido_keys = [simple_key(lido_pubkey)]
     abnormal_case.lido_validators = []
@@ -636,12 +641,12 @@ def test_calculate_injected_capital__v4__invalid_signature_deposit_excluded(web3
     valid_deposit = Mock(pubkey=lido_pubkey, withdrawal_credentials=lido_wc, signature='0xvalid', amount=1000 * 10**9)
     invalid_deposit = Mock(pubkey=lido_pubkey, withdrawal_credentials=lido_wc, signature='0xinvalid', amount=1 * 10**9)
 
-    def fake_is_valid(pubkey, withdrawal_credentials, amount, signature, genesis_fork_version):
-        return signature != b'0xinvalid'
+    def fake_verify(deposits, genesis_fork_version, executor=None):
+        return [deposit.signature != '0xinvalid' for deposit in deposits]
 
     monkeypatch.setattr(
-        'src.web3py.extensions.lido_validators.is_valid_deposit_signature',
-        fake_is_valid,
+        'src.web3py.extensions.lido_validators.verify_deposit_signatures',
+        fake_verify,
     )
     monkeypatch.setattr(
         'src.web3py.extensions.lido_validators.hex_str_to_bytes',
@@ -1,3 +1,5 @@
+from itertools import batched
+
 import pytest
 from web3 import Web3
 
@@ -106,6 +108,21 @@ def test_build_extra_transactions_data():
     )
 
 
+@pytest.mark.unit
+def test_collect__many_operators__golden():
+    exited_validators = {(i % 7, (i * 31) % 1000): i for i in range(5000)}
+
+    extra_data = ExtraDataService.collect(exited_validators, 10, 37)
+
+    assert extra_data.items_count == 140
+    assert len(extra_data.extra_data_list) == 14
+    assert [len(tx) for tx in extra_data.extra_data_list] == [
+        32 + sum(ExtraDataService.get_item_length(payload) for payload in batch)
+        for batch in batched(ExtraDataService.build_validators_payloads(exited_validators, 37), 10, strict=False)
+    ]
+    assert extra_data.data_hash.hex() == "c6042b89b3c3045c459617b4775e9ecef76c471ebe9250d242a814f7bd31050b"
+
+
 @pytest.mark.unit
 def test_add_hashes_to_transactions():
     next_hash, txs = ExtraDataService.add_hashes_to_transactions([])
@@ -1,13 +1,16 @@
 import math
+import random
 import re
+import threading
 from collections import defaultdict
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from eth_utils.address import to_checksum_address
 from hexbytes import HexBytes
 from web3.types import Wei
 
+from src import variables
 from src.constants import (
     EFFECTIVE_BALANCE_INCREMENT,
     MIN_ACTIVATION_BALANCE,
@@ -15,6 +18,7 @@ from src.constants import (
 )
 from src.modules.oracles.staking_modules.common.distribution import (
     Distribution,
+    FrameOutcomes,
     ValidatorDuties,
     ValidatorDutiesOutcome,
 )
@@ -322,7 +326,12 @@ def test_calculate_distribution(
     distribution._get_module_validators = Mock(...)
     distribution.state.data = {f: {} for f in frames}
     distribution._get_frame_blockstamp = Mock(side_effect=frame_blockstamps)
-    distribution._calculate_distribution_in_frame = Mock(side_effect=distribution_in_frame)
+    outcomes_by_frame = {
+        frame: FrameOutcomes(strikes=strikes)
+        for frame, (*_, strikes) in zip(frames, distribution_in_frame, strict=True)
+    }
+    distribution._calculate_frame_outcomes = Mock(side_effect=lambda frame, *_: outcomes_by_frame[frame])
+    distribution._distribute_rewards_in_frame = Mock(side_effect=[in_frame[:3] for in_frame in distribution_in_frame])
 
     result = distribution.calculate(blockstamp=..., last_report=last_report)
 
@@ -351,7 +360,8 @@ def test_calculate_distribution_handles_invalid_distribution():
     distribution._get_module_validators = Mock(...)
     distribution.state.data = {(EpochNumber(0), EpochNumber(31)): {}}
     distribution._get_frame_blockstamp = Mock(return_value=ReferenceBlockStampFactory.build(ref_epoch=31))
-    distribution._calculate_distribution_in_frame = Mock(
+    distribution._calculate_frame_outcomes = Mock(return_value=FrameOutcomes())
+    distribution._distribute_rewards_in_frame = Mock(
         return_value=(
             # rewards
             {NodeOperatorId(1): 500},
@@ -359,8 +369,6 @@ def test_calculate_distribution_handles_invalid_distribution():
             500,
             # rebate_to_protocol
             1,
-            # strikes
-            {},
         )
     )
 
@@ -382,7 +390,8 @@ def test_calculate_distribution_handles_invalid_distribution_in_total():
     distribution._get_module_validators = Mock(...)
     distribution.state.data = {(EpochNumber(0), EpochNumber(31)): {}}
     distribution._get_frame_blockstamp = Mock(return_value=ReferenceBlockStampFactory.build(ref_epoch=31))
-    distribution._calculate_distribution_in_frame = Mock(
+    distribution._calculate_frame_outcomes = Mock(return_value=FrameOutcomes())
+    distribution._distribute_rewards_in_frame = Mock(
         return_value=(
             # rewards
             {NodeOperatorId(1): 500},
@@ -390,8 +399,6 @@ def test_calculate_distribution_handles_invalid_distribution_in_total():
             400,
             # rebate_to_protocol
             1,
-            # strikes
-            {},
         )
     )
 
@@ -1102,7 +1109,7 @@ def test_calculate_distribution_handles_invalid_distribution_in_total():
     ],
 )
 @pytest.mark.unit
-def test_calculate_distribution_in_frame(
+def test_calculate_frame_outcomes_and_distribute_rewards(
     to_distribute,
     frame_validators,
     frame_state_data,
@@ -1124,15 +1131,16 @@ def test_calculate_distribution_in_frame(
 
     distribution = Distribution(w3, converter=..., state=state)
 
-    (rewards_distribution, distributed_rewards, rebate_to_protocol, strikes_in_frame) = (
-        distribution._calculate_distribution_in_frame(
-            frame,
-            blockstamp=...,
-            rewards_to_distribute=to_distribute,
-            operators_to_validators=frame_validators,
-            log=log,
-        )
+    outcomes = distribution._calculate_frame_outcomes(
+        frame,
+        blockstamp=...,
+        operators_to_validators=frame_validators,
+        log=log,
     )
+    rewards_distribution, distributed_rewards, rebate_to_protocol = distribution._distribute_rewards_in_frame(
+        outcomes, rewards_to_distribute=to_distribute, log=log
+    )
+    strikes_in_frame = outcomes.strikes
 
     assert dict(rewards_distribution) == expected_rewards_distribution_map
     assert distributed_rewards == expected_distributed_rewards
@@ -1662,7 +1670,7 @@ def test_get_validator_duties_outcome_scales_by_effective_balance(multiplier: in
 
 
 @pytest.mark.unit
-def test_calculate_distribution_in_frame_assigns_keys_by_sorted_order():
+def test_calculate_frame_outcomes_assigns_keys_by_sorted_order():
     w3 = Mock(spec=Web3StakingModule, staking_module=Mock())
     reward_share_data = Mock()
     reward_share_data.get_for = Mock(side_effect=lambda k: {1: 1.0, 2: 0.9, 3: 0.8, 4: 0.7, 5: 0.6, 6: 0.5}[k])
@@ -1726,7 +1734,7 @@ def test_calculate_distribution_in_frame_assigns_keys_by_sorted_order():
         NodeOperatorId(1): [v_idx10, v_idx7, v_idx5, v_idx8, v_idx9, v_idx6],
     }
 
-    distribution._calculate_distribution_in_frame(frame, blockstamp, Wei(300), operators_to_validators, log)
+    distribution._calculate_frame_outcomes(frame, blockstamp, operators_to_validators, log)
 
     assert log.operators[NodeOperatorId(1)].validators[ValidatorIndex(6)].reward_share == 1.0
     assert log.operators[NodeOperatorId(1)].validators[ValidatorIndex(9)].reward_share == 0.9
@@ -1734,3 +1742,92 @@ def test_calculate_distribution_in_frame_assigns_keys_by_sorted_order():
     assert log.operators[NodeOperatorId(1)].validators[ValidatorIndex(8)].reward_share == 0.7
     assert log.operators[NodeOperatorId(1)].validators[ValidatorIndex(10)].reward_share == 0.6
     assert log.operators[NodeOperatorId(1)].validators[ValidatorIndex(5)].reward_share == 0.5
+
+
+def make_synthetic_distribution(frames_count: int, seed: int) -> Distribution:
+    rng = random.Random(seed)
+    operators = {
+        NodeOperatorId(no_id): [
+            LidoValidatorFactory.build(
+                index=ValidatorIndex(no_id * 10 + i),
+                validator=ValidatorStateFactory.build(slashed=False, effective_balance=MIN_ACTIVATION_BALANCE),
+            )
+            for i in range(3)
+        ]
+        for no_id in range(1, 5)
+    }
+    frames = [(EpochNumber(i * 32), EpochNumber(i * 32 + 31)) for i in range(frames_count)]
+    state = State(frames[0][0], frames[-1][1], epochs_per_frame=32)
+    for frame in frames:
+        duties = NetworkDuties()
+        for validator in (v for validators in operators.values() for v in validators):
+            assigned = rng.randint(0, 32)
+            duties.attestations[validator.index] = DutyAccumulator(assigned, rng.randint(assigned // 2, assigned))
+        state.data[frame] = duties
+    blockstamps = {to_epoch: ReferenceBlockStampFactory.build(ref_epoch=to_epoch) for _, to_epoch in frames}
+    shares = {bs.block_hash: 1000 * (i + 1) for i, bs in enumerate(blockstamps.values())}
+
+    w3 = Mock(spec=Web3StakingModule, staking_module=Mock())
+    w3.staking_module.fee_distributor.shares_to_distribute = Mock(side_effect=shares.__getitem__)
+    w3.staking_module.get_curve_params = Mock(
+        return_value=CurveParams(
+            perf_coeffs=PerformanceCoefficients(),
+            perf_leeway_data=Mock(get_for=Mock(return_value=0.1)),
+            reward_share_data=Mock(get_for=Mock(return_value=0.9)),
+            strikes_params=StrikesParams(lifetime=6, threshold=3),
+        )
+    )
+    distribution = Distribution(w3, converter=..., state=state)
+    distribution._get_frame_blockstamp = Mock(side_effect=lambda _, to_epoch: blockstamps[to_epoch])
+    distribution._get_module_validators = Mock(return_value=operators)
+    return distribution
+
+
+@pytest.mark.unit
+def test_calculate_distribution__frames_in_parallel__same_result_as_sequential():
+    distribution = make_synthetic_distribution(frames_count=4, seed=7)
+    last_report = Mock(strikes={}, rewards=[(NodeOperatorId(1), 10)])
+
+    with patch.object(variables, "PERFORMANCE_ORACLE_MAX_FRAMES_CONCURRENCY", 1):
+        sequential = distribution.calculate(..., last_report)
+    with patch.object(variables, "PERFORMANCE_ORACLE_MAX_FRAMES_CONCURRENCY", 4):
+        parallel = distribution.calculate(..., last_report)
+
+    assert sequential.total_rewards > 0
+    assert sequential.strikes
+    assert parallel.total_rewards == sequential.total_rewards
+    assert parallel.total_rebate == sequential.total_rebate
+    assert parallel.total_rewards_map == sequential.total_rewards_map
+    assert parallel.strikes == sequential.strikes
+    assert parallel.logs.encode() == sequential.logs.encode()
+
+
+@pytest.mark.unit
+def test_calculate_distribution__frames_outcomes__calculated_concurrently():
+    distribution = make_synthetic_distribution(frames_count=3, seed=1)
+    operators = distribution._get_module_validators.return_value
+    barrier = threading.Barrier(3, timeout=5)
+
+    def get_module_validators(_):
+        # Fails with BrokenBarrierError unless all the frames are processed at the same time.
+        barrier.wait()
+        return operators
+
+    distribution._get_module_validators = Mock(side_effect=get_module_validators)
+
+    with patch.object(variables, "PERFORMANCE_ORACLE_MAX_FRAMES_CONCURRENCY", 3):
+        result = distribution.calculate(..., Mock(strikes={}, rewards=[]))
+
+    assert [log.frame for log in result.logs.frames] == distribution.state.frames
+
+
+@pytest.mark.unit
+def test_calculate_distribution__curve_params__loaded_at_once_per_frame():
+    distribution = make_synthetic_distribution(frames_count=2, seed=3)
+    operators = distribution._get_module_validators.return_value
+    get_curve_params_many = distribution.w3.staking_module.get_curve_params_many
+
+    result = distribution.calculate(..., Mock(strikes={}, rewards=[]))
+
+    for frame_log in result.logs.frames:
+        get_curve_params_many.assert_any_call(operators, frame_log.blockstamp)
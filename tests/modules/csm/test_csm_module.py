@@ -1,3 +1,4 @@
+import random
 import time
 from collections import defaultdict
 from dataclasses import dataclass
@@ -8,21 +9,24 @@ import pytest
 from eth_typing import HexAddress
 from hexbytes import HexBytes
 
+from src import variables
 from src.constants import UINT64_MAX
 from src.modules.common.types import ZERO_HASH, CurrentFrame, ModuleExecuteDelay
 from src.modules.oracles.staking_modules.base import SMPerformanceOracle, SMPerformanceOracleError
 from src.modules.oracles.staking_modules.common.distribution import Distribution
 from src.modules.oracles.staking_modules.common.helpers.last_report import LastReport
-from src.modules.oracles.staking_modules.common.log import Logs
-from src.modules.oracles.staking_modules.common.state import DutyAccumulator
+from src.modules.oracles.staking_modules.common.log import FramePerfLog, Logs
+from src.modules.oracles.staking_modules.common.state import DutyAccumulator, State
 from src.modules.oracles.staking_modules.common.tree import RewardsTree, StrikesTree
 from src.modules.oracles.staking_modules.common.types import StrikesList
 from src.modules.oracles.staking_modules.community_staking.csm import CSPerformanceOracle
-from src.modules.sidecars.performance.common.db import Duty
+from src.modules.sidecars.performance.common.db import DutiesSummary, Duty, FilteredDuty
 from src.providers.consensus.types import Validator, ValidatorState
 from src.providers.execution.exceptions import InconsistentData
 from src.providers.ipfs import CID
+from src.providers.performance.client import PerformanceClientError
 from src.types import EpochNumber, FrameNumber, Gwei, NodeOperatorId, SlotNumber, ValidatorIndex
+from src.utils.car import CARConverter
 from src.utils.types import hex_str_to_bytes
 from src.utils.validator_state import is_active_validator
 from src.web3py.extensions.telemetry_data_bus import TelemetryEventId
@@ -53,7 +57,7 @@ def make_validator(index: int, activation_epoch: int = 0, exit_epoch: int = 100)
         index=ValidatorIndex(index),
         balance=Gwei(0),
         validator=ValidatorState(
-            pubkey=f"0x{index:02x}",
+            pubkey=f"0x{index:096x}",
             withdrawal_credentials="0x00",
             effective_balance=Gwei(0),
             slashed=False,
@@ -968,6 +972,139 @@ def test_get_duties_state__missed_attestation_for_unknown_validator__raises_erro
         module._get_duties_state(EpochNumber(0), EpochNumber(0), epochs_per_frame=1)
 
 
+@pytest.mark.unit
+def test_get_frame_duties__filtered_by_tracked_validators__same_network_aggregates(module: CSPerformanceOracle):
+    validators = {ValidatorIndex(i): make_validator(i, activation_epoch=0, exit_epoch=10) for i in range(4)}
+    tracked = {ValidatorIndex(0), ValidatorIndex(2)}
+    epochs_data = [
+        Duty(
+            epoch=0,
+            missed_attestation_vids=[1, 3],
+            proposals_vids=[0, 1],
+            proposals_flags=[True, False],
+            syncs_vids=[2, 3],
+            syncs_misses=[0, 1],
+        ),
+        Duty(
+            epoch=1,
+            missed_attestation_vids=[2],
+            proposals_vids=[2, 3],
+            proposals_flags=[True, True],
+            syncs_vids=[2, 3],
+            syncs_misses=[1, 2],
+        ),
+        Duty(
+            epoch=2,
+            missed_attestation_vids=[],
+            proposals_vids=[1],
+            proposals_flags=[False],
+            syncs_vids=[2, 3],
+            syncs_misses=[0, 0],
+        ),
+    ]
+    module.w3 = Mock()
+    module.w3.performance.get_epochs_data = Mock(return_value=epochs_data)
+    full = module._get_frame_duties(EpochNumber(0), EpochNumber(2), validators)
+    module.w3.performance.get_epochs_data = Mock(
+        return_value=[FilteredDuty.from_duty(duty, tracked) for duty in epochs_data]
+    )
+
+    filtered = module._get_frame_duties(EpochNumber(0), EpochNumber(2), validators, tracked)
+
+    module.w3.performance.get_epochs_data.assert_called_once_with(
+        EpochNumber(0), EpochNumber(2), validator_indexes=tracked
+    )
+    for duties_field in ("attestations", "proposals", "syncs"):
+        untracked_field = f"untracked_{duties_field}"
+        assert getattr(filtered, duties_field) == {
+            vid: acc for vid, acc in getattr(full, duties_field).items() if vid in tracked
+        }
+        assert State._get_duty_network_aggr(
+            getattr(filtered, duties_field), getattr(filtered, untracked_field)
+        ) == State._get_duty_network_aggr(getattr(full, duties_field), getattr(full, untracked_field))
+
+
+@pytest.mark.unit
+def test_get_duties_state__filter_module_validators_enabled__requests_module_validators_only(
+    module: CSPerformanceOracle,
+):
+    module._receive_last_finalized_slot = Mock(return_value="finalized")
+    validators = [make_validator(i, activation_epoch=0, exit_epoch=10) for i in range(3)]
+    module.w3 = Mock()
+    module.w3.cc.get_validators_by_indexes = Mock(return_value={v.index: v for v in validators})
+    module.w3.kac.get_used_module_operators_keys = Mock(
+        return_value={"keys": [Mock(key=validators[0].validator.pubkey), Mock(key=validators[2].validator.pubkey)]}
+    )
+    module.w3.performance.get_epochs_data = Mock(
+        return_value=[
+            FilteredDuty(
+                epoch=0,
+                missed_attestation_vids=[2],
+                summary=DutiesSummary(
+                    missed_attestations=2,
+                    proposals_assigned=0,
+                    proposals_included=0,
+                    syncs_assigned=0,
+                    syncs_missed=0,
+                ),
+            ),
+        ]
+    )
+
+    with patch.object(variables, "PERFORMANCE_ORACLE_FILTER_MODULE_VALIDATORS", True):
+        state = module._get_duties_state(EpochNumber(0), EpochNumber(0), epochs_per_frame=1)
+
+    module.w3.kac.get_used_module_operators_keys.assert_called_once()
+    module.w3.performance.get_epochs_data.assert_called_once_with(
+        EpochNumber(0), EpochNumber(0), validator_indexes={ValidatorIndex(0), ValidatorIndex(2)}
+    )
+    frame_data = state.data[(EpochNumber(0), EpochNumber(0))]
+    assert frame_data.attestations == {
+        ValidatorIndex(0): DutyAccumulator(assigned=1, included=1),
+        ValidatorIndex(2): DutyAccumulator(assigned=1, included=0),
+    }
+    assert frame_data.untracked_attestations == DutyAccumulator(assigned=1, included=0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "summary",
+    [
+        pytest.param(
+            DutiesSummary(
+                missed_attestations=0, proposals_assigned=1, proposals_included=1, syncs_assigned=1, syncs_missed=0
+            ),
+            id="missed-attestations-below-filtered",
+        ),
+        pytest.param(
+            DutiesSummary(
+                missed_attestations=1, proposals_assigned=1, proposals_included=2, syncs_assigned=1, syncs_missed=0
+            ),
+            id="more-blocks-than-proposals",
+        ),
+        pytest.param(
+            DutiesSummary(
+                missed_attestations=1, proposals_assigned=1, proposals_included=1, syncs_assigned=0, syncs_missed=0
+            ),
+            id="syncs-below-filtered",
+        ),
+    ],
+)
+def test_validate_epoch_data__summary_inconsistent_with_filtered_duties__raises_error(summary: DutiesSummary):
+    duty = FilteredDuty(
+        epoch=0,
+        missed_attestation_vids=[1],
+        proposals_vids=[1],
+        proposals_flags=[True],
+        syncs_vids=[1],
+        syncs_misses=[0],
+        summary=summary,
+    )
+
+    with pytest.raises(ValueError, match="summary is inconsistent"):
+        SMPerformanceOracle._validate_epoch_data(duty)
+
+
 @pytest.mark.unit
 def test_get_duties_state__multi_frame__each_frame_fetched_independently(module: CSPerformanceOracle):
     """Два фрейма: get_epochs_data вызывается отдельно для каждого, результаты пишутся в правильные фреймы."""
@@ -1040,6 +1177,105 @@ def test_get_duties_state__no_blocks_in_epoch__sync_duties_not_recorded(module:
     assert validator.index not in frame_data.syncs  # sync не записан
 
 
+def make_synthetic_epochs(validators: list[Validator], epochs: int, seed: int) -> dict[EpochNumber, Duty]:
+    rng = random.Random(seed)
+    epochs_data = {}
+    for epoch in range(epochs):
+        active = [int(v.index) for v in validators if is_active_validator(v, EpochNumber(epoch))]
+        proposers = rng.choices(active, k=4)
+        syncs = rng.sample(active, k=min(3, len(active)))
+        epochs_data[EpochNumber(epoch)] = Duty(
+            epoch=epoch,
+            missed_attestation_vids=rng.sample(active, k=rng.randint(0, len(active))),
+            proposals_vids=proposers,
+            proposals_flags=[rng.random() < 0.8 for _ in proposers],
+            syncs_vids=syncs,
+            syncs_misses=[rng.randint(0, 1) for _ in syncs],
+        )
+    return epochs_data
+
+
+@pytest.mark.unit
+def test_accumulate_duties__epochs_arrive_one_by_one__same_state_as_one_shot(web3, tmp_path):
+    validators = [
+        make_validator(i, activation_epoch=activation, exit_epoch=exit_)
+        for i, (activation, exit_) in enumerate([(0, 100), (0, 4), (2, 100), (3, 5), (5, 100), (0, 100), (7, 100)])
+    ]
+    epochs_data = make_synthetic_epochs(validators, epochs=6, seed=42)
+    l_epoch, r_epoch, epochs_per_frame = EpochNumber(0), EpochNumber(5), 3
+
+    def make_module(arrived_epochs: list[int]) -> CSPerformanceOracle:
+        module = CSPerformanceOracle(web3)
+        module.w3 = Mock()
+        module.w3.cc.get_validators_by_indexes = Mock(return_value={v.index: v for v in validators})
+        module.w3.performance.is_range_available = Mock(side_effect=lambda _, to: to < arrived_epochs[0])
+        module.w3.performance.get_epochs_data = Mock(
+            side_effect=lambda from_, to: [epochs_data[e] for e in range(from_, to + 1)]
+        )
+        module._receive_last_finalized_slot = Mock(return_value="finalized")
+        module._get_predicted_range = Mock(return_value=(l_epoch, r_epoch))
+        module._get_web3_converter = Mock(return_value=Mock(frame_config=Mock(epochs_per_frame=epochs_per_frame)))
+        module.ACCUMULATION_MIN_EPOCHS = 1
+        return module
+
+    one_shot = make_module([6])._get_duties_state(l_epoch, r_epoch, epochs_per_frame)
+
+    arrived_epochs = [0]
+    with patch.object(variables, "PERFORMANCE_ORACLE_STATE_DIR", str(tmp_path)):
+        # The daemon is restarted every cycle to read the partial state from the disk.
+        for arrived in range(1, 6):
+            arrived_epochs[0] = arrived
+            make_module(arrived_epochs).accumulate_duties(Mock())
+        arrived_epochs[0] = 6
+        module = make_module(arrived_epochs)
+        streamed = module._get_duties_state(l_epoch, r_epoch, epochs_per_frame)
+
+    # Only the tail epoch is left to process at the report time.
+    module.w3.performance.get_epochs_data.assert_called_once_with(EpochNumber(5), EpochNumber(5))
+    assert streamed.data == one_shot.data
+    for frame in one_shot.frames:
+        assert streamed.get_att_network_aggr(frame) == one_shot.get_att_network_aggr(frame)
+        assert streamed.get_prop_network_aggr(frame) == one_shot.get_prop_network_aggr(frame)
+        assert streamed.get_sync_network_aggr(frame) == one_shot.get_sync_network_aggr(frame)
+
+
+@pytest.mark.unit
+def test_accumulate_duties__not_enough_new_epochs__state_not_advanced(module: CSPerformanceOracle, tmp_path):
+    module.w3 = Mock()
+    module.w3.performance.is_range_available = Mock(side_effect=lambda _, to: to < 10)
+    module._get_predicted_range = Mock(return_value=(EpochNumber(0), EpochNumber(299)))
+    module._get_web3_converter = Mock(return_value=Mock(frame_config=Mock(epochs_per_frame=300)))
+
+    with patch.object(variables, "PERFORMANCE_ORACLE_STATE_DIR", str(tmp_path)):
+        module.accumulate_duties(Mock())
+
+    module.w3.cc.get_validators_by_indexes.assert_not_called()
+    assert not any(tmp_path.iterdir())
+
+
+@pytest.mark.unit
+def test_accumulate_duties__state_dir_not_set__does_nothing(module: CSPerformanceOracle):
+    module.w3 = Mock()
+    module._get_predicted_range = Mock()
+
+    with patch.object(variables, "PERFORMANCE_ORACLE_STATE_DIR", ""):
+        module.accumulate_duties(Mock())
+
+    module._get_predicted_range.assert_not_called()
+    module.w3.performance.is_range_available.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("available_to", [-1, 0, 6, 7, 15])
+def test_find_last_available_epoch__returns_end_of_available_prefix(module: CSPerformanceOracle, available_to: int):
+    module.w3 = Mock()
+    module.w3.performance.is_range_available = Mock(side_effect=lambda _, to: to <= available_to)
+
+    last_epoch = module._find_last_available_epoch(EpochNumber(0), EpochNumber(15))
+
+    assert last_epoch == (None if available_to < 0 else available_to)
+
+
 @pytest.mark.unit
 def test_get_predicted_range__l_epoch_exceeds_r_epoch__raises_error(
     module: CSPerformanceOracle, mock_chain_config: NoReturn
@@ -1132,29 +1368,31 @@ def test_is_contract_reportable_relies_on_is_main_data_submitted(module: CSPerfo
 @pytest.mark.unit
 def test_publish_tree_uploads_encoded_tree(module: CSPerformanceOracle):
     tree = Mock()
-    tree.encode.return_value = b"tree"
+    tree.encode_to.side_effect = lambda fp: fp.write(b"tree")
     module.w3 = Mock()
     module.w3.ipfs.publish = Mock(return_value=CID("QmTree"))
 
     cid = module._publish_tree(tree)
 
-    module.w3.ipfs.publish.assert_called_once_with(b"tree")
+    (car,) = module.w3.ipfs.publish.call_args.args
+    assert car.read_content() == b"tree"
+    assert car.root.encode() == CARConverter().create_unixfs_based_cid(b"tree")
     assert cid == CID("QmTree")
 
 
 @pytest.mark.unit
-def test_publish_log_uploads_encoded_log(module: CSPerformanceOracle, monkeypatch: pytest.MonkeyPatch):
+def test_publish_log_uploads_encoded_log(module: CSPerformanceOracle):
     logs = Logs()
-    logs.frames = [Mock()]
-    encode_mock = Mock(return_value=b"log")
-    logs.encode = encode_mock
+    logs.frames = [
+        FramePerfLog(blockstamp=ReferenceBlockStampFactory.build(), frame=(EpochNumber(100), EpochNumber(500)))
+    ]
     module.w3 = Mock()
     module.w3.ipfs.publish = Mock(return_value=CID("QmLog"))
 
     cid = module._publish_log(logs)
 
-    encode_mock.assert_called_once()
-    module.w3.ipfs.publish.assert_called_once_with(b"log")
+    (car,) = module.w3.ipfs.publish.call_args.args
+    assert car.read_content() == logs.encode()
     assert cid == CID("QmLog")
 
 
@@ -1535,6 +1773,19 @@ def test_execute_module_no_report_blockstamp(module: CSPerformanceOracle):
     assert execute_delay is ModuleExecuteDelay.NEXT_FINALIZED_EPOCH
 
 
+@pytest.mark.unit
+def test_execute_module__accumulation_failed__waits_for_next_epoch(module: CSPerformanceOracle):
+    module._check_compatibility = Mock(return_value=True)
+    module.get_blockstamp_for_report = Mock(return_value=None)
+    module.push_epochs_demand = Mock()
+    module.accumulate_duties = Mock(side_effect=PerformanceClientError("boom", status=0, text="boom"))
+
+    execute_delay = module.execute_module(last_finalized_blockstamp=Mock(slot_number=100500))
+
+    module.accumulate_duties.assert_called_once()
+    assert execute_delay is ModuleExecuteDelay.NEXT_FINALIZED_EPOCH
+
+
 @pytest.mark.unit
 def test_execute_module_processed(module: CSPerformanceOracle):
     report_blockstamp = Mock(slot_number=100500, ref_epoch=EpochNumber(12))
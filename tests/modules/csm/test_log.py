@@ -1,8 +1,9 @@
 import json
+from dataclasses import asdict
 
 import pytest
 
-from src.modules.oracles.staking_modules.common.log import FramePerfLog, Logs
+from src.modules.oracles.staking_modules.common.log import FramePerfLog, LogJSONEncoder, Logs
 from src.modules.oracles.staking_modules.common.state import DutyAccumulator
 from src.providers.execution.contracts.cs_parameters_registry import PerformanceCoefficients
 from src.types import EpochNumber, NodeOperatorId, ReferenceBlockStamp, ValidatorIndex
@@ -108,3 +109,18 @@ def test_logs_encode(log: FramePerfLog):
     assert decoded_logs[1]["distributable"] == log_2.distributable
     assert decoded_logs[1]["distributed_rewards"] == log_2.distributed_rewards
     assert decoded_logs[1]["rebate_to_protocol"] == log_2.rebate_to_protocol
+
+
+@pytest.mark.unit
+def test_logs_encode__same_as_plain_encoding(log: FramePerfLog):
+    for no_id in range(10):
+        operator = log.operators[NodeOperatorId(no_id)]
+        operator.performance_coefficients = PerformanceCoefficients(no_id, 2, 3)
+        for i in range(10):
+            operator.validators[ValidatorIndex(no_id * 100 + i)].attestation_duty = DutyAccumulator(i, i // 2)
+            operator.validators[ValidatorIndex(no_id * 100 + i)].performance = i / 7
+    logs = Logs(frames=[log, log])
+
+    expected = LogJSONEncoder(indent=None, separators=(',', ':'), sort_keys=True).encode(asdict(logs)).encode()
+
+    assert logs.encode() == expected
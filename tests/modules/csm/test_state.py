@@ -1,8 +1,16 @@
+import random
 from collections import defaultdict
 
 import pytest
 
-from src.modules.oracles.staking_modules.common.state import DutyAccumulator, InvalidState, NetworkDuties, State
+from src.modules.oracles.staking_modules.common.state import (
+    DutyAccumulator,
+    DutyCounters,
+    InvalidState,
+    NetworkDuties,
+    PartialState,
+    State,
+)
 from src.types import EpochNumber, ValidatorIndex
 
 
@@ -234,3 +242,209 @@ def test_get_network_aggr__empty_frame_data__returns_zero_accumulator(aggr_metho
 
     assert aggr.assigned == 0
     assert aggr.included == 0
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "duties_field, untracked_field, aggr_method",
+    [
+        pytest.param("attestations", "untracked_attestations", "get_att_network_aggr", id="attestations"),
+        pytest.param("proposals", "untracked_proposals", "get_prop_network_aggr", id="proposals"),
+        pytest.param("syncs", "untracked_syncs", "get_sync_network_aggr", id="syncs"),
+    ],
+)
+def test_get_network_aggr__untracked_duties__included_in_aggregate(
+    duties_field: str, untracked_field: str, aggr_method: str
+):
+    state = make_state()
+    frame = (EpochNumber(0), EpochNumber(31))
+    frame_data = NetworkDuties()
+    getattr(frame_data, duties_field)[ValidatorIndex(1)] = DutyAccumulator(assigned=10, included=5)
+    setattr(frame_data, untracked_field, DutyAccumulator(assigned=100, included=90))
+    state.data = {frame: frame_data}
+
+    aggr = getattr(state, aggr_method)(frame)
+
+    assert aggr == DutyAccumulator(assigned=110, included=95)
+
+
+@pytest.mark.unit
+def test_get_network_aggr__invalid_untracked_accumulator__raises_error():
+    state = make_state()
+    frame = (EpochNumber(0), EpochNumber(31))
+    state.data = {frame: NetworkDuties(untracked_attestations=DutyAccumulator(assigned=1, included=2))}
+
+    with pytest.raises(InvalidState, match="Invalid accumulator of untracked validators"):
+        state.get_att_network_aggr(frame)
+
+
+@pytest.mark.unit
+def test_save_duties__untracked_duties__merged():
+    state = make_state()
+    frame = (EpochNumber(0), EpochNumber(31))
+
+    state.save_duties(frame, NetworkDuties(untracked_proposals=DutyAccumulator(assigned=3, included=2)))
+    state.save_duties(frame, NetworkDuties(untracked_proposals=DutyAccumulator(assigned=4, included=4)))
+
+    assert state.data[frame].untracked_proposals == DutyAccumulator(assigned=7, included=6)
+
+
+@pytest.mark.unit
+def test_duty_counters__synthetic_frame__equivalent_to_accumulators_mapping():
+    rng = random.Random(42)
+    expected: defaultdict[ValidatorIndex, DutyAccumulator] = defaultdict(DutyAccumulator)
+    counters = DutyCounters()
+    for _ in range(10_000):
+        validator_index = ValidatorIndex(rng.randrange(5_000))
+        assigned = rng.randrange(1, 33)
+        included = rng.randrange(assigned + 1)
+        expected[validator_index].assigned += assigned
+        expected[validator_index].included += included
+        counters.add(validator_index, assigned, included)
+
+    merged = DutyCounters()
+    merged.merge(counters)
+    merged.merge(counters)
+
+    assert counters == expected
+    assert len(counters) == len(expected)
+    assert list(counters) == sorted(expected)
+    assert counters.totals() == DutyAccumulator(
+        assigned=sum(acc.assigned for acc in expected.values()),
+        included=sum(acc.included for acc in expected.values()),
+    )
+    assert merged == {
+        validator_index: DutyAccumulator(assigned=acc.assigned * 2, included=acc.included * 2)
+        for validator_index, acc in expected.items()
+    }
+
+
+@pytest.mark.unit
+def test_duty_counters__missing_validator__behaves_as_mapping():
+    counters = DutyCounters({ValidatorIndex(5): DutyAccumulator(assigned=0, included=0)})
+
+    assert ValidatorIndex(5) in counters
+    assert ValidatorIndex(4) not in counters
+    assert ValidatorIndex(100) not in counters
+    assert counters.get(ValidatorIndex(4)) is None
+    with pytest.raises(KeyError):
+        counters[ValidatorIndex(100)]
+
+
+@pytest.mark.unit
+def test_duty_counters__item_returned__is_snapshot():
+    counters = DutyCounters({ValidatorIndex(1): DutyAccumulator(assigned=2, included=1)})
+
+    counters[ValidatorIndex(1)].assigned += 10
+
+    assert counters[ValidatorIndex(1)] == DutyAccumulator(assigned=2, included=1)
+
+
+@pytest.mark.unit
+def test_duty_counters__delete__removes_validator():
+    counters = DutyCounters({ValidatorIndex(1): DutyAccumulator(assigned=2, included=3)})
+
+    del counters[ValidatorIndex(1)]
+
+    assert counters == {}
+    assert counters.first_invalid() is None
+    assert counters.totals() == DutyAccumulator(assigned=0, included=0)
+
+
+@pytest.mark.unit
+def test_duty_counters__invalid_accumulator_fixed__not_reported():
+    counters = DutyCounters()
+    counters.add(ValidatorIndex(3), assigned=0, included=1)
+    counters.add(ValidatorIndex(1), assigned=0, included=1)
+
+    assert counters.first_invalid() == ValidatorIndex(1)
+
+    counters.add(ValidatorIndex(1), assigned=1, included=0)
+
+    assert counters.first_invalid() == ValidatorIndex(3)
+
+
+@pytest.mark.unit
+def test_network_duties__plain_mappings__converted_to_counters():
+    duties = NetworkDuties(attestations={ValidatorIndex(1): DutyAccumulator(assigned=2, included=1)})
+
+    assert isinstance(duties.attestations, DutyCounters)
+    assert isinstance(duties.proposals, DutyCounters)
+    assert duties.attestations == {ValidatorIndex(1): DutyAccumulator(assigned=2, included=1)}
+
+
+def make_partial_state() -> PartialState:
+    partial = PartialState.empty(EpochNumber(0), EpochNumber(5), 3, filtered=True)
+    partial.processed_epoch = EpochNumber(4)
+    first, second = partial.state.frames
+    partial.state.save_duties(
+        first,
+        NetworkDuties(
+            attestations={ValidatorIndex(0): DutyAccumulator(3, 2), ValidatorIndex(7): DutyAccumulator(3, 4)},
+            proposals={ValidatorIndex(7): DutyAccumulator(1, 1)},
+            untracked_attestations=DutyAccumulator(30, 28),
+        ),
+    )
+    partial.state.save_duties(second, NetworkDuties(syncs={ValidatorIndex(2): DutyAccumulator(64, 60)}))
+    return partial
+
+
+@pytest.mark.unit
+def test_partial_state__saved__loaded_equal(tmp_path):
+    partial = make_partial_state()
+    path = tmp_path / "state"
+
+    partial.save(path)
+    loaded = PartialState.load(path)
+
+    assert loaded is not None
+    assert loaded.matches(EpochNumber(0), EpochNumber(5), 3, filtered=True)
+    assert loaded.processed_epoch == partial.processed_epoch
+    assert loaded.state.data == partial.state.data
+    first_frame = loaded.state.frames[0]
+    assert loaded.state.data[first_frame].attestations.first_invalid() == ValidatorIndex(7)
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.unit
+def test_partial_state__missing_file__returns_none(tmp_path):
+    assert PartialState.load(tmp_path / "state") is None
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("offset", [0, 40, -1])
+def test_partial_state__corrupted_file__returns_none(tmp_path, offset: int):
+    path = tmp_path / "state"
+    make_partial_state().save(path)
+    data = bytearray(path.read_bytes())
+    data[offset] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    assert PartialState.load(path) is None
+    assert not path.exists()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "key",
+    [
+        (EpochNumber(1), EpochNumber(5), 3, True),
+        (EpochNumber(0), EpochNumber(8), 3, True),
+        (EpochNumber(0), EpochNumber(5), 6, True),
+        (EpochNumber(0), EpochNumber(5), 3, False),
+    ],
+)
+def test_partial_state__another_range__not_matches(key):
+    assert not make_partial_state().matches(*key)
+
+
+@pytest.mark.unit
+def test_duty_counters__from_bytes__inconsistent_columns__raises_error():
+    counters = DutyCounters({ValidatorIndex(3): DutyAccumulator(2, 1)})
+    assigned, included, present = counters.to_bytes()
+
+    assert DutyCounters.from_bytes(assigned, included, present) == counters
+    with pytest.raises(ValueError, match="different lengths"):
+        DutyCounters.from_bytes(assigned, included, present[:-1])
+    with pytest.raises(ValueError, match="presence flags"):
+        DutyCounters.from_bytes(assigned, included, present[:-1] + b"\x02")
@@ -1,3 +1,4 @@
+import json
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
 from json import JSONDecoder, JSONEncoder
@@ -49,6 +50,31 @@ class TreeTestBase[LeafType: Iterable](ABC):
         decoded = self.cls.decode(self.encoder.encode(tree.tree.dump()).encode())
         assert decoded.root == tree.root
 
+    @pytest.mark.unit
+    def test_encode__same_as_plain_tree_dump(self, tree: TreeType):
+        expected = self.cls.encoder(indent=None, separators=(',', ':'), sort_keys=True).encode(tree.dump())
+        assert tree.encode() == expected.encode()
+
+    @pytest.mark.unit
+    def test_decode_values(self, tree: TreeType):
+        root, values = self.cls.decode_values(tree.encode())
+        assert root == tree.root
+        assert values == self.values
+
+    @pytest.mark.unit
+    def test_decode_values__tampered_values__raises(self, tree: TreeType):
+        dump = json.loads(tree.encode())
+        dump["values"] = dump["values"][1:]
+
+        with pytest.raises(ValueError, match="Tree root doesn't match"):
+            self.cls.decode_values(json.dumps(dump).encode())
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("content", [b"", b"{}", b"[]", b'{"format":"standard-v1"', b'{"format":"unknown"}'])
+    def test_decode_values__invalid_dump__raises(self, content: bytes):
+        with pytest.raises(ValueError, match="Unable to load tree"):
+            self.cls.decode_values(content)
+
     @pytest.mark.unit
     def test_dump_compatibility(self, tree: TreeType):
         loaded = StandardMerkleTree.load(tree.dump())
@@ -3,8 +3,10 @@ import string
 from collections.abc import Callable, Iterable
 
 import pytest
+from web3 import Web3
 
 from src.modules.oracles.ejector.data_encode import (
+    DATA_FORMAT_LIST_WITH_KEY_INDEX,
     KEY_INDEX_LENGTH,
     MODULE_ID_LENGTH,
     NODE_OPERATOR_ID_LENGTH,
@@ -13,7 +15,7 @@ from src.modules.oracles.ejector.data_encode import (
     encode_data,
     sort_validators_to_eject,
 )
-from src.types import NodeOperatorId, StakingModuleId
+from src.types import NodeOperatorId, StakingModuleId, ValidatorIndex
 from src.web3py.extensions.lido_validators import LidoValidator
 from tests.factory.no_registry import LidoValidatorFactory
 
@@ -280,3 +282,46 @@ def test_validators_sorting_for_ejector_report(validators_to_eject):
 
         assert validator.index > last_validator_index
         last_validator_index = validator.index
+
+
+def _golden_validator(i: int) -> LidoValidator:
+    validator = LidoValidatorFactory.build(index=ValidatorIndex(i))
+    validator.validator.pubkey = "0x" + bytes([i % 256]).hex() * VALIDATOR_PUB_KEY_LENGTH
+    validator.lido_id.index = i * 7
+    return validator
+
+
+@pytest.mark.unit
+def test_encode_data__golden():
+    data = [
+        ((StakingModuleId(m), NodeOperatorId(no)), _golden_validator(i))
+        for i, (m, no) in enumerate([(2, 1), (1, 5), (1, 5), (1, 0)])
+    ]
+
+    (result, data_format) = encode_data(data)
+
+    assert data_format == DATA_FORMAT_LIST_WITH_KEY_INDEX
+    # module id | node operator id | validator index | key index | pubkey, sorted by the first three
+    assert result == bytes.fromhex(
+        "".join(
+            [
+                "000001" + "0000000000" + "0000000000000003" + "0000000000000015" + "03" * VALIDATOR_PUB_KEY_LENGTH,
+                "000001" + "0000000005" + "0000000000000001" + "0000000000000007" + "01" * VALIDATOR_PUB_KEY_LENGTH,
+                "000001" + "0000000005" + "0000000000000002" + "000000000000000e" + "02" * VALIDATOR_PUB_KEY_LENGTH,
+                "000002" + "0000000001" + "0000000000000000" + "0000000000000000" + "00" * VALIDATOR_PUB_KEY_LENGTH,
+            ]
+        )
+    )
+
+
+@pytest.mark.unit
+def test_encode_data__many_validators__golden():
+    data = [
+        ((StakingModuleId((i * 7919) % 5), NodeOperatorId((i * 104729) % 97)), _golden_validator(i))
+        for i in range(1000)
+    ]
+
+    (result, _) = encode_data(data)
+
+    assert len(result) == len(data) * RECORD_LENGTH
+    assert Web3.keccak(result).hex() == "ae5334a51a1d934328f6341f634a53d38e0bba58aa3c29555b6bb45506c4476c"
@@ -1,3 +1,4 @@
+import random
 from typing import cast
 from unittest.mock import Mock, patch
 
@@ -6,6 +7,7 @@ from web3.exceptions import ContractCustomError
 
 from src.constants import (
     EFFECTIVE_BALANCE_INCREMENT,
+    FAR_FUTURE_EPOCH,
     GWEI_TO_WEI,
     MAX_EFFECTIVE_BALANCE,
     MAX_EFFECTIVE_BALANCE_ELECTRA,
@@ -23,7 +25,13 @@ from src.providers.consensus.types import (
 from src.providers.execution.contracts.exit_bus_oracle import ExitBusOracleContract
 from src.services.exit_order_iterator import WeightsNotUpdatedError
 from src.types import BlockStamp, EpochNumber, Gwei, ReferenceBlockStamp, SlotNumber, Wei
-from src.utils.validator_balance import get_predictable_inbound_balance
+from src.utils.units import gwei_to_wei
+from src.utils.validator_balance import (
+    get_predictable_full_inbound_balance,
+    get_predictable_inbound_balance,
+    get_predictable_inbound_sweep,
+)
+from src.utils.validator_state import is_fully_withdrawable_validator
 from src.web3py.extensions.lido_validators import (
     LidoValidator,
     NodeOperatorId,
@@ -33,7 +41,7 @@ from src.web3py.types import Web3
 from tests.factory.base_oracle import EjectorProcessingStateFactory
 from tests.factory.blockstamp import BlockStampFactory, ReferenceBlockStampFactory
 from tests.factory.configs import ChainConfigFactory
-from tests.factory.no_registry import LidoValidatorFactory
+from tests.factory.no_registry import LidoValidatorFactory, ValidatorStateFactory
 
 
 def build_extended_validator(**kwargs) -> LidoValidator:
@@ -49,6 +57,36 @@ def build_extended_validator(**kwargs) -> LidoValidator:
     )
 
 
+def build_extended_validator_with_state(
+    balance: Gwei,
+    withdrawable_epoch: EpochNumber,
+    withdrawal_credentials: str = "0x01",
+    **kwargs,
+) -> LidoValidator:
+    return build_extended_validator(
+        balance=balance,
+        validator=ValidatorStateFactory.build(
+            withdrawable_epoch=withdrawable_epoch,
+            withdrawal_credentials=withdrawal_credentials,
+            effective_balance=min(balance - balance % EFFECTIVE_BALANCE_INCREMENT, MAX_EFFECTIVE_BALANCE),
+        ),
+        **kwargs,
+    )
+
+
+def get_withdrawable_balance_per_validator(validators: list[LidoValidator], epoch: EpochNumber) -> Wei:
+    """Reference withdrawable balance, checking every validator on the epoch"""
+    result = Gwei(0)
+    for v in validators:
+        if v.consolidating_as_source:
+            continue
+        if is_fully_withdrawable_validator(v.validator, v.balance, epoch):
+            result += get_predictable_full_inbound_balance(v)
+        else:
+            result += get_predictable_inbound_sweep(v)
+    return gwei_to_wei(result)
+
+
 def build_extended_validator_with_balance(balance: float, meb: int = MAX_EFFECTIVE_BALANCE, **kwargs) -> LidoValidator:
     lido_validator = LidoValidatorFactory.build_with_balance(balance, meb, **kwargs)
     return LidoValidator(
@@ -540,29 +578,45 @@ def test_get_total_active_balance(ejector: Ejector) -> None:
 def test_get_withdrawable_lido_validators_balance(
     ejector: Ejector,
     ref_blockstamp: ReferenceBlockStamp,
-    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     ejector.w3.lido_validators.get_active_lido_validators = Mock(
         return_value=[
-            build_extended_validator(balance="0"),
-            build_extended_validator(balance="0"),
-            build_extended_validator(balance="31"),
-            build_extended_validator(balance="42"),
+            build_extended_validator_with_state(balance=Gwei(0), withdrawable_epoch=EpochNumber(10)),
+            build_extended_validator_with_state(balance=Gwei(31 * 10**9), withdrawable_epoch=FAR_FUTURE_EPOCH),
+            build_extended_validator_with_state(balance=Gwei(42 * 10**9), withdrawable_epoch=EpochNumber(40)),
+            build_extended_validator_with_state(balance=Gwei(33 * 10**9), withdrawable_epoch=FAR_FUTURE_EPOCH),
         ]
     )
 
-    with monkeypatch.context() as m:
-        m.setattr(
-            ejector_module,
-            "is_fully_withdrawable_validator",
-            Mock(side_effect=lambda _1, b, _2: b > 32),
-        )
+    result = ejector._get_withdrawable_lido_validators_balance(EpochNumber(42), ref_blockstamp)
+    assert result == 43 * 10**9 * GWEI_TO_WEI, "Unexpected withdrawable amount"
 
-        result = ejector._get_withdrawable_lido_validators_balance(42, ref_blockstamp)
-        assert result == 42 * GWEI_TO_WEI, "Unexpected withdrawable amount"
+    result = ejector._get_withdrawable_lido_validators_balance(EpochNumber(39), ref_blockstamp)
+    assert result == 11 * 10**9 * GWEI_TO_WEI, "Only the sweep is expected before the withdrawable epoch"
+    ejector.w3.lido_validators.get_active_lido_validators.assert_called_once()
 
-        ejector._get_withdrawable_lido_validators_balance(42, ref_blockstamp)
-        ejector.w3.lido_validators.get_active_lido_validators.assert_called_once()
+
+@pytest.mark.unit
+def test_get_withdrawable_lido_validators_balance__random_validators__same_as_per_validator_check(
+    ejector: Ejector,
+    ref_blockstamp: ReferenceBlockStamp,
+) -> None:
+    rng = random.Random(0)
+    validators = [
+        build_extended_validator_with_state(
+            balance=Gwei(rng.choice([0, 16, 32, 33, 40, 2100]) * 10**9),
+            withdrawable_epoch=rng.choice([FAR_FUTURE_EPOCH, EpochNumber(rng.randrange(100))]),
+            withdrawal_credentials=rng.choice(["0x00", "0x01", "0x02"]),
+            consolidating_as_source=rng.choice([None, None, None, Mock()]),
+        )
+        for _ in range(200)
+    ]
+    ejector.w3.lido_validators.get_active_lido_validators = Mock(return_value=validators)
+
+    for epoch in range(0, 110, 3):
+        assert ejector._get_withdrawable_lido_validators_balance(EpochNumber(epoch), ref_blockstamp) == (
+            get_withdrawable_balance_per_validator(validators, EpochNumber(epoch))
+        )
 
 
 @pytest.mark.unit
@@ -845,26 +899,142 @@ def test_get_validators_to_eject__no_wq_pressure__no_validator_ejections(
 def test_get_withdrawable_lido_validators_balance__consolidating_as_source__excluded(
     ejector: Ejector,
     ref_blockstamp: ReferenceBlockStamp,
-    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    normal_validator = build_extended_validator_with_balance(Gwei(42))
+    normal_validator = build_extended_validator_with_state(balance=Gwei(42), withdrawable_epoch=EpochNumber(0))
     # Mark as consolidation source — this validator should be excluded from withdrawable balance
-    consolidating_validator = build_extended_validator_with_balance(Gwei(42), consolidating_as_source=Mock())
+    consolidating_validator = build_extended_validator_with_state(
+        balance=Gwei(42),
+        withdrawable_epoch=EpochNumber(0),
+        consolidating_as_source=Mock(),
+    )
 
     ejector.w3.lido_validators.get_active_lido_validators = Mock(
         return_value=[normal_validator, consolidating_validator]
     )
 
-    with monkeypatch.context() as m:
-        m.setattr(
-            ejector_module,
-            "is_fully_withdrawable_validator",
-            Mock(return_value=True),
-        )
-        # Use a different epoch to avoid LRU cache collision with other tests
-        result = ejector._get_withdrawable_lido_validators_balance(
-            EpochNumber(ref_blockstamp.ref_epoch + 1), ref_blockstamp
-        )
+    result = ejector._get_withdrawable_lido_validators_balance(
+        EpochNumber(ref_blockstamp.ref_epoch + 1), ref_blockstamp
+    )
 
     # Only the normal validator contributes; consolidating_as_source is skipped
     assert result == normal_validator.balance * GWEI_TO_WEI
+
+
+class TestGetValidatorsToEjectIncremental:
+    """
+    The predicted EL balance is recalculated after every candidate. Compares the ejection list with the one found by
+    recalculating every part of the prediction from scratch for every prefix of the candidates.
+    """
+
+    REF_EPOCH = EpochNumber(1000)
+
+    @pytest.fixture
+    def ref_blockstamp(self) -> ReferenceBlockStamp:
+        return ReferenceBlockStampFactory.build(ref_slot=self.REF_EPOCH * 32, ref_epoch=self.REF_EPOCH)
+
+    def setup_scenario(self, ejector: Ejector, chain_config: ChainConfig, seed: int) -> dict:
+        rng = random.Random(seed)
+
+        def random_validator() -> LidoValidator:
+            return build_extended_validator_with_state(
+                balance=Gwei(rng.choice([0, 31, 32, 32, 33, 64]) * 10**9),
+                withdrawable_epoch=rng.choice([FAR_FUTURE_EPOCH, EpochNumber(self.REF_EPOCH + rng.randrange(400))]),
+            )
+
+        scenario = {
+            "lido_validators": [random_validator() for _ in range(300)],
+            "going_to_exit": [random_validator() for _ in range(rng.randrange(5))],
+            "candidates": [
+                ((StakingModuleId(1), NodeOperatorId(i)), random_validator()) for i in range(rng.randrange(50, 150))
+            ],
+            "state": BeaconStateView(
+                slot=SlotNumber(self.REF_EPOCH * 32),
+                validators=[],
+                balances=[],
+                slashings=[],
+                earliest_exit_epoch=EpochNumber(self.REF_EPOCH + rng.randrange(20)),
+                exit_balance_to_consume=Gwei(rng.randrange(0, 128) * 10**9),
+            ),
+            "el_balance": Wei(rng.randrange(10**21)),
+            "rewards_per_epoch": Wei(rng.randrange(10**17)),
+            "sweep_delay": rng.randrange(10),
+            "reserve_per_frame": Wei(rng.randrange(10**20)),
+            "epochs_per_frame": rng.choice([225, 10]),
+        }
+        ejector.get_chain_config = Mock(return_value=chain_config)
+        ejector._get_total_el_balance = Mock(return_value=scenario["el_balance"])
+        ejector._get_sweep_delay_in_epochs = Mock(return_value=scenario["sweep_delay"])
+        ejector.prediction_service.get_rewards_per_epoch = Mock(return_value=scenario["rewards_per_epoch"])
+        ejector.validators_state_service.get_recently_requested_but_not_exiting_validators = Mock(
+            return_value=scenario["going_to_exit"]
+        )
+        ejector.w3.lido_validators.get_active_lido_validators = Mock(return_value=scenario["lido_validators"])
+        ejector._get_active_validators = Mock(return_value=scenario["lido_validators"])
+        ejector.w3.cc.get_state_view = Mock(return_value=scenario["state"])
+        ejector.w3.lido_contracts.lido.get_deposits_reserve_target = Mock(return_value=scenario["reserve_per_frame"])
+        ejector.w3.lido_contracts.withdrawal_queue_nft.max_steth_withdrawal_amount = Mock(return_value=Wei(10**30))
+        ejector.w3.lido_contracts.accounting_oracle.get_consensus_contract = Mock(return_value="0x" + "0" * 40)
+        ejector.w3.eth.contract = Mock(
+            return_value=Mock(get_frame_config=Mock(return_value=Mock(epochs_per_frame=scenario["epochs_per_frame"])))
+        )
+        return scenario
+
+    @staticmethod
+    def predicted_el_balance_function(ejector: Ejector, scenario: dict, blockstamp: ReferenceBlockStamp):
+        going_to_exit = Gwei(sum(map(get_predictable_inbound_balance, scenario["going_to_exit"])))
+
+        def predicted_el_balance(to_exit: Gwei) -> int:
+            exit_epoch = ejector.compute_exit_epoch_and_update_churn(
+                scenario["state"], going_to_exit + to_exit, blockstamp
+            )
+            withdrawal_epoch = EpochNumber(exit_epoch + MIN_VALIDATOR_WITHDRAWABILITY_DELAY)
+            epochs = withdrawal_epoch + scenario["sweep_delay"] - blockstamp.ref_epoch
+            return (
+                epochs * scenario["rewards_per_epoch"]
+                + get_withdrawable_balance_per_validator(scenario["lido_validators"], withdrawal_epoch)
+                + scenario["el_balance"]
+                + gwei_to_wei(going_to_exit)
+                - epochs // scenario["epochs_per_frame"] * scenario["reserve_per_frame"]
+            )
+
+        return predicted_el_balance
+
+    @staticmethod
+    def expected_validators_to_eject(predicted_el_balance, scenario: dict, to_withdraw: Wei) -> list:
+        if predicted_el_balance(Gwei(0)) >= to_withdraw:
+            return []
+
+        to_exit = Gwei(0)
+        for i, (_, validator) in enumerate(scenario["candidates"]):
+            to_exit += get_predictable_inbound_balance(validator)
+            if predicted_el_balance(to_exit) + gwei_to_wei(to_exit) >= to_withdraw:
+                return scenario["candidates"][: i + 1]
+        return scenario["candidates"]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("seed", range(8))
+    def test_get_validators_to_eject__random_scenario__same_as_recalculated_prediction(
+        self,
+        ejector: Ejector,
+        ref_blockstamp: ReferenceBlockStamp,
+        chain_config: ChainConfig,
+        seed: int,
+    ) -> None:
+        scenario = self.setup_scenario(ejector, chain_config, seed)
+        predicted_el_balance = self.predicted_el_balance_function(ejector, scenario, ref_blockstamp)
+        # Demand from a bit less than the predicted EL balance to more than all the candidates can cover
+        to_withdraw = Wei(predicted_el_balance(Gwei(0)) + (seed - 1) * len(scenario["candidates"]) * 5 * 10**18)
+        ejector.w3.lido_contracts.withdrawal_queue_nft.unfinalized_steth = Mock(return_value=to_withdraw)
+        expected = self.expected_validators_to_eject(predicted_el_balance, scenario, to_withdraw)
+
+        with patch.object(
+            ejector_module.ValidatorExitIterator,
+            "__iter__",
+            Mock(return_value=iter(SimpleIterator(scenario["candidates"]))),
+        ):
+            result = ejector.get_validators_to_eject(ref_blockstamp)
+
+        assert [v.index for _, v in result] == [v.index for _, v in expected]
+        ejector.w3.lido_validators.get_active_lido_validators.assert_called_once()
+        ejector._get_active_validators.assert_called_once()
+        ejector.w3.lido_contracts.lido.get_deposits_reserve_target.assert_called_once()
@@ -1,4 +1,6 @@
 import math
+import random
+from collections import defaultdict
 from unittest.mock import Mock
 
 import pytest
@@ -6,6 +8,7 @@ import pytest
 import src.modules.oracles.ejector.sweep as sweep_module
 from src.constants import (
     FAR_FUTURE_EPOCH,
+    MAX_EFFECTIVE_BALANCE_ELECTRA,
     MAX_PENDING_PARTIALS_PER_WITHDRAWALS_SWEEP,
     MAX_WITHDRAWALS_PER_PAYLOAD,
     MIN_ACTIVATION_BALANCE,
@@ -19,6 +22,12 @@ from src.modules.oracles.ejector.sweep import (
 )
 from src.providers.consensus.types import BeaconStateView, PendingPartialWithdrawal
 from src.types import Gwei
+from src.utils.validator_state import (
+    get_max_effective_balance,
+    is_fully_withdrawable_validator,
+    is_partially_withdrawable_validator,
+)
+from src.utils.web3converter import epoch_from_slot
 from tests.factory.consensus import BeaconStateViewFactory
 from tests.factory.no_registry import LidoValidatorFactory, ValidatorStateFactory
 
@@ -199,7 +208,7 @@ def test_predict_withdrawals_number_in_sweep_cycle__pending_partials_exceed_rati
 
     with monkeypatch.context() as m:
         m.setattr(sweep_module, "get_pending_partial_withdrawals", Mock(return_value=[Mock()] * num_pending_partials))
-        m.setattr(sweep_module, "get_validators_withdrawals", Mock(return_value=[Mock()] * num_validator_withdrawals))
+        m.setattr(sweep_module, "get_validators_withdrawals_number", Mock(return_value=num_validator_withdrawals))
 
         result = sweep_module.predict_withdrawals_number_in_sweep_cycle(state, 32)
 
@@ -223,7 +232,7 @@ def test_predict_withdrawals_number_in_sweep_cycle__empty_state__returns_zero(mo
 
     with monkeypatch.context() as m:
         m.setattr(sweep_module, "get_pending_partial_withdrawals", Mock(return_value=[]))
-        m.setattr(sweep_module, "get_validators_withdrawals", Mock(return_value=[]))
+        m.setattr(sweep_module, "get_validators_withdrawals_number", Mock(return_value=0))
 
         result = sweep_module.predict_withdrawals_number_in_sweep_cycle(state, 32)
 
@@ -244,3 +253,70 @@ def test_get_validators_withdrawals__empty_validators__returns_empty():
     result = get_validators_withdrawals(state, [], 32)
 
     assert result == []
+
+
+def get_validators_withdrawals_per_validator(
+    state: BeaconStateView, partial_withdrawals: list[Withdrawal], slots_per_epoch: int
+) -> list[Withdrawal]:
+    """Reference implementation checking validators one by one with the spec helpers."""
+    epoch = epoch_from_slot(state.slot, slots_per_epoch)
+    partially_withdrawn: dict[int, int] = defaultdict(int)
+    for withdrawal in partial_withdrawals:
+        partially_withdrawn[withdrawal.validator_index] += withdrawal.amount
+
+    withdrawals = []
+    for validator_index, validator in enumerate(state.validators):
+        balance = Gwei(state.balances[validator_index] - partially_withdrawn[validator_index])
+        if is_fully_withdrawable_validator(validator, balance, epoch):
+            withdrawals.append(Withdrawal(validator_index=validator_index, amount=balance))
+        elif is_partially_withdrawable_validator(validator, balance):
+            withdrawals.append(
+                Withdrawal(validator_index=validator_index, amount=balance - get_max_effective_balance(validator))
+            )
+    return withdrawals
+
+
+def make_random_sweep_state(rng: random.Random, validators_count: int) -> BeaconStateView:
+    validators, balances = [], []
+    for _ in range(validators_count):
+        prefix = rng.choice(['0x00', '0x01', '0x01', '0x02'])
+        max_effective_balance = MAX_EFFECTIVE_BALANCE_ELECTRA if prefix == '0x02' else MIN_ACTIVATION_BALANCE
+        effective_balance = rng.choice([max_effective_balance, max_effective_balance - 10**9, 0])
+        validators.append(
+            ValidatorStateFactory.build(
+                withdrawal_credentials=prefix + '00' * 31,
+                effective_balance=Gwei(effective_balance),
+                exit_epoch=FAR_FUTURE_EPOCH,
+                withdrawable_epoch=rng.choice([0, 10, 11, FAR_FUTURE_EPOCH]),
+            )
+        )
+        balances.append(Gwei(max(0, effective_balance + rng.randrange(-(10**9), 2 * 10**9))))
+
+    pending_partial_withdrawals = [
+        PendingPartialWithdrawal(
+            validator_index=rng.randrange(validators_count),
+            amount=Gwei(rng.randrange(1, 3 * 10**9)),
+            withdrawable_epoch=0,
+        )
+        for _ in range(rng.randrange(validators_count))
+    ]
+    return BeaconStateViewFactory.build(
+        slot=10 * 32 + rng.randrange(64),
+        validators=validators,
+        balances=balances,
+        pending_partial_withdrawals=pending_partial_withdrawals,
+        slashings=[],
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seed", range(20))
+def test_get_validators_withdrawals__random_state__same_as_per_validator_checks(seed: int):
+    rng = random.Random(seed)
+    state = make_random_sweep_state(rng, validators_count=200)
+    partial_withdrawals = get_pending_partial_withdrawals(state)
+
+    expected = get_validators_withdrawals_per_validator(state, partial_withdrawals, 32)
+
+    assert get_validators_withdrawals(state, partial_withdrawals, 32) == expected
+    assert sweep_module.get_validators_withdrawals_number(state, partial_withdrawals, 32) == len(expected)
@@ -1,3 +1,4 @@
+import random
 from unittest.mock import Mock
 
 import pytest
@@ -23,6 +24,7 @@ from src.services.exit_order_iterator import (
 )
 from src.types import Gwei, NodeOperatorId, StakingModuleId
 from src.utils.validator_balance import get_predictable_inbound_balance
+from src.utils.validator_state import get_max_effective_balance
 from src.web3py.extensions.lido_validators import NodeOperator, NodeOperatorLimitMode, StakingModule
 from tests.factory.blockstamp import ReferenceBlockStampFactory
 from tests.factory.meta_registry import OperatorGroupFactory
@@ -1371,3 +1373,201 @@ class TestGetRemainingForcedEdgeCases:
         result = iterator.get_remaining_forced_validators()
 
         assert result == [], "Empty list when no validators are available despite forced exit need"
+
+
+class SortingExitIterator(ValidatorExitIterator):
+    """Reference exit order, sorting all node operators by the predicates for every ejected validator"""
+
+    def __next__(self):
+        for gid, _ in sorted(self.node_operators_stats.items(), key=lambda item: self._no_predicate(item[1])):
+            if not self._has_exitable_validators(gid):
+                continue
+
+            v = self._eject_validator(gid)
+            self.max_current_exit_balance += get_max_effective_balance(v.validator)
+            if self.max_current_exit_balance > self.exit_limit_in_gwei:
+                raise StopIteration
+            return gid, v
+
+        raise StopIteration
+
+    def get_remaining_forced_validators(self):
+        result = []
+        while True:
+            for gid, no_stats in sorted(
+                self.node_operators_stats.items(), key=lambda item: self.no_remaining_forced_predicate(item[1])
+            ):
+                if self._no_force_predicate(no_stats) == 0:
+                    return result
+                if self._has_exitable_validators(gid):
+                    v = self._eject_validator(gid)
+                    self.max_current_exit_balance += get_max_effective_balance(v.validator)
+                    if self.max_current_exit_balance > self.exit_limit_in_gwei:
+                        return result
+                    result.append((gid, v))
+                    break
+            else:
+                return result
+
+
+def make_random_exit_layout(seed: int, blockstamp) -> dict:
+    """Random CMv1, CMv2 with meta-registry groups and equal weight modules"""
+    rng = random.Random(seed)
+    indexes = iter(rng.sample(range(1, 100_000), 5_000))
+
+    modules = [
+        make_staking_module(1, threshold=rng.choice([1000, 3000, 10000]), name=CURATED_V1_MODULE_NAME),
+        make_staking_module(2, threshold=rng.choice([1000, 3000, 10000]), name=CURATED_V2_MODULE_NAME),
+        make_staking_module(3, threshold=rng.choice([500, 2000, 10000])),
+        make_staking_module(4, threshold=rng.choice([500, 2000, 10000])),
+    ]
+    operators = {}
+    weights = {}
+    validators = {}
+    pending = {}
+    for sm, operators_count in zip(modules, (12, 10, 40, 6), strict=True):
+        for no_id in range(operators_count):
+            limit_mode = rng.choices(
+                [NodeOperatorLimitMode.DISABLED, NodeOperatorLimitMode.SOFT, NodeOperatorLimitMode.FORCE],
+                weights=[8, 1, 1],
+            )[0]
+            no = make_node_operator(no_id, sm, target=rng.randrange(0, 6), limit_mode=limit_mode)
+            gid = (sm.id, no.id)
+            operators[gid] = no
+            if sm.id == 2:
+                weights[gid] = float(rng.choice([1, 2, 5]) * 10000)
+            validators[gid] = [
+                LidoValidatorFactory.build(
+                    index=next(indexes),
+                    # Few distinct balances to have ties in the target stake deviation
+                    balance=Gwei(rng.choice([32, 32, 32, 31, 16, 64]) * 10**9),
+                    validator=ValidatorStateFactory.build(
+                        activation_epoch=rng.randrange(0, blockstamp.ref_epoch),
+                        effective_balance=Gwei(32 * 10**9),
+                        withdrawal_credentials=rng.choice(["0x01", "0x02"]),
+                    ),
+                )
+                for _ in range(rng.choice([0, 1, 3, 8]))
+            ]
+            pending[gid] = rng.choice([0, 0, 0, 1, 2])
+
+    cm_v1_ids = [gid[1] for gid in operators if gid[0] == 1]
+    cm_v2_ids = [gid[1] for gid in operators if gid[0] == 2]
+    rng.shuffle(cm_v1_ids)
+    rng.shuffle(cm_v2_ids)
+    groups = []
+    for external_count, internal_count in ((1, 2), (2, 1), (2, 3), (1, 0)):
+        groups.append(
+            OperatorGroupFactory.build(
+                sub_node_operators=[
+                    SubNodeOperator(node_operator_id=cm_v2_ids.pop(), share=1) for _ in range(internal_count)
+                ],
+                external_operators=[
+                    ExternalOperator(data=bytes([0, 1]) + cm_v1_ids.pop().to_bytes(8, byteorder='big'))
+                    for _ in range(external_count)
+                ],
+            )
+        )
+
+    return {
+        "modules": modules,
+        "operators": operators,
+        "weights": weights,
+        "validators": validators,
+        "pending": pending,
+        "groups": groups,
+    }
+
+
+def setup_exit_layout(it: ValidatorExitIterator, layout: dict) -> None:
+    it._reset_iterator_data()
+    it.module_stats = {sm.id: StakingModuleStats(sm) for sm in layout["modules"]}
+    for gid, no in layout["operators"].items():
+        it.node_operators_stats[gid] = NodeOperatorStats(
+            node_operator=no,
+            module_stats=it.module_stats[gid[0]],
+            force_exit_to=no.target_validators_count
+            if no.is_target_limit_active == NodeOperatorLimitMode.FORCE
+            else None,
+            soft_exit_to=no.target_validators_count
+            if no.is_target_limit_active == NodeOperatorLimitMode.SOFT
+            else None,
+            weight=layout["weights"].get(gid, 10 * 10000),
+        )
+        it.exitable_validators[gid] = list(layout["validators"][gid])
+
+    it._calculate_current_cl_balance()
+    for gid, count in layout["pending"].items():
+        balance = Gwei(count * 32 * 10**9)
+        it.total_lido_predictable_balance += balance
+        it.module_stats[gid[0]].predictable_balance += balance
+        it.module_stats[gid[0]].total_stake += balance
+        it.node_operators_stats[gid].predictable_validators += count
+        it.node_operators_stats[gid].predictable_balance += balance
+        it.node_operators_stats[gid].total_stake += balance
+
+    for group in layout["groups"]:
+        it._process_group(group, (StakingModuleId(1), Mock()), (StakingModuleId(2), Mock()))
+    it.cm_v2_id = StakingModuleId(2)
+    it._calculate_sm_weights()
+
+    it.max_current_exit_balance = Gwei(0)
+    it.exit_limit_in_gwei = Gwei(10**9 * 10**9)
+
+
+def exit_order(it: ValidatorExitIterator, limit: int | None = None) -> list[tuple]:
+    order = []
+    while limit is None or len(order) < limit:
+        try:
+            gid, v = next(it)
+        except StopIteration:
+            break
+        order.append((gid, v.index))
+    return order
+
+
+@pytest.mark.unit
+class TestExitOrderEquivalence:
+    @pytest.fixture
+    def reference(self, web3):
+        return SortingExitIterator(
+            web3,
+            ReferenceBlockStampFactory.build(),
+            ChainConfig(slots_per_epoch=32, seconds_per_slot=12, genesis_time=0),
+        )
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_next__random_layout__same_order_as_sorting(self, iterator, reference, seed):
+        layout = make_random_exit_layout(seed, iterator.blockstamp)
+        setup_exit_layout(iterator, layout)
+        setup_exit_layout(reference, layout)
+
+        order = exit_order(iterator)
+
+        assert order == exit_order(reference)
+        assert len(order) == sum(len(validators) for validators in layout["validators"].values())
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_get_remaining_forced_validators__after_next__same_order_as_sorting(self, iterator, reference, seed):
+        layout = make_random_exit_layout(seed, iterator.blockstamp)
+        setup_exit_layout(iterator, layout)
+        setup_exit_layout(reference, layout)
+
+        assert exit_order(iterator, limit=seed * 3) == exit_order(reference, limit=seed * 3)
+        forced = iterator.get_remaining_forced_validators()
+
+        assert [(gid, v.index) for gid, v in forced] == [
+            (gid, v.index) for gid, v in reference.get_remaining_forced_validators()
+        ]
+        assert exit_order(iterator) == exit_order(reference)
+
+    def test_next__exit_limit__same_order_as_sorting(self, iterator, reference):
+        layout = make_random_exit_layout(42, iterator.blockstamp)
+        setup_exit_layout(iterator, layout)
+        setup_exit_layout(reference, layout)
+        iterator.exit_limit_in_gwei = reference.exit_limit_in_gwei = Gwei(10_000 * 10**9)
+
+        order = exit_order(iterator)
+
+        assert order == exit_order(reference)
+        assert 0 < len(order) < sum(len(validators) for validators in layout["validators"].values())
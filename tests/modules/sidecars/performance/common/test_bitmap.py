@@ -0,0 +1,48 @@
+import base64
+from compression import zstd
+
+import pytest
+
+from src.modules.sidecars.performance.common.bitmap import (
+    MAX_BITMAP_BYTES,
+    decode_indexes_bitmap,
+    encode_indexes_bitmap,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "indexes",
+    [
+        pytest.param([], id="empty"),
+        pytest.param([0], id="zero"),
+        pytest.param([7, 8, 9], id="byte-boundary"),
+        pytest.param([5, 1, 5, 3], id="unordered-with-duplicates"),
+        pytest.param(range(0, 2_000_000, 3), id="large"),
+    ],
+)
+def test_encode_indexes_bitmap__round_trip__returns_same_indexes(indexes):
+    encoded = encode_indexes_bitmap(indexes)
+
+    assert decode_indexes_bitmap(encoded) == frozenset(indexes)
+
+
+@pytest.mark.unit
+def test_encode_indexes_bitmap__negative_index__raises_error():
+    with pytest.raises(ValueError, match="Negative validator index"):
+        encode_indexes_bitmap([1, -1])
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "data, match",
+    [
+        pytest.param("not base64!", "not a valid base64", id="invalid-base64"),
+        pytest.param(base64.b64encode(b"not zstd").decode(), "not a valid zstd frame", id="invalid-zstd"),
+        pytest.param(base64.b64encode(zstd.compress(b"\x01" * 100)[:-4]).decode(), "truncated", id="truncated"),
+        pytest.param(base64.b64encode(zstd.compress(bytes(MAX_BITMAP_BYTES + 1))).decode(), "exceeds", id="too-large"),
+    ],
+)
+def test_decode_indexes_bitmap__invalid_data__raises_error(data: str, match: str):
+    with pytest.raises(ValueError, match=match):
+        decode_indexes_bitmap(data)
@@ -573,3 +573,27 @@ class TestGetEpochsData:
             db.get_complete_epochs_data(EpochNumber(10), EpochNumber(15))
 
         db.get_epochs_data.assert_called_once_with(EpochNumber(10), EpochNumber(15))
+
+
+class TestDutyContentHash:
+    def test_same_content__same_hash(self):
+        first = Duty(epoch=10, missed_attestation_vids=[1, 2], syncs_vids=[3], syncs_misses=[1])
+        second = Duty(epoch=10, missed_attestation_vids=[1, 2], syncs_vids=[3], syncs_misses=[1])
+
+        assert first.content_hash == second.content_hash
+
+    @pytest.mark.parametrize(
+        "changes",
+        [
+            pytest.param({"epoch": 11}, id="epoch"),
+            pytest.param({"missed_attestation_vids": [2, 1]}, id="missed-attestations-order"),
+            pytest.param({"proposals_vids": [5], "proposals_flags": [False]}, id="proposals"),
+            pytest.param({"syncs_misses": [2]}, id="sync-misses"),
+        ],
+    )
+    def test_changed_content__different_hash(self, changes):
+        fields = {"epoch": 10, "missed_attestation_vids": [1, 2], "syncs_vids": [3], "syncs_misses": [1]}
+        original = Duty(**fields)
+        changed = Duty(**{**fields, **changes})
+
+        assert original.content_hash != changed.content_hash
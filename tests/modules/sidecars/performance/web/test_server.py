@@ -1,10 +1,14 @@
+import json
+from compression import zstd
 from datetime import UTC, datetime
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from starlette.testclient import TestClient
 
+from src.modules.sidecars.performance.common.bitmap import encode_indexes_bitmap
 from src.modules.sidecars.performance.common.db import DutiesDB, Duty, EpochsDemand, IncompleteEpochRangeError
+from src.modules.sidecars.performance.web.middleware import negotiate_encoding
 from src.modules.sidecars.performance.web.server import app, get_db
 
 
@@ -118,6 +122,15 @@ class TestEpochsData:
         assert data[0]["epoch"] == 10
         assert data[1]["epoch"] == 11
 
+    def test_returns_content_hash_of_each_epoch(self, client, mock_db):
+        duty = Duty(epoch=10, missed_attestation_vids=[1, 2], proposals_vids=[3], proposals_flags=[True])
+        mock_db.get_complete_epochs_data.return_value = [duty]
+
+        response = client.get("/v1/epochs", params={"from": 10, "to": 10})
+
+        assert response.status_code == 200
+        assert response.json()[0]["content_hash"] == duty.content_hash
+
     def test_returns_409_when_range_has_gaps(self, client, mock_db):
         mock_db.get_complete_epochs_data.side_effect = IncompleteEpochRangeError(
             from_epoch=10,
@@ -142,6 +155,77 @@ class TestEpochsData:
         assert response.status_code == 422
 
 
+class TestFilteredEpochsData:
+    def test_returns_duties_of_requested_validators_with_summary(self, client, mock_db):
+        mock_db.get_complete_epochs_data.return_value = [
+            Duty(
+                epoch=10,
+                missed_attestation_vids=[1, 2, 5],
+                proposals_vids=[3, 5],
+                proposals_flags=[True, False],
+                syncs_vids=[4, 5, 6],
+                syncs_misses=[0, 2, 1],
+            ),
+        ]
+
+        response = client.post(
+            "/v1/epochs",
+            json={"from": 10, "to": 10, "validator_indexes": encode_indexes_bitmap([2, 5])},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "epoch": 10,
+                "missed_attestation_vids": [2, 5],
+                "proposals_vids": [5],
+                "proposals_flags": [False],
+                "syncs_vids": [5],
+                "syncs_misses": [2],
+                "summary": {
+                    "missed_attestations": 3,
+                    "proposals_assigned": 2,
+                    "proposals_included": 1,
+                    "syncs_assigned": 3,
+                    "syncs_missed": 3,
+                },
+            }
+        ]
+        mock_db.get_complete_epochs_data.assert_called_once_with(10, 10)
+
+    def test_returns_409_when_range_has_gaps(self, client, mock_db):
+        mock_db.get_complete_epochs_data.side_effect = IncompleteEpochRangeError(
+            from_epoch=10,
+            to_epoch=15,
+            missing_epochs=[11],
+        )
+
+        response = client.post(
+            "/v1/epochs",
+            json={"from": 10, "to": 15, "validator_indexes": encode_indexes_bitmap([1])},
+        )
+
+        assert response.status_code == 409
+
+    @pytest.mark.parametrize(
+        "validator_indexes",
+        [
+            pytest.param("not a bitmap", id="invalid-bitmap"),
+            pytest.param([1, 2], id="plain-list"),
+        ],
+    )
+    def test_rejects_invalid_validator_indexes(self, client, validator_indexes):
+        response = client.post("/v1/epochs", json={"from": 10, "to": 11, "validator_indexes": validator_indexes})
+        assert response.status_code == 422
+
+    def test_rejects_range_too_large(self, client):
+        response = client.post(
+            "/v1/epochs",
+            json={"from": 0, "to": 100000, "validator_indexes": encode_indexes_bitmap([1])},
+        )
+        assert response.status_code == 422
+
+
 class TestEpochData:
     def test_returns_duty_when_found(self, client, mock_db):
         duty = Duty(
@@ -376,3 +460,75 @@ class TestRetentionSettings:
             json={"retention_epochs": -1},
         )
         assert response.status_code == 422
+
+
+class TestCompression:
+    @pytest.fixture
+    def large_duties(self, mock_db):
+        duties = [
+            Duty(
+                epoch=epoch,
+                missed_attestation_vids=list(range(1000)),
+                proposals_vids=[],
+                proposals_flags=[],
+                syncs_vids=[],
+                syncs_misses=[],
+            )
+            for epoch in range(10, 15)
+        ]
+        mock_db.get_complete_epochs_data.return_value = duties
+        return duties
+
+    def test_epochs_data__accepts_zstd__returns_zstd_encoded(self, client, large_duties):
+        with client.stream(
+            "GET", "/v1/epochs", params={"from": 10, "to": 14}, headers={"Accept-Encoding": "zstd, gzip"}
+        ) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "zstd"
+        assert "Accept-Encoding" in response.headers["vary"]
+        data = json.loads(zstd.decompress(raw))
+        assert [item["epoch"] for item in data] == [10, 11, 12, 13, 14]
+        assert data[0]["missed_attestation_vids"] == list(range(1000))
+        assert len(raw) < len(json.dumps(data))
+
+    def test_epochs_data__accepts_gzip_only__returns_gzip_encoded(self, client, large_duties):
+        response = client.get("/v1/epochs", params={"from": 10, "to": 14}, headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert [item["epoch"] for item in response.json()] == [10, 11, 12, 13, 14]
+
+    def test_epochs_data__no_accepted_encoding__returns_identity(self, client, large_duties):
+        response = client.get("/v1/epochs", params={"from": 10, "to": 14}, headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert len(response.json()) == 5
+
+    def test_health__small_response__returns_identity(self, client):
+        response = client.get("/health", headers={"Accept-Encoding": "zstd, gzip"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("zstd", "zstd"),
+        ("gzip, zstd", "zstd"),
+        ("zstd;q=0.5, gzip", "gzip"),
+        ("zstd;q=0, gzip;q=0.1", "gzip"),
+        ("zstd;q=0, gzip;q=0", None),
+        ("*", "zstd"),
+        ("*, zstd;q=0", "gzip"),
+        ("gzip;q=invalid, br", None),
+    ],
+)
+def test_negotiate_encoding__accept_encoding_header__picks_preferred(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, ("zstd", "gzip")) == expected
@@ -0,0 +1,120 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.metrics.prometheus.basic import IPFS_CACHE_REQUESTS
+from src.providers.ipfs import CID, IPFSCache
+from src.utils.car import CARConverter
+
+
+CONTENT = b"hardcoded_fetched_content"
+CONTENT_CID = CID("QmWWiPYSquMJAizMhWMimhmZiHdz8Q9owhv9NyzZm4RDX3")
+CONTENT_CID_V1 = CID("bafybeidzof3oims3ti27awbrtoyynstz5clxou6qeys6hpfrutmwbwtxny")
+
+
+def content_with_cid(i: int) -> tuple[CID, bytes]:
+    content = i.to_bytes(4) * 32
+    return CID(CARConverter().create_unixfs_based_cid(content)), content
+
+
+@pytest.fixture()
+def cache(tmp_path: Path) -> IPFSCache:
+    return IPFSCache(tmp_path / "ipfs", max_size=1024)
+
+
+@pytest.mark.unit
+def test_get__stored_content__hit_counted(cache: IPFSCache):
+    hits = IPFS_CACHE_REQUESTS.labels(result="hit")._value.get()
+    misses = IPFS_CACHE_REQUESTS.labels(result="miss")._value.get()
+
+    assert cache.get(CONTENT_CID) is None
+    cache.put(CONTENT_CID, CONTENT)
+    assert cache.get(CONTENT_CID) == CONTENT
+
+    assert IPFS_CACHE_REQUESTS.labels(result="hit")._value.get() == hits + 1
+    assert IPFS_CACHE_REQUESTS.labels(result="miss")._value.get() == misses + 1
+
+
+@pytest.mark.unit
+def test_get__cid_v1__same_entry_as_cid_v0(cache: IPFSCache):
+    cache.put(CONTENT_CID_V1, CONTENT)
+
+    assert cache.get(CONTENT_CID) == CONTENT
+    assert cache.get(CONTENT_CID_V1) == CONTENT
+
+
+@pytest.mark.unit
+def test_get__corrupted_entry__dropped(cache: IPFSCache):
+    corrupted = IPFS_CACHE_REQUESTS.labels(result="corrupted")._value.get()
+    cache.put(CONTENT_CID, CONTENT)
+    (cache.path / str(CONTENT_CID)).write_bytes(b"corrupted_fetched_content")
+
+    assert cache.get(CONTENT_CID) is None
+
+    assert not (cache.path / str(CONTENT_CID)).exists()
+    assert IPFS_CACHE_REQUESTS.labels(result="corrupted")._value.get() == corrupted + 1
+
+
+@pytest.mark.unit
+def test_put__content_not_matching_cid__not_stored(cache: IPFSCache):
+    cache.put(CONTENT_CID, b"another content")
+
+    assert not any(cache.path.iterdir())
+    assert cache._size == 0
+
+
+@pytest.mark.unit
+def test_put__invalid_cid__ignored(cache: IPFSCache):
+    cache.put(CID("QmCID1"), CONTENT)
+
+    assert cache.get(CID("QmCID1")) is None
+    assert not any(cache.path.iterdir())
+
+
+@pytest.mark.unit
+def test_put_car__content_streamed__stored_under_root_without_hashing(cache: IPFSCache):
+    car = CARConverter().create_car([CONTENT[:10], CONTENT[10:]])
+
+    with patch.object(CARConverter, "create_unixfs_based_cid") as create_cid:
+        cache.put_car(car)
+
+    create_cid.assert_not_called()
+    assert (cache.path / str(CONTENT_CID)).read_bytes() == CONTENT
+    assert cache._size == len(CONTENT)
+
+
+@pytest.mark.unit
+def test_put_car__over_max_size__not_stored(cache: IPFSCache):
+    cache.put_car(CARConverter().create_car([b"x" * 2048]))
+
+    assert not any(cache.path.iterdir())
+    assert cache._size == 0
+
+
+@pytest.mark.unit
+def test_get__after_restart__served_from_disk(tmp_path: Path):
+    IPFSCache(tmp_path / "ipfs", max_size=1024).put(CONTENT_CID, CONTENT)
+
+    restarted = IPFSCache(tmp_path / "ipfs", max_size=1024)
+
+    assert restarted.get(CONTENT_CID) == CONTENT
+    assert restarted._size == len(CONTENT)
+
+
+@pytest.mark.unit
+def test_put__over_max_size__least_recently_used_evicted(cache: IPFSCache):
+    entries = [content_with_cid(i) for i in range(9)]
+    for i, (cid, content) in enumerate(entries[:8]):
+        cache.put(cid, content)
+        os.utime(cache.path / str(cid), ns=(i, i))
+    # Read the oldest entry to make it the most recently used one
+    assert cache.get(entries[0][0]) == entries[0][1]
+
+    cache.put(*entries[8])
+
+    assert cache._size <= cache.max_size
+    assert cache.get(entries[0][0]) == entries[0][1]
+    assert cache.get(entries[1][0]) is None
+    assert cache.get(entries[8][0]) == entries[8][1]
@@ -5,6 +5,7 @@ from multiformats.multibase.err import MultibaseKeyError
 
 from src.providers.ipfs import CID, CIDv0, IPFSProvider
 from src.providers.ipfs.types import CIDValidationError
+from src.utils.car import CARConverter
 
 
 @pytest.mark.unit
@@ -72,6 +73,16 @@ class TestIPFS:
         with pytest.raises(CIDValidationError):
             provider.publish(content)
 
+    def test_publish__valid_cid__content_hashed_once(self, test_provider):
+        content = b"mock car content for upload test"
+        provider = test_provider(CARConverter().create_unixfs_based_cid(content))
+
+        with patch.object(CARConverter, "create_unixfs_based_cid") as create_cid:
+            result = provider.publish(content)
+
+        create_cid.assert_not_called()
+        assert result == CARConverter().create_unixfs_based_cid(content)
+
     @patch('src.variables.IPFS_VALIDATE_CID', False)
     def test_fetch__validation_disabled__no_validation_performed(self, test_provider):
         provider = test_provider()
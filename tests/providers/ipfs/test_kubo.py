@@ -1,3 +1,4 @@
+import json
 from unittest.mock import patch
 
 import pytest
@@ -8,6 +9,7 @@ from src.providers.ipfs.cid import CID
 from src.providers.ipfs.filebase import Filebase
 from src.providers.ipfs.kubo import Kubo
 from src.providers.ipfs.types import FetchError, PinError, UploadError
+from src.utils.car import CARConverter
 
 
 @pytest.mark.unit
@@ -169,7 +171,12 @@ class TestKubo:
         upload_response = {"Hash": "QmTvfdWcdo964nULYqsDtLfUV7Gj7Yrob8msaeVJZo58zc"}
         cid = CID("QmTvfdWcdo964nULYqsDtLfUV7Gj7Yrob8msaeVJZo58zc")
 
-        responses.add(responses.POST, "http://localhost:5001/api/v0/add", json=upload_response, status=200)
+        responses.add(
+            responses.POST,
+            "http://localhost:5001/api/v0/dag/import",
+            body=json.dumps({"Root": {"Cid": {"/": upload_response["Hash"]}, "PinErrorMsg": ""}}),
+            status=200,
+        )
         responses.add(
             responses.POST,
             "http://localhost:5001/api/v0/pin/add",
@@ -182,6 +189,35 @@ class TestKubo:
         assert str(result) == str(cid)
         assert len(responses.calls) == 2
 
+    @responses.activate
+    def test_publish_car__car_imported__cid_validated_against_car_root(self, kubo_provider):
+        car = CARConverter().create_car([b"x" * 300000])
+        root = car.root.encode()
+        imported = []
+
+        def dag_import(request):
+            body = b"".join(request.body)
+            imported.append(body)
+            return 200, {}, json.dumps({"Root": {"Cid": {"/": root}, "PinErrorMsg": ""}}) + "\n"
+
+        responses.add_callback(responses.POST, "http://localhost:5001/api/v0/dag/import", callback=dag_import)
+        responses.add(responses.POST, "http://localhost:5001/api/v0/pin/add", json={"Pins": [root]}, status=200)
+
+        result = kubo_provider.publish_car(car, "report.json")
+
+        assert str(result) == root
+        assert car.read() in imported[0]
+        assert b'filename="report.json"' in imported[0]
+        assert "pin-roots=true" in responses.calls[0].request.url
+
+    @responses.activate
+    @pytest.mark.parametrize("body", ["", "not json", json.dumps({"Stats": {"BlockCount": 1}})])
+    def test_upload_car__no_root_in_response__raises_upload_error(self, kubo_provider, body):
+        responses.add(responses.POST, "http://localhost:5001/api/v0/dag/import", body=body, status=200)
+
+        with pytest.raises(UploadError):
+            kubo_provider.upload_car(CARConverter().create_car([b"content"]))
+
     @responses.activate
     def test_pin__successful__does_not_raise(self, kubo_provider):
         cid = CID("QmTvfdWcdo964nULYqsDtLfUV7Gj7Yrob8msaeVJZo58zc")
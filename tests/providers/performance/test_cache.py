@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+from src.modules.sidecars.performance.common.db import Duty
+from src.providers.performance.cache import EpochsDutiesCache
+from src.types import EpochNumber
+
+
+@pytest.fixture()
+def cache(tmp_path: Path) -> EpochsDutiesCache:
+    return EpochsDutiesCache(tmp_path / "epochs")
+
+
+def make_item(epoch: int) -> dict:
+    return Duty(epoch=epoch, missed_attestation_vids=[1, 2], proposals_vids=[3], proposals_flags=[True]).model_dump()
+
+
+@pytest.mark.unit
+def test_get__stored_epoch__returns_duty(cache: EpochsDutiesCache):
+    cache.put(EpochNumber(10), make_item(10))
+
+    assert cache.has(EpochNumber(10))
+    assert cache.get(EpochNumber(10)) == Duty(
+        epoch=10, missed_attestation_vids=[1, 2], proposals_vids=[3], proposals_flags=[True]
+    )
+
+
+@pytest.mark.unit
+def test_get__missing_epoch__returns_none(cache: EpochsDutiesCache):
+    assert not cache.has(EpochNumber(10))
+    assert cache.get(EpochNumber(10)) is None
+
+
+@pytest.mark.unit
+def test_put__temporary_files__not_left_behind(cache: EpochsDutiesCache):
+    cache.put(EpochNumber(10), make_item(10))
+
+    assert [path.name for path in cache.path.iterdir()] == ["10.json.zst"]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "item",
+    [
+        pytest.param({**make_item(10), "content_hash": "0" * 32}, id="content-hash-mismatch"),
+        pytest.param(make_item(11), id="epoch-mismatch"),
+        pytest.param({**make_item(10), "proposals_flags": "broken"}, id="invalid-duty"),
+    ],
+)
+def test_get__entry_does_not_match__drops_entry(cache: EpochsDutiesCache, item: dict):
+    cache.put(EpochNumber(10), item)
+
+    assert cache.get(EpochNumber(10)) is None
+    assert not cache.has(EpochNumber(10))
+
+
+@pytest.mark.unit
+def test_get__corrupted_file__drops_entry(cache: EpochsDutiesCache):
+    (cache.path / "10.json.zst").write_bytes(b"not zstd")
+
+    assert cache.get(EpochNumber(10)) is None
+    assert not cache.has(EpochNumber(10))
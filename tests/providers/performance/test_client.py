@@ -1,10 +1,19 @@
-from unittest.mock import Mock
+import json
+import threading
+import time
+from compression import zstd
+from pathlib import Path
+from unittest.mock import Mock, patch
 
 import pytest
+import responses
 
-from src.modules.sidecars.performance.common.db import Duty, EpochsDemand
+from src import variables
+from src.modules.sidecars.performance.common.bitmap import decode_indexes_bitmap
+from src.modules.sidecars.performance.common.db import DutiesSummary, Duty, EpochsDemand, FilteredDuty
 from src.providers.http_provider import data_is_bool, data_is_int, data_is_list
-from src.providers.performance.client import PerformanceClient, PerformanceClientError
+from src.providers.performance.cache import EpochsDutiesCache
+from src.providers.performance.client import EpochsBatchSizer, PerformanceClient, PerformanceClientError
 from src.types import EpochNumber
 
 
@@ -155,6 +164,212 @@ def test_get_epochs_data(client: PerformanceClient):
     )
 
 
+@pytest.mark.unit
+def test_get_epochs_data__validator_indexes_given__posts_bitmap_and_yields_filtered_duties(client: PerformanceClient):
+    summary = {
+        "missed_attestations": 5,
+        "proposals_assigned": 1,
+        "proposals_included": 1,
+        "syncs_assigned": 2,
+        "syncs_missed": 0,
+    }
+    raw = [
+        {
+            "epoch": 100,
+            "missed_attestation_vids": [101],
+            "proposals_vids": [],
+            "proposals_flags": [],
+            "syncs_vids": [],
+            "syncs_misses": [],
+            "summary": summary,
+        },
+    ]
+    client._post = Mock(return_value=(raw, {}))
+
+    result = list(client.get_epochs_data(EpochNumber(100), EpochNumber(100), validator_indexes=[101, 203]))
+
+    assert result == [
+        FilteredDuty(epoch=100, missed_attestation_vids=[101], summary=DutiesSummary.model_validate(summary)),
+    ]
+    client._post.assert_called_once()
+    endpoint = client._post.call_args.args[0]
+    body = client._post.call_args.kwargs["body_data"]
+    assert endpoint == "v1/epochs"
+    assert body["from"] == 100
+    assert body["to"] == 100
+    assert decode_indexes_bitmap(body["validator_indexes"]) == {101, 203}
+    assert client._post.call_args.kwargs["validate_response"] is data_is_list
+
+
+def duties_for_range(query_params: dict) -> list[dict]:
+    return [{"epoch": epoch} for epoch in range(query_params["from"], query_params["to"] + 1)]
+
+
+@pytest.mark.unit
+def test_get_epochs_data__batches_complete_out_of_order__yields_epochs_in_order(client: PerformanceClient):
+    def get(endpoint, query_params, validate_response):
+        # The first batches are the slowest ones.
+        time.sleep(0.05 * (10 - query_params["from"]) / 10)
+        return duties_for_range(query_params), {}
+
+    client._get = Mock(side_effect=get)
+
+    with (
+        patch.object(variables, "PERFORMANCE_COLLECTOR_EPOCHS_BATCH_SIZE", 2),
+        patch.object(variables, "PERFORMANCE_CLIENT_MAX_CONCURRENCY", 3),
+    ):
+        result = list(client.get_epochs_data(EpochNumber(0), EpochNumber(9)))
+
+    assert [duty.epoch for duty in result] == list(range(10))
+    assert client._get.call_count > 1
+
+
+@pytest.mark.unit
+def test_get_epochs_data__max_concurrency__fetches_batches_in_parallel(client: PerformanceClient):
+    # Every request blocks until all three are in flight, so sequential fetching would time out.
+    barrier = threading.Barrier(3, timeout=5)
+
+    def get(endpoint, query_params, validate_response):
+        barrier.wait()
+        return duties_for_range(query_params), {}
+
+    client._get = Mock(side_effect=get)
+
+    with (
+        patch.object(variables, "PERFORMANCE_COLLECTOR_EPOCHS_BATCH_SIZE", 1),
+        patch.object(variables, "PERFORMANCE_CLIENT_MAX_CONCURRENCY", 3),
+    ):
+        result = list(client.get_epochs_data(EpochNumber(0), EpochNumber(2)))
+
+    assert [duty.epoch for duty in result] == [0, 1, 2]
+
+
+@pytest.mark.unit
+@responses.activate
+def test_get_epochs_data__broken_body__retries_batch():
+    client = PerformanceClient(hosts=[HOST], request_timeout=5, retry_total=1, retry_backoff_factor=0)
+    responses.get(f"{HOST}/v1/epochs", body='[{"epoch": 1')
+    responses.get(f"{HOST}/v1/epochs", json=[Duty(epoch=100).model_dump()])
+
+    result = list(client.get_epochs_data(EpochNumber(100), EpochNumber(100)))
+
+    assert result == [Duty(epoch=100)]
+    assert len(responses.calls) == 2
+
+
+@pytest.mark.unit
+@responses.activate
+@pytest.mark.parametrize("validator_indexes", [None, [1]], ids=["all", "filtered"])
+def test_get_epochs_data__persistent_server_error__retried_by_adapter_only(validator_indexes: list[int] | None):
+    client = PerformanceClient(hosts=[HOST], request_timeout=5, retry_total=2, retry_backoff_factor=0)
+    responses.get(f"{HOST}/v1/epochs", status=503)
+    responses.post(f"{HOST}/v1/epochs", status=503)
+
+    with pytest.raises(PerformanceClientError):
+        list(client.get_epochs_data(EpochNumber(100), EpochNumber(100), validator_indexes))
+
+    # The first attempt and `retry_total` retries of the adapter
+    assert len(responses.calls) == 3
+
+
+@pytest.mark.unit
+def test_get_epochs_data__client_error__raises_without_retry():
+    client = PerformanceClient(hosts=[HOST], request_timeout=5, retry_total=3, retry_backoff_factor=0)
+    client._get = Mock(side_effect=PerformanceClientError("gaps", status=409, text="gaps"))
+
+    with pytest.raises(PerformanceClientError, match="gaps"):
+        list(client.get_epochs_data(EpochNumber(100), EpochNumber(100)))
+
+    assert client._get.call_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("size", "epochs", "duration", "expected"),
+    [
+        pytest.param(100, 100, 5.0, 100, id="on-target"),
+        pytest.param(100, 100, 4.0, 112, id="slightly-fast"),
+        pytest.param(100, 100, 0.01, 200, id="fast-growth-capped"),
+        pytest.param(800, 800, 0.01, 1000, id="max-size-capped"),
+        pytest.param(100, 100, 50.0, 55, id="slow"),
+        pytest.param(1, 1, 1000.0, 1, id="min-size"),
+        pytest.param(100, 100, 0.0, 100, id="zero-duration-ignored"),
+    ],
+)
+def test_epochs_batch_sizer__observe__adjusts_size(size: int, epochs: int, duration: float, expected: int):
+    sizer = EpochsBatchSizer(size=size, max_size=1000, target_seconds=5)
+
+    sizer.observe(epochs, duration)
+
+    assert sizer.size == expected
+
+
+def add_epochs_response(from_epoch: int, to_epoch: int) -> None:
+    responses.get(
+        f"{HOST}/v1/epochs",
+        match=[responses.matchers.query_param_matcher({"from": str(from_epoch), "to": str(to_epoch)})],
+        json=[
+            Duty(epoch=epoch, missed_attestation_vids=[epoch]).model_dump() for epoch in range(from_epoch, to_epoch + 1)
+        ],
+    )
+
+
+@pytest.mark.unit
+@responses.activate
+def test_get_epochs_data__epochs_cached__second_call_makes_no_requests(client: PerformanceClient, tmp_path: Path):
+    client.epochs_cache = EpochsDutiesCache(tmp_path)
+    add_epochs_response(100, 103)
+    first = list(client.get_epochs_data(EpochNumber(100), EpochNumber(103)))
+
+    second = list(client.get_epochs_data(EpochNumber(100), EpochNumber(103)))
+
+    assert second == first
+    assert [duty.epoch for duty in second] == [100, 101, 102, 103]
+    assert len(responses.calls) == 1
+
+
+@pytest.mark.unit
+@responses.activate
+def test_get_epochs_data__range_partially_cached__fetches_missing_epochs_only(
+    client: PerformanceClient, tmp_path: Path
+):
+    client.epochs_cache = EpochsDutiesCache(tmp_path)
+    add_epochs_response(101, 102)
+    list(client.get_epochs_data(EpochNumber(101), EpochNumber(102)))
+    add_epochs_response(100, 100)
+    add_epochs_response(103, 104)
+
+    result = list(client.get_epochs_data(EpochNumber(100), EpochNumber(104)))
+
+    assert [duty.epoch for duty in result] == [100, 101, 102, 103, 104]
+    assert [call.request.params for call in responses.calls[1:]] == [
+        {"from": "100", "to": "100"},
+        {"from": "103", "to": "104"},
+    ]
+
+
+@pytest.mark.unit
+def test_get_epochs_data__content_hash_mismatch__raises_and_does_not_cache(client: PerformanceClient, tmp_path: Path):
+    client.epochs_cache = EpochsDutiesCache(tmp_path)
+    client._get = Mock(return_value=([{"epoch": 100, "content_hash": "0" * 32}], {}))
+
+    with pytest.raises(PerformanceClientError, match="Content hash mismatch"):
+        list(client.get_epochs_data(EpochNumber(100), EpochNumber(100)))
+
+    assert not client.epochs_cache.has(EpochNumber(100))
+
+
+@pytest.mark.unit
+def test_get_epochs_data__response_without_content_hash__not_cached(client: PerformanceClient, tmp_path: Path):
+    client.epochs_cache = EpochsDutiesCache(tmp_path)
+    client._get = Mock(return_value=([{"epoch": 100}], {}))
+
+    result = list(client.get_epochs_data(EpochNumber(100), EpochNumber(100)))
+
+    assert result == [Duty(epoch=100)]
+    assert not client.epochs_cache.has(EpochNumber(100))
+
+
 @pytest.mark.unit
 def test_get_epochs_demand_returns_demand(client: PerformanceClient):
     raw = {"consumer": "csm", "from_epoch": 10, "to_epoch": 20, "updated_at": None}
@@ -223,3 +438,25 @@ def test_delete_epochs_demand(client: PerformanceClient):
 def test_provider_exception_is_performance_client_error():
     assert PerformanceClient.PROVIDER_EXCEPTION is PerformanceClientError
     assert issubclass(PerformanceClientError, Exception)
+
+
+@pytest.mark.unit
+def test_session__default__advertises_zstd_and_gzip(client: PerformanceClient):
+    assert client.session.headers["Accept-Encoding"] == "zstd, gzip"
+
+
+@pytest.mark.unit
+@responses.activate
+def test_get_epochs_data__zstd_encoded_response__decodes_duties(client: PerformanceClient):
+    raw = [{"epoch": 100, "missed_attestation_vids": [1, 2, 3]}]
+    responses.get(
+        f"{HOST}/v1/epochs",
+        body=zstd.compress(json.dumps(raw).encode()),
+        headers={"Content-Encoding": "zstd"},
+        content_type="application/json",
+    )
+
+    result = list(client.get_epochs_data(EpochNumber(100), EpochNumber(100)))
+
+    assert result == [Duty(epoch=100, missed_attestation_vids=[1, 2, 3])]
+    assert responses.calls[0].request.headers["Accept-Encoding"] == "zstd, gzip"
@@ -1,10 +1,17 @@
 # pylint: disable=protected-access
+import io
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, Mock
 
 import pytest
+import responses
 from requests import Response
 
-from src.metrics.prometheus.basic import CL_REQUESTS_DURATION
+from src.metrics.prometheus.basic import CL_REQUESTS_DURATION, HTTP_COALESCED_REQUESTS
 from src.providers.http_provider import HTTPProvider, NoHostsProvided, NotOkResponse, data_is_any, data_is_int
 
 
@@ -80,6 +87,7 @@ def test_force_raise():
         stream=False,
         validate_response=data_is_any,
         stream_consumer=None,
+        stream_meta=False,
     )
 
 
@@ -159,6 +167,46 @@ def test_stream_consumer_failure_triggers_fallback():
     assert call_count == 2
 
 
+@pytest.mark.unit
+def test_stream_meta__fields_around_data__collected_as_meta():
+    provider = HTTPProvider(['http://localhost:1'], 5 * 60, 1, 1)
+    provider.PROMETHEUS_HISTOGRAM = CL_REQUESTS_DURATION
+
+    resp = Response()
+    resp.status_code = 200
+    resp.raw = io.BytesIO(b'{"version": 1, "data": [1, 2, 3], "meta": {"block": 10}}')
+    provider.session.get = Mock(return_value=resp)
+    meta_seen_by_validator = []
+    validate_response = Mock(side_effect=lambda data, meta, endpoint: meta_seen_by_validator.append(dict(meta)))
+
+    data, meta = provider._get_without_fallbacks(
+        'http://localhost:1',
+        'test',
+        stream=True,
+        validate_response=validate_response,
+        stream_consumer=lambda d: [x * 2 for x in d],
+        stream_meta=True,
+    )
+
+    assert data == [2, 4, 6]
+    assert meta == {"version": 1, "meta": {"block": 10}}
+    assert meta_seen_by_validator == [{"version": 1}]
+
+
+@pytest.mark.unit
+def test_stream_meta__no_data__raises():
+    provider = HTTPProvider(['http://localhost:1'], 5 * 60, 1, 1)
+    provider.PROMETHEUS_HISTOGRAM = CL_REQUESTS_DURATION
+
+    resp = Response()
+    resp.status_code = 200
+    resp.raw = io.BytesIO(b'{"meta": {"block": 10}}')
+    provider.session.get = Mock(return_value=resp)
+
+    with pytest.raises(ValueError, match="Expected data"):
+        provider._get_without_fallbacks('http://localhost:1', 'test', stream=True, stream_meta=True)
+
+
 @pytest.mark.unit
 def test_make_get_request_delegates_to_session():
     provider = HTTPProvider(['http://localhost:1'], 5 * 60, 1, 1)
@@ -193,3 +241,114 @@ def test_data_is_int_rejects_bool():
 def test_data_is_int_rejects_non_int():
     with pytest.raises(ValueError, match="Expected int response"):
         data_is_int("1", {}, endpoint="test")
+
+
+class StubNode:
+    """Counts the requests by URL and holds the responses until `release` is set"""
+
+    URL = 'http://stub-node:5052/'
+
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.hits: dict[str, int] = {}
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def register(self) -> None:
+        responses.add_callback(responses.GET, re.compile(re.escape(self.URL) + '.*'), callback=self._respond)
+
+    def _respond(self, request) -> tuple[int, dict, str]:
+        with self._lock:
+            self.hits[request.url] = self.hits.get(request.url, 0) + 1
+        self.release.wait(timeout=10)
+        return self.status, {}, json.dumps({'data': {'url': request.url}})
+
+    def make_provider(self) -> HTTPProvider:
+        provider = HTTPProvider([self.URL], 5 * 60, 0, 0)
+        provider.PROMETHEUS_HISTOGRAM = CL_REQUESTS_DURATION
+        return provider
+
+
+def coalesced_count(endpoint: str) -> float:
+    return HTTP_COALESCED_REQUESTS.labels(provider=HTTPProvider.__name__, endpoint=endpoint)._value.get()
+
+
+def wait_for(condition, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'Condition is not met in time'
+        time.sleep(0.01)
+
+
+@pytest.mark.unit
+@responses.activate
+def test_get__concurrent_identical_requests__single_upstream_hit():
+    node = StubNode()
+    node.register()
+    provider = node.make_provider()
+    endpoint = 'eth/v1/coalesced/{}'
+    coalesced_before = coalesced_count(endpoint)
+    requests_count = 16
+
+    with ThreadPoolExecutor(requests_count) as executor:
+        futures = [
+            executor.submit(provider._get, endpoint, path_params=('head',), query_params={'id': 1})
+            for _ in range(requests_count)
+        ]
+        wait_for(lambda: coalesced_count(endpoint) - coalesced_before == requests_count - 1)
+        node.release.set()
+        results = [future.result(timeout=10) for future in futures]
+
+    url = node.URL + 'eth/v1/coalesced/head?id=1'
+    assert node.hits == {url: 1}
+    assert all(result is results[0] for result in results)
+    assert results[0] == ({'url': url}, {})
+    assert not provider._in_flight
+
+
+@pytest.mark.unit
+@responses.activate
+def test_get__concurrent_identical_requests_failed__error_shared():
+    node = StubNode(status=404)
+    node.register()
+    provider = node.make_provider()
+    endpoint = 'eth/v1/coalesced_failed'
+    coalesced_before = coalesced_count(endpoint)
+    requests_count = 8
+
+    with ThreadPoolExecutor(requests_count) as executor:
+        futures = [executor.submit(provider._get, endpoint) for _ in range(requests_count)]
+        wait_for(lambda: coalesced_count(endpoint) - coalesced_before == requests_count - 1)
+        node.release.set()
+        for future in futures:
+            with pytest.raises(NotOkResponse):
+                future.result(timeout=10)
+
+    assert node.hits == {node.URL + endpoint: 1}
+    assert not provider._in_flight
+
+
+@pytest.mark.unit
+@responses.activate
+def test_get__different_or_sequential_requests__not_coalesced():
+    node = StubNode()
+    node.register()
+    provider = node.make_provider()
+    endpoint = 'eth/v1/not_coalesced'
+    coalesced_before = coalesced_count(endpoint)
+
+    with ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(provider._get, endpoint, query_params={'id': i}) for i in range(4)]
+        wait_for(lambda: sum(node.hits.values()) == 4)
+        node.release.set()
+        for future in futures:
+            future.result(timeout=10)
+    provider._get(endpoint, query_params={'id': 0})
+
+    assert node.hits == {
+        node.URL + endpoint + '?id=0': 2,
+        node.URL + endpoint + '?id=1': 1,
+        node.URL + endpoint + '?id=2': 1,
+        node.URL + endpoint + '?id=3': 1,
+    }
+    assert coalesced_count(endpoint) == coalesced_before
@@ -227,6 +227,76 @@ class TestUnitKeysAPIClient:
         assert keys1 == keys2
         assert len(responses.calls) == 1
 
+    @responses.activate
+    def test_get_used_lido_keys__large_response__keys_parsed_from_stream(
+        self,
+        keys_api_client: KeysAPIClient,
+        empty_blockstamp,
+    ):
+        module_addresses = ['0x' + f'{module:040x}' for module in range(3)]
+        response_keys = [
+            {
+                'index': i,
+                'key': '0x' + f'{i:096X}',
+                'depositSignature': '0x' + f'{i:0192x}',
+                'operatorIndex': i % 100,
+                'used': True,
+                'moduleAddress': module_addresses[i % 3],
+            }
+            for i in range(20_000)
+        ]
+        responses.get(
+            self.KEYS_API_MOCK_URL + keys_api_client.USED_KEYS,
+            json={'data': response_keys, 'meta': {'elBlockSnapshot': {'blockNumber': 0}}},
+        )
+
+        keys = keys_api_client.get_used_lido_keys(empty_blockstamp)
+
+        assert keys == [
+            LidoKey(
+                index=key['index'],
+                key=key['key'].lower(),
+                deposit_signature=key['depositSignature'],
+                operator_index=key['operatorIndex'],
+                used=key['used'],
+                module_address=key['moduleAddress'],
+            )
+            for key in response_keys
+        ]
+        assert len({id(key.module_address) for key in keys}) == 3
+
+    @responses.activate
+    def test_get_used_lido_keys__meta_before_data__keys_returned(
+        self,
+        keys_api_client: KeysAPIClient,
+        empty_blockstamp,
+    ):
+        responses.get(
+            self.KEYS_API_MOCK_URL + keys_api_client.USED_KEYS,
+            body=(
+                '{"meta": {"elBlockSnapshot": {"blockNumber": 0}}, "data": [{"index": 0, "key": "0xAB", '
+                '"used": true, "operatorIndex": 1, "moduleAddress": "0x01", "depositSignature": "0x02"}]}'
+            ),
+        )
+
+        keys = keys_api_client.get_used_lido_keys(empty_blockstamp)
+
+        assert keys == [LidoKey(0, '0xab', '0x02', 1, True, '0x01')]
+
+    @responses.activate
+    def test_get_used_lido_keys__data_is_not_list__raises(
+        self,
+        keys_api_client: KeysAPIClient,
+        empty_blockstamp,
+    ):
+        responses.get(
+            self.KEYS_API_MOCK_URL + keys_api_client.USED_KEYS,
+            json={'data': {}, 'meta': {'elBlockSnapshot': {'blockNumber': 0}}},
+        )
+
+        with pytest.raises(ValueError, match="Expected list"):
+            keys_api_client.get_used_lido_keys(empty_blockstamp)
+
     @responses.activate
     def test_get_used_module_operators_keys__empty_response__empty_lists(
         self,
@@ -0,0 +1,172 @@
+import json
+from pathlib import Path
+
+import pytest
+import responses
+
+from src.providers.keys.client import KeysAPIClient
+from src.providers.keys.store import KeysStore
+from tests.factory.blockstamp import ReferenceBlockStampFactory
+
+
+KEYS_API_MOCK_URL = 'http://mock:1234/'
+MODULE_A = '0x' + 'a' * 40
+MODULE_B = '0x' + 'b' * 40
+
+
+class FakeKAPI:
+    """Serves used keys of the modules and bumps the module nonce on every change, as KAPI does"""
+
+    def __init__(self, modules: dict[str, int]):
+        self.keys: dict[str, list[dict]] = {module: [] for module in modules}
+        self.nonces = dict.fromkeys(modules, 0)
+        self.module_keys_requests: list[str] = []
+        for module, keys_count in modules.items():
+            self.add_keys(module, keys_count)
+
+    def add_keys(self, module: str, count: int, operator: int = 0) -> None:
+        keys = self.keys[module]
+        first_index = sum(1 for key in keys if key['operatorIndex'] == operator)
+        keys.extend(
+            {
+                'index': first_index + i,
+                'key': f'0x{module[2:6]}{operator:04x}{first_index + i:088x}',
+                'depositSignature': '0x' + f'{first_index + i:0192x}',
+                'operatorIndex': operator,
+                'used': True,
+                'moduleAddress': module,
+            }
+            for i in range(count)
+        )
+        self.nonces[module] += 1
+
+    def remove_key(self, module: str, position: int) -> None:
+        del self.keys[module][position]
+        self.nonces[module] += 1
+
+    def module(self, module: str) -> dict:
+        return {
+            'stakingModuleAddress': module,
+            'nonce': self.nonces[module],
+            'lastChangedBlockHash': f'0x{self.nonces[module]:064x}',
+        }
+
+    def register(self) -> None:
+        meta = {'elBlockSnapshot': {'blockNumber': 100}}
+        responses.add_callback(
+            responses.GET,
+            KEYS_API_MOCK_URL + KeysAPIClient.MODULES,
+            callback=lambda _: (200, {}, json.dumps({'data': [self.module(m) for m in self.keys], **meta})),
+        )
+        responses.add_callback(
+            responses.GET,
+            KEYS_API_MOCK_URL + 'v1/keys',
+            callback=lambda _: (200, {}, json.dumps({'data': self.all_keys(), 'meta': meta})),
+        )
+        for module in self.keys:
+            responses.add_callback(
+                responses.GET,
+                KEYS_API_MOCK_URL + f'v1/modules/{module}/keys',
+                callback=lambda _, module=module: self._module_keys_response(module, meta),
+            )
+
+    def _module_keys_response(self, module: str, meta: dict) -> tuple[int, dict, str]:
+        self.module_keys_requests.append(module)
+        data = {'keys': self.keys[module], 'module': self.module(module)}
+        return 200, {}, json.dumps({'data': data, 'meta': meta})
+
+    def all_keys(self) -> list[dict]:
+        return [key for keys in self.keys.values() for key in keys]
+
+
+def make_client(store: KeysStore | None) -> KeysAPIClient:
+    client = KeysAPIClient(hosts=[KEYS_API_MOCK_URL], request_timeout=5 * 60, retry_total=1, retry_backoff_factor=0)
+    client.keys_store = store
+    return client
+
+
+def sync(client: KeysAPIClient, block_number: int) -> list:
+    return client.get_used_lido_keys(ReferenceBlockStampFactory.build(block_number=block_number))
+
+
+def by_key(keys: list) -> dict:
+    return {key.key: key for key in keys}
+
+
+@pytest.mark.unit
+@responses.activate
+def test_sync_used_keys__keys_added_and_removed__same_as_full_fetch():
+    kapi = FakeKAPI({MODULE_A: 10, MODULE_B: 5})
+    kapi.register()
+    client = make_client(KeysStore())
+    full_fetch_client = make_client(None)
+
+    assert by_key(sync(client, 1)) == by_key(sync(full_fetch_client, 1))
+    assert kapi.module_keys_requests == [MODULE_A, MODULE_B]
+
+    kapi.add_keys(MODULE_A, 3, operator=1)
+    kapi.remove_key(MODULE_A, 2)
+    assert by_key(sync(client, 2)) == by_key(sync(full_fetch_client, 2))
+    assert kapi.module_keys_requests == [MODULE_A, MODULE_B, MODULE_A]
+
+    kapi.remove_key(MODULE_B, 0)
+    keys = sync(client, 3)
+    assert by_key(keys) == by_key(sync(full_fetch_client, 3))
+    assert len(keys) == 16
+    assert kapi.module_keys_requests == [MODULE_A, MODULE_B, MODULE_A, MODULE_B]
+
+
+@pytest.mark.unit
+@responses.activate
+def test_sync_used_keys__module_removed__keys_dropped():
+    kapi = FakeKAPI({MODULE_A: 2, MODULE_B: 2})
+    kapi.register()
+    store = KeysStore()
+    client = make_client(store)
+    sync(client, 1)
+
+    del kapi.keys[MODULE_B]
+    keys = sync(client, 2)
+
+    assert {key.module_address for key in keys} == {MODULE_A}
+    assert store.get_version(MODULE_B) is None
+
+
+@pytest.mark.unit
+@responses.activate
+def test_sync_used_keys__module_changed_between_requests__full_fetch():
+    kapi = FakeKAPI({MODULE_A: 4, MODULE_B: 4})
+    kapi.register()
+    store = KeysStore()
+    client = make_client(store)
+    sync(client, 1)
+
+    kapi.add_keys(MODULE_A, 1)
+    # The module changes once again after the modules list is served
+    original_response = kapi._module_keys_response
+
+    def changed_response(module, meta):
+        kapi.add_keys(module, 1)
+        return original_response(module, meta)
+
+    kapi._module_keys_response = changed_response
+    keys = sync(client, 2)
+
+    assert by_key(keys) == by_key(sync(make_client(None), 2))
+    assert len(keys) == 10
+    assert store.get_version(MODULE_A) is None
+    assert store.get_version(MODULE_B) is None
+
+
+@pytest.mark.unit
+@responses.activate
+def test_sync_used_keys__after_restart__unchanged_modules_not_fetched(tmp_path: Path):
+    kapi = FakeKAPI({MODULE_A: 3, MODULE_B: 3})
+    kapi.register()
+    expected = by_key(sync(make_client(KeysStore(tmp_path / 'keys.sqlite')), 1))
+    kapi.module_keys_requests.clear()
+
+    keys = sync(make_client(KeysStore(tmp_path / 'keys.sqlite')), 2)
+
+    assert by_key(keys) == expected
+    assert kapi.module_keys_requests == []
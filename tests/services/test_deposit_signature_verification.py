@@ -1,15 +1,30 @@
-from unittest.mock import patch
+from dataclasses import asdict
+from unittest.mock import Mock, patch
 
 import pytest
+from eth_typing import HexStr
+from py_ecc.bls import G2ProofOfPossession
+from py_ecc.bls.g2_primitives import G1_to_pubkey
+from py_ecc.optimized_bls12_381 import FQ, b, field_modulus
 
+from src import variables
 from src.constants import DOMAIN_DEPOSIT_TYPE, GENESIS_FORK_VERSION
+from src.providers.consensus.types import PendingDeposit
+from src.services import deposit_signature_verification
 from src.services.deposit_signature_verification import (
+    ArkworksBLSVerifier,
     DepositMessage,
+    DepositSignatureCache,
+    compute_deposit_signing_root,
     compute_domain,
     compute_fork_data_root,
     compute_signing_root,
     is_valid_deposit_signature,
+    signature_verification_pool,
+    verify_deposit_signatures,
 )
+from src.types import Gwei, SlotNumber
+from src.utils.types import hex_str_to_bytes
 
 
 # SSZ-valid byte constants (sizes match the ssz field types)
@@ -210,3 +225,142 @@ def test_is_valid_deposit_signature_different_fork_versions_produce_different_si
         root2 = mock_bls.Verify.call_args[0][1]
 
     assert root1 != root2
+
+
+# ---- BLS backends ----
+
+
+def _pubkey_not_in_subgroup() -> bytes:
+    """Compressed point on the G1 curve outside the prime-order subgroup."""
+    x = 1
+    while True:
+        y_squared = FQ(x) ** 3 + b
+        y = y_squared ** ((field_modulus + 1) // 4)
+        if y**2 == y_squared:
+            return G1_to_pubkey((FQ(x), y, FQ.one()))
+        x += 1
+
+
+@pytest.fixture(scope="module")
+def signed_deposits() -> list[PendingDeposit]:
+    deposits = []
+    for secret_key in range(1, 5):
+        pubkey = G2ProofOfPossession.SkToPk(secret_key)
+        amount = secret_key * 10**9
+        signing_root = compute_deposit_signing_root(pubkey, _WC, amount, GENESIS_FORK_VERSION)
+        deposits.append(
+            PendingDeposit(
+                pubkey=HexStr('0x' + pubkey.hex()),
+                withdrawal_credentials=HexStr('0x' + _WC.hex()),
+                amount=Gwei(amount),
+                signature=HexStr('0x' + G2ProofOfPossession.Sign(secret_key, signing_root).hex()),
+                slot=SlotNumber(0),
+            )
+        )
+    return deposits
+
+
+def _deposit_vectors(deposit: PendingDeposit) -> list[tuple[bytes, bytes, bytes, bool]]:
+    pubkey = hex_str_to_bytes(deposit.pubkey)
+    signature = hex_str_to_bytes(deposit.signature)
+    signing_root = compute_deposit_signing_root(pubkey, _WC, deposit.amount, GENESIS_FORK_VERSION)
+    other_root = compute_deposit_signing_root(pubkey, _WC, deposit.amount + 1, GENESIS_FORK_VERSION)
+    return [
+        (pubkey, signing_root, signature, True),
+        (pubkey, other_root, signature, False),
+        (G2ProofOfPossession.SkToPk(42), signing_root, signature, False),
+        (b'\xc0' + bytes(47), signing_root, signature, False),  # point at infinity
+        (_pubkey_not_in_subgroup(), signing_root, signature, False),
+        (_PUBKEY, signing_root, signature, False),  # not a point
+        (pubkey, signing_root, b'\xc0' + bytes(95), False),
+        (pubkey, signing_root, _SIGNATURE, False),
+        (pubkey, signing_root, signature[:-1], False),
+    ]
+
+
+@pytest.mark.unit
+def test_arkworks_verifier__valid_and_invalid_vectors__same_as_py_ecc(signed_deposits: list[PendingDeposit]):
+    pytest.importorskip("py_arkworks_bls12381")
+
+    for pubkey, signing_root, signature, expected in _deposit_vectors(signed_deposits[0]):
+        assert G2ProofOfPossession.Verify(pubkey, signing_root, signature) is expected
+        assert ArkworksBLSVerifier.Verify(pubkey, signing_root, signature) is expected
+
+
+# ---- verify_deposit_signatures ----
+
+
+@pytest.fixture()
+def signature_cache(tmp_path, monkeypatch) -> DepositSignatureCache:
+    signature_cache = DepositSignatureCache(tmp_path / "signatures.sqlite")
+    monkeypatch.setattr(deposit_signature_verification, "get_deposit_signature_cache", lambda: signature_cache)
+    monkeypatch.setattr(variables, "DEPOSIT_SIGNATURE_VERIFICATION_WORKERS", 1)
+    return signature_cache
+
+
+def _with_amount(deposit: PendingDeposit, amount: int) -> PendingDeposit:
+    return PendingDeposit(**{**asdict(deposit), "amount": Gwei(amount)})
+
+
+@pytest.mark.unit
+def test_verify_deposit_signatures__second_call__served_from_cache(signed_deposits, signature_cache):
+    deposits = [*signed_deposits, _with_amount(signed_deposits[0], 1)]
+
+    with patch.object(
+        deposit_signature_verification, "BLSVerifier", Mock(wraps=deposit_signature_verification.BLSVerifier)
+    ) as verifier:
+        assert verify_deposit_signatures(deposits, GENESIS_FORK_VERSION) == [True] * 4 + [False]
+        assert verifier.Verify.call_count == 5
+
+        assert verify_deposit_signatures(deposits, GENESIS_FORK_VERSION) == [True] * 4 + [False]
+        assert verifier.Verify.call_count == 5
+
+        # Another fork is another signing domain
+        assert verify_deposit_signatures(deposits[:1], b'\x01\x00\x00\x00') == [False]
+        assert verifier.Verify.call_count == 6
+
+
+@pytest.mark.unit
+def test_verify_deposit_signatures__after_restart__served_from_disk(signed_deposits, signature_cache, monkeypatch):
+    verify_deposit_signatures(signed_deposits, GENESIS_FORK_VERSION)
+    signature_cache.close()
+
+    restarted = DepositSignatureCache(signature_cache.path)
+    monkeypatch.setattr(deposit_signature_verification, "get_deposit_signature_cache", lambda: restarted)
+
+    with patch.object(deposit_signature_verification, "BLSVerifier") as verifier:
+        assert verify_deposit_signatures(signed_deposits, GENESIS_FORK_VERSION) == [True] * 4
+    verifier.Verify.assert_not_called()
+
+
+@pytest.mark.unit
+def test_verify_deposit_signatures__many_duplicates__verified_once(signed_deposits, signature_cache):
+    # More deposits than variables allowed in a single SQLite statement
+    deposits = [_with_amount(signed_deposits[0], 1)] * 1500 + signed_deposits * 10
+
+    with patch.object(deposit_signature_verification, "BLSVerifier") as verifier:
+        verifier.Verify.side_effect = lambda pubkey, root, signature: pubkey != hex_str_to_bytes(deposits[0].pubkey)
+        results = verify_deposit_signatures(deposits, GENESIS_FORK_VERSION)
+
+    assert verifier.Verify.call_count == 5
+    assert results == [False] * 1500 + [False, True, True, True] * 10
+
+
+@pytest.mark.unit
+def test_verify_deposit_signatures__process_pool__same_as_sequential(signed_deposits, signature_cache, monkeypatch):
+    monkeypatch.setattr(variables, "DEPOSIT_SIGNATURE_VERIFICATION_WORKERS", 2)
+    deposits = [deposit for d in signed_deposits for deposit in (d, _with_amount(d, d.amount + 1))]
+
+    with signature_verification_pool(len(deposits)) as executor:
+        assert executor is not None
+        results = verify_deposit_signatures(deposits, GENESIS_FORK_VERSION, executor)
+
+    assert results == [True, False] * len(signed_deposits)
+
+
+@pytest.mark.unit
+def test_signature_verification_pool__single_worker__no_pool(monkeypatch):
+    monkeypatch.setattr(variables, "DEPOSIT_SIGNATURE_VERIFICATION_WORKERS", 4)
+
+    with signature_verification_pool(1) as executor:
+        assert executor is None
@@ -0,0 +1,39 @@
+import pytest
+
+from src.utils.bytes_writer import BytesWriter
+
+
+@pytest.mark.unit
+def test_to_bytes__fields_written__concatenated_big_endian():
+    writer = BytesWriter(12)
+
+    writer.write_uint(1, 3)
+    writer.write_uints([2, 0xABCD], 2)
+    writer.write_bytes(b'\xff' * 5)
+
+    assert writer.to_bytes() == bytes.fromhex('0000010002abcdffffffffff')
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("value", [-1, 2**16])
+def test_write_uint__value_not_fitting__raises(value: int):
+    with pytest.raises(OverflowError):
+        BytesWriter(2).write_uint(value, 2)
+
+
+@pytest.mark.unit
+def test_write_bytes__over_size__raises():
+    writer = BytesWriter(4)
+    writer.write_uint(0, 3)
+
+    with pytest.raises(ValueError, match="exceeds size 4"):
+        writer.write_bytes(b'ab')
+
+
+@pytest.mark.unit
+def test_to_bytes__not_filled__raises():
+    writer = BytesWriter(4)
+    writer.write_uint(0, 3)
+
+    with pytest.raises(ValueError, match="Only 3 of 4 bytes are written"):
+        writer.to_bytes()
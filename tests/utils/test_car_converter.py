@@ -1,8 +1,16 @@
+import io
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from ipld_dag_pb import PBNode, encode as dag_pb_encode
 
 from src.providers.ipfs.cid import is_cid_v0
-from src.utils.car import CARConverter
-from src.utils.car.converter import DEFAULT_CHUNK_SIZE
+from src.utils import json_writer
+from src.utils.car import CARConverter, CARFile
+from src.utils.car.converter import DEFAULT_CHUNK_SIZE, encode_car_block
+from src.utils.car.schemes import unixfs_pb2
 
 
 @pytest.mark.unit
@@ -37,3 +45,99 @@ class TestCARConverter:
         assert len(blocks) == 1
         assert blocks[0][0] == root_cid
         assert is_cid_v0(root_cid.encode())
+
+    def test_serialize_unixfs_leaf_node__same_as_dag_pb_encode(self, converter):
+        for size in (0, 1, 127, 128, 300, DEFAULT_CHUNK_SIZE):
+            data = random.Random(size).randbytes(size)
+            unixfs = unixfs_pb2.Data()  # type: ignore[attr-defined]
+            unixfs.Type = unixfs_pb2.Data.File  # type: ignore[attr-defined]
+            unixfs.Data = data
+            unixfs.filesize = size
+
+            expected = dag_pb_encode(PBNode(data=unixfs.SerializeToString(), links=[]))
+
+            assert converter._serialize_unixfs_leaf_node(data) == bytes(expected)
+
+    @pytest.mark.parametrize(
+        ("data", "expected_cid"),
+        [
+            (b"", "QmaRwA91m9Rdfaq9u3FH1fdMVxw1wFPjKL38czkWMxh3KB"),
+            (b"hello world", "Qmf412jQZiuVUtdgnB36FXFX7xg5V6KEbSJ4dpQuhkLyfD"),
+            (b"x" * (DEFAULT_CHUNK_SIZE + 100), "QmVkftnMT3JnT9ingZLSjcp1sAWyDKBE188SuEtuyc3eLM"),
+            (bytes(range(256)) * 5000, "Qma8gTArz9gHtqAb4iorXohoVLJm1xwPb4eBZjSdB7BD6e"),
+        ],
+    )
+    def test_create_unixfs_based_cid__golden_cids(self, converter, data, expected_cid):
+        assert converter.create_unixfs_based_cid(data) == expected_cid
+
+    @pytest.mark.parametrize(
+        "size",
+        [
+            0,
+            1,
+            1000,
+            DEFAULT_CHUNK_SIZE - 1,
+            DEFAULT_CHUNK_SIZE,
+            DEFAULT_CHUNK_SIZE + 1,
+            2 * DEFAULT_CHUNK_SIZE,
+            5 * DEFAULT_CHUNK_SIZE + 12345,
+        ],
+    )
+    @pytest.mark.parametrize("piece_size", [1000, DEFAULT_CHUNK_SIZE, 3 * DEFAULT_CHUNK_SIZE + 1])
+    def test_create_car__stream__same_cid_and_blocks_as_whole_content(self, converter, size, piece_size):
+        data = random.Random(size).randbytes(size)
+        root_cid, blocks = converter._build_unixfs_blocks_and_root(data)
+
+        car = converter.create_car(data[i : i + piece_size] for i in range(0, len(data), piece_size))
+
+        assert car.root == root_cid
+        assert car.read() == car.header() + b"".join(encode_car_block(cid, bytes(block)) for cid, block in blocks)
+        assert car.read_content() == data
+        assert converter.create_unixfs_based_cid(data) == root_cid.encode()
+
+    def test_create_car__small_spool__blocks_spilled_to_disk(self, converter):
+        data = random.Random(0).randbytes(3 * DEFAULT_CHUNK_SIZE)
+
+        car = converter.create_car([data], workers=2, spool_max_size=DEFAULT_CHUNK_SIZE)
+
+        assert car.blocks._rolled  # type: ignore[attr-defined]
+        assert car.root == converter._build_unixfs_blocks_and_root(data)[0]
+
+    def test_open_car__written_by_json_writer__same_car_as_whole_content(self, converter):
+        logs = {"frames": [{"validator": i, "duties": list(range(i % 50))} for i in range(20000)]}
+        expected = json.dumps(logs, separators=(',', ':')).encode()
+
+        with converter.open_car(workers=2) as writer:
+            json_writer.dump(logs, writer, json.JSONEncoder(separators=(',', ':')), depth=3)
+            car = writer.finish()
+
+        assert car.read_content() == expected
+        assert car.read() == converter.create_car([expected]).read()
+
+    def test_car_file__read_by_several_threads__same_bytes(self, converter):
+        data = random.Random(0).randbytes(5 * DEFAULT_CHUNK_SIZE)
+        car = converter.create_car([data], spool_max_size=DEFAULT_CHUNK_SIZE)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: b"".join(car.iter_bytes(chunk_size=1000)), range(4)))
+
+        assert results == [car.read()] * 4
+
+    def test_open_car__failed_writing__spooled_files_closed(self, converter):
+        with pytest.raises(RuntimeError), converter.open_car() as writer:
+            writer.write(b"x" * DEFAULT_CHUNK_SIZE)
+            blocks, content = writer._blocks, writer._content
+            raise RuntimeError
+
+        assert blocks.closed and content.closed
+
+    def test_car_header__roots_and_version_encoded(self, converter):
+        root_cid, _ = converter._build_unixfs_blocks_and_root(b"hello world")
+
+        header = CARFile(root_cid, io.BytesIO(), io.BytesIO()).header()
+
+        assert header[0] == len(header) - 1
+        assert header[1:8] == b"\xa2\x65roots"
+        assert header[8:14] == b"\x81\xd8\x2a\x58\x23\x00"
+        assert header[14:48] == bytes(root_cid)
+        assert header[48:] == b"\x67version\x01"
@@ -0,0 +1,80 @@
+import io
+import json
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+
+import pytest
+
+from src.utils import json_writer
+
+
+@dataclass
+class Inner:
+    value: float = 0.5
+    flag: bool = False
+    items: tuple[int, ...] = (1, 2)
+
+
+@dataclass
+class Outer:
+    name: str = "outer"
+    by_id: dict[int, Inner] = field(default_factory=lambda: defaultdict(Inner))
+    empty: list = field(default_factory=list)
+
+
+class Encoder(json.JSONEncoder):
+    def default(self, o):
+        return json_writer.shallow_asdict(o)
+
+
+def make_outer() -> Outer:
+    outer = Outer()
+    for i in (10, 2, 33):
+        outer.by_id[i] = Inner(value=i / 3, flag=bool(i % 2), items=tuple(range(i % 4)))
+    return outer
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("depth", [0, 1, 2, 3, 10])
+@pytest.mark.parametrize("sort_keys", [True, False])
+def test_iterencode__same_as_json_encode(depth: int, sort_keys: bool):
+    encoder = Encoder(indent=None, separators=(',', ':'), sort_keys=sort_keys)
+    outer = make_outer()
+
+    streamed = "".join(json_writer.iterencode(outer, encoder, depth))
+
+    assert streamed == encoder.encode(asdict(outer))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "obj",
+    [
+        {1: "a", 2.5: "b", False: "c", None: "d"},
+        {"b": [], "a": {}, "c": [{"z": 1, "y": [None, "ü"]}]},
+        [],
+        "string",
+    ],
+)
+def test_iterencode__json_types__same_as_json_encode(obj):
+    encoder = json.JSONEncoder(sort_keys=False)
+
+    assert "".join(json_writer.iterencode(obj, encoder, depth=3)) == encoder.encode(obj)
+
+
+@pytest.mark.unit
+def test_iterencode__unsupported_key__raises():
+    with pytest.raises(TypeError, match="keys must be"):
+        "".join(json_writer.iterencode({(1, 2): 1}, json.JSONEncoder(), depth=1))
+
+
+@pytest.mark.unit
+def test_dump__batched_writes__same_as_json_encode(monkeypatch):
+    monkeypatch.setattr(json_writer, "WRITE_BATCH_SIZE", 3)
+    encoder = Encoder(indent=None, separators=(',', ':'), sort_keys=True)
+    outer = make_outer()
+    buffer = io.BytesIO()
+
+    json_writer.dump(outer, buffer, encoder, depth=3)
+
+    assert buffer.getvalue() == encoder.encode(asdict(outer)).encode()
@@ -0,0 +1,123 @@
+import random
+
+import pytest
+from eth_abi import encode
+from eth_hash.auto import keccak
+from hexbytes import HexBytes
+from oz_merkle_tree import StandardMerkleTree
+
+from src.modules.oracles.staking_modules.common.types import StrikesList
+from src.utils.merkle import build_standard_tree_dump, make_leaf_encoder
+
+
+REWARDS_ENCODING = ("uint256", "uint256")
+STRIKES_ENCODING = ("uint256", "bytes", "uint256[]")
+
+
+def make_rewards_values(count: int, seed: int = 0) -> list[tuple]:
+    rnd = random.Random(seed)
+    return [(i, rnd.randrange(2**96)) for i in range(count)]
+
+
+def make_strikes_values(count: int, seed: int = 0) -> list[tuple]:
+    rnd = random.Random(seed)
+    return [
+        (i // 3, HexBytes(rnd.randbytes(48)), StrikesList([rnd.randrange(3) for _ in range(rnd.randrange(7))]))
+        for i in range(count)
+    ]
+
+
+def get_proof(tree: list[HexBytes], index: int) -> list[HexBytes]:
+    proof = []
+    while index > 0:
+        sibling = index - 1 if index % 2 == 0 else index + 1
+        proof.append(tree[sibling])
+        index = (index - 1) // 2
+    return proof
+
+
+def process_proof(leaf: bytes, proof: list[HexBytes]) -> bytes:
+    computed = leaf
+    for node in proof:
+        computed = keccak(computed + node if computed <= node else node + computed)
+    return computed
+
+
+@pytest.mark.unit
+def test_build_standard_tree_dump__openzeppelin_readme_example__golden_root():
+    values = [
+        ("0x1111111111111111111111111111111111111111", 5000000000000000000),
+        ("0x2222222222222222222222222222222222222222", 2500000000000000000),
+    ]
+
+    dump = build_standard_tree_dump(values, ("address", "uint256"))
+
+    assert dump["format"] == "standard-v1"
+    assert dump["leafEncoding"] == ["address", "uint256"]
+    assert dump["tree"][0] == "0xd4dee0beab2d53f2cc83e567171bd2820e49898130a22622b10ead383e90bd77"
+    assert dump["values"] == [{"value": values[0], "treeIndex": 1}, {"value": values[1], "treeIndex": 2}]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("leaf_encoding", "values"),
+    [
+        (REWARDS_ENCODING, make_rewards_values(50)),
+        (STRIKES_ENCODING, make_strikes_values(50)),
+        (("address", "uint256"), [("0x" + "ab" * 20, 0), ("0x" + "01" * 20, 2**256 - 1)]),
+        (("bool", "uint256"), [(True, 1), (False, 2)]),
+    ],
+)
+def test_make_leaf_encoder__same_as_abi_encode(leaf_encoding, values):
+    encoder = make_leaf_encoder(leaf_encoding)
+
+    for value in values:
+        assert encoder(value) == encode(leaf_encoding, value)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("value", [(-1, 0), (2**256, 0)])
+def test_make_leaf_encoder__out_of_range__raises(value):
+    with pytest.raises(OverflowError):
+        make_leaf_encoder(REWARDS_ENCODING)(value)
+
+
+@pytest.mark.unit
+def test_build_standard_tree_dump__no_values__raises():
+    with pytest.raises(ValueError, match="non-zero number of leaves"):
+        build_standard_tree_dump([], REWARDS_ENCODING)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("count", [1, 2, 3, 7, 16, 33])
+def test_build_standard_tree_dump__proofs__verified_against_root(count):
+    values = make_strikes_values(count, seed=count)
+
+    dump = build_standard_tree_dump(values, STRIKES_ENCODING)
+
+    tree = [HexBytes(node) for node in dump["tree"]]
+    assert len(tree) == 2 * count - 1
+    for item in dump["values"]:
+        leaf = keccak(keccak(encode(STRIKES_ENCODING, item["value"])))
+        assert tree[item["treeIndex"]] == leaf
+        assert process_proof(leaf, get_proof(tree, item["treeIndex"])) == tree[0]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("leaf_encoding", "values"),
+    [
+        (REWARDS_ENCODING, make_rewards_values(1)),
+        (REWARDS_ENCODING, make_rewards_values(100)),
+        (STRIKES_ENCODING, make_strikes_values(5)),
+        (STRIKES_ENCODING, make_strikes_values(100)),
+    ],
+)
+def test_build_standard_tree_dump__same_as_standard_merkle_tree(leaf_encoding, values):
+    expected = StandardMerkleTree(values, leaf_encoding).dump()
+
+    dump = build_standard_tree_dump(values, leaf_encoding)
+
+    assert [HexBytes(node) for node in dump["tree"]] == [HexBytes(node) for node in expected["tree"]]
+    assert [v["treeIndex"] for v in dump["values"]] == [v["treeIndex"] for v in expected["values"]]
+    assert StandardMerkleTree.load(dump).root == StandardMerkleTree(values, leaf_encoding).root
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from src.utils.priority_queue import IndexedPriorityQueue
+
+
+@pytest.mark.unit
+def test_pop__initial_items__ordered_by_key():
+    queue = IndexedPriorityQueue([("c", 3), ("a", 1), ("b", 2)])
+
+    assert [queue.pop() for _ in range(len(queue))] == [("a", 1), ("b", 2), ("c", 3)]
+
+
+@pytest.mark.unit
+def test_init__duplicated_items__raises():
+    with pytest.raises(ValueError, match="must be unique"):
+        IndexedPriorityQueue([("a", 1), ("a", 2)])
+
+
+@pytest.mark.unit
+def test_push__existing_item__key_changed():
+    queue = IndexedPriorityQueue([("a", 1), ("b", 2), ("c", 3)])
+
+    queue.push("a", 4)
+    queue.push("c", 0)
+
+    assert len(queue) == 3
+    assert [queue.pop() for _ in range(len(queue))] == [("c", 0), ("b", 2), ("a", 4)]
+
+
+@pytest.mark.unit
+def test_remove__missing_item__raises():
+    queue = IndexedPriorityQueue([("a", 1)])
+    queue.remove("a")
+
+    assert "a" not in queue
+    with pytest.raises(KeyError):
+        queue.remove("a")
+    with pytest.raises(IndexError):
+        queue.peek()
+
+
+@pytest.mark.unit
+def test_random_operations__same_order_as_sorting():
+    rng = random.Random(0)
+    queue: IndexedPriorityQueue[int] = IndexedPriorityQueue()
+    keys: dict[int, tuple] = {}
+
+    for _ in range(5_000):
+        item = rng.randrange(200)
+        if item in keys and rng.random() < 0.3:
+            queue.remove(item)
+            del keys[item]
+        else:
+            # Tuple keys with ties on the first element, as the exit order predicates have
+            keys[item] = (rng.randrange(10), item)
+            queue.push(item, keys[item])
+
+        assert len(queue) == len(keys)
+        if keys:
+            assert queue.peek() == min(keys.items(), key=lambda entry: entry[1])
+
+    assert [queue.pop()[0] for _ in range(len(queue))] == sorted(keys, key=keys.__getitem__)
@@ -0,0 +1,126 @@
+import random
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.pubkey_index import PUBKEY_LENGTH, PubkeyIndex
+
+
+def make_registry(size: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [
+        SimpleNamespace(index=index, validator=SimpleNamespace(pubkey='0x' + rng.randbytes(PUBKEY_LENGTH).hex()))
+        for index in range(size)
+    ]
+
+
+def pubkeys(registry: list) -> list[str]:
+    return [validator.validator.pubkey for validator in registry]
+
+
+@pytest.mark.unit
+def test_get_many__growing_registry__all_validators_found():
+    registry = make_registry(5_000)
+    index = PubkeyIndex()
+
+    for size in (0, 1, 700, 701, 5_000):
+        index.update(registry[:size])
+
+        assert len(index) == size
+        assert index.get_many(pubkeys(registry[:size])) == list(range(size))
+        assert index.get_many(pubkeys(registry[size:])) == [None] * (len(registry) - size)
+
+
+@pytest.mark.unit
+def test_update__older_state__index_kept():
+    registry = make_registry(100)
+    index = PubkeyIndex()
+    index.update(registry)
+
+    index.update(registry[:50])
+
+    assert len(index) == 100
+    assert index.get(registry[99].validator.pubkey) == 99
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("pubkey", ["0x", "0x00", "not a hex", "0x" + "zz" * PUBKEY_LENGTH])
+def test_get__malformed_pubkey__not_found(pubkey: str):
+    index = PubkeyIndex()
+    index.update(make_registry(10))
+
+    assert index.get(pubkey) is None
+
+
+@pytest.mark.unit
+def test_get__pubkey_without_prefix__found():
+    registry = make_registry(10)
+    index = PubkeyIndex()
+    index.update(registry)
+
+    assert index.get(registry[3].validator.pubkey.removeprefix('0x').upper()) == 3
+
+
+@pytest.mark.unit
+def test_update__another_chain__index_rebuilt(tmp_path: Path):
+    index = PubkeyIndex(tmp_path / "pubkeys")
+    index.update(make_registry(100, seed=1))
+    registry = make_registry(80, seed=2)
+
+    index.update(registry)
+
+    assert len(index) == 80
+    assert index.get_many(pubkeys(registry)) == list(range(80))
+    assert (tmp_path / "pubkeys").stat().st_size == 80 * PUBKEY_LENGTH
+
+
+@pytest.mark.unit
+def test_init__after_restart__restored_from_disk(tmp_path: Path):
+    registry = make_registry(3_000)
+    PubkeyIndex(tmp_path / "pubkeys").update(registry[:2_000])
+    PubkeyIndex(tmp_path / "pubkeys").update(registry)
+
+    restarted = PubkeyIndex(tmp_path / "pubkeys")
+
+    assert len(restarted) == 3_000
+    assert restarted.get_many(pubkeys(registry)) == list(range(3_000))
+
+
+@pytest.mark.unit
+def test_init__interrupted_write__tail_dropped(tmp_path: Path):
+    registry = make_registry(10)
+    PubkeyIndex(tmp_path / "pubkeys").update(registry)
+    with (tmp_path / "pubkeys").open('ab') as f:
+        f.write(b'\x01' * 20)
+
+    restarted = PubkeyIndex(tmp_path / "pubkeys")
+    restarted.update(make_registry(12))
+
+    assert len(restarted) == 12
+    assert restarted.get(registry[9].validator.pubkey) == 9
+
+
+@pytest.mark.unit
+def test_update__large_registry__less_memory_than_dict_of_hex_strings():
+    rng = random.Random(0)
+    raw_pubkeys = [rng.randbytes(PUBKEY_LENGTH) for _ in range(50_000)]
+    registry = [SimpleNamespace(validator=SimpleNamespace(pubkey=pubkey.hex())) for pubkey in raw_pubkeys]
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        index = PubkeyIndex()
+        index.update(registry)
+        index_size = tracemalloc.get_traced_memory()[0] - before
+
+        before = tracemalloc.get_traced_memory()[0]
+        # As the pubkeys are decoded from an API response, every key is a new string
+        by_pubkey = {'0x' + pubkey.hex(): i for i, pubkey in enumerate(raw_pubkeys)}
+        dict_size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert len(index) == len(by_pubkey)
+    assert index_size * 3 < dict_size
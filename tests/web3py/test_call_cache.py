@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import pytest
+from hexbytes import HexBytes
+
+from src.metrics.prometheus.basic import EL_CALL_CACHE_REQUESTS
+from src.web3py.call_cache import ContractCallCache
+
+
+BLOCK_HASH = "0x" + "ab" * 32
+TRANSACTION = {"to": "0x1111111111111111111111111111111111111111", "data": "0x12345678"}
+
+
+@pytest.fixture()
+def cache(tmp_path: Path) -> ContractCallCache:
+    return ContractCallCache(tmp_path / "calls.sqlite", max_size=1024)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("block_identifier", ["latest", "finalized", 100, "0x64", None])
+def test_key__not_block_hash__not_cacheable(block_identifier):
+    assert ContractCallCache.key(TRANSACTION, block_identifier) is None
+
+
+@pytest.mark.unit
+def test_key__block_hash__same_for_str_and_bytes():
+    key = ContractCallCache.key(TRANSACTION, BLOCK_HASH)
+
+    assert key is not None
+    assert key == ContractCallCache.key(TRANSACTION, HexBytes(BLOCK_HASH))
+    assert key != ContractCallCache.key(TRANSACTION | {"data": "0x87654321"}, BLOCK_HASH)
+    assert key != ContractCallCache.key(TRANSACTION, "0x" + "cd" * 32)
+
+
+@pytest.mark.unit
+def test_get__stored_result__hit_counted(cache: ContractCallCache):
+    hits = EL_CALL_CACHE_REQUESTS.labels(result="hit")._value.get()
+    misses = EL_CALL_CACHE_REQUESTS.labels(result="miss")._value.get()
+
+    assert cache.get(b"key") is None
+    cache.put(b"key", b"result")
+    assert cache.get(b"key") == b"result"
+
+    assert EL_CALL_CACHE_REQUESTS.labels(result="hit")._value.get() == hits + 1
+    assert EL_CALL_CACHE_REQUESTS.labels(result="miss")._value.get() == misses + 1
+
+
+@pytest.mark.unit
+def test_get__after_restart__served_from_disk(tmp_path: Path):
+    ContractCallCache(tmp_path / "calls.sqlite", max_size=1024).put(b"key", b"result")
+
+    restarted = ContractCallCache(tmp_path / "calls.sqlite", max_size=1024)
+
+    assert restarted.get(b"key") == b"result"
+    assert restarted._size == len(b"key") + len(b"result")
+
+
+@pytest.mark.unit
+def test_put__over_max_size__oldest_evicted(cache: ContractCallCache):
+    for i in range(10):
+        cache.put(i.to_bytes(4), bytes(124))
+
+    assert cache._size <= cache.max_size
+    assert cache.get((0).to_bytes(4)) is None
+    assert cache.get((9).to_bytes(4)) == bytes(124)
+
+
+@pytest.mark.unit
+def test_put__same_key_twice__size_counted_once(cache: ContractCallCache):
+    cache.put(b"key", b"result")
+    cache.put(b"key", b"result")
+
+    assert cache._size == len(b"key") + len(b"result")
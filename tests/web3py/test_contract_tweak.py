@@ -0,0 +1,208 @@
+import json
+from dataclasses import dataclass, field
+
+import pytest
+import responses
+from eth_abi import decode, encode
+from web3 import HTTPProvider, Web3
+from web3.exceptions import ContractLogicError
+
+from src.providers.execution.contracts.cs_accounting import CSAccountingContract
+from src.types import NodeOperatorId
+from src.variables import MULTICALL3_ADDRESS
+from src.web3py.call_cache import ContractCallCache
+from src.web3py.contract_tweak import BatchReads, tweak_w3_contracts
+
+
+RPC_URL = "http://localhost:8545"
+ACCOUNTING_ADDRESS = "0x1111111111111111111111111111111111111111"
+BLOCK_HASH = "0xabababababababababababababababababababababababababababababababab"
+
+
+@dataclass
+class FakeNode:
+    """
+    Fake EL node: `eth_call` of `getBondCurveId(id)` returns `id % 3` and reverts for `reverting` ids.
+    Multicall3 `aggregate3` is emulated on top of it if `multicall_deployed` is set.
+    """
+
+    multicall_deployed: bool = True
+    reverting: set[int] = field(default_factory=set)
+    requests: list[list[dict] | dict] = field(default_factory=list)
+
+    @property
+    def eth_calls(self) -> list[dict]:
+        flat = [r for body in self.requests for r in (body if isinstance(body, list) else [body])]
+        return [r for r in flat if r["method"] == "eth_call"]
+
+    def bond_curve_id(self, calldata: bytes) -> tuple[bool, bytes]:
+        node_operator_id = int.from_bytes(calldata[4:], "big")
+        if node_operator_id in self.reverting:
+            return False, b""
+        return True, encode(["uint256"], [node_operator_id % 3])
+
+    def aggregate3(self, calldata: bytes) -> bytes:
+        (calls,) = decode(["(address,bool,bytes)[]"], calldata[4:])
+        results = []
+        for target, _, inner_calldata in calls:
+            assert target.lower() == ACCOUNTING_ADDRESS
+            results.append(self.bond_curve_id(inner_calldata))
+        return encode(["(bool,bytes)[]"], [results])
+
+    def answer(self, request: dict) -> dict:
+        response = {"jsonrpc": "2.0", "id": request["id"]}
+        if request["method"] == "eth_chainId":
+            return response | {"result": "0x1"}
+        if request["method"] == "eth_getCode":
+            return response | {"result": "0x"}
+
+        assert request["method"] == "eth_call"
+        assert request["params"][1] in (BLOCK_HASH, "latest")
+        to, calldata = request["params"][0]["to"].lower(), bytes.fromhex(request["params"][0]["data"][2:])
+        if to == MULTICALL3_ADDRESS.lower():
+            return response | {"result": "0x" + (self.aggregate3(calldata).hex() if self.multicall_deployed else "")}
+
+        success, return_data = self.bond_curve_id(calldata)
+        if not success:
+            return response | {"error": {"code": 3, "message": "execution reverted", "data": "0x"}}
+        return response | {"result": "0x" + return_data.hex()}
+
+    def callback(self, request):
+        body = json.loads(request.body)
+        self.requests.append(body)
+        result = [self.answer(r) for r in body] if isinstance(body, list) else self.answer(body)
+        return 200, {}, json.dumps(result)
+
+
+@pytest.fixture()
+def node() -> FakeNode:
+    fake_node = FakeNode()
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        mock.add_callback(responses.POST, RPC_URL, callback=fake_node.callback, content_type="application/json")
+        yield fake_node
+
+
+@pytest.fixture()
+def accounting() -> CSAccountingContract:
+    w3 = Web3(HTTPProvider(RPC_URL))
+    tweak_w3_contracts(w3)
+    return w3.eth.contract(address=ACCOUNTING_ADDRESS, ContractFactoryClass=CSAccountingContract)  # type: ignore
+
+
+def read_unbatched(accounting: CSAccountingContract, ids: list[int]) -> list[int]:
+    return [accounting.functions.getBondCurveId(i).call(block_identifier=BLOCK_HASH) for i in ids]
+
+
+def read_batched(accounting: CSAccountingContract, ids: list[int], **kwargs) -> list[int]:
+    with BatchReads(accounting.w3, BLOCK_HASH, **kwargs) as reads:
+        for i in ids:
+            reads.add(accounting.functions.getBondCurveId(i))
+        return reads.execute()
+
+
+@pytest.mark.unit
+def test_call_out_of_batch__decoded_result(accounting: CSAccountingContract, node):
+    assert accounting.functions.getBondCurveId(5).call(block_identifier=BLOCK_HASH) == 2
+    assert len(node.eth_calls) == 1
+
+
+@pytest.mark.unit
+def test_batch_reads__same_results_as_unbatched__single_eth_call(accounting: CSAccountingContract, node):
+    ids = list(range(10))
+
+    unbatched = read_unbatched(accounting, ids)
+    assert len(node.eth_calls) == len(ids)
+
+    node.requests.clear()
+    assert read_batched(accounting, ids) == unbatched
+    assert len(node.eth_calls) == 1
+
+
+@pytest.mark.unit
+def test_batch_reads__max_calls__split_into_chunks(accounting: CSAccountingContract, node):
+    ids = list(range(10))
+
+    assert read_batched(accounting, ids, max_calls=4) == [i % 3 for i in ids]
+    assert len(node.eth_calls) == 3
+
+
+@pytest.mark.unit
+def test_batch_reads__no_calls__no_requests(accounting: CSAccountingContract, node):
+    assert not read_batched(accounting, [])
+    assert not node.requests
+
+
+@pytest.mark.unit
+def test_batch_reads__multicall_not_deployed__falls_back_to_individual_calls(accounting: CSAccountingContract, node):
+    node.multicall_deployed = False
+    ids = list(range(5))
+
+    assert read_batched(accounting, ids) == [i % 3 for i in ids]
+    assert len(node.eth_calls) == 1 + len(ids)
+
+
+@pytest.mark.unit
+def test_batch_reads__reverted_call__raises_as_unbatched(accounting: CSAccountingContract, node):
+    node.reverting = {3}
+
+    with pytest.raises(ContractLogicError):
+        read_unbatched(accounting, [1, 2, 3])
+    node.requests.clear()
+
+    with pytest.raises(ContractLogicError):
+        read_batched(accounting, [1, 2, 3])
+    # Aggregated call and the repeated reverted one
+    assert len(node.eth_calls) == 2
+
+
+@pytest.mark.unit
+def test_get_bond_curve_ids__single_eth_call(accounting: CSAccountingContract, node):
+    node_operator_ids = [NodeOperatorId(i) for i in range(10)]
+
+    result = accounting.get_bond_curve_ids(node_operator_ids, BLOCK_HASH)
+
+    assert result == {i: i % 3 for i in node_operator_ids}
+    assert len(node.eth_calls) == 1
+
+
+@pytest.fixture()
+def call_cache(tmp_path, accounting: CSAccountingContract) -> ContractCallCache:
+    cache = ContractCallCache(tmp_path / "calls.sqlite", max_size=2**20)
+    tweak_w3_contracts(accounting.w3, cache)
+    return cache
+
+
+@pytest.mark.unit
+def test_call_cache__cached_run__same_results_no_eth_calls(accounting: CSAccountingContract, node, call_cache):
+    ids = list(range(5))
+
+    uncached = read_unbatched(accounting, ids)
+    assert len(node.eth_calls) == len(ids)
+
+    node.requests.clear()
+    assert read_unbatched(accounting, ids) == uncached
+    assert read_batched(accounting, ids) == read_batched(accounting, ids) == uncached
+    # Aggregated call is cached as a whole
+    assert len(node.eth_calls) == 1
+
+
+@pytest.mark.unit
+def test_call_cache__restarted__served_from_disk(accounting: CSAccountingContract, node, call_cache, tmp_path):
+    uncached = read_unbatched(accounting, [1, 2])
+    call_cache.close()
+
+    w3 = Web3(HTTPProvider(RPC_URL))
+    tweak_w3_contracts(w3, ContractCallCache(tmp_path / "calls.sqlite", max_size=2**20))
+    restarted = w3.eth.contract(address=ACCOUNTING_ADDRESS, ContractFactoryClass=CSAccountingContract)
+    node.requests.clear()
+
+    assert read_unbatched(restarted, [1, 2]) == uncached  # type: ignore[arg-type]
+    assert not node.eth_calls
+
+
+@pytest.mark.unit
+def test_call_cache__relative_block__bypassed(accounting: CSAccountingContract, node, call_cache):
+    for _ in range(2):
+        assert accounting.functions.getBondCurveId(1).call(block_identifier="latest") == 1
+
+    assert len(node.eth_calls) == 2
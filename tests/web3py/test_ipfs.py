@@ -1,11 +1,18 @@
+import time
+from dataclasses import dataclass
 from unittest.mock import MagicMock, patch
 
 import pytest
+import responses
 
+from src.metrics.prometheus.basic import IPFS_PROVIDER_LATENCY, IPFS_UPLOADS
+from src.providers.ipfs import Kubo
+from src.providers.ipfs.cache import IPFSCache
 from src.providers.ipfs.cid import CID
 from src.providers.ipfs.types import IPFSError, IPFSProvider
 from src.types import FrameNumber
-from src.web3py.extensions.ipfs import IPFS, MaxRetryError, NoMoreProvidersError
+from src.utils.car import CARConverter
+from src.web3py.extensions.ipfs import IPFS, MaxRetryError, NoMoreProvidersError, ProviderStats
 
 
 HARDCODED_FETCH_CONTENT = b"hardcoded_fetched_content"
@@ -27,6 +34,26 @@ def create_mock_provider_class(name: str):
     return type(name, (IPFSProvider,), {'_fetch': _fetch, '_upload': _upload, 'pin': pin})
 
 
+def delayed(delay: float, result):
+    """Side effect returning the result or raising it after the delay"""
+
+    def side_effect(*args, **kwargs):
+        time.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return side_effect
+
+
+def wait_for_background_uploads(ipfs: IPFS, timeout: float = 5) -> None:
+    """Waits for the background uploads, an upload is discarded by its last done callback after the reporting ones"""
+    deadline = time.perf_counter() + timeout
+    while ipfs.background_uploads and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert not ipfs.background_uploads
+
+
 MockProvider1 = create_mock_provider_class("MockProvider1")
 MockProvider2 = create_mock_provider_class("MockProvider2")
 MockProvider3 = create_mock_provider_class("MockProvider3")
@@ -176,19 +203,19 @@ class TestIPFS:
 
     def test_publish__first_attempt_fails__retries_and_succeeds(self, mock_w3, mock_provider1):
         provider = mock_provider1
-        provider.publish = MagicMock(side_effect=[IPFSError("fail"), HARDCODED_PUBLISH_CID])
+        provider.publish_car = MagicMock(side_effect=[IPFSError("fail"), HARDCODED_PUBLISH_CID])
         ipfs = IPFS(mock_w3, [provider], retries=2)
         result = ipfs.publish(b"test", "test")
         assert result == HARDCODED_PUBLISH_CID
-        assert provider.publish.call_count == 2
+        assert provider.publish_car.call_count == 2
 
     def test_publish__all_retries_fail__raises_no_more_providers_error(self, mock_w3, mock_provider1):
         provider = mock_provider1
-        provider.publish = MagicMock(side_effect=IPFSError("fail"))
+        provider.publish_car = MagicMock(side_effect=IPFSError("fail"))
         ipfs = IPFS(mock_w3, [provider], retries=3)
         with pytest.raises(NoMoreProvidersError):
             ipfs.publish(b"test", "test")
-        assert provider.publish.call_count == 3
+        assert provider.publish_car.call_count == 3
 
     @patch('random.shuffle')
     def test_publish__all_providers_succeed__uploads_to_all_providers(
@@ -196,16 +223,16 @@ class TestIPFS:
     ):
         mock_shuffle.return_value = None
         provider1 = mock_provider1
-        provider1.publish = MagicMock(return_value=HARDCODED_PUBLISH_CID)
+        provider1.publish_car = MagicMock(return_value=HARDCODED_PUBLISH_CID)
         provider2 = mock_provider2
-        provider2.publish = MagicMock(return_value=HARDCODED_PUBLISH_CID)
+        provider2.publish_car = MagicMock(return_value=HARDCODED_PUBLISH_CID)
 
         ipfs = IPFS(mock_w3, [provider1, provider2])
         result = ipfs.publish(b"test", "test")
 
         assert result == HARDCODED_PUBLISH_CID
-        assert provider1.publish.call_count == 1
-        assert provider2.publish.call_count == 1
+        assert provider1.publish_car.call_count == 1
+        assert provider2.publish_car.call_count == 1
 
     @patch('random.shuffle')
     def test_publish__all_providers_fail__raises_no_more_providers_error(
@@ -213,17 +240,17 @@ class TestIPFS:
     ):
         mock_shuffle.return_value = None
         provider1 = mock_provider1
-        provider1.publish = MagicMock(side_effect=Exception("fail1"))
+        provider1.publish_car = MagicMock(side_effect=Exception("fail1"))
         provider2 = mock_provider2
-        provider2.publish = MagicMock(side_effect=Exception("fail2"))
+        provider2.publish_car = MagicMock(side_effect=Exception("fail2"))
 
         ipfs = IPFS(mock_w3, [provider1, provider2])
 
         with pytest.raises(NoMoreProvidersError):
             ipfs.publish(b"test", "test")
 
-        assert provider1.publish.call_count == 1
-        assert provider2.publish.call_count == 1
+        assert provider1.publish_car.call_count == 1
+        assert provider2.publish_car.call_count == 1
 
     @patch('random.shuffle')
     def test_publish__some_providers_fail_some_succeed__returns_successful_cid(
@@ -231,16 +258,16 @@ class TestIPFS:
     ):
         mock_shuffle.return_value = None
         provider1 = mock_provider1
-        provider1.publish = MagicMock(side_effect=Exception("fail"))
+        provider1.publish_car = MagicMock(side_effect=Exception("fail"))
         provider2 = mock_provider2
-        provider2.publish = MagicMock(return_value=HARDCODED_PUBLISH_CID)
+        provider2.publish_car = MagicMock(return_value=HARDCODED_PUBLISH_CID)
 
         ipfs = IPFS(mock_w3, [provider1, provider2])
         result = ipfs.publish(b"test", "test")
 
         assert result == HARDCODED_PUBLISH_CID
-        assert provider1.publish.call_count == 1
-        assert provider2.publish.call_count == 1
+        assert provider1.publish_car.call_count == 1
+        assert provider2.publish_car.call_count == 1
 
     def test_publish_quorum__consensus_reached__returns_consensus_cid(
         self, mock_w3, mock_provider1, mock_provider2, mock_provider3
@@ -248,17 +275,17 @@ class TestIPFS:
         consensus_cid = CID("QmConsensus")
         minority_cid = CID("QmMinority")
 
-        mock_provider1.publish = MagicMock(return_value=consensus_cid)
-        mock_provider2.publish = MagicMock(return_value=consensus_cid)
-        mock_provider3.publish = MagicMock(return_value=minority_cid)
+        mock_provider1.publish_car = MagicMock(return_value=consensus_cid)
+        mock_provider2.publish_car = MagicMock(return_value=consensus_cid)
+        mock_provider3.publish_car = MagicMock(return_value=minority_cid)
 
         ipfs = IPFS(mock_w3, [mock_provider1, mock_provider2, mock_provider3])
         result = ipfs.publish(b"test", "test")
 
         assert result == consensus_cid
-        assert mock_provider1.publish.call_count == 1
-        assert mock_provider2.publish.call_count == 1
-        assert mock_provider3.publish.call_count == 1
+        assert mock_provider1.publish_car.call_count == 1
+        assert mock_provider2.publish_car.call_count == 1
+        assert mock_provider3.publish_car.call_count == 1
 
     def test_publish_quorum__no_consensus__falls_back_to_priority_provider(
         self, mock_w3, mock_provider1, mock_provider2, mock_provider3
@@ -267,17 +294,17 @@ class TestIPFS:
         cid2 = CID("QmCID2")
         cid3 = CID("QmCID3")
 
-        mock_provider1.publish = MagicMock(return_value=cid1)
-        mock_provider2.publish = MagicMock(return_value=cid2)
-        mock_provider3.publish = MagicMock(return_value=cid3)
+        mock_provider1.publish_car = MagicMock(return_value=cid1)
+        mock_provider2.publish_car = MagicMock(return_value=cid2)
+        mock_provider3.publish_car = MagicMock(return_value=cid3)
 
         ipfs = IPFS(mock_w3, [mock_provider1, mock_provider2, mock_provider3])
         result = ipfs.publish(b"test", "test")
 
         assert result == cid1
-        assert mock_provider1.publish.call_count == 1
-        assert mock_provider2.publish.call_count == 1
-        assert mock_provider3.publish.call_count == 1
+        assert mock_provider1.publish_car.call_count == 1
+        assert mock_provider2.publish_car.call_count == 1
+        assert mock_provider3.publish_car.call_count == 1
 
     def test_publish_quorum__four_providers_no_consensus__falls_back_to_second_priority(
         self, mock_w3, mock_provider1, mock_provider2, mock_provider3, mock_provider4
@@ -286,19 +313,19 @@ class TestIPFS:
         cid3 = CID("QmCID3")
         cid4 = CID("QmCID4")
 
-        mock_provider1.publish = MagicMock(side_effect=Exception("fail"))
-        mock_provider2.publish = MagicMock(return_value=cid2)
-        mock_provider3.publish = MagicMock(return_value=cid3)
-        mock_provider4.publish = MagicMock(return_value=cid4)
+        mock_provider1.publish_car = MagicMock(side_effect=Exception("fail"))
+        mock_provider2.publish_car = MagicMock(return_value=cid2)
+        mock_provider3.publish_car = MagicMock(return_value=cid3)
+        mock_provider4.publish_car = MagicMock(return_value=cid4)
 
         ipfs = IPFS(mock_w3, [mock_provider1, mock_provider2, mock_provider3, mock_provider4])
         result = ipfs.publish(b"test", "test")
 
         assert result == cid2
-        assert mock_provider1.publish.call_count == 1
-        assert mock_provider2.publish.call_count == 1
-        assert mock_provider3.publish.call_count == 1
-        assert mock_provider4.publish.call_count == 1
+        assert mock_provider1.publish_car.call_count == 1
+        assert mock_provider2.publish_car.call_count == 1
+        assert mock_provider3.publish_car.call_count == 1
+        assert mock_provider4.publish_car.call_count == 1
 
     def test_publish_quorum__four_providers_tie__falls_back_to_priority(
         self, mock_w3, mock_provider1, mock_provider2, mock_provider3, mock_provider4
@@ -307,16 +334,279 @@ class TestIPFS:
         cid_b = CID("QmCIDB")
 
         # Required quorum = (4 // 2) + 1 = 3, but each CID appears only 2 times
-        mock_provider1.publish = MagicMock(return_value=cid_a)
-        mock_provider2.publish = MagicMock(return_value=cid_a)
-        mock_provider3.publish = MagicMock(return_value=cid_b)
-        mock_provider4.publish = MagicMock(return_value=cid_b)
+        mock_provider1.publish_car = MagicMock(return_value=cid_a)
+        mock_provider2.publish_car = MagicMock(return_value=cid_a)
+        mock_provider3.publish_car = MagicMock(return_value=cid_b)
+        mock_provider4.publish_car = MagicMock(return_value=cid_b)
 
         ipfs = IPFS(mock_w3, [mock_provider1, mock_provider2, mock_provider3, mock_provider4])
         result = ipfs.publish(b"test", "test")
 
         assert result == cid_a
-        assert mock_provider1.publish.call_count == 1
-        assert mock_provider2.publish.call_count == 1
-        assert mock_provider3.publish.call_count == 1
-        assert mock_provider4.publish.call_count == 1
+        assert mock_provider1.publish_car.call_count == 1
+        assert mock_provider2.publish_car.call_count == 1
+        assert mock_provider3.publish_car.call_count == 1
+        assert mock_provider4.publish_car.call_count == 1
+
+    def test_publish__several_providers__content_hashed_once(self, mock_w3, mock_provider1, mock_provider2):
+        ipfs = IPFS(mock_w3, [mock_provider1, mock_provider2])
+
+        with (
+            patch.object(CARConverter, "create_car", wraps=ipfs.car_converter.create_car) as create_car,
+            patch.object(CARConverter, "create_unixfs_based_cid") as create_cid,
+        ):
+            assert ipfs.publish(HARDCODED_PUBLISH_CONTENT, "test") == HARDCODED_PUBLISH_CID
+
+        create_car.assert_called_once()
+        create_cid.assert_not_called()
+
+    def test_fetch__with_cache__fetched_from_provider_once(self, mock_w3, mock_provider1, tmp_path):
+        mock_provider1._fetch = MagicMock(return_value=HARDCODED_FETCH_CONTENT)
+        ipfs = IPFS(mock_w3, [mock_provider1], cache=IPFSCache(tmp_path, max_size=1024))
+
+        for frame in range(3):
+            assert ipfs.fetch(HARDCODED_FETCH_CID, FrameNumber(frame)) == HARDCODED_FETCH_CONTENT
+
+        mock_provider1._fetch.assert_called_once_with(HARDCODED_FETCH_CID)
+
+    def test_fetch__corrupted_cache_entry__fetched_from_provider_again(self, mock_w3, mock_provider1, tmp_path):
+        mock_provider1._fetch = MagicMock(return_value=HARDCODED_FETCH_CONTENT)
+        ipfs = IPFS(mock_w3, [mock_provider1], cache=IPFSCache(tmp_path, max_size=1024))
+        ipfs.fetch(HARDCODED_FETCH_CID, FrameNumber(0))
+
+        (tmp_path / str(HARDCODED_FETCH_CID)).write_bytes(b"corrupted")
+
+        assert ipfs.fetch(HARDCODED_FETCH_CID, FrameNumber(0)) == HARDCODED_FETCH_CONTENT
+        assert mock_provider1._fetch.call_count == 2
+        assert (tmp_path / str(HARDCODED_FETCH_CID)).read_bytes() == HARDCODED_FETCH_CONTENT
+
+    def test_publish__with_cache__published_content_fetched_from_cache(self, mock_w3, mock_provider1, tmp_path):
+        mock_provider1._fetch = MagicMock()
+        ipfs = IPFS(mock_w3, [mock_provider1], cache=IPFSCache(tmp_path, max_size=1024))
+
+        cid = ipfs.publish(HARDCODED_PUBLISH_CONTENT, "test")
+
+        assert ipfs.fetch(cid, FrameNumber(0)) == HARDCODED_PUBLISH_CONTENT
+        mock_provider1._fetch.assert_not_called()
+
+    @patch('random.shuffle')
+    @pytest.mark.parametrize(
+        ("delays", "quorum_delay"),
+        [((0.0, 0.2, 1.0), 0.2), ((0.2, 1.0, 0.0), 0.2), ((0.0, 0.1, 0.2, 1.0, 1.0), 0.2)],
+    )
+    def test_publish_early_quorum__slow_provider__returns_after_quorum_th_fastest(
+        self, mock_shuffle, mock_w3, delays, quorum_delay
+    ):
+        providers = [create_mock_provider_class(f"MockProvider{i}")() for i in range(len(delays))]
+        for provider, delay in zip(providers, delays, strict=True):
+            provider.publish_car = MagicMock(side_effect=delayed(delay, HARDCODED_PUBLISH_CID))
+        ipfs = IPFS(mock_w3, providers, early_quorum=True)
+
+        started = time.perf_counter()
+        result = ipfs.publish(b"test", "test")
+        elapsed = time.perf_counter() - started
+
+        assert result == HARDCODED_PUBLISH_CID
+        assert quorum_delay <= elapsed < 0.8
+
+        wait_for_background_uploads(ipfs)
+        for provider in providers:
+            assert provider.publish_car.call_count == 1
+            assert IPFS_UPLOADS.labels(provider=provider.__class__.__name__, result="success")._value.get() >= 1
+
+    @patch('random.shuffle')
+    def test_publish_early_quorum__background_upload_fails__failure_reported(
+        self, mock_shuffle, mock_w3, mock_provider1, mock_provider2, mock_provider3, caplog
+    ):
+        failures = IPFS_UPLOADS.labels(provider="MockProvider3", result="failure")._value.get()
+        mock_provider1.publish_car = MagicMock(return_value=HARDCODED_PUBLISH_CID)
+        mock_provider2.publish_car = MagicMock(return_value=HARDCODED_PUBLISH_CID)
+        mock_provider3.publish_car = MagicMock(side_effect=delayed(0.5, IPFSError("fail")))
+        ipfs = IPFS(mock_w3, [mock_provider1, mock_provider2, mock_provider3], retries=2, early_quorum=True)
+
+        assert ipfs.publish(b"test", "test") == HARDCODED_PUBLISH_CID
+
+        wait_for_background_uploads(ipfs)
+        assert mock_provider3.publish_car.call_count == 2
+        assert IPFS_UPLOADS.labels(provider="MockProvider3", result="failure")._value.get() == failures + 1
+        assert "Background upload failed" in caplog.text
+
+    @patch('random.shuffle')
+    def test_publish_early_quorum__background_upload_left__next_publish_not_delayed(
+        self, mock_shuffle, mock_w3, mock_provider1, mock_provider2, mock_provider3
+    ):
+        mock_provider1.publish_car = MagicMock(return_value=HARDCODED_PUBLISH_CID)
+        mock_provider2.publish_car = MagicMock(return_value=HARDCODED_PUBLISH_CID)
+        mock_provider3.publish_car = MagicMock(side_effect=delayed(1.0, HARDCODED_PUBLISH_CID))
+        ipfs = IPFS(mock_w3, [mock_provider1, mock_provider2, mock_provider3], early_quorum=True)
+
+        started = time.perf_counter()
+        assert ipfs.publish(b"first", "first") == HARDCODED_PUBLISH_CID
+        assert ipfs.publish(b"second", "second") == HARDCODED_PUBLISH_CID
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.5
+        assert len(ipfs.background_uploads) == 2
+        wait_for_background_uploads(ipfs)
+        assert mock_provider3.publish_car.call_count == 2
+
+    @patch('random.shuffle')
+    def test_publish_early_quorum__background_upload__car_closed_after_it(
+        self, mock_shuffle, mock_w3, mock_provider1, mock_provider2, mock_provider3
+    ):
+        car = CARConverter().create_car([HARDCODED_PUBLISH_CONTENT])
+        uploaded = []
+
+        def slow_upload(car, name):
+            time.sleep(0.3)
+            uploaded.append(car.read_content())
+            return HARDCODED_PUBLISH_CID
+
+        mock_provider1.publish_car = MagicMock(return_value=HARDCODED_PUBLISH_CID)
+        mock_provider2.publish_car = MagicMock(return_value=HARDCODED_PUBLISH_CID)
+        mock_provider3.publish_car = MagicMock(side_effect=slow_upload)
+        ipfs = IPFS(mock_w3, [mock_provider1, mock_provider2, mock_provider3], early_quorum=True)
+
+        assert ipfs.publish(car, "test") == HARDCODED_PUBLISH_CID
+        assert not car.blocks.closed
+
+        wait_for_background_uploads(ipfs)
+        assert uploaded == [HARDCODED_PUBLISH_CONTENT]
+        assert car.blocks.closed
+        assert car.content.closed
+
+    @patch('random.shuffle')
+    def test_publish_early_quorum__no_majority__waits_for_all_uploads(
+        self, mock_shuffle, mock_w3, mock_provider1, mock_provider2, mock_provider3
+    ):
+        mock_provider1.publish_car = MagicMock(return_value=CID("QmCID1"))
+        mock_provider2.publish_car = MagicMock(return_value=CID("QmCID2"))
+        mock_provider3.publish_car = MagicMock(side_effect=delayed(0.3, CID("QmCID2")))
+        ipfs = IPFS(mock_w3, [mock_provider1, mock_provider2, mock_provider3], early_quorum=True)
+
+        assert ipfs.publish(b"test", "test") == CID("QmCID2")
+        assert mock_provider3.publish_car.call_count == 1
+
+
+@dataclass
+class GatewayStandIn:
+    """Kubo `cat` endpoint answering with the given delay and response"""
+
+    delay: float = 0.0
+    status: int = 200
+    content: bytes = HARDCODED_FETCH_CONTENT
+    requests: int = 0
+
+    def __call__(self, request):
+        self.requests += 1
+        time.sleep(self.delay)
+        return self.status, {}, self.content
+
+
+@pytest.mark.unit
+class TestHedgedFetch:
+    @pytest.fixture
+    def serve(self):
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+
+            def serve(*stand_ins: GatewayStandIn) -> list[Kubo]:
+                providers = []
+                for port, stand_in in enumerate(stand_ins, start=5001):
+                    rsps.add_callback(responses.POST, f"http://127.0.0.1:{port}/api/v0/cat", callback=stand_in)
+                    providers.append(Kubo("http://127.0.0.1", port, timeout=5))
+                return providers
+
+            yield serve
+
+    @pytest.fixture(autouse=True)
+    def no_shuffle(self):
+        with patch('random.shuffle'):
+            yield
+
+    def test_fetch__slow_first_provider__hedged_to_fast_one(self, serve):
+        slow, fast = GatewayStandIn(delay=3), GatewayStandIn()
+        ipfs = IPFS(MagicMock(), serve(slow, fast), hedged=True, hedge_delay=0.1)
+
+        started = time.perf_counter()
+        result = ipfs.fetch(HARDCODED_FETCH_CID, FrameNumber(0))
+
+        assert result == HARDCODED_FETCH_CONTENT
+        assert time.perf_counter() - started < 2
+        assert slow.requests == 1
+        assert fast.requests == 1
+
+    def test_fetch__fast_first_provider__not_hedged(self, serve):
+        fast, other = GatewayStandIn(), GatewayStandIn()
+        ipfs = IPFS(MagicMock(), serve(fast, other), hedged=True, hedge_delay=2)
+
+        assert ipfs.fetch(HARDCODED_FETCH_CID, FrameNumber(0)) == HARDCODED_FETCH_CONTENT
+
+        assert fast.requests == 1
+        assert other.requests == 0
+
+    @pytest.mark.parametrize(
+        "broken",
+        [GatewayStandIn(status=500), GatewayStandIn(content=b"corrupted_fetched_content")],
+        ids=["server_error", "invalid_content"],
+    )
+    def test_fetch__failing_first_provider__next_one_called_without_delay(self, serve, broken):
+        healthy = GatewayStandIn()
+        ipfs = IPFS(MagicMock(), serve(broken, healthy), retries=1, hedged=True, hedge_delay=10)
+
+        started = time.perf_counter()
+        result = ipfs.fetch(HARDCODED_FETCH_CID, FrameNumber(0))
+
+        assert result == HARDCODED_FETCH_CONTENT
+        assert time.perf_counter() - started < 5
+        assert ipfs.stats[id(ipfs.providers[0])].error_rate > 0
+
+    def test_fetch__hedged_provider_fails_after_response__not_retried(self, serve):
+        failing, fast = GatewayStandIn(delay=0.3, status=500), GatewayStandIn()
+        ipfs = IPFS(MagicMock(), serve(failing, fast), retries=3, hedged=True, hedge_delay=0.1)
+
+        assert ipfs.fetch(HARDCODED_FETCH_CID, FrameNumber(0)) == HARDCODED_FETCH_CONTENT
+
+        time.sleep(1)
+        assert failing.requests == 1
+        assert fast.requests == 1
+
+    def test_fetch__all_providers_fail__raises_no_more_providers_error(self, serve):
+        ipfs = IPFS(
+            MagicMock(),
+            serve(GatewayStandIn(status=500), GatewayStandIn(status=404)),
+            retries=1,
+            hedged=True,
+            hedge_delay=0.1,
+        )
+
+        with pytest.raises(NoMoreProvidersError):
+            ipfs.fetch(HARDCODED_FETCH_CID, FrameNumber(0))
+
+    def test_fetch__latency_history__fastest_provider_called_first(self, serve):
+        slower, faster = GatewayStandIn(), GatewayStandIn()
+        providers = serve(slower, faster)
+        ipfs = IPFS(MagicMock(), providers, hedged=True, hedge_delay=5)
+        ipfs.stats[id(providers[0])].observe(2.0)
+        ipfs.stats[id(providers[1])].observe(1.0)
+
+        assert ipfs.fetch(HARDCODED_FETCH_CID, FrameNumber(0)) == HARDCODED_FETCH_CONTENT
+
+        assert faster.requests == 1
+        assert slower.requests == 0
+        assert IPFS_PROVIDER_LATENCY.labels(provider="Kubo")._value.get() > 0
+
+
+@pytest.mark.unit
+def test_provider_stats__observe__moving_averages_updated():
+    stats = ProviderStats()
+    assert stats.expected_latency == float("inf")
+    assert stats.latency_percentile(95) is None
+
+    stats.observe(1.0)
+    stats.observe(None)
+    stats.observe(2.0)
+
+    assert stats.latency == pytest.approx(1.3)
+    assert stats.error_rate == pytest.approx(0.21)
+    assert stats.expected_latency == pytest.approx(1.3 / 0.79)
+    assert stats.latency_percentile(95) == pytest.approx(1.95)
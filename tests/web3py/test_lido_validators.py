@@ -1,7 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
 import pytest
 
+from src import variables
 from src.constants import COMPOUNDING_WITHDRAWAL_PREFIX, ETH1_ADDRESS_WITHDRAWAL_PREFIX
 from src.modules.oracles.accounting.types import BeaconStat
 from src.web3py.extensions.lido_validators import (
@@ -218,8 +220,15 @@ def test_get_lido_wc_list(web3):
 # ---- merge_validators_with_keys ----
 
 
+@pytest.fixture(params=[False, True], ids=["dict", "pubkey_index"])
+def pubkey_index_path(request, tmp_path, monkeypatch):
+    path = str(tmp_path / "pubkeys") if request.param else ''
+    monkeypatch.setattr(variables, 'PUBKEY_INDEX_PATH', path)
+    return path
+
+
 @pytest.mark.unit
-def test_merge_validators_with_keys():
+def test_merge_validators_with_keys(pubkey_index_path):
     validators = ValidatorFactory.batch(5)
     matching_keys = LidoKeyFactory.generate_for_validators(validators[:3])
     extra_keys = LidoKeyFactory.batch(2)
@@ -240,6 +249,18 @@ def test_merge_validators_with_keys_empty():
     assert pending == []
 
 
+@pytest.mark.unit
+def test_merge_validators_with_keys__older_state_after_newer__new_keys_pending(pubkey_index_path):
+    validators = ValidatorFactory.batch(5)
+    keys = LidoKeyFactory.generate_for_validators(validators)
+    LidoValidatorsProvider.compute_lido_validators(keys, validators)
+
+    active, pending = LidoValidatorsProvider.compute_lido_validators(keys, validators[:3])
+
+    assert [v.index for v in active] == [v.index for v in validators[:3]]
+    assert pending == keys[3:]
+
+
 @pytest.mark.unit
 def test_merge_validators_with_keys_all_pending():
     # Keys present in KAPI but no validators on CL yet
@@ -350,6 +371,10 @@ def _setup_pending_validators(web3, pending_lido_keys, pending_deposits):
     web3.lido_validators._get_lido_validators_with_keys = Mock(return_value=([], pending_lido_keys))
 
 
+def _all_valid(deposits, genesis_fork_version, executor=None):
+    return [True] * len(deposits)
+
+
 def _make_deposit(pubkey=_PUBKEY, wc=_LIDO_WC):
     return Mock(pubkey=pubkey, withdrawal_credentials=wc, amount=32_000_000_000, signature=_SIGNATURE)
 
@@ -373,7 +398,7 @@ def test_get_pending_lido_validators_happy_path(web3):
     deposit = _make_deposit(wc=_LIDO_WC)
     _setup_pending_validators(web3, [lido_key], [deposit])
 
-    with patch('src.web3py.extensions.lido_validators.is_valid_deposit_signature', return_value=True):
+    with patch('src.web3py.extensions.lido_validators.verify_deposit_signatures', side_effect=_all_valid):
         result = web3.lido_validators.get_pending_lido_validators(ReferenceBlockStampFactory.build())
 
     assert _PUBKEY in result
@@ -389,7 +414,7 @@ def test_get_pending_lido_validators_frontrun_attack(web3, caplog):
     deposit = _make_deposit(wc=_NON_LIDO_WC)
     _setup_pending_validators(web3, [lido_key], [deposit])
 
-    with patch('src.web3py.extensions.lido_validators.is_valid_deposit_signature', return_value=True):
+    with patch('src.web3py.extensions.lido_validators.verify_deposit_signatures', side_effect=_all_valid):
         result = web3.lido_validators.get_pending_lido_validators(ReferenceBlockStampFactory.build())
 
     assert result == {}
@@ -404,7 +429,7 @@ def test_get_pending_lido_validators_second_deposit_appended(web3):
     deposit2 = _make_deposit(wc=_LIDO_WC)
     _setup_pending_validators(web3, [lido_key], [deposit1, deposit2])
 
-    with patch('src.web3py.extensions.lido_validators.is_valid_deposit_signature', return_value=True):
+    with patch('src.web3py.extensions.lido_validators.verify_deposit_signatures', side_effect=_all_valid):
         result = web3.lido_validators.get_pending_lido_validators(ReferenceBlockStampFactory.build())
 
     assert _PUBKEY in result
@@ -420,12 +445,38 @@ def test_get_pending_lido_validators_second_deposit_for_invalid_key_skipped(web3
     deposit2 = _make_deposit(wc=_LIDO_WC)
     _setup_pending_validators(web3, [lido_key], [deposit1, deposit2])
 
-    with patch('src.web3py.extensions.lido_validators.is_valid_deposit_signature', return_value=True):
+    with patch('src.web3py.extensions.lido_validators.verify_deposit_signatures', side_effect=_all_valid):
         result = web3.lido_validators.get_pending_lido_validators(ReferenceBlockStampFactory.build())
 
     assert result == {}
 
 
+@pytest.mark.unit
+def test_get_first_valid_deposits__several_rounds__single_pool(monkeypatch):
+    monkeypatch.setattr(variables, 'DEPOSIT_SIGNATURE_VERIFICATION_WORKERS', 2)
+    invalid = _make_deposit(pubkey=_PUBKEY)
+    valid = _make_deposit(pubkey=_PUBKEY)
+    other = _make_deposit(pubkey='0x' + 'cd' * 4)
+    executors = []
+
+    def verify(deposits, genesis_fork_version, executor=None):
+        executors.append(executor)
+        return [deposit is not invalid for deposit in deposits]
+
+    with (
+        patch('src.services.deposit_signature_verification.ProcessPoolExecutor', wraps=ThreadPoolExecutor) as pool,
+        patch('src.web3py.extensions.lido_validators.verify_deposit_signatures', side_effect=verify),
+    ):
+        first_valid = LidoValidatorsProvider._get_first_valid_deposits(
+            {_PUBKEY: [invalid, valid], other.pubkey: [other]}, b''
+        )
+
+    assert first_valid == {_PUBKEY: valid, other.pubkey: other}
+    pool.assert_called_once_with(max_workers=2)
+    assert len(executors) == 2
+    assert executors[0] is not None and executors[0] is executors[1]
+
+
 @pytest.mark.unit
 def test_get_active_lido_validators__with_empty_data__returns_empty_list(web3):
     """
@@ -191,6 +191,65 @@ def test_get_curve_params(w3: Web3StakingModule, blockstamp):
     w3.staking_module.params.get_strikes_params.assert_called_once_with(curve_id, BLOCK_HASH)
 
 
+@pytest.fixture()
+def curve_params_reads(w3: Web3StakingModule) -> dict[str, Mock]:
+    params = w3.staking_module.params
+    reads = {
+        "get_performance_coefficients": Mock(side_effect=lambda curve_id, _: f"perf_coeffs_{curve_id}"),
+        "get_performance_leeway_data": Mock(side_effect=lambda curve_id, _: f"perf_leeway_{curve_id}"),
+        "get_reward_share_data": Mock(side_effect=lambda curve_id, _: f"reward_share_{curve_id}"),
+        "get_strikes_params": Mock(side_effect=lambda curve_id, _: f"strikes_params_{curve_id}"),
+    }
+    for name, read in reads.items():
+        setattr(params, name, read)
+    return reads
+
+
+@pytest.mark.unit
+def test_get_curve_params_many__reads_every_distinct_curve_once(
+    w3: Web3StakingModule, blockstamp, curve_params_reads: dict[str, Mock]
+):
+    no_ids = [NodeOperatorId(i) for i in range(100)]
+    w3.staking_module.accounting.get_bond_curve_ids = Mock(side_effect=lambda ids, _: {i: i % 3 for i in ids})
+    w3.staking_module.accounting.get_bond_curve_id = Mock()
+
+    result = w3.staking_module.get_curve_params_many(no_ids + no_ids[:10], blockstamp)
+
+    assert list(result) == no_ids
+    assert result[NodeOperatorId(4)].perf_coeffs == "perf_coeffs_1"
+    assert result[NodeOperatorId(4)].strikes_params == "strikes_params_1"
+    assert result[NodeOperatorId(3)] is result[NodeOperatorId(0)]
+    w3.staking_module.accounting.get_bond_curve_ids.assert_called_once_with(no_ids, BLOCK_HASH)
+    for read in curve_params_reads.values():
+        assert read.call_count == 3
+
+    # Memoised per block: no requests for the known node operators anymore.
+    assert w3.staking_module.get_curve_params(NodeOperatorId(5), blockstamp) is result[NodeOperatorId(5)]
+    assert w3.staking_module.get_curve_params_many(no_ids[:50], blockstamp) == {i: result[i] for i in no_ids[:50]}
+    w3.staking_module.accounting.get_bond_curve_ids.assert_called_once()
+    w3.staking_module.accounting.get_bond_curve_id.assert_not_called()
+    for read in curve_params_reads.values():
+        assert read.call_count == 3
+
+
+@pytest.mark.unit
+def test_get_curve_params_many__another_block__requests_again(
+    w3: Web3StakingModule, monkeypatch, curve_params_reads: dict[str, Mock]
+):
+    monkeypatch.setattr(StakingModuleContracts, "CURVE_PARAMS_CACHE_BLOCKS", 2)
+    w3.staking_module.accounting.get_bond_curve_ids = Mock(side_effect=lambda ids, _: dict.fromkeys(ids, 0))
+
+    for block_hash in ("0x01", "0x02", "0x03", "0x01"):
+        w3.staking_module.get_curve_params_many([NodeOperatorId(1)], Mock(block_hash=block_hash))
+
+    assert [c.args[1] for c in w3.staking_module.accounting.get_bond_curve_ids.call_args_list] == [
+        "0x01",
+        "0x02",
+        "0x03",
+        "0x01",
+    ]
+
+
 @pytest.mark.unit
 def test_has_contract_address_changed_returns_false_when_same(w3: Web3StakingModule):
     assert w3.staking_module.has_contract_address_changed() is False